@@ -0,0 +1,54 @@
+"""Backfill flow is_component
+
+Revision ID: 4f9b6e2c1d7a
+Revises: 631faacf5da2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.engine.reflection import Inspector
+
+# revision identifiers, used by Alembic.
+revision: str = "4f9b6e2c1d7a"
+down_revision: Union[str, None] = "631faacf5da2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+flow_table = sa.table(
+    "flow",
+    sa.column("id"),
+    sa.column("data", sa.JSON),
+    sa.column("is_component", sa.Boolean),
+)
+
+
+def is_component_from_data(data) -> bool:
+    # Same rule as validate_is_component, which sets it when flows are saved
+    if not data:
+        return False
+    if data.get("is_component") is not None:
+        return bool(data["is_component"])
+    return len(data.get("nodes", [])) == 1
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)  # type: ignore
+    if "flow" not in inspector.get_table_names():
+        return
+    rows = conn.execute(
+        sa.select(flow_table.c.id, flow_table.c.data).where(flow_table.c.is_component.is_(None))
+    ).fetchall()
+    for flow_id, data in rows:
+        conn.execute(
+            flow_table.update().where(flow_table.c.id == flow_id).values(is_component=is_component_from_data(data))
+        )
+
+
+def downgrade() -> None:
+    # The flows saved without is_component can't be told apart anymore
+    pass
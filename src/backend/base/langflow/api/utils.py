@@ -1,7 +1,8 @@
+import asyncio
 import uuid
 import warnings
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
 
 from fastapi import HTTPException
 from platformdirs import user_cache_dir
@@ -150,24 +151,6 @@ def get_file_path_value(file_path):
     return file_path
 
 
-def validate_is_component(flows: list["Flow"]):
-    for flow in flows:
-        if not flow.data or flow.is_component is not None:
-            continue
-
-        is_component = get_is_component_from_data(flow.data)
-        if is_component is not None:
-            flow.is_component = is_component
-        else:
-            flow.is_component = len(flow.data.get("nodes", [])) == 1
-    return flows
-
-
-def get_is_component_from_data(data: dict):
-    """Returns True if the data is a component."""
-    return data.get("is_component")
-
-
 async def check_langflow_version(component: StoreComponentCreate):
     from langflow.version.version import __version__ as current_version  # type: ignore
 
@@ -223,7 +206,9 @@ async def build_graph_from_db(flow_id: str, session: Session, chat_service: "Cha
     graph.set_run_id(run_id)
     graph.set_run_name()
     await graph.initialize_run()
-    await chat_service.set_cache(flow_id, graph)
+    # Warm the variable cache for the vertices that will be built next
+    graph.prefetch_variables()
+    await chat_service.set_graph(flow_id, graph)
     return graph
 
 
@@ -233,8 +218,14 @@ async def build_and_cache_graph_from_data(
     graph_data: dict,
 ):  # -> Graph | Any:
     """Build and cache the graph."""
-    graph = Graph.from_payload(graph_data, flow_id)
-    await chat_service.set_cache(flow_id, graph)
+    if cached_graph := await chat_service.get_graph(flow_id):
+        # Vertices that did not change since the last build keep their results. The cached
+        # graph may still be used by other builds, so a copy of it is updated and replaces it
+        graph = cached_graph.copy().update_from_payload(graph_data)
+        graph.reset_inactivated_vertices()
+    else:
+        graph = Graph.from_payload(graph_data, flow_id)
+    await chat_service.set_graph(flow_id, graph)
     return graph
 
 
@@ -321,6 +312,74 @@ def get_top_level_vertices(graph, vertices_ids):
     return top_level_vertices
 
 
+_END_OF_STREAM = object()
+
+
+async def coalesce_chunks(
+    chunks: AsyncIterator[str],
+    max_interval: float = 0.05,
+    max_size: int = 2048,
+    queue_size: int = 1000,
+) -> AsyncIterator[str]:
+    """
+    Joins the chunks of a stream so that a chunk is yielded at most every `max_interval` seconds
+    or when `max_size` characters are waiting.
+
+    The stream is read by a task into a queue of `queue_size` chunks. When the consumer is slower
+    than the stream, the chunks that arrived meanwhile are joined into one, and once the queue is
+    full the stream is not read until the consumer catches up. With a `max_interval` of 0 every
+    chunk is yielded as it arrives.
+    """
+    if max_interval <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(queue_size, 1))
+
+    async def read_stream():
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as exc:
+            await queue.put(exc)
+        else:
+            await queue.put(_END_OF_STREAM)
+
+    reader = asyncio.create_task(read_stream())
+    loop = asyncio.get_running_loop()
+    buffer: List[str] = []
+    size = 0
+    last_yield = loop.time()
+    done = False
+    try:
+        while not done:
+            if buffer:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(last_yield + max_interval - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    item = None
+            else:
+                item = await queue.get()
+            # Take what is already waiting in the queue without suspending
+            while item is not None:
+                if item is _END_OF_STREAM:
+                    done = True
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                buffer.append(item)
+                size += len(item)
+                item = queue.get_nowait() if size < max_size and not queue.empty() else None
+            if buffer and (done or size >= max_size or loop.time() - last_yield >= max_interval):
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+                last_yield = loop.time()
+    finally:
+        reader.cancel()
+
+
 def parse_exception(exc):
     """Parse the exception message."""
     if hasattr(exc, "body"):
@@ -11,6 +11,7 @@ from loguru import logger
 from langflow.api.utils import (
     build_and_cache_graph_from_data,
     build_graph_from_db,
+    coalesce_chunks,
     format_elapsed_time,
     format_exception_message,
     get_top_level_vertices,
@@ -29,7 +30,7 @@ from langflow.graph.graph.base import Graph
 from langflow.schema.schema import OutputLog
 from langflow.services.auth.utils import get_current_active_user
 from langflow.services.chat.service import ChatService
-from langflow.services.deps import get_chat_service, get_session, get_session_service
+from langflow.services.deps import get_chat_service, get_session, get_session_service, get_settings_service
 from langflow.services.monitor.utils import log_vertex_build
 
 if TYPE_CHECKING:
@@ -110,7 +111,7 @@ async def retrieve_vertices_order(
         # We need to get the id of each vertex
         # and return the same structure but only with the ids
         vertices_to_run = list(graph.vertices_to_run) + get_top_level_vertices(graph, graph.vertices_to_run)
-        await chat_service.set_cache(str(flow_id), graph)
+        await chat_service.set_graph(str(flow_id), graph)
         return VerticesOrderResponse(ids=first_layer, run_id=graph._run_id, vertices_to_run=vertices_to_run)
 
     except Exception as exc:
@@ -154,17 +155,18 @@ async def build_vertex(
     top_level_vertices = []
     try:
         start_time = time.perf_counter()
-        cache = await chat_service.get_cache(flow_id_str)
-        if not cache:
+        graph: Optional["Graph"] = await chat_service.get_graph(flow_id_str)
+        if graph is None:
             # If there's no cache
             logger.warning(f"No cache found for {flow_id_str}. Building graph starting at {vertex_id}")
-            graph: "Graph" = await build_graph_from_db(
+            graph = await build_graph_from_db(
                 flow_id=flow_id_str, session=next(get_session()), chat_service=chat_service
             )
         else:
-            graph = cache.get("result")
             await graph.initialize_run()
         vertex = graph.get_vertex(vertex_id)
+        # Building a vertex can build predecessors that were not built yet, their state is saved too
+        built_vertex_ids = {v.id for v in graph.vertices if v._built}
 
         try:
             lock = chat_service._cache_locks[flow_id_str]
@@ -232,7 +234,10 @@ async def build_vertex(
         graph.reset_inactivated_vertices()
         graph.reset_activated_vertices()
 
-        await chat_service.set_cache(flow_id_str, graph)
+        changed_vertex_ids = [vertex.id] + [
+            v.id for v in graph.vertices if v._built and v.id not in built_vertex_ids and v.id != vertex.id
+        ]
+        await chat_service.set_graph_run_state(flow_id_str, graph, changed_vertex_ids)
 
         # graph.stop_vertex tells us if the user asked
         # to stop the build of the graph at a certain vertex
@@ -252,6 +257,7 @@ async def build_vertex(
             params=params,
             id=vertex.id,
             data=result_data_response,
+            result_cache=graph.get_result_cache_counts(),
         )
         return build_response
     except Exception as exc:
@@ -297,14 +303,16 @@ async def build_vertex_stream(
     try:
         flow_id_str = str(flow_id)
 
+        settings = get_settings_service().settings
+
         async def stream_vertex():
+            graph = None
+            close_data: dict = {"message": "Stream closed"}
             try:
-                cache = await chat_service.get_cache(flow_id_str)
-                if not cache:
+                graph = await chat_service.get_graph(flow_id_str)
+                if graph is None:
                     # If there's no cache
                     raise ValueError(f"No cache found for {flow_id_str}.")
-                else:
-                    graph = cache.get("result")
 
                 vertex: "InterfaceVertex" = graph.get_vertex(vertex_id)
                 if not hasattr(vertex, "stream"):
@@ -328,12 +336,23 @@ async def build_vertex_stream(
                         data={"message": f"Streaming vertex {vertex_id}"},
                     )
                     yield str(stream_data)
-                    async for chunk in vertex.stream():
+                    n_chunks = 0
+                    # Tokens are sent in chunks, joined when they arrive faster than
+                    # the interval or than the client reads them
+                    async for chunk in coalesce_chunks(
+                        vertex.stream(),
+                        max_interval=settings.stream_chunk_interval,
+                        max_size=settings.stream_chunk_size,
+                        queue_size=settings.stream_queue_size,
+                    ):
                         stream_data = StreamData(
                             event="message",
                             data={"chunk": chunk},
                         )
                         yield str(stream_data)
+                        n_chunks += 1
+                    if vertex.stream_metrics:
+                        close_data["metrics"] = {**vertex.stream_metrics, "chunks": n_chunks}
                 elif vertex.result is not None:
                     stream_data = StreamData(
                         event="message",
@@ -351,8 +370,9 @@ async def build_vertex_stream(
                 yield str(StreamData(event="error", data={"error": exc_message}))
             finally:
                 logger.debug("Closing stream")
-                await chat_service.set_cache(flow_id_str, graph)
-                yield str(StreamData(event="close", data={"message": "Stream closed"}))
+                if graph is not None:
+                    await chat_service.set_graph_run_state(flow_id_str, graph, [vertex_id])
+                yield str(StreamData(event="close", data=close_data))
 
         return StreamingResponse(stream_vertex(), media_type="text/event-stream")
     except Exception as exc:
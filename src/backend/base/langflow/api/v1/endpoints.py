@@ -1,3 +1,4 @@
+import json
 from asyncio import Lock
 from http import HTTPStatus
 from typing import TYPE_CHECKING, Annotated, List, Optional, Union
@@ -5,6 +6,8 @@ from uuid import UUID
 
 import sqlalchemy as sa
 from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Request, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from sqlmodel import Session, select
 
@@ -25,7 +28,7 @@ from langflow.custom.utils import build_custom_component_template
 from langflow.graph.graph.base import Graph
 from langflow.graph.schema import RunOutputs
 from langflow.helpers.flow import get_flow_by_id_or_endpoint_name
-from langflow.processing.process import process_tweaks, run_graph_internal
+from langflow.processing.process import process_tweaks, run_graph_internal, stream_graph_runs
 from langflow.schema.graph import Tweaks
 from langflow.services.auth.utils import api_key_security, get_current_active_user
 from langflow.services.cache.utils import save_uploaded_file
@@ -81,9 +84,14 @@ async def simple_run_flow(
         flow_id_str = str(flow.id)
         if flow.data is None:
             raise ValueError(f"Flow {flow_id_str} has no data")
-        graph_data = flow.data.copy()
-        graph_data = process_tweaks(graph_data, input_request.tweaks or {}, stream=stream)
-        graph = Graph.from_payload(graph_data, flow_id=flow_id_str, user_id=str(user_id))
+        graph = get_session_service().load_compiled_graph(
+            flow_id=flow_id_str,
+            data_graph=flow.data,
+            updated_at=flow.updated_at,
+            tweaks=input_request.tweaks,
+            stream=stream,
+            user_id=str(user_id),
+        )
         inputs = [
             InputValueRequest(components=[], input_value=input_request.input_value, type=input_request.input_type)
         ]
@@ -255,6 +263,30 @@ async def webhook_run_flow(
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+async def stream_run_results(
+    graph: Graph,
+    flow_id: str,
+    session_id: Optional[str],
+    inputs: Optional[List[InputValueRequest]],
+    outputs: List[str],
+    max_concurrency: int,
+):
+    """Yields one JSON line per input with its index and outputs, as the runs finish."""
+    try:
+        async for index, run_outputs in stream_graph_runs(
+            graph=graph,
+            flow_id=flow_id,
+            session_id=session_id,
+            inputs=inputs,
+            outputs=outputs,
+            max_concurrency=max_concurrency,
+        ):
+            yield json.dumps(jsonable_encoder({"index": index, "outputs": run_outputs})) + "\n"
+    except Exception as exc:
+        logger.exception(exc)
+        yield json.dumps({"error": str(exc)}) + "\n"
+
+
 @router.post("/run/advanced/{flow_id}", response_model=RunResponse, response_model_exclude_none=True)
 async def experimental_run_flow(
     session: Annotated[Session, Depends(get_session)],
@@ -264,8 +296,11 @@ async def experimental_run_flow(
     tweaks: Annotated[Optional[Tweaks], Body(embed=True)] = None,  # noqa: F821
     stream: Annotated[bool, Body(embed=True)] = False,  # noqa: F821
     session_id: Annotated[Union[None, str], Body(embed=True)] = None,  # noqa: F821
+    max_concurrency: Annotated[int, Body(embed=True, ge=1)] = 1,  # noqa: F821
+    stream_results: Annotated[bool, Body(embed=True)] = False,  # noqa: F821
     api_key_user: User = Depends(api_key_security),
     session_service: SessionService = Depends(get_session_service),
+    settings_service: "SettingsService" = Depends(get_settings_service),
 ):
     """
     Executes a specified flow by ID with optional input values, output selection, tweaks, and streaming capability.
@@ -278,6 +313,8 @@ async def experimental_run_flow(
     - `tweaks` (Optional[Tweaks], optional): A dictionary of tweaks to customize the flow execution. The tweaks can be used to modify the flow's parameters and components. Tweaks can be overridden by the input values.
     - `stream` (bool, optional): Specifies whether the results should be streamed. Defaults to False.
     - `session_id` (Union[None, str], optional): An optional session ID to utilize existing session data for the flow execution.
+    - `max_concurrency` (int, optional): How many inputs run at the same time, each on its own copy of the flow. Capped by the `max_batch_concurrency` setting. Defaults to 1, which runs them one after the other.
+    - `stream_results` (bool, optional): Return the outputs of each input as newline-delimited JSON as soon as its run finishes, instead of all of them in input order. Defaults to False.
     - `api_key_user` (User): The user associated with the current API key. Automatically resolved from the API key.
     - `session_service` (SessionService): The session service object for managing flow sessions.
 
@@ -330,6 +367,12 @@ async def experimental_run_flow(
             graph_data = flow.data
             graph_data = process_tweaks(graph_data, tweaks or {})
             graph = Graph.from_payload(graph_data, flow_id=flow_id_str)
+        max_concurrency = min(max_concurrency, settings_service.settings.max_batch_concurrency)
+        if stream_results:
+            return StreamingResponse(
+                stream_run_results(graph, flow_id_str, session_id, inputs, outputs, max_concurrency),
+                media_type="application/x-ndjson",
+            )
         task_result, session_id = await run_graph_internal(
             graph=graph,
             flow_id=flow_id_str,
@@ -337,6 +380,7 @@ async def experimental_run_flow(
             inputs=inputs,
             outputs=outputs,
             stream=stream,
+            max_concurrency=max_concurrency,
         )
 
         return RunResponse(outputs=task_result, session_id=session_id)
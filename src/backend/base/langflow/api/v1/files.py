@@ -1,10 +1,9 @@
-import hashlib
 from http import HTTPStatus
-from io import BytesIO
+from typing import AsyncIterator, Optional
 from uuid import UUID
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, UploadFile
 from fastapi.responses import StreamingResponse
 
 
@@ -13,7 +12,7 @@ from langflow.services.auth.utils import get_current_active_user
 from langflow.services.database.models.flow import Flow
 from langflow.services.deps import get_session, get_storage_service
 from langflow.services.storage.service import StorageService
-from langflow.services.storage.utils import build_content_type_from_extension
+from langflow.services.storage.utils import build_content_type_from_extension, parse_range_header
 
 router = APIRouter(tags=["Files"], prefix="/files")
 
@@ -36,6 +35,11 @@ def get_flow_id(
     return flow_id_str
 
 
+async def read_chunks(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
 @router.post("/upload/{flow_id}", status_code=HTTPStatus.CREATED)
 async def upload_file(
     file: UploadFile,
@@ -44,17 +48,24 @@ async def upload_file(
 ):
     try:
         flow_id_str = str(flow_id)
-        file_content = await file.read()
-        file_name = file.filename or hashlib.sha256(file_content).hexdigest()
         folder = flow_id_str
-        await storage_service.save_file(flow_id=folder, file_name=file_name, data=file_content)
+        # Files without a name are named after the SHA-256 of their content
+        stored_file = await storage_service.save_file_stream(
+            flow_id=folder, file_name=file.filename, chunks=read_chunks(file, storage_service.chunk_size)
+        )
+        file_name = file.filename or stored_file.name
         return UploadFileResponse(flowId=flow_id_str, file_path=f"{folder}/{file_name}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/download/{flow_id}/{file_name}")
-async def download_file(file_name: str, flow_id: UUID, storage_service: StorageService = Depends(get_storage_service)):
+async def download_file(
+    file_name: str,
+    flow_id: UUID,
+    storage_service: StorageService = Depends(get_storage_service),
+    range_header: Optional[str] = Header(None, alias="Range"),
+):
     try:
         flow_id_str = str(flow_id)
         extension = file_name.split(".")[-1]
@@ -67,13 +78,32 @@ async def download_file(file_name: str, flow_id: UUID, storage_service: StorageS
         if not content_type:
             raise HTTPException(status_code=500, detail=f"Content type not found for extension {extension}")
 
-        file_content = await storage_service.get_file(flow_id=flow_id_str, file_name=file_name)
+        file_size = await storage_service.get_file_size(flow_id=flow_id_str, file_name=file_name)
         headers = {
             "Content-Disposition": f"attachment; filename={file_name} filename*=UTF-8''{file_name}",
             "Content-Type": "application/octet-stream",
-            "Content-Length": str(len(file_content)),
+            "Accept-Ranges": "bytes",
         }
-        return StreamingResponse(BytesIO(file_content), media_type=content_type, headers=headers)
+        try:
+            byte_range = parse_range_header(range_header, file_size)
+        except ValueError:
+            return Response(
+                status_code=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{file_size}"},
+            )
+        status_code = HTTPStatus.OK
+        start, end = 0, file_size - 1
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = HTTPStatus.PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            storage_service.stream_file(flow_id=flow_id_str, file_name=file_name, start=start, end=end),
+            status_code=status_code,
+            media_type=content_type,
+            headers=headers,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -94,8 +124,12 @@ async def download_image(file_name: str, flow_id: UUID, storage_service: Storage
         elif not content_type.startswith("image"):
             raise HTTPException(status_code=500, detail=f"Content type {content_type} is not an image")
 
-        file_content = await storage_service.get_file(flow_id=flow_id_str, file_name=file_name)
-        return StreamingResponse(BytesIO(file_content), media_type=content_type)
+        file_size = await storage_service.get_file_size(flow_id=flow_id_str, file_name=file_name)
+        return StreamingResponse(
+            storage_service.stream_file(flow_id=flow_id_str, file_name=file_name),
+            media_type=content_type,
+            headers={"Content-Length": str(file_size)},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -112,8 +146,12 @@ async def download_profile_picture(
         config_path = Path(config_dir)  # type: ignore
         folder_path = config_path / "profile_pictures" / folder_name
         content_type = build_content_type_from_extension(extension)
-        file_content = await storage_service.get_file(flow_id=folder_path, file_name=file_name)  # type: ignore
-        return StreamingResponse(BytesIO(file_content), media_type=content_type)
+        file_size = await storage_service.get_file_size(flow_id=folder_path, file_name=file_name)  # type: ignore
+        return StreamingResponse(
+            storage_service.stream_file(flow_id=folder_path, file_name=file_name),  # type: ignore
+            media_type=content_type,
+            headers={"Content-Length": str(file_size)},
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,28 +1,34 @@
+import hashlib
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
 from uuid import UUID
 
 import orjson
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
+from sqlalchemy import case, func
+from sqlalchemy.orm import defer
 from sqlmodel import Session, col, select
+from sqlmodel.sql.expression import SelectOfScalar
 
-from langflow.api.utils import remove_api_keys, validate_is_component
-from langflow.api.v1.schemas import FlowListCreate, FlowListRead
+from langflow.api.utils import remove_api_keys
+from langflow.api.v1.schemas import FlowListCreate, FlowListRead, FlowsPage
 from langflow.initial_setup.setup import STARTER_FOLDER_NAME
 from langflow.services.auth.utils import get_current_active_user
-from langflow.services.database.models.flow import Flow, FlowCreate, FlowRead, FlowUpdate
-from langflow.services.database.models.flow.utils import get_webhook_component_in_flow
+from langflow.services.database.models.flow import Flow, FlowCreate, FlowHeader, FlowRead, FlowUpdate
+from langflow.services.database.models.flow.utils import get_webhook_component_in_flow, validate_is_component
 from langflow.services.database.models.folder.constants import DEFAULT_FOLDER_NAME
 from langflow.services.database.models.folder.model import Folder
 from langflow.services.database.models.user.model import User
-from langflow.services.deps import get_session, get_settings_service
+from langflow.services.deps import get_session, get_session_service, get_settings_service
 from langflow.services.settings.service import SettingsService
 
 # build router
 router = APIRouter(prefix="/flows", tags=["Flows"])
 
+DOWNLOAD_BATCH_SIZE = 100
+
 
 @router.post("/", response_model=FlowRead, status_code=201)
 def create_flow(
@@ -72,6 +78,7 @@ def create_flow(
                 flow.endpoint_name = f"{flow.endpoint_name}-1"
 
         db_flow = Flow.model_validate(flow, from_attributes=True)
+        validate_is_component([db_flow])
         db_flow.updated_at = datetime.now(timezone.utc)
 
         if db_flow.folder_id is None:
@@ -107,13 +114,129 @@ def create_flow(
             raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-@router.get("/", response_model=list[FlowRead], status_code=200)
+def flows_query(
+    session: Session,
+    current_user: User,
+    settings_service: "SettingsService",
+    folder_id: Optional[UUID] = None,
+    name: Optional[str] = None,
+    is_component: Optional[bool] = None,
+    remove_example_flows: bool = False,
+) -> SelectOfScalar:
+    """Selects the flows the user can see, without loading their data."""
+    if settings_service.auth_settings.AUTO_LOGIN:
+        condition = (Flow.user_id == None) | (Flow.user_id == current_user.id)  # noqa
+    else:
+        condition = Flow.user_id == current_user.id
+    if not remove_example_flows:
+        starter_folder_id = session.exec(select(Folder.id).where(Folder.name == STARTER_FOLDER_NAME)).first()
+        if starter_folder_id:
+            condition = condition | (Flow.folder_id == starter_folder_id)
+    # The flows of the user come before the example flows
+    stmt = select(Flow).where(condition).order_by(case((Flow.user_id == current_user.id, 0), else_=1))
+    return filter_flows(stmt, folder_id=folder_id, name=name, is_component=is_component)
+
+
+def filter_flows(
+    stmt: SelectOfScalar,
+    folder_id: Optional[UUID] = None,
+    name: Optional[str] = None,
+    is_component: Optional[bool] = None,
+) -> SelectOfScalar:
+    """Filters a select of flows and defers the loading of their data."""
+    stmt = stmt.options(defer(Flow.data))  # type: ignore
+    if folder_id is not None:
+        stmt = stmt.where(Flow.folder_id == folder_id)
+    if name:
+        stmt = stmt.where(col(Flow.name).ilike(f"%{name}%"))
+    if is_component is not None:
+        # Flows are saved with is_component set, see validate_is_component
+        stmt = stmt.where(Flow.is_component == is_component)
+    return stmt
+
+
+def serialize_flows(session: Session, flows: Sequence[Flow], header_flows: bool = False) -> List[Dict[str, Any]]:
+    """
+    Serializes flows loaded by `flows_query`. Unless `header_flows` is set, the data of the flows
+    is loaded with a single query.
+    """
+    items = [FlowHeader.model_validate(flow, from_attributes=True).model_dump() for flow in flows]
+    if header_flows or not items:
+        return items
+    ids = [item["id"] for item in items]
+    data = dict(session.exec(select(Flow.id, Flow.data).where(col(Flow.id).in_(ids))).all())  # type: ignore
+    for item in items:
+        item["data"] = data.get(item["id"])
+    return items
+
+
+def flows_etag(flows: Sequence[Flow], *args: Any) -> str:
+    """
+    Hashes the flows loaded by `flows_query` and the arguments of the request.
+
+    Saving the data of a flow sets its updated_at, so the data doesn't need to be loaded.
+    """
+    headers = [FlowHeader.model_validate(flow, from_attributes=True).model_dump() for flow in flows]
+    return f'"{hashlib.sha256(orjson.dumps([headers, args], default=str)).hexdigest()}"'
+
+
+def etag_response(request: Request, etag: str, content: Callable[[], Any]) -> Response:
+    """Answers 304 Not Modified if the client already has `etag`, else the JSON of `content()`."""
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(content(), headers={"ETag": etag})
+
+
+def flows_response(
+    request: Request,
+    session: Session,
+    stmt: SelectOfScalar,
+    header_flows: bool,
+    page: Optional[int],
+    size: int,
+    wrap: Callable[[Any], Any] = lambda flows: flows,
+) -> Response:
+    """Responds with the flows selected by `stmt`, or a page of them if `page` is set, and their ETag."""
+    if page is None:
+        flows = session.exec(stmt).all()
+        etag = flows_etag(flows, header_flows, str(request.query_params))
+        return etag_response(request, etag, lambda: wrap(serialize_flows(session, flows, header_flows)))
+
+    total = session.exec(select(func.count()).select_from(stmt.subquery())).one()
+    flows = session.exec(
+        stmt.order_by(col(Flow.updated_at).desc(), col(Flow.id)).offset((page - 1) * size).limit(size)
+    ).all()
+    etag = flows_etag(flows, header_flows, str(request.query_params), total)
+    return etag_response(
+        request,
+        etag,
+        lambda: wrap(
+            {
+                "items": serialize_flows(session, flows, header_flows),
+                "total": total,
+                "page": page,
+                "size": size,
+                "pages": (total + size - 1) // size,
+            }
+        ),
+    )
+
+
+@router.get("/", response_model=Union[List[FlowRead], List[FlowHeader], FlowsPage], status_code=200)
 def read_flows(
     *,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_session),
     settings_service: "SettingsService" = Depends(get_settings_service),
     remove_example_flows: bool = False,
+    folder_id: Optional[UUID] = None,
+    name: Optional[str] = None,
+    is_component: Optional[bool] = None,
+    header_flows: bool = False,
+    page: Optional[int] = Query(None, ge=1),
+    size: int = Query(50, ge=1, le=1000),
 ):
     """
     Retrieve a list of flows.
@@ -123,39 +246,34 @@ def read_flows(
         session (Session): The database session.
         settings_service (SettingsService): The settings service.
         remove_example_flows (bool, optional): Whether to remove example flows. Defaults to False.
+        folder_id (UUID, optional): Only return the flows of this folder.
+        name (str, optional): Only return the flows whose name contains this text.
+        is_component (bool, optional): Only return components, or only flows that are not components.
+        header_flows (bool, optional): Return the flows without their data. Defaults to False.
+        page (int, optional): Return this page of `size` flows, with the total count, instead of all the flows.
+        size (int, optional): Number of flows per page. Defaults to 50.
 
+    The response has an ETag. Requests with a matching If-None-Match header get a 304 response.
 
     Returns:
-        List[Dict]: A list of flows in JSON format.
+        List[Dict]: A list of flows in JSON format, or a page of flows if `page` is set.
     """
 
     try:
-        auth_settings = settings_service.auth_settings
-        if auth_settings.AUTO_LOGIN:
-            flows = session.exec(
-                select(Flow).where(
-                    (Flow.user_id == None) | (Flow.user_id == current_user.id)  # noqa
-                )
-            ).all()
-        else:
-            flows = current_user.flows
-
-        flows = validate_is_component(flows)  # type: ignore
-        flow_ids = [flow.id for flow in flows]
-        # with the session get the flows that DO NOT have a user_id
-        if not remove_example_flows:
-            try:
-                folder = session.exec(select(Folder).where(Folder.name == STARTER_FOLDER_NAME)).first()
-
-                example_flows = folder.flows if folder else []
-                for example_flow in example_flows:
-                    if example_flow.id not in flow_ids:
-                        flows.append(example_flow)  # type: ignore
-            except Exception as e:
-                logger.error(e)
+        stmt = flows_query(
+            session,
+            current_user,
+            settings_service,
+            folder_id=folder_id,
+            name=name,
+            is_component=is_component,
+            remove_example_flows=remove_example_flows,
+        )
+        return flows_response(request, session, stmt, header_flows, page, size)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
-    return [jsonable_encoder(flow) for flow in flows]
 
 
 @router.get("/{flow_id}", response_model=FlowRead, status_code=200)
@@ -206,6 +324,7 @@ def update_flow(
         for key, value in flow_data.items():
             if value is not None:
                 setattr(db_flow, key, value)
+        validate_is_component([db_flow])
         webhook_component = get_webhook_component_in_flow(db_flow.data)
         db_flow.webhook = webhook_component is not None
         db_flow.updated_at = datetime.now(timezone.utc)
@@ -216,6 +335,7 @@ def update_flow(
         session.add(db_flow)
         session.commit()
         session.refresh(db_flow)
+        get_session_service().clear_compiled_graphs(str(db_flow.id))
         return db_flow
     except Exception as e:
         # If it is a validation error, return the error message
@@ -257,6 +377,7 @@ def delete_flow(
         raise HTTPException(status_code=404, detail="Flow not found")
     session.delete(flow)
     session.commit()
+    get_session_service().clear_compiled_graphs(str(flow_id))
     return {"message": "Flow deleted successfully"}
 
 
@@ -272,6 +393,7 @@ def create_flows(
     for flow in flow_list.flows:
         flow.user_id = current_user.id
         db_flow = Flow.model_validate(flow, from_attributes=True)
+        validate_is_component([db_flow])
         session.add(db_flow)
         db_flows.append(db_flow)
     session.commit()
@@ -309,8 +431,19 @@ async def download_file(
     current_user: User = Depends(get_current_active_user),
 ):
     """Download all flows as a file."""
-    flows = read_flows(current_user=current_user, session=session, settings_service=settings_service)
-    return FlowListRead(flows=flows)
+    flows = session.exec(flows_query(session, current_user, settings_service)).all()
+
+    def flows_json() -> Iterator[bytes]:
+        # The data of the flows is loaded and written a few flows at a time. The request
+        # session may be closed before the response is streamed, so this uses its own.
+        with Session(session.get_bind()) as stream_session:
+            yield b'{"flows":['
+            for start in range(0, len(flows), DOWNLOAD_BATCH_SIZE):
+                items = serialize_flows(stream_session, flows[start : start + DOWNLOAD_BATCH_SIZE])
+                yield (b"," if start else b"") + b",".join(orjson.dumps(item, default=str) for item in items)
+            yield b"]}"
+
+    return StreamingResponse(flows_json(), media_type="application/json")
 
 
 @router.delete("/")
@@ -333,6 +466,9 @@ async def delete_multiple_flows(
         for flow in deleted_flows:
             db.delete(flow)
         db.commit()
+        session_service = get_session_service()
+        for flow in deleted_flows:
+            session_service.clear_compiled_graphs(str(flow.id))
         return {"deleted": len(deleted_flows)}
     except Exception as exc:
         logger.exception(exc)
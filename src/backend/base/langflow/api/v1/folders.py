@@ -1,12 +1,12 @@
-from typing import List
+from typing import List, Optional, Union
 
 import orjson
-from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
 from sqlalchemy import or_, update
 from sqlmodel import Session, select
 
-from langflow.api.v1.flows import create_flows
-from langflow.api.v1.schemas import FlowListCreate, FlowListReadWithFolderName
+from langflow.api.v1.flows import create_flows, filter_flows, flows_response
+from langflow.api.v1.schemas import FlowListCreate, FlowListReadWithFolderName, FolderWithPaginatedFlows
 from langflow.helpers.flow import generate_unique_flow_name
 from langflow.helpers.folders import generate_unique_folder_name
 from langflow.services.auth.utils import get_current_active_user
@@ -95,19 +95,39 @@ def read_folders(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{folder_id}", response_model=FolderReadWithFlows, status_code=200)
+@router.get("/{folder_id}", response_model=Union[FolderReadWithFlows, FolderWithPaginatedFlows], status_code=200)
 def read_folder(
     *,
+    request: Request,
     session: Session = Depends(get_session),
     folder_id: str,
     current_user: User = Depends(get_current_active_user),
+    name: Optional[str] = None,
+    is_component: Optional[bool] = None,
+    header_flows: bool = False,
+    page: Optional[int] = Query(None, ge=1),
+    size: int = Query(50, ge=1, le=1000),
 ):
+    """
+    Read a folder and its flows. The flows can be filtered, paginated and loaded without
+    their data like in `GET /flows/`. If `page` is set, the response has the folder and a page of flows.
+    """
     try:
         folder = session.exec(select(Folder).where(Folder.id == folder_id, Folder.user_id == current_user.id)).first()
         if not folder:
             raise HTTPException(status_code=404, detail="Folder not found")
-        return folder
+        folder_data = FolderRead.model_validate(folder, from_attributes=True).model_dump()
+        stmt = filter_flows(select(Flow), folder_id=folder.id, name=name, is_component=is_component)
+        if page is None:
+            return flows_response(
+                request, session, stmt, header_flows, page, size, wrap=lambda flows: {**folder_data, "flows": flows}
+            )
+        return flows_response(
+            request, session, stmt, header_flows, page, size, wrap=lambda flows: {"folder": folder_data, "flows": flows}
+        )
     except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
         if "No result found" in str(e):
             raise HTTPException(status_code=404, detail="Folder not found")
         raise HTTPException(status_code=500, detail=str(e))
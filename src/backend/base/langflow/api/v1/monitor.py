@@ -1,6 +1,6 @@
+import asyncio
 from typing import List, Optional
 
-
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from langflow.services.deps import get_monitor_service
@@ -25,8 +25,9 @@ async def get_vertex_builds(
     monitor_service: MonitorService = Depends(get_monitor_service),
 ):
     try:
-        vertex_build_dicts = monitor_service.get_vertex_builds(
-            flow_id=flow_id, vertex_id=vertex_id, valid=valid, order_by=order_by
+        # The service waits for the queued rows and the database lock, so it runs off the event loop
+        vertex_build_dicts = await asyncio.to_thread(
+            monitor_service.get_vertex_builds, flow_id=flow_id, vertex_id=vertex_id, valid=valid, order_by=order_by
         )
         vertex_build_map = VertexBuildMapModel.from_list_of_dicts(vertex_build_dicts)
         return vertex_build_map
@@ -40,7 +41,7 @@ async def delete_vertex_builds(
     monitor_service: MonitorService = Depends(get_monitor_service),
 ):
     try:
-        monitor_service.delete_vertex_builds(flow_id=flow_id)
+        await asyncio.to_thread(monitor_service.delete_vertex_builds, flow_id=flow_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -55,15 +56,15 @@ async def get_messages(
     monitor_service: MonitorService = Depends(get_monitor_service),
 ):
     try:
-        df = monitor_service.get_messages(
+        messages = await asyncio.to_thread(
+            monitor_service.get_messages,
             flow_id=flow_id,
             sender=sender,
             sender_name=sender_name,
             session_id=session_id,
             order_by=order_by,
         )
-        dicts = df.to_dict(orient="records")
-        return [MessageModelResponse(**d) for d in dicts]
+        return [MessageModelResponse(**message) for message in messages]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -74,7 +75,7 @@ async def delete_messages(
     monitor_service: MonitorService = Depends(get_monitor_service),
 ):
     try:
-        monitor_service.delete_messages(message_ids=message_ids)
+        await asyncio.to_thread(monitor_service.delete_messages, message_ids=message_ids)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,7 +89,7 @@ async def update_message(
     try:
         message_dict = message.model_dump(exclude_none=True)
         message_dict.pop("index", None)
-        monitor_service.update_message(message_id=message_id, **message_dict)  # type: ignore
+        await asyncio.to_thread(monitor_service.update_message, message_id=message_id, **message_dict)  # type: ignore
         return MessageModelResponse(index=message_id, **message_dict)
 
     except Exception as e:
@@ -101,7 +102,7 @@ async def delete_messages_session(
     monitor_service: MonitorService = Depends(get_monitor_service),
 ):
     try:
-        monitor_service.delete_messages_session(session_id=session_id)
+        await asyncio.to_thread(monitor_service.delete_messages_session, session_id=session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -116,8 +117,13 @@ async def get_transactions(
     monitor_service: MonitorService = Depends(get_monitor_service),
 ):
     try:
-        dicts = monitor_service.get_transactions(
-            source=source, target=target, status=status, order_by=order_by, flow_id=flow_id
+        dicts = await asyncio.to_thread(
+            monitor_service.get_transactions,
+            source=source,
+            target=target,
+            status=status,
+            order_by=order_by,
+            flow_id=flow_id,
         )
         result = []
         for d in dicts:
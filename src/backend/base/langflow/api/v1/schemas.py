@@ -12,7 +12,8 @@ from langflow.schema.graph import Tweaks
 from langflow.schema.schema import InputType, OutputLog, OutputType
 from langflow.services.database.models.api_key.model import ApiKeyRead
 from langflow.services.database.models.base import orjson_dumps
-from langflow.services.database.models.flow import FlowCreate, FlowRead
+from langflow.services.database.models.flow import FlowCreate, FlowHeader, FlowRead
+from langflow.services.database.models.folder.model import FolderRead
 from langflow.services.database.models.user import UserRead
 
 
@@ -147,6 +148,19 @@ class FlowListRead(BaseModel):
     flows: List[FlowRead]
 
 
+class FlowsPage(BaseModel):
+    items: List[Union[FlowRead, FlowHeader]]
+    total: int
+    page: int
+    size: int
+    pages: int
+
+
+class FolderWithPaginatedFlows(BaseModel):
+    folder: FolderRead
+    flows: FlowsPage
+
+
 class FlowListReadWithFolderName(BaseModel):
     flows: List[FlowRead]
     name: str
@@ -251,6 +265,7 @@ class ResultDataResponse(BaseModel):
     timedelta: Optional[float] = None
     duration: Optional[str] = None
     used_frozen_result: Optional[bool] = False
+    used_memoized_result: Optional[bool] = False
 
 
 class VertexBuildResponse(BaseModel):
@@ -265,6 +280,8 @@ class VertexBuildResponse(BaseModel):
     """Mapping of vertex ids to result dict containing the param name and result value."""
     timestamp: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
     """Timestamp of the build."""
+    result_cache: Optional[Dict[str, int]] = None
+    """Hits and misses of the memoized components built in the current run."""
 
 
 class VerticesBuiltResponse(BaseModel):
@@ -8,7 +8,8 @@ from langflow.services.auth import utils as auth_utils
 from langflow.services.auth.utils import get_current_active_user
 from langflow.services.database.models.user.model import User
 from langflow.services.database.models.variable import Variable, VariableCreate, VariableRead, VariableUpdate
-from langflow.services.deps import get_session, get_settings_service
+from langflow.services.deps import get_session, get_settings_service, get_variable_service
+from langflow.services.variable.base import VariableService
 
 router = APIRouter(prefix="/variables", tags=["Variables"])
 
@@ -20,6 +21,7 @@ def create_variable(
     variable: VariableCreate,
     current_user: User = Depends(get_current_active_user),
     settings_service=Depends(get_settings_service),
+    variable_service: VariableService = Depends(get_variable_service),
 ):
     """Create a new variable."""
     try:
@@ -49,6 +51,7 @@ def create_variable(
         session.add(db_variable)
         session.commit()
         session.refresh(db_variable)
+        variable_service.invalidate_variables(current_user.id)
         return db_variable
     except Exception as e:
         if isinstance(e, HTTPException):
@@ -77,6 +80,7 @@ def update_variable(
     variable_id: UUID,
     variable: VariableUpdate,
     current_user: User = Depends(get_current_active_user),
+    variable_service: VariableService = Depends(get_variable_service),
 ):
     """Update a variable."""
     try:
@@ -92,6 +96,7 @@ def update_variable(
         db_variable.updated_at = datetime.now(timezone.utc)
         session.commit()
         session.refresh(db_variable)
+        variable_service.invalidate_variables(current_user.id)
         return db_variable
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -103,6 +108,7 @@ def delete_variable(
     session: Session = Depends(get_session),
     variable_id: UUID,
     current_user: User = Depends(get_current_active_user),
+    variable_service: VariableService = Depends(get_variable_service),
 ):
     """Delete a variable."""
     try:
@@ -113,5 +119,6 @@ def delete_variable(
             raise HTTPException(status_code=404, detail="Variable not found")
         session.delete(db_variable)
         session.commit()
+        variable_service.invalidate_variables(current_user.id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
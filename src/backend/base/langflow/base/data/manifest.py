@@ -0,0 +1,119 @@
+import copy
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from cachetools import LRUCache
+
+# Paths whose size and modification time are remembered, to skip hashing unchanged files
+MAX_MANIFEST_PATHS = 100_000
+
+
+class FileFingerprint(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @property
+    def content_key(self) -> tuple:
+        # The same content is parsed differently depending on the type of the file
+        return self.sha256, Path(self.path).suffix.lower()
+
+
+def _stat(file_path: str) -> tuple:
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _hash_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _text_size(text: Any) -> int:
+    return len(text) if isinstance(text, str) else len(repr(text))
+
+
+class IngestionManifest:
+    """
+    Parsed contents of the files loaded by the Directory component.
+
+    Files are identified by (path, size, modification time, content hash). A file whose size and
+    modification time didn't change since it was parsed is not read again; a file that changed is
+    hashed, and only parsed if no file with the same content and type was parsed before. Up to
+    `max_characters` characters of parsed content are kept. A `max_characters` of 0 disables it.
+    """
+
+    def __init__(self, max_characters: int = 50_000_000):
+        self.enabled = max_characters > 0
+        self._paths: LRUCache = LRUCache(maxsize=MAX_MANIFEST_PATHS)
+        self._contents: LRUCache = LRUCache(maxsize=max(max_characters, 1), getsizeof=lambda entry: entry[1])
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def fingerprint(self, file_path: str) -> FileFingerprint:
+        size, mtime_ns = _stat(file_path)
+        with self._lock:
+            known = self._paths.get(file_path)
+        if known is not None and (known.size, known.mtime_ns) == (size, mtime_ns):
+            return known
+        return FileFingerprint(file_path, size, mtime_ns, _hash_file(file_path))
+
+    def get(self, fingerprint: FileFingerprint) -> Optional[Any]:
+        """Returns the parsed content of the file or None if it has to be parsed."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._contents.get(fingerprint.content_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._paths[fingerprint.path] = fingerprint
+        text = entry[0]
+        # Parsed YAML is a dict or a list, so every caller gets its own copy
+        return text if isinstance(text, str) else copy.deepcopy(text)
+
+    def set(self, fingerprint: FileFingerprint, text: Any) -> None:
+        if not self.enabled:
+            return
+        try:
+            if _stat(fingerprint.path) != (fingerprint.size, fingerprint.mtime_ns):
+                # Changed while it was parsed, the content may not match the hash
+                return
+        except OSError:
+            return
+        size = _text_size(text)
+        if not isinstance(text, str):
+            text = copy.deepcopy(text)
+        with self._lock:
+            if size > self._contents.maxsize:
+                return
+            self._contents[fingerprint.content_key] = (text, size)
+            self._paths[fingerprint.path] = fingerprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths.clear()
+            self._contents.clear()
+            self.hits = self.misses = 0
+
+
+_ingestion_manifest: Optional[IngestionManifest] = None
+
+
+def get_ingestion_manifest() -> IngestionManifest:
+    global _ingestion_manifest
+    if _ingestion_manifest is None:
+        from langflow.services.deps import get_settings_service
+
+        _ingestion_manifest = IngestionManifest(
+            max_characters=get_settings_service().settings.ingestion_cache_size,
+        )
+    return _ingestion_manifest
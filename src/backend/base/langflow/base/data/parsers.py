@@ -0,0 +1,30 @@
+# Parsers that run in the document process pool. This module is imported by every worker
+# process, so it must not import langflow modules that take long to import.
+
+# Parsing these is CPU bound pure Python, so they are parsed in processes instead of threads
+DOCUMENT_FILE_TYPES = (".pdf", ".docx")
+
+
+def is_document(file_path: str) -> bool:
+    return file_path.endswith(DOCUMENT_FILE_TYPES)
+
+
+def read_docx_file(file_path: str) -> str:
+    from docx import Document  # type: ignore
+
+    doc = Document(file_path)
+    return "\n\n".join([p.text for p in doc.paragraphs])
+
+
+def parse_pdf_to_text(file_path: str) -> str:
+    from pypdf import PdfReader  # type: ignore
+
+    with open(file_path, "rb") as f:
+        reader = PdfReader(f)
+        return "\n\n".join([page.extract_text() for page in reader.pages])
+
+
+def parse_document(file_path: str) -> str:
+    if file_path.endswith(".pdf"):
+        return parse_pdf_to_text(file_path)
+    return read_docx_file(file_path)
@@ -1,15 +1,30 @@
+import functools
+import multiprocessing
+import threading
 import unicodedata
 import xml.etree.ElementTree as ET
 from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Callable, List, Optional, Text
+from typing import Any, Callable, List, Optional, Text
 
 import chardet
 import orjson
 import yaml
+from loguru import logger
 
+from langflow.base.data.manifest import IngestionManifest
+from langflow.base.data.parsers import is_document, parse_document
+from langflow.base.data.parsers import parse_pdf_to_text as parse_pdf_to_text
+from langflow.base.data.parsers import read_docx_file as read_docx_file
 from langflow.schema import Data
 
+# chardet is slow on large files, a sample is enough to detect the encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+_document_executor: Optional[futures.ProcessPoolExecutor] = None
+_document_executor_lock = threading.Lock()
+
 # Types of files that can be read simply by file.read()
 # and have 100% to be completely readable
 TEXT_FILE_TYPES = [
@@ -99,54 +114,86 @@ def retrieve_file_paths(
 def read_text_file(file_path: str) -> str:
     with open(file_path, "rb") as f:
         raw_data = f.read()
-        result = chardet.detect(raw_data)
-        encoding = result["encoding"]
-
-        if encoding in ["Windows-1252", "Windows-1254", "MacRoman"]:
-            encoding = "utf-8"
-
-    with open(file_path, "r", encoding=encoding) as f:
-        return f.read()
-
-
-def read_docx_file(file_path: str) -> str:
-    from docx import Document  # type: ignore
-
-    doc = Document(file_path)
-    return "\n\n".join([p.text for p in doc.paragraphs])
-
-
-def parse_pdf_to_text(file_path: str) -> str:
-    from pypdf import PdfReader  # type: ignore
-
-    with open(file_path, "rb") as f:
-        reader = PdfReader(f)
-        return "\n\n".join([page.extract_text() for page in reader.pages])
-
-
-def parse_text_file_to_data(file_path: str, silent_errors: bool) -> Optional[Data]:
     try:
-        if file_path.endswith(".pdf"):
-            text = parse_pdf_to_text(file_path)
-        elif file_path.endswith(".docx"):
-            text = read_docx_file(file_path)
+        # Most files are UTF-8 (or ASCII), which doesn't need detection. A BOM is dropped
+        text = raw_data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        encoding = chardet.detect(raw_data[:ENCODING_SAMPLE_SIZE])["encoding"] or "utf-8"
+        text = raw_data.decode(encoding, errors="replace")
+    # Universal newlines, like reading the file in text mode
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def get_document_executor() -> Optional[futures.ProcessPoolExecutor]:
+    """Returns the process pool PDF and DOCX files are parsed in, or None if they should be parsed in threads."""
+    global _document_executor
+    with _document_executor_lock:
+        if _document_executor is None:
+            from langflow.services.deps import get_settings_service
+
+            max_workers = get_settings_service().settings.document_process_pool_size
+            if max_workers <= 0:
+                return None
+            # Forking a process that runs threads can deadlock the child
+            _document_executor = futures.ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _document_executor
+
+
+def _parse_document_in_process(file_path: str, process_pool: futures.ProcessPoolExecutor) -> str:
+    global _document_executor
+    try:
+        return process_pool.submit(parse_document, file_path).result()
+    except BrokenProcessPool:
+        # A worker died (out of memory, a crash in a parser): start a new pool next time
+        logger.warning(f"The document process pool broke while parsing {file_path}, parsing it in a thread")
+        with _document_executor_lock:
+            if _document_executor is process_pool:
+                _document_executor = None
+        return parse_document(file_path)
+
+
+def parse_file_text(file_path: str, process_pool: Optional[futures.ProcessPoolExecutor] = None) -> Any:
+    if is_document(file_path):
+        if process_pool is not None:
+            text = _parse_document_in_process(file_path, process_pool)
         else:
-            text = read_text_file(file_path)
-
-        # if file is json, yaml, or xml, we can parse it
-        if file_path.endswith(".json"):
-            text = orjson.loads(text)
-            if isinstance(text, dict):
-                text = {k: normalize_text(v) if isinstance(v, str) else v for k, v in text.items()}
-            elif isinstance(text, list):
-                text = [normalize_text(item) if isinstance(item, str) else item for item in text]
-            text = orjson.dumps(text).decode("utf-8")
-
-        elif file_path.endswith(".yaml") or file_path.endswith(".yml"):
-            text = yaml.safe_load(text)
-        elif file_path.endswith(".xml"):
-            xml_element = ET.fromstring(text)
-            text = ET.tostring(xml_element, encoding="unicode")
+            text = parse_document(file_path)
+    else:
+        text = read_text_file(file_path)
+
+    # if file is json, yaml, or xml, we can parse it
+    if file_path.endswith(".json"):
+        text = orjson.loads(text)
+        if isinstance(text, dict):
+            text = {k: normalize_text(v) if isinstance(v, str) else v for k, v in text.items()}
+        elif isinstance(text, list):
+            text = [normalize_text(item) if isinstance(item, str) else item for item in text]
+        text = orjson.dumps(text).decode("utf-8")
+
+    elif file_path.endswith(".yaml") or file_path.endswith(".yml"):
+        text = yaml.safe_load(text)
+    elif file_path.endswith(".xml"):
+        xml_element = ET.fromstring(text)
+        text = ET.tostring(xml_element, encoding="unicode")
+    return text
+
+
+def load_file_to_data(
+    file_path: str,
+    silent_errors: bool,
+    manifest: Optional[IngestionManifest] = None,
+    process_pool: Optional[futures.ProcessPoolExecutor] = None,
+) -> Optional[Data]:
+    """Parses a file, or takes its content from `manifest` if a file with the same content was parsed before."""
+    try:
+        fingerprint = manifest.fingerprint(file_path) if manifest is not None and manifest.enabled else None
+        text = manifest.get(fingerprint) if manifest is not None and fingerprint is not None else None
+        if text is None:
+            text = parse_file_text(file_path, process_pool)
+            if manifest is not None and fingerprint is not None:
+                manifest.set(fingerprint, text)
     except Exception as e:
         if not silent_errors:
             raise ValueError(f"Error loading file {file_path}: {e}") from e
@@ -156,6 +203,10 @@ def parse_text_file_to_data(file_path: str, silent_errors: bool) -> Optional[Dat
     return record
 
 
+def parse_text_file_to_data(file_path: str, silent_errors: bool) -> Optional[Data]:
+    return load_file_to_data(file_path, silent_errors)
+
+
 # ! Removing unstructured dependency until
 # ! 3.12 is supported
 # def get_elements(
@@ -177,7 +228,13 @@ def parallel_load_data(
     silent_errors: bool,
     max_concurrency: int,
     load_function: Callable = parse_text_file_to_data,
+    manifest: Optional[IngestionManifest] = None,
 ) -> List[Optional[Data]]:
+    if load_function is parse_text_file_to_data:
+        # The threads hash and read the files, PDF and DOCX files are parsed in processes
+        # since their parsers hold the GIL
+        load_function = functools.partial(load_file_to_data, manifest=manifest, process_pool=get_document_executor())
+
     with futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
         loaded_files = executor.map(
             lambda file_path: load_function(file_path, silent_errors),
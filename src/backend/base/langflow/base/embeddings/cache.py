@@ -0,0 +1,300 @@
+import asyncio
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from langflow.field_typing import Embeddings
+
+# Attributes of embeddings classes that aren't pydantic models that change the vectors they return
+MODEL_ATTRIBUTES = ("model", "model_name", "model_id", "repo_id", "deployment", "dimensions")
+ENDPOINT_ATTRIBUTES = ("openai_api_base", "azure_endpoint", "base_url", "endpoint_url", "region_name")
+# Parts of the names of fields that hold credentials, which are left out of the namespace
+SECRET_NAME_PARTS = {"key", "token", "secret", "password", "credential", "credentials"}
+
+
+def text_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def _is_secret(name: str, value: Any) -> bool:
+    return type(value).__name__ in ("SecretStr", "SecretBytes") or bool(SECRET_NAME_PARTS & set(name.split("_")))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    # Clients and other objects are skipped, they are built from the other fields
+    raise TypeError(f"Can't serialize a value of type {type(value).__name__}")
+
+
+def _embedding_settings(embeddings: Embeddings) -> Dict[str, Any]:
+    embeddings_class = type(embeddings)
+    # pydantic 2 models have model_fields, the langchain ones are still pydantic 1 models
+    fields = getattr(embeddings_class, "model_fields", None) or getattr(embeddings_class, "__fields__", None)
+    if not isinstance(fields, dict):
+        return {
+            attribute: getattr(embeddings, attribute)
+            for attribute in MODEL_ATTRIBUTES + ENDPOINT_ATTRIBUTES
+            if getattr(embeddings, attribute, None) not in (None, "")
+        }
+    settings = {}
+    for name in sorted(fields):
+        value = getattr(embeddings, name, None)
+        if value is None or _is_secret(name, value):
+            continue
+        try:
+            settings[name] = json.loads(json.dumps(value, sort_keys=True, default=_json_default))
+        except (TypeError, ValueError):
+            continue
+    return settings
+
+
+def embedding_namespace(embeddings: Embeddings) -> str:
+    """
+    Identifies the provider and the settings of `embeddings`. Vectors are only shared within a namespace.
+
+    For pydantic models every field that can be serialized and doesn't hold a credential is part of
+    the namespace, hashed so that the settings aren't written to the store.
+    """
+    embeddings_class = type(embeddings)
+    settings = json.dumps(_embedding_settings(embeddings), sort_keys=True)
+    digest = hashlib.sha256(settings.encode("utf-8")).hexdigest()
+    return f"{embeddings_class.__module__}.{embeddings_class.__qualname__}|{digest}"
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingStore:
+    """
+    Vectors in a SQLite file, keyed by (namespace, SHA-256 of the text) and stored as float32.
+
+    The file is shared by every worker using the same path. When it holds more than `max_vectors`
+    vectors the least recently used ones are deleted. A `max_vectors` of 0 disables the store.
+    """
+
+    def __init__(self, path: str, max_vectors: int = 100_000):
+        self.path = path
+        self.max_vectors = max_vectors
+        self.enabled = max_vectors > 0
+        self.hits = self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._count: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "namespace TEXT NOT NULL, text_hash BLOB NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (namespace, text_hash)) WITHOUT ROWID"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, namespace: str, hashes: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """Returns the stored vectors of `hashes` and marks them as used."""
+        if not self.enabled or not hashes:
+            return {}
+        found: Dict[bytes, List[float]] = {}
+        with self._lock:
+            connection = self._connect()
+            # SQLite limits the number of parameters of a statement
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE namespace = ? AND text_hash IN ({placeholders})",
+                    (namespace, *batch),
+                ).fetchall()
+                found.update((key, unpack_vector(vector)) for key, vector in rows)
+            if found:
+                connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE namespace = ? AND text_hash = ?",
+                    [(time.time(), namespace, key) for key in found],
+                )
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def set_many(self, namespace: str, vectors: Iterable[Tuple[bytes, Sequence[float]]]) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        rows = [(namespace, key, pack_vector(vector), now) for key, vector in vectors]
+        with self._lock:
+            connection = self._connect()
+            if self._count is None:
+                self._count = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            cursor = connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (namespace, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._count += max(cursor.rowcount, 0)
+            if self._count > self.max_vectors:
+                self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        # Other workers may have added vectors to the file, so the count is read again
+        count = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = count - self.max_vectors
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM embeddings WHERE (namespace, text_hash) IN "
+                "(SELECT namespace, text_hash FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        self._count = min(count, self.max_vectors)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM embeddings")
+            self._count = 0
+            self.hits = self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                self._count = None
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings that only call the wrapped `embeddings` for texts they haven't embedded before.
+
+    Texts repeated in a batch are embedded once. Every vector is returned as float32, the way it is
+    stored, so the result doesn't depend on whether it came from the store. Failures of the store
+    are logged and the provider is called instead.
+    """
+
+    def __init__(self, embeddings: Embeddings, store: "EmbeddingStore", namespace: Optional[str] = None):
+        self.embeddings = embeddings
+        self.store = store
+        self.namespace = namespace or embedding_namespace(embeddings)
+
+    def __getattr__(self, name: str) -> Any:
+        # Vector stores sometimes read attributes of the embeddings, like the model name
+        if name in ("embeddings", "store", "namespace") or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+    def __getstate__(self):
+        # The store holds a connection, the unpickled copy uses the store of its process
+        return {"embeddings": self.embeddings, "namespace": self.namespace}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.store = get_embedding_store()
+
+    def _lookup(self, texts: List[str], namespace: str) -> Tuple[List[bytes], Dict[bytes, List[float]], List[str]]:
+        hashes = [text_hash(text) for text in texts]
+        try:
+            found = self.store.get_many(namespace, list(dict.fromkeys(hashes)))
+        except sqlite3.Error as exc:
+            logger.warning(f"Error reading the embedding cache: {exc}")
+            found = {}
+        missing = list({key: text for key, text in zip(hashes, texts) if key not in found}.values())
+        return hashes, found, missing
+
+    def _save(self, namespace: str, texts: List[str], vectors: List[List[float]], found: Dict[bytes, List[float]]):
+        new_vectors = {text_hash(text): unpack_vector(pack_vector(vector)) for text, vector in zip(texts, vectors)}
+        found.update(new_vectors)
+        try:
+            self.store.set_many(namespace, new_vectors.items())
+        except sqlite3.Error as exc:
+            logger.warning(f"Error writing the embedding cache: {exc}")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, found, missing = self._lookup(texts, self.namespace)
+        if missing:
+            self._save(self.namespace, missing, self.embeddings.embed_documents(missing), found)
+        return [list(found[key]) for key in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        # Some models embed queries differently from documents
+        namespace = f"{self.namespace}|query"
+        hashes, found, missing = self._lookup([text], namespace)
+        if missing:
+            self._save(namespace, missing, [self.embeddings.embed_query(text)], found)
+        return list(found[hashes[0]])
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, found, missing = await asyncio.to_thread(self._lookup, texts, self.namespace)
+        if missing:
+            vectors = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self._save, self.namespace, missing, vectors, found)
+        return [list(found[key]) for key in hashes]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        namespace = f"{self.namespace}|query"
+        hashes, found, missing = await asyncio.to_thread(self._lookup, [text], namespace)
+        if missing:
+            vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self._save, namespace, missing, [vector], found)
+        return list(found[hashes[0]])
+
+
+def cache_embeddings(embeddings: Any) -> Any:
+    """Wraps `embeddings` in the embedding cache of the process, unless the cache is disabled."""
+    if not isinstance(embeddings, Embeddings) or isinstance(embeddings, CachedEmbeddings):
+        return embeddings
+    store = get_embedding_store()
+    if not store.enabled:
+        return embeddings
+    return CachedEmbeddings(embeddings, store)
+
+
+def cache_build_embeddings(component_class: type) -> None:
+    """Makes the `build_embeddings` method defined by `component_class` return cached embeddings."""
+    # Saved flows call build_embeddings directly, so the embeddings it returns are wrapped here
+    build_embeddings = component_class.__dict__.get("build_embeddings")
+    if build_embeddings is None or hasattr(build_embeddings, "__wrapped__"):
+        return
+
+    @functools.wraps(build_embeddings)
+    def build_cached_embeddings(self) -> Embeddings:
+        return cache_embeddings(build_embeddings(self))
+
+    component_class.build_embeddings = build_cached_embeddings  # type: ignore[attr-defined]
+
+
+_embedding_store: Optional[EmbeddingStore] = None
+_embedding_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    global _embedding_store
+    with _embedding_store_lock:
+        if _embedding_store is None:
+            from langflow.services.deps import get_settings_service
+
+            settings = get_settings_service().settings
+            path = settings.embedding_cache_path or str(Path(settings.config_dir) / "embedding_cache.db")
+            _embedding_store = EmbeddingStore(path, max_vectors=settings.embedding_cache_size)
+        return _embedding_store
@@ -1,3 +1,4 @@
+from langflow.base.embeddings.cache import cache_build_embeddings
 from langflow.custom import Component
 from langflow.field_typing import Embeddings
 from langflow.io import Output
@@ -10,6 +11,10 @@ class LCEmbeddingsModel(Component):
         Output(display_name="Embeddings", name="embeddings", method="build_embeddings"),
     ]
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cache_build_embeddings(cls)
+
     def _validate_outputs(self):
         required_output_methods = ["build_embeddings"]
         output_names = [output.name for output in self.outputs]
@@ -5,6 +5,7 @@ from typing import Optional, Union
 from langchain_core.language_models.llms import LLM
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
+from langflow.base.embeddings.cache import cache_build_embeddings
 from langflow.custom import Component
 from langflow.field_typing import LanguageModel
 from langflow.schema.message import Message
@@ -21,6 +22,11 @@ class LCModelComponent(Component):
         Output(display_name="Language Model", name="model_output", method="build_model"),
     ]
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Most embeddings components are built on this class
+        cache_build_embeddings(cls)
+
     def _get_exception_message(self, e: Exception):
         return str(e)
 
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+from langchain_core.documents import Document
+from loguru import logger
+
+from langflow.field_typing import Embeddings
+
+# Added documents are written to delta files next to the index, which are merged into it once there are this many
+MAX_DELTAS = 8
+
+
+def document_id(document: Document) -> str:
+    """Identifies a document by its content, so adding the same document twice doesn't duplicate it."""
+    content = json.dumps([document.page_content, document.metadata], sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _mmap_flag(faiss) -> int:
+    # Newer versions of faiss map flat indexes too, older ones only the inverted lists of IVF indexes
+    return getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+
+
+class LoadedIndex:
+    """
+    An index read from disk, shared by every FAISS vector store returned for it.
+
+    Searches use the index without a lock, so it is never modified once it is shared. Changes are
+    made to a copy that replaces it in the registry.
+    """
+
+    def __init__(
+        self,
+        index,
+        docstore,
+        index_to_docstore_id: Dict[int, str],
+        signature: tuple,
+        mmapped: bool,
+        document_ids: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.index = index
+        self.docstore = docstore
+        self.index_to_docstore_id = index_to_docstore_id
+        self.signature = signature
+        # Memory-mapped indexes are read-only, faiss aborts the process when they are modified
+        self.mmapped = mmapped
+        self._document_ids = document_ids
+
+    @property
+    def document_ids(self) -> Dict[str, List[str]]:
+        """
+        The docstore ids of the documents in the index by `document_id`.
+
+        Indexes created before documents were identified by their content store them under random
+        ids, so the ids are computed from the documents themselves.
+        """
+        if self._document_ids is None:
+            document_ids: Dict[str, List[str]] = {}
+            for docstore_id in self.index_to_docstore_id.values():
+                document = self.docstore.search(docstore_id)
+                document_ids.setdefault(document_id(document), []).append(docstore_id)
+            self._document_ids = document_ids
+        return self._document_ids
+
+    def vector_store(self, embeddings: Embeddings) -> FAISS:
+        return FAISS(embeddings, self.index, self.docstore, self.index_to_docstore_id)
+
+
+class FaissIndexRegistry:
+    """
+    FAISS indexes kept in memory between runs, keyed by their resolved folder and index name.
+
+    An index is read from disk again when its files changed. Index files of at least `mmap_threshold`
+    bytes are memory-mapped. Up to `max_indexes` indexes are kept, the least recently used one is
+    dropped first. A `max_indexes` of 0 reads the index from disk every time.
+    """
+
+    def __init__(self, max_indexes: int = 4, mmap_threshold: int = 256 * 1024 * 1024):
+        self.enabled = max_indexes > 0
+        self.mmap_threshold = mmap_threshold
+        self.loads = 0
+        self._indexes: LRUCache = LRUCache(maxsize=max(max_indexes, 1))
+        self._index_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(folder_path: str, index_name: str) -> Tuple[str, str]:
+        return str(Path(folder_path).resolve()), index_name
+
+    def _index_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._index_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _delta_names(path: Path, index_name: str) -> List[str]:
+        prefix = f"{index_name}.delta-"
+        try:
+            file_names = os.listdir(path)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            file_name[: -len(".faiss")]
+            for file_name in file_names
+            if file_name.startswith(prefix) and file_name.endswith(".faiss")
+        )
+
+    @staticmethod
+    def _signature(path: Path, names: List[str]) -> tuple:
+        signature = []
+        for name in names:
+            for suffix in (".faiss", ".pkl"):
+                stat = (path / f"{name}{suffix}").stat()
+                signature.append((name, suffix, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def _cached(self, key: Tuple[str, str], signature: tuple) -> Optional[LoadedIndex]:
+        with self._lock:
+            loaded = self._indexes.get(key)
+        if loaded is not None and loaded.signature == signature:
+            return loaded
+        return None
+
+    def _remember(self, key: Tuple[str, str], loaded: LoadedIndex) -> None:
+        if self.enabled:
+            with self._lock:
+                self._indexes[key] = loaded
+
+    def _forget(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._indexes.pop(key, None)
+
+    def _read(self, path: Path, index_name: str, embeddings: Embeddings) -> LoadedIndex:
+        faiss = dependable_faiss_import()
+        deltas = self._delta_names(path, index_name)
+        signature = self._signature(path, [index_name, *deltas])
+        index_file = path / f"{index_name}.faiss"
+        # Deltas are merged into the index, so it can only be mapped when there are none
+        mmapped = not deltas and index_file.stat().st_size >= self.mmap_threshold
+        index = None
+        if mmapped:
+            try:
+                index = faiss.read_index(str(index_file), _mmap_flag(faiss))
+            except RuntimeError as exc:
+                logger.debug(f"Could not memory-map the FAISS index {index_file}: {exc}")
+                mmapped = False
+        if index is None:
+            index = faiss.read_index(str(index_file))
+        with open(path / f"{index_name}.pkl", "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)  # ignore[pickle]: explicit-opt-in
+        loaded = LoadedIndex(index, docstore, index_to_docstore_id, signature, mmapped)
+
+        vector_store = loaded.vector_store(embeddings)
+        for delta in deltas:
+            vector_store.merge_from(
+                FAISS.load_local(str(path), embeddings, delta, allow_dangerous_deserialization=True)
+            )
+        self.loads += 1
+        return loaded
+
+    def _load(self, key: Tuple[str, str], embeddings: Embeddings, allow_dangerous_deserialization: bool) -> LoadedIndex:
+        path, index_name = Path(key[0]), key[1]
+        signature = self._signature(path, [index_name, *self._delta_names(path, index_name)])
+        loaded = self._cached(key, signature)
+        if loaded is None:
+            if not allow_dangerous_deserialization:
+                raise ValueError("Loading a FAISS index deserializes a pickle file, which has to be allowed.")
+            loaded = self._read(path, index_name, embeddings)
+            self._remember(key, loaded)
+        return loaded
+
+    def get(
+        self, folder_path: str, index_name: str, embeddings: Embeddings, allow_dangerous_deserialization: bool = False
+    ) -> FAISS:
+        """Returns the index saved in `folder_path`, reading it from disk only if it changed since it was read."""
+        key = self._key(folder_path, index_name)
+        with self._index_lock(key):
+            return self._load(key, embeddings, allow_dangerous_deserialization).vector_store(embeddings)
+
+    def update(
+        self,
+        folder_path: str,
+        index_name: str,
+        embeddings: Embeddings,
+        documents: List[Document],
+        allow_dangerous_deserialization: bool = False,
+    ) -> FAISS:
+        """
+        Makes the index hold `documents`, embedding only the ones that aren't in it yet.
+
+        Added documents are saved next to the index as a delta file. The index is rewritten when
+        documents are removed from it or there are `MAX_DELTAS` deltas. Without an index, or when an
+        index on disk can't be deserialized, a new index is created from the documents and replaces it.
+        """
+        key = self._key(folder_path, index_name)
+        path = Path(key[0])
+        documents_by_id = {document_id(document): document for document in documents}
+        with self._index_lock(key):
+            loaded = None
+            if (path / f"{index_name}.faiss").exists() and documents_by_id:
+                signature = self._signature(path, [index_name, *self._delta_names(path, index_name)])
+                loaded = self._cached(key, signature)
+                if loaded is None and allow_dangerous_deserialization:
+                    loaded = self._load(key, embeddings, allow_dangerous_deserialization)
+            if loaded is None:
+                return self._create(key, embeddings, documents_by_id)
+
+            new_documents = {
+                id_: document for id_, document in documents_by_id.items() if id_ not in loaded.document_ids
+            }
+            # Documents that are no longer in the input, and copies of a document in older indexes
+            removed_ids = [
+                docstore_id
+                for id_, docstore_ids in loaded.document_ids.items()
+                for docstore_id in (docstore_ids[1:] if id_ in documents_by_id else docstore_ids)
+            ]
+            if not new_documents and not removed_ids:
+                return loaded.vector_store(embeddings)
+
+            vector_store = self._copy(loaded, path, index_name, embeddings)
+            if removed_ids:
+                try:
+                    vector_store.delete(removed_ids)
+                except RuntimeError as exc:
+                    # Not every type of index supports removing vectors
+                    logger.debug(f"Could not remove documents from the FAISS index {index_name}: {exc}")
+                    return self._create(key, embeddings, documents_by_id)
+            delta = None
+            if new_documents:
+                delta = FAISS.from_documents(list(new_documents.values()), embeddings, ids=list(new_documents))
+                vector_store.merge_from(delta)
+
+            deltas = self._delta_names(path, index_name)
+            if delta is None or removed_ids or len(deltas) + 1 >= MAX_DELTAS:
+                # Deltas can only add documents, so removing documents rewrites the index
+                self._save(vector_store, path, index_name)
+                self._remove_deltas(path, index_name)
+            else:
+                self._save(delta, path, self._next_delta_name(index_name, deltas))
+
+            if removed_ids:
+                document_ids = {
+                    id_: docstore_ids[:1] for id_, docstore_ids in loaded.document_ids.items() if id_ in documents_by_id
+                }
+            else:
+                document_ids = dict(loaded.document_ids)
+            document_ids.update((id_, [id_]) for id_ in new_documents)
+            signature = self._signature(path, [index_name, *self._delta_names(path, index_name)])
+            self._remember(
+                key,
+                LoadedIndex(
+                    vector_store.index,
+                    vector_store.docstore,
+                    vector_store.index_to_docstore_id,
+                    signature,
+                    False,
+                    document_ids,
+                ),
+            )
+            return vector_store
+
+    @staticmethod
+    def _copy(loaded: LoadedIndex, path: Path, index_name: str, embeddings: Embeddings) -> FAISS:
+        """Returns a vector store with a copy of the index that can be modified while the index is searched."""
+        faiss = dependable_faiss_import()
+        if loaded.mmapped:
+            # Only indexes without deltas are mapped, the file holds the whole index
+            index = faiss.read_index(str(path / f"{index_name}.faiss"))
+        else:
+            index = faiss.clone_index(loaded.index)
+        if not isinstance(loaded.docstore, InMemoryDocstore):
+            raise ValueError("Only FAISS indexes with an in-memory docstore can be updated.")
+        docstore = InMemoryDocstore(dict(loaded.docstore._dict))
+        return FAISS(embeddings, index, docstore, dict(loaded.index_to_docstore_id))
+
+    def _create(self, key: Tuple[str, str], embeddings: Embeddings, documents_by_id: Dict[str, Document]) -> FAISS:
+        if not documents_by_id:
+            raise ValueError("There are no documents to create the FAISS index from.")
+        path, index_name = Path(key[0]), key[1]
+        vector_store = FAISS.from_documents(list(documents_by_id.values()), embeddings, ids=list(documents_by_id))
+        self._save(vector_store, path, index_name)
+        self._remove_deltas(path, index_name)
+        signature = self._signature(path, [index_name])
+        document_ids = {id_: [id_] for id_ in documents_by_id}
+        self._remember(
+            key,
+            LoadedIndex(
+                vector_store.index,
+                vector_store.docstore,
+                vector_store.index_to_docstore_id,
+                signature,
+                False,
+                document_ids,
+            ),
+        )
+        return vector_store
+
+    def _remove_deltas(self, path: Path, index_name: str) -> None:
+        for name in self._delta_names(path, index_name):
+            for suffix in (".faiss", ".pkl"):
+                (path / f"{name}{suffix}").unlink(missing_ok=True)
+
+    @staticmethod
+    def _next_delta_name(index_name: str, deltas: List[str]) -> str:
+        number = int(deltas[-1].rsplit("-", 1)[1]) + 1 if deltas else 1
+        return f"{index_name}.delta-{number:06d}"
+
+    @staticmethod
+    def _save(vector_store: FAISS, path: Path, index_name: str) -> None:
+        # The files are replaced rather than overwritten, a memory-mapped index keeps reading the old ones.
+        # The temporary files are hidden so they aren't listed as deltas.
+        temporary_name = f".{index_name}.tmp-{os.getpid()}-{threading.get_ident()}"
+        vector_store.save_local(str(path), temporary_name)
+        for suffix in (".faiss", ".pkl"):
+            os.replace(path / f"{temporary_name}{suffix}", path / f"{index_name}{suffix}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self.loads = 0
+
+
+_faiss_index_registry: Optional[FaissIndexRegistry] = None
+
+
+def get_faiss_index_registry() -> FaissIndexRegistry:
+    global _faiss_index_registry
+    if _faiss_index_registry is None:
+        from langflow.services.deps import get_settings_service
+
+        settings = get_settings_service().settings
+        _faiss_index_registry = FaissIndexRegistry(
+            max_indexes=settings.faiss_index_cache_size,
+            mmap_threshold=settings.faiss_mmap_threshold,
+        )
+    return _faiss_index_registry
@@ -3,7 +3,7 @@ from typing import List
 from langchain_core.documents import Document
 from loguru import logger
 
-from langflow.custom import Component
+from langflow.custom import Component, cache_per_build
 from langflow.field_typing import Retriever, Text, VectorStore
 from langflow.helpers.data import docs_to_data
 from langflow.io import Output
@@ -25,6 +25,11 @@ class LCVectorStoreComponent(Component):
         ),
     ]
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "build_vector_store" in cls.__dict__:
+            cls.build_vector_store = cache_per_build(cls.__dict__["build_vector_store"])
+
     def _validate_outputs(self):
         # At least these three outputs must be defined
         required_output_methods = ["build_base_retriever", "search_documents"]
@@ -1,6 +1,7 @@
 from typing import List, Optional
 
-from langflow.base.data.utils import parallel_load_data, parse_text_file_to_data, retrieve_file_paths
+from langflow.base.data.manifest import get_ingestion_manifest
+from langflow.base.data.utils import load_file_to_data, parallel_load_data, retrieve_file_paths
 from langflow.custom import Component
 from langflow.io import BoolInput, IntInput, TextInput
 from langflow.schema import Data
@@ -78,11 +79,13 @@ class DirectoryComponent(Component):
         resolved_path = self.resolve_path(path)
         file_paths = retrieve_file_paths(resolved_path, load_hidden, recursive, depth)
         loaded_data = []
+        # Files that didn't change since a previous run are not parsed again
+        manifest = get_ingestion_manifest()
 
         if use_multithreading:
-            loaded_data = parallel_load_data(file_paths, silent_errors, max_concurrency)
+            loaded_data = parallel_load_data(file_paths, silent_errors, max_concurrency, manifest=manifest)
         else:
-            loaded_data = [parse_text_file_to_data(file_path, silent_errors) for file_path in file_paths]
+            loaded_data = [load_file_to_data(file_path, silent_errors, manifest) for file_path in file_paths]
         loaded_data = list(filter(None, loaded_data))
         self.status = loaded_data
         return loaded_data
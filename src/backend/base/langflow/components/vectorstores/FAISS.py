@@ -3,8 +3,8 @@ from typing import List
 from langchain_community.vectorstores import FAISS
 from loguru import logger
 
+from langflow.base.vectorstores.faiss_registry import get_faiss_index_registry
 from langflow.base.vectorstores.model import LCVectorStoreComponent
-from langflow.field_typing import Text
 from langflow.helpers.data import docs_to_data
 from langflow.io import BoolInput, HandleInput, IntInput, Output, StrInput
 from langflow.schema import Data
@@ -19,6 +19,8 @@ class FaissVectorStoreComponent(LCVectorStoreComponent):
     description: str = "FAISS Vector Store with search capabilities"
     documentation = "https://python.langchain.com/docs/modules/data_connection/vectorstores/integrations/faiss"
     icon = "FAISS"
+    # The outputs only share the vector store, which the index registry loads and updates under a lock
+    concurrent_outputs = True
 
     inputs = [
         StrInput(
@@ -88,6 +90,7 @@ class FaissVectorStoreComponent(LCVectorStoreComponent):
         if not self.folder_path:
             raise ValueError("Folder path is required to save the FAISS index.")
         path = self.resolve_path(self.folder_path)
+        registry = get_faiss_index_registry()
 
         if self.add_to_vector_store:
             documents = []
@@ -97,14 +100,19 @@ class FaissVectorStoreComponent(LCVectorStoreComponent):
                 else:
                     documents.append(_input)
 
-            faiss = FAISS.from_documents(documents=documents, embedding=self.embedding)
-            faiss.save_local(Text(path), self.index_name)
+            faiss = registry.update(
+                path,
+                self.index_name,
+                self.embedding,
+                documents,
+                allow_dangerous_deserialization=self.allow_dangerous_deserialization,
+            )
         else:
             try:
-                faiss = FAISS.load_local(
-                    folder_path=Text(path),
-                    embeddings=self.embedding,
-                    index_name=self.index_name,
+                faiss = registry.get(
+                    path,
+                    self.index_name,
+                    self.embedding,
                     allow_dangerous_deserialization=self.allow_dangerous_deserialization,
                 )
             except Exception as e:
@@ -120,23 +128,8 @@ class FaissVectorStoreComponent(LCVectorStoreComponent):
         """
         Search for documents in the FAISS vector store.
         """
-        if not self.folder_path:
-            raise ValueError("Folder path is required to load the FAISS index.")
-        path = self.resolve_path(self.folder_path)
-
-        try:
-            vector_store = FAISS.load_local(
-                folder_path=Text(path),
-                embeddings=self.embedding,
-                index_name=self.index_name,
-                allow_dangerous_deserialization=self.allow_dangerous_deserialization,
-            )
-        except Exception as e:
-            raise ValueError(
-                "Failed to load the FAISS index. Make sure the index was created with trusted data. "
-                "If you trust the data source, you can set `allow_dangerous_deserialization` to `True` "
-                "in the component's advanced settings to enable deserialization."
-            ) from e
+        # The index loaded for the other outputs of this build is reused
+        vector_store = self.build_vector_store()
 
         if not vector_store:
             raise ValueError("Failed to load the FAISS index.")
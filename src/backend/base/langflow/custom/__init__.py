@@ -1,4 +1,4 @@
 from langflow.custom.custom_component import CustomComponent
-from langflow.custom.custom_component.component import Component
+from langflow.custom.custom_component.component import Component, cache_per_build
 
-__all__ = ["CustomComponent", "Component"]
+__all__ = ["CustomComponent", "Component", "cache_per_build"]
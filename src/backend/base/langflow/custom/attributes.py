@@ -50,6 +50,7 @@ ATTR_FUNC_MAPPING: dict[str, Callable] = {
     "documentation": getattr_return_str,
     "icon": validate_icon,
     "frozen": getattr_return_bool,
+    "memoize": getattr_return_bool,
     "is_input": getattr_return_bool,
     "is_output": getattr_return_bool,
     "conditional_paths": getattr_return_list_of_str,
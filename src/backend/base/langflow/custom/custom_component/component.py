@@ -1,14 +1,20 @@
+import asyncio
+import functools
 import inspect
-from typing import Any, AsyncIterator, Callable, ClassVar, Generator, Iterator, List, Optional, Union
+import threading
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, ClassVar, Dict, Generator, Iterator, List, Optional, Union
 from uuid import UUID
 
 import yaml
 from pydantic import BaseModel
 
+from langflow.custom.executor import run_in_component_executor
 from langflow.inputs.inputs import InputTypes
 from langflow.schema.artifact import get_artifact_type, post_process_raw
 from langflow.schema.data import Data
 from langflow.schema.message import Message
+from langflow.services.tracing.schema import Log
 from langflow.template.field.base import UNDEFINED, Output
 
 from .custom_component import CustomComponent
@@ -34,20 +40,93 @@ def recursive_serialize_or_str(obj):
         return str(obj)
 
 
+class _OutputState:
+    """Status and logs of one output evaluated concurrently with the other outputs of its component."""
+
+    def __init__(self, component: "Component", status: Any):
+        self.component = component
+        self.status = status
+        self.logs: List[Log] = []
+
+
+_output_state: ContextVar[Optional[_OutputState]] = ContextVar("_output_state", default=None)
+
+
+class _CachedCall:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.done = False
+        self.value: Any = None
+
+
+def cache_per_build(method: Callable) -> Callable:
+    """
+    Caches the result of a component method for the current build.
+
+    Outputs that share expensive setup (e.g. loading a vector store) can call the decorated
+    method and it runs once per build and arguments, even when the outputs are evaluated
+    concurrently. Errors are not cached.
+    """
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(self: "Component", *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            with self._build_cache_lock:
+                task = self._build_cache.get(key)
+                if task is None:
+                    task = self._build_cache[key] = asyncio.ensure_future(method(self, *args, **kwargs))
+            try:
+                return await task
+            except Exception:
+                with self._build_cache_lock:
+                    if self._build_cache.get(key) is task:
+                        del self._build_cache[key]
+                raise
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self: "Component", *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        with self._build_cache_lock:
+            call = self._build_cache.get(key)
+            if call is None:
+                call = self._build_cache[key] = _CachedCall()
+        with call.lock:
+            if not call.done:
+                call.value = method(self, *args, **kwargs)
+                call.done = True
+        return call.value
+
+    return wrapper
+
+
 class Component(CustomComponent):
     inputs: List[InputTypes] = []
     outputs: List[Output] = []
     code_class_base_inheritance: ClassVar[str] = "Component"
+    max_thread_concurrency: ClassVar[Optional[int]] = None
+    """Maximum number of sync output methods of this component running in threads at the same time.
+    None means only the size of the thread pool limits them."""
+    concurrent_outputs: ClassVar[bool] = False
+    """Evaluate the connected outputs of this component concurrently instead of one after the other.
+    Only enable it when the output methods don't depend on each other; shared setup belongs in a
+    method decorated with `cache_per_build`."""
+    _status: Optional[Any] = None
 
     def __init__(self, **data):
         super().__init__(**data)
         self._inputs: dict[str, InputTypes] = {}
         self._results: dict[str, Any] = {}
         self._attributes: dict[str, Any] = {}
+        self._build_cache: Dict[Any, Any] = {}
+        self._build_cache_lock = threading.Lock()
         if not hasattr(self, "trace_type"):
             self.trace_type = "chain"
         if self.inputs is not None:
-            self.map_inputs(self.inputs)
+            # The class is shared by every build of the component, so each instance gets its own inputs
+            self.map_inputs([input_.model_copy(deep=True) for input_ in self.inputs])
 
     def __getattr__(self, name: str) -> Any:
         if "_attributes" in self.__dict__ and name in self.__dict__["_attributes"]:
@@ -56,6 +135,29 @@ class Component(CustomComponent):
             return self.__dict__["_inputs"][name].value
         raise AttributeError(f"{name} not found in {self.__class__.__name__}")
 
+    @property  # type: ignore[override]
+    def status(self) -> Optional[Any]:
+        # Outputs evaluated concurrently each see and set their own status
+        state = _output_state.get()
+        if state is not None and state.component is self:
+            return state.status
+        return self._status
+
+    @status.setter
+    def status(self, value: Optional[Any]):
+        state = _output_state.get()
+        if state is not None and state.component is self:
+            state.status = value
+        else:
+            self._status = value
+
+    def _add_log(self, log: Log):
+        state = _output_state.get()
+        if state is not None and state.component is self:
+            state.logs.append(log)
+        else:
+            super()._add_log(log)
+
     def map_inputs(self, inputs: List[InputTypes]):
         self.inputs = inputs
         for input_ in inputs:
@@ -118,11 +220,10 @@ class Component(CustomComponent):
     async def build_results(self):
         inputs = self.get_trace_as_inputs()
         metadata = self.get_trace_as_metadata()
-        async with self._tracing_service.trace_context(
-            f"{self.display_name} ({self.vertex.id})", self.trace_type, inputs, metadata
-        ):
+        trace_name = f"{self.display_name} ({self.vertex.id})"
+        async with self._tracing_service.trace_context(trace_name, self.trace_type, inputs, metadata):
             _results, _artifacts = await self._build_results()
-            self._tracing_service.set_outputs(_results)
+            self._tracing_service.set_outputs(trace_name, _results)
 
         return _results, _artifacts
 
@@ -130,60 +231,97 @@ class Component(CustomComponent):
         _results = {}
         _artifacts = {}
         if hasattr(self, "outputs"):
+            # Flows saved before an output opted out of threads don't have the flag, so the class decides
+            runs_in_thread = {output.name: output.run_in_thread for output in self.outputs}
             self._set_outputs(self.vertex.outputs)
-            for output in self.outputs:
-                # Build the output if it's connected to some other vertex
-                # or if it's not connected to any vertex
-                if not self.vertex.outgoing_edges or output.name in self.vertex.edges_source_names:
-                    if output.method is None:
-                        raise ValueError(f"Output {output.name} does not have a method defined.")
-                    method: Callable = getattr(self, output.method)
-                    if output.cache and output.value != UNDEFINED:
-                        _results[output.name] = output.value
-                    else:
-                        result = method()
-                        # If the method is asynchronous, we need to await it
-                        if inspect.iscoroutinefunction(method):
-                            result = await result
-                        if (
-                            isinstance(result, Message)
-                            and result.flow_id is None
-                            and self.vertex.graph.flow_id is not None
-                        ):
-                            result.set_flow_id(self.vertex.graph.flow_id)
-                        _results[output.name] = result
-                        output.value = result
-                        custom_repr = self.custom_repr()
-                        if custom_repr is None and isinstance(result, (dict, Data, str)):
-                            custom_repr = result
-                        if not isinstance(custom_repr, str):
-                            custom_repr = str(custom_repr)
-                        raw = result
-                        if self.status is None:
-                            artifact_value = raw
-                        else:
-                            artifact_value = self.status
-                            raw = self.status
-
-                        if hasattr(raw, "data") and raw is not None:
-                            raw = raw.data
-                        if raw is None:
-                            raw = custom_repr
-
-                        elif hasattr(raw, "model_dump") and raw is not None:
-                            raw = raw.model_dump()
-                        if raw is None and isinstance(result, (dict, Data, str)):
-                            raw = result.data if isinstance(result, Data) else result
-                        artifact_type = get_artifact_type(artifact_value, result)
-                        raw = post_process_raw(raw, artifact_type)
-                        artifact = {"repr": custom_repr, "raw": raw, "type": artifact_type}
-                        _artifacts[output.name] = artifact
+            self._build_cache = {}
+            # Build the output if it's connected to some other vertex
+            # or if it's not connected to any vertex
+            outputs = [
+                output
+                for output in self.outputs
+                if not self.vertex.outgoing_edges or output.name in self.vertex.edges_source_names
+            ]
+            for output in outputs:
+                if output.method is None:
+                    raise ValueError(f"Output {output.name} does not have a method defined.")
+            pending = [output for output in outputs if not (output.cache and output.value != UNDEFINED)]
+            states: Dict[str, tuple[Any, _OutputState]] = {}
+            if self.concurrent_outputs and len(pending) > 1:
+                states = await self._build_outputs_concurrently(pending, runs_in_thread)
+
+            # Results are processed in the order of the outputs, however they were evaluated
+            for output in outputs:
+                if output.cache and output.value != UNDEFINED:
+                    _results[output.name] = output.value
+                    continue
+                if output.name in states:
+                    result, state = states[output.name]
+                    self.status = state.status
+                    for log in state.logs:
+                        self._add_log(log)
+                else:
+                    result = await self._build_output(output, runs_in_thread)
+                if isinstance(result, Message) and result.flow_id is None and self.vertex.graph.flow_id is not None:
+                    result.set_flow_id(self.vertex.graph.flow_id)
+                _results[output.name] = result
+                output.value = result
+                custom_repr = self.custom_repr()
+                if custom_repr is None and isinstance(result, (dict, Data, str)):
+                    custom_repr = result
+                if not isinstance(custom_repr, str):
+                    custom_repr = str(custom_repr)
+                raw = result
+                if self.status is None:
+                    artifact_value = raw
+                else:
+                    artifact_value = self.status
+                    raw = self.status
+
+                if hasattr(raw, "data") and raw is not None:
+                    raw = raw.data
+                if raw is None:
+                    raw = custom_repr
+
+                elif hasattr(raw, "model_dump") and raw is not None:
+                    raw = raw.model_dump()
+                if raw is None and isinstance(result, (dict, Data, str)):
+                    raw = result.data if isinstance(result, Data) else result
+                artifact_type = get_artifact_type(artifact_value, result)
+                raw = post_process_raw(raw, artifact_type)
+                artifact = {"repr": custom_repr, "raw": raw, "type": artifact_type}
+                _artifacts[output.name] = artifact
         self._artifacts = _artifacts
         self._results = _results
-        if self._tracing_service:
-            self._tracing_service.set_outputs(_results)
         return _results, _artifacts
 
+    async def _build_output(self, output: Output, runs_in_thread: Dict[str, bool]) -> Any:
+        method: Callable = getattr(self, output.method)
+        if inspect.iscoroutinefunction(method):
+            return await method()
+        if output.run_in_thread is not False and runs_in_thread.get(output.name) is not False:
+            # Sync methods often block on network or disk, so keep them off the event loop
+            return await run_in_component_executor(
+                method, component_class=type(self), limit=self.max_thread_concurrency
+            )
+        return method()
+
+    async def _build_outputs_concurrently(
+        self, outputs: List[Output], runs_in_thread: Dict[str, bool]
+    ) -> Dict[str, tuple[Any, _OutputState]]:
+        async def build_output(output: Output) -> tuple[Any, _OutputState]:
+            # Each output runs in its own task, so the state is only visible to its method
+            state = _OutputState(self, self.status)
+            _output_state.set(state)
+            return await self._build_output(output, runs_in_thread), state
+
+        results = await asyncio.gather(*[build_output(output) for output in outputs], return_exceptions=True)
+        # Raise the error of the first failed output, not of the first one to fail
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return {output.name: result for output, result in zip(outputs, results)}  # type: ignore[misc]
+
     def custom_repr(self):
         if self.repr_value == "":
             self.repr_value = self.status
@@ -68,6 +68,9 @@ class CustomComponent(BaseComponent):
     """The field order of the component. Defaults to an empty list."""
     frozen: Optional[bool] = False
     """The default frozen state of the component. Defaults to False."""
+    memoize: Optional[bool] = False
+    """Whether results are reused when the code, inputs and upstream results are the same. Defaults to False.
+    Only set it on components whose results don't depend on anything else, like splitters or embedders."""
     build_parameters: Optional[dict] = None
     """The build parameters of the component. Defaults to None."""
     vertex: Optional["Vertex"] = None
@@ -130,6 +133,7 @@ class CustomComponent(BaseComponent):
             **data: Additional keyword arguments to initialize the custom component.
         """
         self.cache = TTLCache(maxsize=1024, ttl=60)
+        self._logs = []
         super().__init__(**data)
 
     @staticmethod
@@ -492,6 +496,9 @@ class CustomComponent(BaseComponent):
         if hasattr(message, "model_dump") and isinstance(message, BaseModel):
             message = message.model_dump()
         log = Log(message=message, type=get_artifact_type(message), name=name)
+        self._add_log(log)
+
+    def _add_log(self, log: Log):
         self._logs.append(log)
         if self.vertex:
             self._tracing_service.add_log(trace_name=self.vertex.id, log=log)
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+from loguru import logger
+
+# Bump when the entries change shape
+MANIFEST_FORMAT = 2
+
+
+def get_langflow_version() -> str:
+    try:
+        from langflow.version import __version__  # type: ignore
+
+        return __version__
+    except ImportError:
+        from importlib import metadata
+
+        try:
+            return metadata.version("langflow-base")
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+
+def get_sources_signature(exclude: Optional[str] = None) -> str:
+    """
+    Hash of the size and modification time of the langflow source files, except the ones in `exclude`.
+
+    Components import base classes and helpers from langflow, so their templates change when these
+    files do, even if the component files didn't.
+    """
+    import langflow
+
+    excluded = Path(exclude).resolve() if exclude else None
+    digest = hashlib.sha256()
+    for root in langflow.__path__:
+        for directory, directory_names, file_names in os.walk(root):
+            directory_names[:] = sorted(
+                name
+                for name in directory_names
+                if name not in ("__pycache__", "frontend") and Path(directory, name).resolve() != excluded
+            )
+            for file_name in sorted(file_names):
+                if file_name.endswith(".py"):
+                    file_path = os.path.join(directory, file_name)
+                    stat = os.stat(file_path)
+                    digest.update(f"{file_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def hash_file(file_path: str) -> Optional[str]:
+    try:
+        with open(file_path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class ComponentManifest:
+    """
+    Templates built from the component files of a directory, saved on disk.
+
+    Entries are keyed by file path and only used while the content hash of the file
+    matches the one they were built with. The whole manifest is only used with the langflow
+    version and langflow source files (`sources`) it was built with.
+    """
+
+    def __init__(self, manifest_path: Path, version: Optional[str] = None, sources: Optional[str] = None):
+        self.manifest_path = manifest_path
+        self.version = version or get_langflow_version()
+        self.sources = sources
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def for_directory(cls, config_dir: str, directory: str) -> "ComponentManifest":
+        key = hashlib.sha256(str(Path(directory).resolve()).encode("utf-8")).hexdigest()[:16]
+        sources = get_sources_signature(exclude=directory)
+        return cls(Path(config_dir) / "component_manifests" / f"{key}.json", sources=sources)
+
+    def load(self) -> "ComponentManifest":
+        try:
+            data = orjson.loads(self.manifest_path.read_bytes())
+        except FileNotFoundError:
+            return self
+        except (OSError, orjson.JSONDecodeError) as exc:
+            logger.warning(f"Ignoring unreadable component manifest {self.manifest_path}: {exc}")
+            return self
+        if (
+            data.get("format") == MANIFEST_FORMAT
+            and data.get("version") == self.version
+            and data.get("sources") == self.sources
+        ):
+            self.entries = data.get("entries", {})
+        return self
+
+    def get(self, file_path: str, file_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(file_path)
+        if entry is None or file_hash is None or entry.get("hash") != file_hash:
+            return None
+        return entry
+
+    def set(self, file_path: str, file_hash: Optional[str], entry: Dict[str, Any]) -> None:
+        if file_hash is None:
+            return
+        try:
+            # Templates that can't be saved are rebuilt on the next start
+            orjson.dumps(entry)
+        except TypeError as exc:
+            logger.debug(f"Not caching the template of {file_path}: {exc}")
+            self.entries.pop(file_path, None)
+            return
+        self.entries[file_path] = {**entry, "hash": file_hash}
+
+    def save(self, file_paths: Iterable[str]) -> None:
+        """Writes the entries of `file_paths`, dropping the ones of files that are gone."""
+        entries = {file_path: self.entries[file_path] for file_path in file_paths if file_path in self.entries}
+        content = orjson.dumps(
+            {"format": MANIFEST_FORMAT, "version": self.version, "sources": self.sources, "entries": entries}
+        )
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            # Other workers may read the manifest while it is written
+            with tempfile.NamedTemporaryFile("wb", dir=self.manifest_path.parent, delete=False) as file:
+                file.write(content)
+            os.replace(file.name, self.manifest_path)
+        except OSError as exc:
+            logger.warning(f"Could not save the component manifest {self.manifest_path}: {exc}")
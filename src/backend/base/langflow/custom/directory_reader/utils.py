@@ -1,7 +1,18 @@
+import asyncio
+import importlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
 from loguru import logger
 
 from langflow.custom.directory_reader import DirectoryReader
-from langflow.template.frontend_node.custom_components import CustomComponentFrontendNode
+from langflow.custom.directory_reader.manifest import ComponentManifest, hash_file
+
+
+# Below this number of changed files, starting the processes costs more than it saves
+MIN_FILES_PER_POOL = 16
 
 
 def merge_nested_dicts_with_renaming(dict1, dict2):
@@ -18,49 +29,6 @@ def merge_nested_dicts_with_renaming(dict1, dict2):
     return dict1
 
 
-def build_invalid_menu(invalid_components):
-    """Build the invalid menu."""
-    if not invalid_components.get("menu"):
-        return {}
-
-    logger.debug("------------------- INVALID COMPONENTS -------------------")
-    invalid_menu = {}
-    for menu_item in invalid_components["menu"]:
-        menu_name = menu_item["name"]
-        invalid_menu[menu_name] = build_invalid_menu_items(menu_item)
-    return invalid_menu
-
-
-def build_valid_menu(valid_components):
-    """Build the valid menu."""
-    valid_menu = {}
-    logger.debug("------------------- VALID COMPONENTS -------------------")
-    for menu_item in valid_components["menu"]:
-        menu_name = menu_item["name"]
-        valid_menu[menu_name] = build_menu_items(menu_item)
-    return valid_menu
-
-
-def build_and_validate_all_files(reader: DirectoryReader, file_list):
-    """Build and validate all files"""
-    data = reader.build_component_menu_list(file_list)
-
-    valid_components = reader.filter_loaded_components(data=data, with_errors=False)
-    invalid_components = reader.filter_loaded_components(data=data, with_errors=True)
-
-    return valid_components, invalid_components
-
-
-async def abuild_and_validate_all_files(reader: DirectoryReader, file_list):
-    """Build and validate all files"""
-    data = await reader.abuild_component_menu_list(file_list)
-
-    valid_components = reader.filter_loaded_components(data=data, with_errors=False)
-    invalid_components = reader.filter_loaded_components(data=data, with_errors=True)
-
-    return valid_components, invalid_components
-
-
 def load_files_from_path(path: str):
     """Load all files from a given path"""
     reader = DirectoryReader(path, False)
@@ -68,73 +36,99 @@ def load_files_from_path(path: str):
     return reader.get_files()
 
 
-def build_custom_component_list_from_path(path: str):
-    """Build a list of custom components for the langchain from a given path"""
-    file_list = load_files_from_path(path)
-    reader = DirectoryReader(path, False)
-
-    valid_components, invalid_components = build_and_validate_all_files(reader, file_list)
-
-    valid_menu = build_valid_menu(valid_components)
-    invalid_menu = build_invalid_menu(invalid_components)
-
-    return merge_nested_dicts_with_renaming(valid_menu, invalid_menu)
-
-
-async def abuild_custom_component_list_from_path(path: str):
-    """Build a list of custom components for the langchain from a given path"""
-    file_list = load_files_from_path(path)
-    reader = DirectoryReader(path, False)
-
-    valid_components, invalid_components = await abuild_and_validate_all_files(reader, file_list)
+def build_component_entry(file_path: str) -> dict:
+    """
+    Build the template of a single component file.
+
+    This is a module level function so that it can run in the processes of the build pool.
+    """
+    from langflow.custom.utils import build_component
+
+    reader = DirectoryReader(os.path.dirname(file_path), False)
+    menu = reader.build_component_menu_list([file_path])["menu"][0]
+    component = menu["components"][0]
+    valid = not component["error"]
+    template = None
+    try:
+        # Files with errors are left out of the menus, like DirectoryReader.filter_loaded_components does
+        if valid:
+            _, template = build_component(component)
+    except Exception as exc:
+        logger.debug(f"Error while loading component {component['name']}: {exc}")
+    return {"menu": menu["name"], "component": component["name"], "valid": valid, "template": template}
+
+
+def build_component_entries(file_paths: List[str], workers: int) -> List[dict]:
+    """Build the entries of `file_paths`, in a process pool when there are enough files to pay for it."""
+    workers = min(workers, len(file_paths), os.cpu_count() or 1)
+    if workers > 1 and len(file_paths) >= MIN_FILES_PER_POOL:
+        try:
+            # Forking a process with running threads (the event loop, the services) is not safe
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                # langflow.custom can't be the first langflow module imported by the workers
+                initializer=importlib.import_module,
+                initargs=("langflow.graph",),
+            ) as pool:
+                return list(pool.map(build_component_entry, file_paths, chunksize=8))
+        except Exception as exc:
+            logger.warning(f"Could not build components in a process pool, building them here: {exc}")
+    return [build_component_entry(file_path) for file_path in file_paths]
 
-    valid_menu = build_valid_menu(valid_components)
-    invalid_menu = build_invalid_menu(invalid_components)
 
-    return merge_nested_dicts_with_renaming(valid_menu, invalid_menu)
+def build_menu_from_entries(entries: List[dict]) -> dict:
+    """Group the entries of the components that were built in their menus, in the order of the files."""
+    menu: dict = {}
+    for entry in entries:
+        if entry["valid"] and entry["template"] is not None:
+            menu.setdefault(entry["menu"], {})[entry["component"]] = entry["template"]
+    return menu
 
 
-def create_invalid_component_template(component, component_name):
-    """Create a template for an invalid component."""
-    component_code = component["code"]
-    component_frontend_node = CustomComponentFrontendNode(
-        description="ERROR - Check your Python Code",
-        display_name=f"ERROR - {component_name}",
-    )
+def get_components_manifest(path: str) -> Optional[ComponentManifest]:
+    from langflow.services.deps import get_settings_service
 
-    component_frontend_node.error = component.get("error", None)
-    field = component_frontend_node.template.get_field("code")
-    field.value = component_code
-    component_frontend_node.template.update_field("code", field)
-    return component_frontend_node.model_dump(by_alias=True, exclude_none=True)
+    settings = get_settings_service().settings
+    if not settings.cache_components_manifest or not settings.config_dir:
+        return None
+    return ComponentManifest.for_directory(settings.config_dir, path).load()
 
 
-def log_invalid_component_details(component):
-    """Log details of an invalid component."""
-    logger.debug(component)
-    logger.debug(f"Component Path: {component.get('path', None)}")
-    logger.debug(f"Component Error: {component.get('error', None)}")
+def build_custom_component_list_from_path(path: str):
+    """
+    Build a list of custom components for the langchain from a given path.
 
+    Files whose content did not change since the last build reuse the template
+    saved in the components manifest, the others are built again.
+    """
+    from langflow.services.deps import get_settings_service
 
-def build_invalid_component(component):
-    """Build a single invalid component."""
-    component_name = component["name"]
-    component_template = create_invalid_component_template(component, component_name)
-    log_invalid_component_details(component)
-    return component_name, component_template
+    file_list = load_files_from_path(path)
+    manifest = get_components_manifest(path)
+    workers = get_settings_service().settings.components_build_workers
+    if manifest is None:
+        return build_menu_from_entries(build_component_entries(file_list, workers))
+
+    hashes = {file_path: hash_file(file_path) for file_path in file_list}
+    entries = {file_path: manifest.get(file_path, hashes[file_path]) for file_path in file_list}
+    changed = [file_path for file_path, entry in entries.items() if entry is None]
+    if changed:
+        logger.debug(f"Building {len(changed)} of {len(file_list)} component file(s) from {path}")
+        for file_path, entry in zip(changed, build_component_entries(changed, workers)):
+            entries[file_path] = entry
+            # Components that failed to build may only miss a dependency, so they are retried
+            if entry["template"] is not None:
+                manifest.set(file_path, hashes[file_path], entry)
+    if changed or len(manifest.entries) != len(file_list):
+        manifest.save(file_list)
+    return build_menu_from_entries([entries[file_path] for file_path in file_list])
 
 
-def build_invalid_menu_items(menu_item):
-    """Build invalid menu items for a given menu."""
-    menu_items = {}
-    for component in menu_item["components"]:
-        try:
-            component_name, component_template = build_invalid_component(component)
-            menu_items[component_name] = component_template
-            logger.debug(f"Added {component_name} to invalid menu.")
-        except Exception as exc:
-            logger.exception(f"Error while creating custom component [{component_name}]: {str(exc)}")
-    return menu_items
+async def abuild_custom_component_list_from_path(path: str):
+    """Build a list of custom components for the langchain from a given path"""
+    return await asyncio.to_thread(build_custom_component_list_from_path, path)
 
 
 def get_new_key(dictionary, original_key):
@@ -155,17 +149,3 @@ def determine_component_name(component):
     #     file_name = component.get("file").split(".")[0]
     #     return "".join(word.capitalize() for word in file_name.split("_")) if "_" in file_name else file_name
     return component["name"]
-
-
-def build_menu_items(menu_item):
-    """Build menu items for a given menu."""
-    menu_items = {}
-    logger.debug(f"Building menu items for {menu_item['name']}")
-    logger.debug(f"Loading {len(menu_item['components'])} components")
-    for component_name, component_template, component in menu_item["components"]:
-        try:
-            menu_items[component_name] = component_template
-        except Exception as exc:
-            logger.error(f"Error loading Component: {component['output_types']}")
-            logger.exception(f"Error while building custom component {component['output_types']}: {exc}")
-    return menu_items
@@ -1,12 +1,31 @@
+import hashlib
+import threading
 from typing import TYPE_CHECKING, Type
 
+from cachetools import LRUCache, cached
+
 from langflow.utils import validate
 
 if TYPE_CHECKING:
     from langflow.custom import CustomComponent
 
+CLASS_CACHE_SIZE = 512
+"""Maximum number of compiled component classes kept in memory."""
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
 
+
+@cached(cache=LRUCache(maxsize=CLASS_CACHE_SIZE), key=code_hash, lock=threading.Lock(), info=True)
 def eval_custom_component_code(code: str) -> Type["CustomComponent"]:
-    """Evaluate custom component code"""
+    """
+    Evaluate custom component code.
+
+    The class is compiled once per distinct code and shared by every caller, so components
+    must not keep per-build state on the class. Hits and misses are available through
+    `eval_custom_component_code.cache_info()` and the cache is emptied with
+    `eval_custom_component_code.cache_clear()`.
+    """
     class_name = validate.extract_class_name(code)
     return validate.create_class(code, class_name)
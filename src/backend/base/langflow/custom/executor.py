@@ -0,0 +1,55 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Semaphores belong to an event loop, so there is one per loop and component class
+_class_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[type, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_component_executor() -> Optional[ThreadPoolExecutor]:
+    """Returns the executor sync output methods run in, or None if they should run on the event loop."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from langflow.services.deps import get_settings_service
+
+            max_workers = get_settings_service().settings.component_thread_pool_size
+            if max_workers <= 0:
+                return None
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="langflow-component")
+        return _executor
+
+
+def get_class_semaphore(component_class: type, limit: int) -> asyncio.Semaphore:
+    semaphores = _class_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if (semaphore := semaphores.get(component_class)) is None:
+        semaphore = semaphores[component_class] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+async def run_in_component_executor(
+    func: Callable[..., Any], *args: Any, component_class: Optional[type] = None, limit: Optional[int] = None
+) -> Any:
+    """
+    Runs a blocking function in the component thread pool without blocking the event loop.
+
+    The context variables of the caller (used by tracing) are visible to the function.
+    When `limit` is set, at most `limit` functions of `component_class` run at the same time.
+    """
+    executor = get_component_executor()
+    if executor is None:
+        return func(*args)
+    call = functools.partial(contextvars.copy_context().run, func, *args)
+    loop = asyncio.get_running_loop()
+    if component_class is not None and limit:
+        async with get_class_semaphore(component_class, limit):
+            return await loop.run_in_executor(executor, call)
+    return await loop.run_in_executor(executor, call)
@@ -94,9 +94,9 @@ class Edge:
             raise ValueError(f"Edge between {source.vertex_type} and {target.vertex_type} " f"has invalid handles")
 
     def __setstate__(self, state):
-        self.source_id = state["source_id"]
-        self.target_id = state["target_id"]
-        self.target_param = state["target_param"]
+        # Restore everything (matched_type, is_fulfilled, the raw handles...) so an
+        # unpickled graph can be built like the original one
+        self.__dict__.update(state)
         self.source_handle = state.get("source_handle")
         self.target_handle = state.get("target_handle")
 
@@ -1,27 +1,52 @@
 import asyncio
+import copy
+import pickle
 import uuid
 from collections import defaultdict, deque
 from datetime import datetime, timezone
 from functools import partial
 from itertools import chain
-from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Tuple, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from loguru import logger
 
 from langflow.exceptions.component import ComponentBuildException
 from langflow.graph.edge.base import ContractEdge
-from langflow.graph.graph.constants import lazy_load_vertex_dict
+from langflow.graph.graph.constants import GRAPH_SCHEDULERS, lazy_load_vertex_dict
+from langflow.graph.graph.diff import GraphDiff
+from langflow.graph.graph.execution_plan import ExecutionPlan, PlanKey, structure_hash
+from langflow.graph.graph.reachability import ReachabilityIndex
+from langflow.graph.graph.run_state import dump_run_state, load_run_state
 from langflow.graph.graph.runnable_vertices_manager import RunnableVerticesManager
 from langflow.graph.graph.state_manager import GraphStateManager
 from langflow.graph.graph.utils import process_flow
 from langflow.graph.schema import InterfaceComponentTypes, RunOutputs
-from langflow.graph.vertex.base import Vertex
+from langflow.graph.vertex.base import Vertex, VertexStates
 from langflow.graph.vertex.types import InterfaceVertex, StateVertex
 from langflow.schema import Data
 from langflow.schema.schema import INPUT_FIELD_NAME, InputType
-from langflow.services.cache.utils import CacheMiss
 from langflow.services.chat.service import ChatService
-from langflow.services.deps import get_chat_service, get_tracing_service
+from langflow.services.deps import (
+    get_chat_service,
+    get_settings_service,
+    get_tracing_service,
+    get_variable_service,
+    session_scope,
+)
 from langflow.services.monitor.utils import log_transaction
 
 if TYPE_CHECKING:
@@ -29,6 +54,10 @@ if TYPE_CHECKING:
     from langflow.services.tracing.service import TracingService
 
 
+GRAPH_RUN_STATE_KEY = "__graph__"
+"""Key of the run state of the graph itself in the result of `Graph.dump_run_state`."""
+
+
 class Graph:
     """A class representing a graph of vertices and edges."""
 
@@ -61,6 +90,8 @@ class Graph:
         self._is_state_vertices: List[str] = []
         self._has_session_id_vertices: List[str] = []
         self._sorted_vertices_layers: List[List[str]] = []
+        self._execution_plans: Dict[PlanKey, ExecutionPlan] = {}
+        self._reachability: Optional[ReachabilityIndex] = None
         self._run_id = ""
         self._start_time = datetime.now(timezone.utc)
 
@@ -242,6 +273,30 @@ class Graph:
     async def initialize_run(self):
         await self.tracing_service.initialize_tracers()
 
+    def get_load_from_db_variable_names(self) -> Set[str]:
+        """Returns the names of the variables the load_from_db fields of the vertices refer to."""
+        names = set()
+        for vertex in self.vertices:
+            for field in vertex.load_from_db_fields:
+                if (name := vertex.params.get(field)) and isinstance(name, str):
+                    names.add(name)
+        return names
+
+    def prefetch_variables(self) -> None:
+        """
+        Loads the variables used by the graph in one round trip, so the vertices
+        get them from the variable cache instead of querying them one by one.
+        """
+        if not self.user_id or not (names := self.get_load_from_db_variable_names()):
+            return
+        try:
+            variable_service = get_variable_service()
+            with session_scope() as session:
+                variable_service.prefetch_variables(self.user_id, list(names), session)
+        except Exception as exc:
+            # The vertices will load their variables themselves
+            logger.warning(f"Error prefetching variables: {exc}")
+
     async def end_all_traces(self, outputs: dict[str, Any] | None = None, error: str | None = None):
         if not self.tracing_service:
             return
@@ -413,6 +468,7 @@ class Graph:
         session_id: Optional[str] = None,
         stream: bool = False,
         fallback_to_env_vars: bool = False,
+        max_concurrency: int = 1,
     ) -> List[RunOutputs]:
         """
         Runs the graph with the given inputs.
@@ -423,6 +479,8 @@ class Graph:
             outputs (Optional[list[str]], optional): The outputs to retrieve from the graph. Defaults to None.
             session_id (Optional[str], optional): The session ID for the graph. Defaults to None.
             stream (bool, optional): Whether to stream the results or not. Defaults to False.
+            max_concurrency (int, optional): When greater than 1, the inputs run concurrently with
+                `arun_batch`. Defaults to 1, which runs them one after the other on this graph.
 
         Returns:
             List[RunOutputs]: The outputs of the graph.
@@ -431,22 +489,24 @@ class Graph:
         # we need to go through self.inputs and update the self._raw_params
         # of the vertices that are inputs
         # if the value is a list, we need to run multiple times
+        runs = self._prepare_runs(inputs, inputs_components, types)
+        if max_concurrency > 1 and len(runs) > 1:
+            batch_outputs: List[Optional[RunOutputs]] = [None] * len(runs)
+            async for index, run_output_object in self.arun_batch(
+                inputs=inputs,
+                inputs_components=inputs_components,
+                types=types,
+                outputs=outputs,
+                session_id=session_id,
+                stream=stream,
+                fallback_to_env_vars=fallback_to_env_vars,
+                max_concurrency=max_concurrency,
+            ):
+                batch_outputs[index] = run_output_object
+            return cast(List[RunOutputs], batch_outputs)
+
         vertex_outputs = []
-        if not isinstance(inputs, list):
-            inputs = [inputs]
-        elif not inputs:
-            inputs = [{}]
-        # Length of all should be the as inputs length
-        # just add empty lists to complete the length
-        if inputs_components is None:
-            inputs_components = []
-        for _ in range(len(inputs) - len(inputs_components)):
-            inputs_components.append([])
-        if types is None:
-            types = []
-        for _ in range(len(inputs) - len(types)):
-            types.append("chat")  # default to chat
-        for run_inputs, components, input_type in zip(inputs, inputs_components, types):
+        for run_inputs, components, input_type in runs:
             run_outputs = await self._run(
                 inputs=run_inputs,
                 input_components=components,
@@ -461,6 +521,137 @@ class Graph:
             vertex_outputs.append(run_output_object)
         return vertex_outputs
 
+    @staticmethod
+    def _prepare_runs(
+        inputs: list[Dict[str, str]],
+        inputs_components: Optional[list[list[str]]],
+        types: Optional[list[InputType | None]],
+    ) -> List[Tuple[Dict[str, str], list[str], InputType | None]]:
+        """Pairs each input with its components and type."""
+        if not isinstance(inputs, list):
+            inputs = [inputs]
+        elif not inputs:
+            inputs = [{}]
+        # Length of all should be the as inputs length
+        # just add empty lists to complete the length
+        inputs_components = list(inputs_components or [])
+        for _ in range(len(inputs) - len(inputs_components)):
+            inputs_components.append([])
+        types = list(types or [])
+        for _ in range(len(inputs) - len(types)):
+            types.append("chat")  # default to chat
+        return list(zip(inputs, inputs_components, types))
+
+    async def arun_batch(
+        self,
+        inputs: list[Dict[str, str]],
+        inputs_components: Optional[list[list[str]]] = None,
+        types: Optional[list[InputType | None]] = None,
+        outputs: Optional[list[str]] = None,
+        session_id: Optional[str] = None,
+        stream: bool = False,
+        fallback_to_env_vars: bool = False,
+        max_concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[int, RunOutputs]]:
+        """
+        Runs the graph once per input, running up to `max_concurrency` inputs at the same time.
+
+        Each input runs on its own copy of the graph, so runs don't see each other's results, and
+        in its own session unless `session_id` is given. Frozen vertices that don't depend on other
+        vertices, or only on such vertices, give the same result for every input: they are built
+        once and shared by all the copies.
+
+        Args:
+            Same as `arun`, plus:
+            max_concurrency (int, optional): The maximum number of inputs running at the same time. Defaults to 4.
+
+        Yields:
+            Tuple[int, RunOutputs]: The index of the input and its outputs, in the order the runs finish.
+        """
+        runs = self._prepare_runs(inputs, inputs_components, types)
+        # The copies are unpickled from the graph as it is before the shared vertices are built
+        pickled_graph = self._pickle_for_copies()
+        shared_vertex_ids = await self._build_shared_vertices(fallback_to_env_vars)
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+        async def run(index: int, run_inputs: Dict[str, str], components: list[str], input_type: InputType | None):
+            async with semaphore:
+                graph = self._copy_for_run(pickled_graph, shared_vertex_ids)
+                run_outputs = await graph._run(
+                    inputs=run_inputs,
+                    input_components=components,
+                    input_type=input_type,
+                    outputs=outputs or [],
+                    stream=stream,
+                    session_id=session_id or str(uuid.uuid4()),
+                    fallback_to_env_vars=fallback_to_env_vars,
+                )
+                return index, RunOutputs(inputs=run_inputs, outputs=run_outputs)
+
+        tasks = [asyncio.create_task(run(index, *run_args)) for index, run_args in enumerate(runs)]
+        try:
+            for next_run in asyncio.as_completed(tasks):
+                yield await next_run
+        finally:
+            # The caller stopped iterating or a run failed
+            for task in tasks:
+                task.cancel()
+
+    def get_shared_vertex_ids(self) -> List[str]:
+        """
+        Returns the ids of the frozen vertices whose predecessors are all shared too, in topological order.
+
+        Their result doesn't depend on the inputs of a run, so it can be shared by runs of different inputs.
+        """
+        shared_vertex_ids: List[str] = []
+        for vertex in self.topological_sort():
+            if (
+                vertex.frozen
+                and vertex.id not in self._is_input_vertices
+                and all(predecessor in shared_vertex_ids for predecessor in self.predecessor_map.get(vertex.id, []))
+            ):
+                shared_vertex_ids.append(vertex.id)
+        return shared_vertex_ids
+
+    async def _build_shared_vertices(self, fallback_to_env_vars: bool) -> List[str]:
+        shared_vertex_ids = self.get_shared_vertex_ids()
+        for vertex_id in shared_vertex_ids:
+            vertex = self.get_vertex(vertex_id)
+            if not vertex._built:
+                await vertex.build(user_id=self.user_id, fallback_to_env_vars=fallback_to_env_vars)
+        return shared_vertex_ids
+
+    def _pickle_for_copies(self) -> Optional[bytes]:
+        """Pickles the graph to copy it for runs, or returns None if it holds objects that can't be pickled."""
+        try:
+            return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        except (TypeError, AttributeError, pickle.PicklingError) as exc:
+            logger.debug(f"Graph can't be pickled, runs copy it from its data: {exc}")
+            return None
+
+    def _copy_for_run(self, pickled_graph: Optional[bytes], shared_vertex_ids: List[str]) -> "Graph":
+        """Creates a copy of the graph with the results of the shared vertices."""
+        if pickled_graph is not None:
+            graph: Graph = pickle.loads(pickled_graph)
+        else:
+            # Vertices built by an earlier run may hold objects that can't be pickled
+            graph = Graph.from_payload(
+                copy.deepcopy(self.raw_graph_data), flow_id=self.flow_id, flow_name=self.flow_name, user_id=self.user_id
+            )
+        # The state of the graph is stored by run, so copies can't share a run id
+        graph.set_run_id()
+        for vertex_id in shared_vertex_ids:
+            vertex, shared_vertex = graph.get_vertex(vertex_id), self.get_vertex(vertex_id)
+            vertex._built = True
+            vertex._built_object = shared_vertex._built_object
+            vertex._built_result = shared_vertex._built_result
+            vertex._custom_component = shared_vertex._custom_component
+            vertex.result = shared_vertex.result
+            vertex.results = shared_vertex.results
+            vertex.artifacts = shared_vertex.artifacts
+            vertex.artifacts_raw = shared_vertex.artifacts_raw
+        return graph
+
     def next_vertex_to_build(self):
         """
         Returns the next vertex to be built.
@@ -501,6 +692,14 @@ class Graph:
 
         self.in_degree_map = self.build_in_degree(edges)
         self.parent_child_map = self.build_parent_child_map(vertices)
+        self._reachability = None
+
+    @property
+    def reachability(self) -> ReachabilityIndex:
+        """The descendants and ancestors of every vertex, built on first use after the structure changes."""
+        if self._reachability is None:
+            self._reachability = ReachabilityIndex(self.vertex_map, self.successor_map)
+        return self._reachability
 
     def reset_inactivated_vertices(self):
         """
@@ -522,7 +721,7 @@ class Graph:
         vertex.set_state(state)
 
     def mark_branch(self, vertex_id: str, state: str, visited: Optional[set] = None, output_name: Optional[str] = None):
-        """Marks a branch of the graph."""
+        """Marks a vertex and every vertex that descends from it, through `output_name` if given."""
         if visited is None:
             visited = set()
         if vertex_id in visited:
@@ -531,6 +730,7 @@ class Graph:
 
         self.mark_vertex(vertex_id, state)
 
+        children_ids = []
         for child_id in self.parent_child_map[vertex_id]:
             # Only child_id that have an edge with the vertex_id through the output_name
             # should be marked
@@ -538,15 +738,46 @@ class Graph:
                 edge = self.get_edge(vertex_id, child_id)
                 if edge and edge.source_handle.name != output_name:
                     continue
-            self.mark_branch(child_id, state)
+            children_ids.append(child_id)
+        if not children_ids:
+            return
+        descendants = set(self.reachability.descendants(*children_ids))
+        for branch_vertex_id in [*children_ids, *descendants.difference(children_ids)]:
+            if branch_vertex_id not in visited:
+                visited.add(branch_vertex_id)
+                self.mark_vertex(branch_vertex_id, state)
 
     def get_edge(self, source_id: str, target_id: str) -> Optional[ContractEdge]:
         """Returns the edge between two vertices."""
-        for edge in self.edges:
-            if edge.source_id == source_id and edge.target_id == target_id:
-                return edge
+        if edges := self._edge_map.get((source_id, target_id)):
+            return edges[0]
         return None
 
+    def build_edge_maps(self) -> None:
+        """
+        Indexes the edges by source, by target and by (source, target) so that
+        looking up the edges of a vertex does not scan every edge of the graph.
+        """
+        self._outgoing_edges: Dict[str, List[ContractEdge]] = defaultdict(list)
+        self._incoming_edges: Dict[str, List[ContractEdge]] = defaultdict(list)
+        self._edge_map: Dict[Tuple[str, str], List[ContractEdge]] = defaultdict(list)
+        for edge in self.edges:
+            self._index_edge(edge)
+
+    def _index_edge(self, edge: ContractEdge) -> None:
+        self._outgoing_edges[edge.source_id].append(edge)
+        self._incoming_edges[edge.target_id].append(edge)
+        self._edge_map[(edge.source_id, edge.target_id)].append(edge)
+
+    def _add_edge(self, edge: ContractEdge) -> None:
+        """Adds an edge to the graph and to the edge indexes."""
+        self.edges.append(edge)
+        self._index_edge(edge)
+
+    def _remove_edges_of_vertex(self, vertex_id: str) -> None:
+        """Removes every edge that has the vertex as source or target from the graph and the edge indexes."""
+        self._remove_edges(self._outgoing_edges.pop(vertex_id, []) + self._incoming_edges.pop(vertex_id, []))
+
     def build_parent_child_map(self, vertices: List[Vertex]):
         parent_child_map = defaultdict(list)
         for vertex in vertices:
@@ -572,6 +803,7 @@ class Graph:
             "raw_graph_data": self.raw_graph_data,
             "top_level_vertices": self.top_level_vertices,
             "inactivated_vertices": self.inactivated_vertices,
+            "inactive_vertices": self.inactive_vertices,
             "run_manager": self.run_manager.to_dict(),
             "_run_id": self._run_id,
             "in_degree_map": self.in_degree_map,
@@ -580,9 +812,11 @@ class Graph:
             "successor_map": self.successor_map,
             "activated_vertices": self.activated_vertices,
             "vertices_layers": self.vertices_layers,
+            "_sorted_vertices_layers": self._sorted_vertices_layers,
             "vertices_to_run": self.vertices_to_run,
             "stop_vertex": self.stop_vertex,
             "vertex_map": self.vertex_map,
+            "_execution_plans": self._execution_plans,
         }
 
     def __setstate__(self, state):
@@ -591,12 +825,64 @@ class Graph:
             state["run_manager"] = run_manager
         else:
             state["run_manager"] = RunnableVerticesManager.from_dict(run_manager)
+        state.setdefault("_execution_plans", {})
+        state.setdefault("inactive_vertices", set())
+        state.setdefault("_sorted_vertices_layers", [])
         self.__dict__.update(state)
+        self._reachability = None
+        self._runs, self._updates = 0, 0
+        self._start_time = datetime.now(timezone.utc)
+        self._is_input_vertices, self._is_output_vertices = [], []
+        self._is_state_vertices, self._has_session_id_vertices = [], []
+        self.define_vertices_lists()
+        self.build_edge_maps()
         self.state_manager = GraphStateManager()
         self.tracing_service = get_tracing_service()
         self.set_run_id(self._run_id)
         self.set_run_name()
 
+    def dump_run_state(self, vertex_ids: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Serializes what a run changed: the state of the given vertices and the run state of the graph.
+
+        References to the graph and its vertices are stored by id, so the size of each entry doesn't
+        grow with the graph. The result is applied to a copy of the graph with `load_run_state`.
+        """
+        state = {
+            vertex_id: dump_run_state(self, self.get_vertex(vertex_id).get_run_state()) for vertex_id in vertex_ids
+        }
+        state[GRAPH_RUN_STATE_KEY] = dump_run_state(
+            self,
+            {
+                "run_manager": self.run_manager.to_dict(),
+                "inactivated_vertices": self.inactivated_vertices,
+                "activated_vertices": self.activated_vertices,
+                "vertices_to_run": self.vertices_to_run,
+                "stop_vertex": self.stop_vertex,
+                "_run_id": self._run_id,
+                # Branches can activate or inactivate vertices that were not built
+                "vertex_states": {
+                    vertex.id: vertex.state for vertex in self.vertices if vertex.state != VertexStates.ACTIVE
+                },
+            },
+        )
+        return state
+
+    def load_run_state(self, state: Dict[str, bytes]):
+        """Applies run state serialized by `dump_run_state`."""
+        for vertex_id, data in state.items():
+            if vertex_id != GRAPH_RUN_STATE_KEY and vertex_id in self.vertex_map:
+                self.get_vertex(vertex_id).set_run_state(load_run_state(self, data))
+        if GRAPH_RUN_STATE_KEY not in state:
+            return
+        graph_state = load_run_state(self, state[GRAPH_RUN_STATE_KEY])
+        vertex_states = graph_state.pop("vertex_states")
+        for vertex in self.vertices:
+            vertex.state = vertex_states.get(vertex.id, VertexStates.ACTIVE)
+        graph_state["run_manager"] = RunnableVerticesManager.from_dict(graph_state["run_manager"])
+        self.__dict__.update(graph_state)
+        self.set_run_id(self._run_id)
+
     @classmethod
     def from_payload(
         cls,
@@ -643,13 +929,10 @@ class Graph:
 
     def update_edges_from_vertex(self, vertex: Vertex, other_vertex: Vertex) -> None:
         """Updates the edges of a vertex in the Graph."""
-        new_edges = []
-        for edge in self.edges:
-            if edge.source_id == other_vertex.id or edge.target_id == other_vertex.id:
-                continue
-            new_edges.append(edge)
-        new_edges += other_vertex.edges
-        self.edges = new_edges
+        new_edges = other_vertex.edges
+        self._remove_edges_of_vertex(other_vertex.id)
+        for edge in new_edges:
+            self._add_edge(edge)
 
     def vertex_data_is_identical(self, vertex: Vertex, other_vertex: Vertex) -> bool:
         data_is_equivalent = vertex == other_vertex
@@ -667,55 +950,206 @@ class Graph:
         return True
 
     def update(self, other: "Graph") -> "Graph":
-        # Existing vertices in self graph
-        existing_vertex_ids = set(vertex.id for vertex in self.vertices)
-        # Vertex IDs in the other graph
-        other_vertex_ids = set(other.vertex_map.keys())
+        """Updates this graph in place to match `other`, a newer version of the same flow, like `update_from_payload`."""
+        return self._update(other.raw_graph_data, other._graph_data)
+
+    def update_from_payload(self, payload: Dict) -> "Graph":
+        """
+        Updates this graph in place to match `payload`, the data of a newer version of the same flow.
+
+        Only the vertices and edges that differ are created or patched: the adjacency maps are updated
+        edge by edge, and the built results are only reset for the vertices whose params changed and
+        their successors. The other vertices keep their results.
+        """
+        if "data" in payload:
+            payload = payload["data"]
+        raw_graph_data = {"nodes": payload["nodes"], "edges": payload["edges"]}
+        # Only flows with groups have to be processed, copying the others costs as much as building them
+        if any(vertex.get("data", {}).get("node", {}).get("flow") for vertex in raw_graph_data["nodes"]):
+            return self._update(raw_graph_data, process_flow(raw_graph_data))
+        return self._update(raw_graph_data, raw_graph_data)
+
+    def _update(self, raw_graph_data: Dict, graph_data: Dict) -> "Graph":
+        self.raw_graph_data = raw_graph_data
+        self._graph_data = graph_data
+        self._vertices = graph_data["nodes"]
+        self._edges = graph_data["edges"]
+        self.top_level_vertices = [vertex["id"] for vertex in raw_graph_data["nodes"] if vertex.get("id")]
+        diff = GraphDiff.from_data(self, graph_data)
+        if diff.is_empty:
+            return self
+
+        for edge in diff.removed_edges:
+            self._unlink_edge(edge)
+        self._remove_edges(diff.removed_edges)
+        for vertex_id in diff.removed_vertices:
+            self.vertices.remove(self.vertex_map.pop(vertex_id))
+            for vertex_map in (self.predecessor_map, self.successor_map, self.in_degree_map, self.parent_child_map):
+                vertex_map.pop(vertex_id, None)
+            self._outgoing_edges.pop(vertex_id, None)
+            self._incoming_edges.pop(vertex_id, None)
+
+        nodes = {vertex["id"]: vertex for vertex in self._vertices}
+        for vertex_id in diff.added_vertices:
+            self._add_vertex(self._create_vertex(nodes[vertex_id]))
+            self.parent_child_map[vertex_id] = []
+        for vertex_id in diff.changed_vertices:
+            vertex = self.get_vertex(vertex_id)
+            vertex._data = nodes[vertex_id]
+            vertex._parse_data()
 
-        # Find vertices that are in other but not in self (new vertices)
-        new_vertex_ids = other_vertex_ids - existing_vertex_ids
+        for edge_data in diff.added_edges:
+            edge = ContractEdge(self.get_vertex(edge_data["source"]), self.get_vertex(edge_data["target"]), edge_data)
+            self._add_edge(edge)
+            self._link_edge(edge)
 
-        # Find vertices that are in self but not in other (removed vertices)
-        removed_vertex_ids = existing_vertex_ids - other_vertex_ids
+        dirty = diff.dirty_vertices()
+        for vertex_id in dirty:
+            vertex = self.get_vertex(vertex_id)
+            vertex.params = {}
+            vertex._build_params()
+        for vertex_id in self._get_vertices_and_successors(dirty):
+            self._invalidate_vertex(self.get_vertex(vertex_id))
 
-        # Remove vertices that are not in the other graph
-        for vertex_id in removed_vertex_ids:
-            try:
-                self.remove_vertex(vertex_id)
-            except ValueError:
-                pass
-
-        # The order here matters because adding the vertex is required
-        # if any of them have edges that point to any of the new vertices
-        # By adding them first, them adding the edges we ensure that the
-        # edges have valid vertices to point to
-
-        # Add new vertices
-        for vertex_id in new_vertex_ids:
-            new_vertex = other.get_vertex(vertex_id)
-            self._add_vertex(new_vertex)
-
-        # Now update the edges
-        for vertex_id in new_vertex_ids:
-            new_vertex = other.get_vertex(vertex_id)
-            self._update_edges(new_vertex)
-            # Graph is set at the end because the edges come from the graph
-            # and the other graph is where the new edges and vertices come from
-            new_vertex.graph = self
-
-        # Update existing vertices that have changed
-        for vertex_id in existing_vertex_ids.intersection(other_vertex_ids):
-            self_vertex = self.get_vertex(vertex_id)
-            other_vertex = other.get_vertex(vertex_id)
-            # If the vertices are not identical, update the vertex
-            if not self.vertex_data_is_identical(self_vertex, other_vertex):
-                self.update_vertex_from_another(self_vertex, other_vertex)
-
-        self.build_graph_maps()
-        self.define_vertices_lists()
+        self._update_vertices_lists(diff.added_vertices | diff.changed_vertices, diff.removed_vertices)
+        if diff.structure_changed:
+            self._sorted_vertices_layers = []
+            self._reachability = None
         self.increment_update_count()
         return self
 
+    def copy(self) -> "Graph":
+        """
+        Returns a copy of the graph that can be updated and built without changing this graph.
+
+        The vertices, edges and maps are copied, not created again from the data of the flow.
+        The vertices keep their results, but not the components that built them.
+        """
+        graph = Graph.__new__(Graph)
+        graph.__dict__.update(self.__dict__)
+        graph.vertices = [vertex.copy(graph) for vertex in self.vertices]
+        graph.vertex_map = {vertex.id: vertex for vertex in graph.vertices}
+
+        def copy_param(value):
+            # The params refer to the vertices they are built from
+            if isinstance(value, Vertex):
+                return graph.vertex_map.get(value.id, value)
+            if isinstance(value, list):
+                return [copy_param(item) for item in value]
+            if isinstance(value, dict):
+                return {key: copy_param(item) for key, item in value.items()}
+            return value
+
+        for vertex in graph.vertices:
+            vertex.params = copy_param(vertex.params)
+            vertex._raw_params = copy_param(vertex._raw_params)
+        graph.edges = [copy.copy(edge) for edge in self.edges]
+        graph.build_edge_maps()
+        for name in ("predecessor_map", "successor_map", "parent_child_map"):
+            vertex_map = defaultdict(list)
+            vertex_map.update((vertex_id, list(ids)) for vertex_id, ids in getattr(self, name).items())
+            setattr(graph, name, vertex_map)
+        graph.in_degree_map = copy.copy(self.in_degree_map)
+        for name in (
+            "top_level_vertices",
+            "inactivated_vertices",
+            "inactive_vertices",
+            "activated_vertices",
+            "vertices_to_run",
+            "_is_input_vertices",
+            "_is_output_vertices",
+            "_is_state_vertices",
+            "_has_session_id_vertices",
+            "_execution_plans",
+        ):
+            setattr(graph, name, copy.copy(getattr(self, name)))
+        graph.vertices_layers = [list(layer) for layer in self.vertices_layers]
+        graph._sorted_vertices_layers = [list(layer) for layer in self._sorted_vertices_layers]
+        graph.run_manager = RunnableVerticesManager.from_dict(self.run_manager.to_dict())
+        graph._reachability = None
+        graph.set_run_id()
+        return graph
+
+    def diff(self, other: "Graph") -> GraphDiff:
+        """Returns the vertices and edges that were added, removed or changed in `other`."""
+        return GraphDiff.from_graphs(self, other)
+
+    def _link_edge(self, edge: ContractEdge) -> None:
+        """Adds an edge to the adjacency maps."""
+        self.predecessor_map[edge.target_id].append(edge.source_id)
+        self.successor_map[edge.source_id].append(edge.target_id)
+        self.in_degree_map[edge.target_id] = len(self.predecessor_map[edge.target_id])
+        self.parent_child_map[edge.source_id].append(edge.target_id)
+        self._reachability = None
+
+    def _unlink_edge(self, edge: ContractEdge) -> None:
+        """Removes an edge from the adjacency maps."""
+        for vertex_map, vertex_id, other_id in (
+            (self.predecessor_map, edge.target_id, edge.source_id),
+            (self.successor_map, edge.source_id, edge.target_id),
+            (self.parent_child_map, edge.source_id, edge.target_id),
+        ):
+            if other_id in vertex_map.get(vertex_id, []):
+                vertex_map[vertex_id].remove(other_id)
+        self.in_degree_map[edge.target_id] = len(self.predecessor_map.get(edge.target_id, []))
+        self._reachability = None
+
+    def _remove_edges(self, edges: List[ContractEdge]) -> None:
+        """Removes edges from the graph and from the edge indexes."""
+        if not edges:
+            return
+        # Edges are hashed by their repr, so compare them by identity instead
+        removed_ids = {id(edge) for edge in edges}
+
+        def keep(edges: List[ContractEdge]) -> List[ContractEdge]:
+            return [edge for edge in edges if id(edge) not in removed_ids]
+
+        for edge in edges:
+            if edge.source_id in self._outgoing_edges:
+                self._outgoing_edges[edge.source_id] = keep(self._outgoing_edges[edge.source_id])
+            if edge.target_id in self._incoming_edges:
+                self._incoming_edges[edge.target_id] = keep(self._incoming_edges[edge.target_id])
+            pair = (edge.source_id, edge.target_id)
+            if remaining := keep(self._edge_map.get(pair, [])):
+                self._edge_map[pair] = remaining
+            else:
+                self._edge_map.pop(pair, None)
+        self.edges = keep(self.edges)
+
+    def _get_vertices_and_successors(self, vertex_ids: Set[str]) -> Set[str]:
+        """Returns the vertices and all the vertices reachable from them."""
+        visited = set(vertex_ids)
+        queue = deque(vertex_ids)
+        while queue:
+            for successor_id in self.successor_map.get(queue.popleft(), []):
+                if successor_id not in visited:
+                    visited.add(successor_id)
+                    queue.append(successor_id)
+        return visited
+
+    def _invalidate_vertex(self, vertex: Vertex) -> None:
+        """Drops the result of a vertex so that it is built again."""
+        # Frozen vertices keep their results until they are unfrozen
+        if vertex.frozen:
+            return
+        vertex._built = False
+        vertex.result = None
+        vertex.artifacts = {}
+        vertex.set_top_level(self.top_level_vertices)
+        for edge in self._incoming_edges.get(vertex.id, []):
+            edge.is_fulfilled = False
+            edge.result = None
+
+    def _update_vertices_lists(self, updated_vertex_ids: Set[str], removed_vertex_ids: Set[str]) -> None:
+        """Updates the lists of input, output, session_id and state vertices for the vertices that changed."""
+        stale_vertex_ids = updated_vertex_ids | removed_vertex_ids
+        for attribute in ["is_input", "is_output", "has_session_id", "is_state"]:
+            vertex_ids = getattr(self, f"_{attribute}_vertices")
+            vertex_ids[:] = [vertex_id for vertex_id in vertex_ids if vertex_id not in stale_vertex_ids]
+            vertex_ids.extend(
+                vertex_id for vertex_id in updated_vertex_ids if getattr(self.get_vertex(vertex_id), attribute)
+            )
+
     def update_vertex_from_another(self, vertex: Vertex, other_vertex: Vertex) -> None:
         """
         Updates a vertex from another vertex.
@@ -763,14 +1197,19 @@ class Graph:
         """Updates the edges of a vertex."""
         # Vertex has edges, so we need to update the edges
         for edge in vertex.edges:
-            if edge not in self.edges and edge.source_id in self.vertex_map and edge.target_id in self.vertex_map:
-                self.edges.append(edge)
+            if (
+                edge not in self._edge_map.get((edge.source_id, edge.target_id), [])
+                and edge.source_id in self.vertex_map
+                and edge.target_id in self.vertex_map
+            ):
+                self._add_edge(edge)
 
     def _build_graph(self) -> None:
         """Builds the graph from the vertices and edges."""
         self.vertices = self._build_vertices()
         self.vertex_map = {vertex.id: vertex for vertex in self.vertices}
         self.edges = self._build_edges()
+        self.build_edge_maps()
 
         # This is a hack to make sure that the LLM vertex is sent to
         # the toolkit vertex
@@ -787,7 +1226,8 @@ class Graph:
             return
         self.vertices.remove(vertex)
         self.vertex_map.pop(vertex_id)
-        self.edges = [edge for edge in self.edges if edge.source_id != vertex_id and edge.target_id != vertex_id]
+        self._remove_edges_of_vertex(vertex_id)
+        self._reachability = None
 
     def _build_vertex_params(self) -> None:
         """Identifies and handles the LLM vertex within the graph."""
@@ -797,7 +1237,7 @@ class Graph:
     def _validate_vertex(self, vertex: Vertex) -> bool:
         """Validates a vertex."""
         # All vertices that do not have edges are invalid
-        return len(self.get_vertex_edges(vertex.id)) > 0
+        return bool(self._outgoing_edges.get(vertex.id) or self._incoming_edges.get(vertex.id))
 
     def get_vertex(self, vertex_id: str) -> Vertex:
         """Returns a vertex by id."""
@@ -849,23 +1289,20 @@ class Graph:
         vertex = self.get_vertex(vertex_id)
         try:
             params = ""
+            # Vertex ids are copied along with flows, so they are only unique within a flow
+            vertex_cache_key = f"{self.flow_id}:{vertex.id}"
             if vertex.frozen:
                 # Check the cache for the vertex
-                cached_result = await chat_service.get_cache(key=vertex.id)
-                if isinstance(cached_result, CacheMiss):
+                cached_result = await chat_service.get_vertex_result(vertex_cache_key, self)
+                if cached_result is None:
                     await vertex.build(
                         user_id=user_id, inputs=inputs_dict, fallback_to_env_vars=fallback_to_env_vars, files=files
                     )
-                    await chat_service.set_cache(key=vertex.id, data=vertex)
+                    await chat_service.set_vertex_result(vertex_cache_key, vertex)
                 else:
-                    cached_vertex = cached_result["result"]
-                    # Now set update the vertex with the cached vertex
-                    vertex._built = cached_vertex._built
-                    vertex.result = cached_vertex.result
-                    vertex.results = cached_vertex.results
-                    vertex.artifacts = cached_vertex.artifacts
-                    vertex._built_object = cached_vertex._built_object
-                    vertex._custom_component = cached_vertex._custom_component
+                    # Now set update the vertex with the cached result
+                    for attribute, value in cached_result.items():
+                        setattr(vertex, attribute, value)
                     if vertex.result is not None:
                         vertex.result.used_frozen_result = True
 
@@ -873,7 +1310,7 @@ class Graph:
                 await vertex.build(
                     user_id=user_id, inputs=inputs_dict, fallback_to_env_vars=fallback_to_env_vars, files=files
                 )
-                await chat_service.set_cache(key=vertex.id, data=vertex)
+                await chat_service.set_vertex_result(vertex_cache_key, vertex)
 
             if vertex.result is not None:
                 params = f"{vertex._built_object_repr()}{params}"
@@ -892,6 +1329,12 @@ class Graph:
             log_transaction(flow_id, vertex, status="failure", error=str(exc))
             raise exc
 
+    def get_result_cache_counts(self) -> Dict[str, int]:
+        """Returns the hits and misses of the memoized vertices built in the current run."""
+        built = [vertex for vertex in self.vertices if vertex.memoize and vertex._built and vertex.result is not None]
+        hits = sum(1 for vertex in built if vertex.result.used_memoized_result)
+        return {"hits": hits, "misses": len(built) - hits}
+
     def get_vertex_edges(
         self,
         vertex_id: str,
@@ -901,55 +1344,115 @@ class Graph:
         """Returns a list of edges for a given vertex."""
         # The idea here is to return the edges that have the vertex_id as source or target
         # or both
-        return [
-            edge
-            for edge in self.edges
-            if (edge.source_id == vertex_id and is_source is not False)
-            or (edge.target_id == vertex_id and is_target is not False)
-        ]
+        edges: List[ContractEdge] = []
+        if is_source is not False:
+            edges.extend(self._outgoing_edges.get(vertex_id, []))
+        if is_target is not False:
+            # Self-loops are already in the outgoing edges
+            edges.extend(
+                edge
+                for edge in self._incoming_edges.get(vertex_id, [])
+                if is_source is False or edge.source_id != vertex_id
+            )
+        return edges
 
     def get_vertices_with_target(self, vertex_id: str) -> List[Vertex]:
         """Returns the vertices connected to a vertex."""
         vertices: List[Vertex] = []
-        for edge in self.edges:
-            if edge.target_id == vertex_id:
-                vertex = self.get_vertex(edge.source_id)
-                if vertex is None:
-                    continue
-                vertices.append(vertex)
+        for edge in self._incoming_edges.get(vertex_id, []):
+            vertex = self.get_vertex(edge.source_id)
+            if vertex is None:
+                continue
+            vertices.append(vertex)
         return vertices
 
-    async def process(self, fallback_to_env_vars: bool, start_component_id: Optional[str] = None) -> "Graph":
-        """Processes the graph with vertices in each layer run in parallel."""
+    async def process(
+        self,
+        fallback_to_env_vars: bool,
+        start_component_id: Optional[str] = None,
+        scheduler: Optional[str] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> "Graph":
+        """
+        Processes the graph.
+
+        With the "layered" scheduler the vertices of each layer run in parallel and the next layer
+        only starts when the whole layer is built. With the "streaming" scheduler each vertex starts
+        as soon as its predecessors are built.
+
+        Args:
+            fallback_to_env_vars (bool): Whether to fallback to environment variables when loading variables.
+            start_component_id (Optional[str], optional): The ID of the vertex to start from. Defaults to None.
+            scheduler (Optional[str], optional): "layered" or "streaming". Defaults to the `graph_scheduler` setting.
+            max_in_flight (Optional[int], optional): Maximum number of vertices built at the same time by the
+                "streaming" scheduler, 0 means no limit. Defaults to the `graph_max_in_flight` setting.
+
+        Returns:
+            Graph: The processed graph.
+        """
+        if scheduler is None or max_in_flight is None:
+            settings = get_settings_service().settings
+            scheduler = scheduler or settings.graph_scheduler
+            max_in_flight = settings.graph_max_in_flight if max_in_flight is None else max_in_flight
+        if scheduler not in GRAPH_SCHEDULERS:
+            raise ValueError(f"Invalid scheduler: {scheduler}. Expected one of {GRAPH_SCHEDULERS}")
 
         first_layer = self.sort_vertices(start_component_id=start_component_id)
-        vertex_task_run_count: Dict[str, int] = {}
-        to_process = deque(first_layer)
-        layer_index = 0
+        self.prefetch_variables()
         chat_service = get_chat_service()
         run_id = uuid.uuid4()
         self.set_run_id(run_id)
         self.set_run_name()
         await self.initialize_run()
         lock = chat_service._cache_locks[self.run_id]
+        if scheduler == "streaming":
+            await self._process_streaming(first_layer, chat_service, fallback_to_env_vars, max_in_flight)
+        else:
+            await self._process_layered(first_layer, chat_service, lock, fallback_to_env_vars)
+
+        logger.debug("Graph processing complete")
+        return self
+
+    def _create_build_task(
+        self,
+        chat_service: ChatService,
+        vertex_id: str,
+        fallback_to_env_vars: bool,
+        vertex_task_run_count: Dict[str, int],
+    ) -> asyncio.Task:
+        """Creates the task that builds a vertex."""
+        vertex = self.get_vertex(vertex_id)
+        task = asyncio.create_task(
+            self.build_vertex(
+                chat_service=chat_service,
+                vertex_id=vertex_id,
+                user_id=self.user_id,
+                inputs_dict={},
+                fallback_to_env_vars=fallback_to_env_vars,
+            ),
+            name=f"{vertex.display_name} Run {vertex_task_run_count.get(vertex_id, 0)}",
+        )
+        vertex_task_run_count[vertex_id] = vertex_task_run_count.get(vertex_id, 0) + 1
+        return task
+
+    async def _process_layered(
+        self,
+        first_layer: List[str],
+        chat_service: ChatService,
+        lock: asyncio.Lock,
+        fallback_to_env_vars: bool,
+    ) -> None:
+        """Runs the vertices of each layer in parallel, one layer at a time."""
+        vertex_task_run_count: Dict[str, int] = {}
+        to_process = deque(first_layer)
+        layer_index = 0
         while to_process:
             current_batch = list(to_process)  # Copy current deque items to a list
             to_process.clear()  # Clear the deque for new items
-            tasks = []
-            for vertex_id in current_batch:
-                vertex = self.get_vertex(vertex_id)
-                task = asyncio.create_task(
-                    self.build_vertex(
-                        chat_service=chat_service,
-                        vertex_id=vertex_id,
-                        user_id=self.user_id,
-                        inputs_dict={},
-                        fallback_to_env_vars=fallback_to_env_vars,
-                    ),
-                    name=f"{vertex.display_name} Run {vertex_task_run_count.get(vertex_id, 0)}",
-                )
-                tasks.append(task)
-                vertex_task_run_count[vertex_id] = vertex_task_run_count.get(vertex_id, 0) + 1
+            tasks = [
+                self._create_build_task(chat_service, vertex_id, fallback_to_env_vars, vertex_task_run_count)
+                for vertex_id in current_batch
+            ]
 
             logger.debug(f"Running layer {layer_index} with {len(tasks)} tasks")
             try:
@@ -962,8 +1465,41 @@ class Graph:
             to_process.extend(next_runnable_vertices)
             layer_index += 1
 
-        logger.debug("Graph processing complete")
-        return self
+    async def _process_streaming(
+        self,
+        first_layer: List[str],
+        chat_service: ChatService,
+        fallback_to_env_vars: bool,
+        max_in_flight: int,
+    ) -> None:
+        """Starts each vertex as soon as all of its predecessors are built."""
+        vertex_task_run_count: Dict[str, int] = {}
+        ready = deque(first_layer)
+        for vertex_id in first_layer:
+            # Scheduled vertices must not be picked up again as runnable predecessors
+            self.run_manager.update_vertex_run_state(vertex_id, is_runnable=False)
+        in_flight: Dict[asyncio.Task, str] = {}
+        try:
+            while ready or in_flight:
+                while ready and (max_in_flight <= 0 or len(in_flight) < max_in_flight):
+                    vertex_id = ready.popleft()
+                    task = self._create_build_task(chat_service, vertex_id, fallback_to_env_vars, vertex_task_run_count)
+                    in_flight[task] = vertex_id
+
+                logger.debug(f"Running {len(in_flight)} tasks, {len(ready)} waiting")
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.pop(task)
+                    if exc := task.exception():
+                        logger.error(f"Task {task.get_name()} failed with exception: {exc}")
+                        raise exc
+                    result = task.result()
+                    if not (isinstance(result, tuple) and len(result) == 5):
+                        raise ValueError(f"Invalid result from task {task.get_name()}: {result}")
+                    ready.extend(self.run_manager.mark_vertex_built(result[4].id))
+        finally:
+            for task in in_flight:
+                task.cancel()
 
     async def _execute_tasks(self, tasks: List[asyncio.Task], lock: asyncio.Lock) -> List[str]:
         """Executes tasks in parallel, handling exceptions for each task."""
@@ -1018,9 +1554,8 @@ class Graph:
                 raise ValueError("Graph contains a cycle, cannot perform topological sort")
             if state[vertex] == 0:
                 state[vertex] = 1
-                for edge in vertex.edges:
-                    if edge.source_id == vertex.id:
-                        dfs(self.get_vertex(edge.target_id))
+                for edge in self._outgoing_edges.get(vertex.id, []):
+                    dfs(self.get_vertex(edge.target_id))
                 state[vertex] = 2
                 sorted_vertices.append(vertex)
 
@@ -1042,36 +1577,22 @@ class Graph:
         return [self.get_vertex(source_id) for source_id in self.predecessor_map.get(vertex.id, [])]
 
     def get_all_successors(self, vertex: Vertex, recursive=True, flat=True):
-        # Recursively get the successors of the current vertex
-        # successors = vertex.successors
-        # if not successors:
-        #     return []
-        # successors_result = []
-        # for successor in successors:
-        #     # Just return a list of successors
-        #     if recursive:
-        #         next_successors = self.get_all_successors(successor)
-        #         successors_result.extend(next_successors)
-        #     successors_result.append(successor)
-        # return successors_result
-        # The above is the version without the flat parameter
-        # The below is the version with the flat parameter
-        # the flat parameter will define if each layer of successors
-        # becomes one list or if the result is a list of lists
-        # if flat is True, the result will be a list of vertices
-        # if flat is False, the result will be a list of lists of vertices
-        # each list will represent a layer of successors
+        """
+        Returns the successors of a vertex, and their successors and so on if `recursive`.
+
+        If `flat` is False, each successor is returned in its own list, preceded by
+        the list of its successors if `recursive`.
+        """
+        if recursive and flat:
+            # Each descendant once, even when it is reached through several paths
+            return [self.get_vertex(vertex_id) for vertex_id in self.reachability.descendants(vertex.id)]
         successors = vertex.successors
         if not successors:
             return []
         successors_result = []
         for successor in successors:
             if recursive:
-                next_successors = self.get_all_successors(successor)
-                if flat:
-                    successors_result.extend(next_successors)
-                else:
-                    successors_result.append(next_successors)
+                successors_result.append(self.get_all_successors(successor))
             if flat:
                 successors_result.append(successor)
             else:
@@ -1085,7 +1606,7 @@ class Graph:
     def get_vertex_neighbors(self, vertex: Vertex) -> Dict[Vertex, int]:
         """Returns the neighbors of a vertex."""
         neighbors: Dict[Vertex, int] = {}
-        for edge in self.edges:
+        for edge in self.get_vertex_edges(vertex.id):
             if edge.source_id == vertex.id:
                 neighbor = self.get_vertex(edge.target_id)
                 if neighbor is None:
@@ -1146,21 +1667,21 @@ class Graph:
 
     def _build_vertices(self) -> List[Vertex]:
         """Builds the vertices of the graph."""
-        vertices: List[Vertex] = []
-        for vertex in self._vertices:
-            vertex_data = vertex["data"]
-            vertex_type: str = vertex_data["type"]  # type: ignore
-            vertex_base_type: str = vertex_data["node"]["template"]["_type"]  # type: ignore
-            if "id" not in vertex_data:
-                raise ValueError(f"Vertex data for {vertex_data['display_name']} does not contain an id")
+        return [self._create_vertex(vertex) for vertex in self._vertices]
 
-            VertexClass = self._get_vertex_class(vertex_type, vertex_base_type, vertex_data["id"])
+    def _create_vertex(self, vertex: Dict) -> Vertex:
+        """Creates a vertex of this graph from its data."""
+        vertex_data = vertex["data"]
+        vertex_type: str = vertex_data["type"]  # type: ignore
+        vertex_base_type: str = vertex_data["node"]["template"]["_type"]  # type: ignore
+        if "id" not in vertex_data:
+            raise ValueError(f"Vertex data for {vertex_data['display_name']} does not contain an id")
 
-            vertex_instance = VertexClass(vertex, graph=self)
-            vertex_instance.set_top_level(self.top_level_vertices)
-            vertices.append(vertex_instance)
+        VertexClass = self._get_vertex_class(vertex_type, vertex_base_type, vertex_data["id"])
 
-        return vertices
+        vertex_instance = VertexClass(vertex, graph=self)
+        vertex_instance.set_top_level(self.top_level_vertices)
+        return vertex_instance
 
     def get_children_by_vertex_type(self, vertex: Vertex, vertex_type: str) -> List[Vertex]:
         """Returns the children of a vertex based on the vertex type."""
@@ -1183,20 +1704,6 @@ class Graph:
         visited = set()  # To keep track of visited vertices
         excluded = set()  # To keep track of vertices that should be excluded
 
-        def get_successors(vertex, recursive=True):
-            # Recursively get the successors of the current vertex
-            successors = vertex.successors
-            if not successors:
-                return []
-            successors_result = []
-            for successor in successors:
-                # Just return a list of successors
-                if recursive:
-                    next_successors = get_successors(successor)
-                    successors_result.extend(next_successors)
-                successors_result.append(successor)
-            return successors_result
-
         try:
             stop_or_start_vertex = self.get_vertex(vertex_id)
             stack = [vertex_id]  # Use a list as a stack for DFS
@@ -1219,17 +1726,11 @@ class Graph:
                     # and their successors and so on
                     # if the vertex is a start, it means we are starting from the beginning
                     # and getting successors
-                    for successor in current_vertex.successors:
+                    for successor_id in self.reachability.descendants(current_id):
                         if is_start:
-                            stack.append(successor.id)
+                            stack.append(successor_id)
                         else:
-                            excluded.add(successor.id)
-                        all_successors = get_successors(successor)
-                        for successor in all_successors:
-                            if is_start:
-                                stack.append(successor.id)
-                            else:
-                                excluded.add(successor.id)
+                            excluded.add(successor_id)
                 elif current_id not in stop_predecessors:
                     # If the current vertex is not the target vertex, we should add all its successors
                     # to the stack if they are not in visited
@@ -1249,13 +1750,17 @@ class Graph:
     ) -> List[List[str]]:
         """Performs a layered topological sort of the vertices in the graph."""
         vertices_ids = {vertex.id for vertex in vertices}
+        # Edges are 'removed' from a copy, the graph's in_degree_map is left untouched
+        in_degree_map = {vertex_id: self.in_degree_map.get(vertex_id, 0) for vertex_id in vertices_ids}
         # Queue for vertices with no incoming edges
         queue = deque(
             vertex.id
             for vertex in vertices
             # if filter_graphs then only vertex.is_input will be considered
-            if self.in_degree_map[vertex.id] == 0 and (not filter_graphs or vertex.is_input)
+            if in_degree_map[vertex.id] == 0 and (not filter_graphs or vertex.is_input)
         )
+        # The vertices in `queue`, to check membership without scanning it
+        queued = set(queue)
         layers: List[List[str]] = []
         visited = set(queue)
 
@@ -1265,6 +1770,7 @@ class Graph:
             layer_size = len(queue)
             for _ in range(layer_size):
                 vertex_id = queue.popleft()
+                queued.discard(vertex_id)
                 visited.add(vertex_id)
 
                 layers[current_layer].append(vertex_id)
@@ -1276,16 +1782,18 @@ class Graph:
                     if neighbor not in vertices_ids:
                         continue
 
-                    self.in_degree_map[neighbor] -= 1  # 'remove' edge
-                    if self.in_degree_map[neighbor] == 0 and neighbor not in visited:
+                    in_degree_map[neighbor] -= 1  # 'remove' edge
+                    if in_degree_map[neighbor] == 0 and neighbor not in visited:
                         queue.append(neighbor)
+                        queued.add(neighbor)
 
                     # if > 0 it might mean not all predecessors have added to the queue
                     # so we should process the neighbors predecessors
-                    elif self.in_degree_map[neighbor] > 0:
+                    elif in_degree_map[neighbor] > 0:
                         for predecessor in self.predecessor_map[neighbor]:
-                            if predecessor not in queue and predecessor not in visited:
+                            if predecessor not in queued and predecessor not in visited:
                                 queue.append(predecessor)
+                                queued.add(predecessor)
 
             current_layer += 1  # Next layer
         new_layers = self.refine_layers(layers)
@@ -1379,8 +1887,37 @@ class Graph:
     ) -> List[str]:
         """Sorts the vertices in the graph."""
         self.mark_all_vertices("ACTIVE")
+        plan = self.get_execution_plan(stop_component_id, start_component_id)
+        self.increment_run_count()
+        # Return just the first layer, the rest are saved in vertices_layers
+        return plan.apply(self)
+
+    def get_execution_plan(
+        self,
+        stop_component_id: Optional[str] = None,
+        start_component_id: Optional[str] = None,
+    ) -> ExecutionPlan:
+        """Returns the execution plan for the current structure of the graph, computing it on first use."""
+        if stop_component_id is not None:
+            start_component_id = None
+        key = (structure_hash(self), start_component_id or None, stop_component_id)
+        plan = self._execution_plans.get(key)
+        if plan is None:
+            plan = self._build_execution_plan(key, stop_component_id, start_component_id)
+            # Plans of previous structures of the graph won't be used again
+            self._execution_plans = {
+                plan_key: plan for plan_key, plan in self._execution_plans.items() if plan_key[0] == key[0]
+            }
+            self._execution_plans[key] = plan
+        return plan
+
+    def _build_execution_plan(
+        self,
+        key: PlanKey,
+        stop_component_id: Optional[str] = None,
+        start_component_id: Optional[str] = None,
+    ) -> ExecutionPlan:
         if stop_component_id is not None:
-            self.stop_vertex = stop_component_id
             vertices = self.sort_up_to_vertex(stop_component_id)
         elif start_component_id:
             vertices = self.sort_up_to_vertex(start_component_id, is_start=True)
@@ -1396,15 +1933,7 @@ class Graph:
         # Now we should sort each layer in a way that we make sure
         # vertex V does not depend on vertex V+1
         vertices_layers = self.sort_layer_by_dependency(vertices_layers)
-        self.increment_run_count()
-        self._sorted_vertices_layers = vertices_layers
-        first_layer = vertices_layers[0]
-        # save the only the rest
-        self.vertices_layers = vertices_layers[1:]
-        self.vertices_to_run = {vertex_id for vertex_id in chain.from_iterable(vertices_layers)}
-        self.build_run_map()
-        # Return just the first layer
-        return first_layer
+        return ExecutionPlan.from_layers(key, self, vertices_layers, stop_vertex=stop_component_id)
 
     def sort_interface_components_first(self, vertices_layers: List[List[str]]) -> List[List[str]]:
         """Sorts the vertices in the graph so that vertices containing ChatInput or ChatOutput come first."""
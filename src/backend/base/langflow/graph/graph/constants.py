@@ -2,6 +2,8 @@ from langflow.graph.schema import CHAT_COMPONENTS
 from langflow.graph.vertex import types
 from langflow.utils.lazy_load import LazyLoadDictBase
 
+GRAPH_SCHEDULERS = ("layered", "streaming")
+
 
 class VertexTypesDict(LazyLoadDictBase):
     def __init__(self):
@@ -0,0 +1,89 @@
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from langflow.graph.edge.base import ContractEdge
+    from langflow.graph.graph.base import Graph
+
+EdgeKey = Tuple[str, str, str, str]
+
+
+def _edge_key(source_id: str, target_id: str, source_handle, target_handle) -> EdgeKey:
+    return (
+        source_id,
+        target_id,
+        json.dumps(source_handle, sort_keys=True),
+        json.dumps(target_handle, sort_keys=True),
+    )
+
+
+def edge_key(edge: "ContractEdge") -> EdgeKey:
+    """Identifies an edge by its vertices and handles, like Edge.__eq__ does."""
+    return _edge_key(edge.source_id, edge.target_id, edge._source_handle, edge._target_handle)
+
+
+def edge_data_key(edge: Dict) -> EdgeKey:
+    """Identifies the data of an edge like `edge_key` identifies the edge created from it."""
+    if data := edge.get("data", {}):
+        return _edge_key(edge["source"], edge["target"], data.get("sourceHandle", {}), data.get("targetHandle", {}))
+    return _edge_key(edge["source"], edge["target"], edge.get("sourceHandle", ""), edge.get("targetHandle", ""))
+
+
+@dataclass
+class GraphDiff:
+    """
+    Vertices and edges that differ between a graph and the data of another version of it.
+
+    The added edges are the data they are created from, the removed ones are the edges of the graph.
+    """
+
+    added_vertices: Set[str] = field(default_factory=set)
+    removed_vertices: Set[str] = field(default_factory=set)
+    changed_vertices: Set[str] = field(default_factory=set)
+    unchanged_vertices: Set[str] = field(default_factory=set)
+    added_edges: List[Dict] = field(default_factory=list)
+    removed_edges: List["ContractEdge"] = field(default_factory=list)
+
+    @classmethod
+    def from_data(cls, graph: "Graph", graph_data: Dict) -> "GraphDiff":
+        """Compares a graph with processed graph data, with ungrouped nodes, like `Graph._graph_data`."""
+        nodes = {node["id"]: node for node in graph_data["nodes"]}
+        vertex_ids = set(graph.vertex_map)
+        diff = cls(added_vertices=nodes.keys() - vertex_ids, removed_vertices=vertex_ids - nodes.keys())
+        for vertex_id in vertex_ids & nodes.keys():
+            if graph.vertex_map[vertex_id].data == nodes[vertex_id]["data"]:
+                diff.unchanged_vertices.add(vertex_id)
+            else:
+                diff.changed_vertices.add(vertex_id)
+
+        edges: Dict[EdgeKey, "ContractEdge"] = {edge_key(edge): edge for edge in graph.edges}
+        other_edges: Dict[EdgeKey, Dict] = {edge_data_key(edge): edge for edge in graph_data["edges"]}
+        diff.added_edges = [edge for key, edge in other_edges.items() if key not in edges]
+        diff.removed_edges = [edge for key, edge in edges.items() if key not in other_edges]
+        return diff
+
+    @classmethod
+    def from_graphs(cls, graph: "Graph", other: "Graph") -> "GraphDiff":
+        return cls.from_data(graph, other._graph_data)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.added_vertices
+            or self.removed_vertices
+            or self.changed_vertices
+            or self.added_edges
+            or self.removed_edges
+        )
+
+    @property
+    def structure_changed(self) -> bool:
+        return bool(self.added_vertices or self.removed_vertices or self.added_edges or self.removed_edges)
+
+    def dirty_vertices(self) -> Set[str]:
+        """Vertices whose own params changed: the changed and added ones, and the targets of added or removed edges."""
+        dirty = self.changed_vertices | self.added_vertices
+        dirty.update(edge["target"] for edge in self.added_edges)
+        dirty.update(edge.target_id for edge in self.removed_edges)
+        return dirty - self.removed_vertices
@@ -0,0 +1,72 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    from langflow.graph.graph.base import Graph
+
+PlanKey = Tuple[str, Optional[str], Optional[str]]
+
+
+def structure_hash(graph: "Graph") -> str:
+    """Hashes what the order of a graph depends on: its vertices, their groups and the connections between them."""
+    digest = hashlib.sha256()
+    for vertex in sorted(graph.vertices, key=lambda vertex: vertex.id):
+        digest.update(f"{vertex.id}\0{vertex.parent_node_id or ''}\0".encode())
+        for predecessor_id in sorted(graph.predecessor_map.get(vertex.id, [])):
+            digest.update(f"{predecessor_id}\1".encode())
+        digest.update(b"\2")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    The order in which the vertices of a graph are built for a start or stop vertex.
+
+    Plans only depend on the structure of the graph, so they are computed once per
+    (structure hash, start vertex, stop vertex) and applied to the graph on every
+    `Graph.sort_vertices` call. A plan is never changed once it is built.
+    """
+
+    key: PlanKey
+    layers: Tuple[Tuple[str, ...], ...]
+    vertices_to_run: FrozenSet[str]
+    run_map: Mapping[str, Tuple[str, ...]]
+    run_predecessors: Mapping[str, Tuple[str, ...]]
+    stop_vertex: Optional[str] = None
+
+    @classmethod
+    def from_layers(cls, key: PlanKey, graph: "Graph", layers: List[List[str]], stop_vertex: Optional[str] = None):
+        run_map: Dict[str, List[str]] = defaultdict(list)
+        for vertex_id, predecessors in graph.predecessor_map.items():
+            for predecessor in predecessors:
+                run_map[predecessor].append(vertex_id)
+        return cls(
+            key=key,
+            layers=tuple(tuple(layer) for layer in layers),
+            vertices_to_run=frozenset(vertex_id for layer in layers for vertex_id in layer),
+            run_map={vertex_id: tuple(successors) for vertex_id, successors in run_map.items()},
+            run_predecessors={
+                vertex_id: tuple(predecessors) for vertex_id, predecessors in graph.predecessor_map.items()
+            },
+            stop_vertex=stop_vertex,
+        )
+
+    def apply(self, graph: "Graph") -> List[str]:
+        """Sets the run state of `graph` from the plan and returns the first layer."""
+        layers = [list(layer) for layer in self.layers]
+        graph._sorted_vertices_layers = layers
+        graph.vertices_layers = layers[1:]
+        graph.vertices_to_run = set(self.vertices_to_run)
+        if self.stop_vertex is not None:
+            graph.stop_vertex = self.stop_vertex
+        # The run manager changes these during a run, so it gets its own copies
+        run_manager = graph.run_manager
+        run_manager.run_map = defaultdict(list, {key: list(value) for key, value in self.run_map.items()})
+        run_manager.run_predecessors = defaultdict(
+            list, {key: list(value) for key, value in self.run_predecessors.items()}
+        )
+        run_manager.vertices_to_run = graph.vertices_to_run
+        return list(layers[0])
@@ -0,0 +1,120 @@
+from typing import Dict, Iterable, Iterator, List, Mapping
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class ReachabilityIndex:
+    """
+    Transitive closure of a graph, stored as one bitset (a Python int) of descendants per vertex.
+
+    It is built in O(V + E) big-int operations: the strongly connected components are found
+    first, so that cycles are handled, and the descendants of each component are the union of
+    the descendants of the components it points to, in reverse topological order. Queries then
+    cost one lookup plus the size of the answer, instead of a walk that revisits shared
+    descendants once per path (exponential on chains of diamonds).
+    """
+
+    def __init__(self, vertex_ids: Iterable[str], successor_map: Mapping[str, Iterable[str]]):
+        self._ids: List[str] = list(dict.fromkeys(vertex_ids))
+        self._index: Dict[str, int] = {vertex_id: index for index, vertex_id in enumerate(self._ids)}
+        successors = [
+            [self._index[target_id] for target_id in successor_map.get(vertex_id, []) if target_id in self._index]
+            for vertex_id in self._ids
+        ]
+        self._descendants = self._transitive_closure(successors)
+        predecessors: List[List[int]] = [[] for _ in self._ids]
+        for source, targets in enumerate(successors):
+            for target in targets:
+                predecessors[target].append(source)
+        self._ancestors = self._transitive_closure(predecessors)
+
+    def __contains__(self, vertex_id: str) -> bool:
+        return vertex_id in self._index
+
+    @staticmethod
+    def _transitive_closure(adjacency: List[List[int]]) -> List[int]:
+        n_vertices = len(adjacency)
+        # Iterative Tarjan. Components are completed in reverse topological order,
+        # so the components a vertex points to always have their closure already
+        index_of = [-1] * n_vertices
+        low_link = [0] * n_vertices
+        on_stack = [False] * n_vertices
+        component_stack: List[int] = []
+        closure = [0] * n_vertices
+        counter = 0
+        for root in range(n_vertices):
+            if index_of[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                vertex, next_edge = work.pop()
+                if next_edge == 0:
+                    index_of[vertex] = low_link[vertex] = counter
+                    counter += 1
+                    component_stack.append(vertex)
+                    on_stack[vertex] = True
+                edges = adjacency[vertex]
+                while next_edge < len(edges):
+                    target = edges[next_edge]
+                    next_edge += 1
+                    if index_of[target] == -1:
+                        work.append((vertex, next_edge))
+                        work.append((target, 0))
+                        break
+                    if on_stack[target]:
+                        low_link[vertex] = min(low_link[vertex], index_of[target])
+                else:
+                    if low_link[vertex] == index_of[vertex]:
+                        component = []
+                        while True:
+                            member = component_stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == vertex:
+                                break
+                        members = 0
+                        for member in component:
+                            members |= 1 << member
+                        reachable = 0
+                        for member in component:
+                            for target in adjacency[member]:
+                                if not members >> target & 1:
+                                    reachable |= (1 << target) | closure[target]
+                        # Vertices of a cycle reach each other and themselves
+                        if len(component) > 1 or vertex in adjacency[vertex]:
+                            reachable |= members
+                        for member in component:
+                            closure[member] = reachable
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[vertex])
+        return closure
+
+    def _ids_of(self, bits: int) -> List[str]:
+        return [self._ids[index] for index in _iter_bits(bits)]
+
+    def _union(self, closures: List[int], vertex_ids: Iterable[str]) -> int:
+        bits = 0
+        for vertex_id in vertex_ids:
+            if (index := self._index.get(vertex_id)) is not None:
+                bits |= closures[index]
+        return bits
+
+    def descendants(self, *vertex_ids: str) -> List[str]:
+        """Every vertex reachable from any of `vertex_ids`, in the order the vertices were given to the index."""
+        return self._ids_of(self._union(self._descendants, vertex_ids))
+
+    def ancestors(self, *vertex_ids: str) -> List[str]:
+        """Every vertex that reaches any of `vertex_ids`."""
+        return self._ids_of(self._union(self._ancestors, vertex_ids))
+
+    def reaches(self, source_id: str, target_id: str) -> bool:
+        source, target = self._index.get(source_id), self._index.get(target_id)
+        if source is None or target is None:
+            return False
+        return bool(self._descendants[source] >> target & 1)
@@ -0,0 +1,45 @@
+import io
+import pickle
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from langflow.graph.graph.base import Graph
+
+
+class _RunStatePickler(pickle.Pickler):
+    # The graph and its vertices are pickled as references, so the state of a vertex
+    # doesn't drag the rest of the graph along with it
+    def __init__(self, file, graph: "Graph"):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.graph = graph
+        self.vertex_ids = {id(vertex): vertex.id for vertex in graph.vertices}
+
+    def persistent_id(self, obj):
+        if obj is self.graph:
+            return ("graph",)
+        if (vertex_id := self.vertex_ids.get(id(obj))) is not None:
+            return ("vertex", vertex_id)
+        return None
+
+
+class _RunStateUnpickler(pickle.Unpickler):
+    def __init__(self, file, graph: "Graph"):
+        super().__init__(file)
+        self.graph = graph
+
+    def persistent_load(self, pid):
+        if pid[0] == "graph":
+            return self.graph
+        return self.graph.get_vertex(pid[1])
+
+
+def dump_run_state(graph: "Graph", state: Any) -> bytes:
+    """Pickles run state of `graph`, storing references to the graph and its vertices by id."""
+    buffer = io.BytesIO()
+    _RunStatePickler(buffer, graph).dump(state)
+    return buffer.getvalue()
+
+
+def load_run_state(graph: "Graph", data: bytes) -> Any:
+    """Unpickles run state dumped by `dump_run_state`, resolving the references in `graph`."""
+    return _RunStateUnpickler(io.BytesIO(data), graph).load()
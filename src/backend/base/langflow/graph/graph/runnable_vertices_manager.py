@@ -70,7 +70,11 @@ class RunnableVerticesManager:
         for vertex_id, predecessors in graph.predecessor_map.items():
             for predecessor in predecessors:
                 self.run_map[predecessor].append(vertex_id)
-        self.run_predecessors = graph.predecessor_map.copy()
+        # Copy the lists too, otherwise removing predecessors during a run
+        # would also remove them from the graph's predecessor_map
+        self.run_predecessors = defaultdict(
+            list, {vertex_id: list(predecessors) for vertex_id, predecessors in graph.predecessor_map.items()}
+        )
         self.vertices_to_run = graph.vertices_to_run
 
     def update_vertex_run_state(self, vertex_id: str, is_runnable: bool):
@@ -117,6 +121,28 @@ class RunnableVerticesManager:
                 await set_cache_coro(data=graph, lock=lock)  # type: ignore
         return next_runnable_vertices
 
+    def mark_vertex_built(self, vertex_id: str) -> List[str]:
+        """
+        Marks a vertex as built and returns the vertices that became runnable because of it.
+
+        Unlike `get_next_runnable_vertices`, a vertex only stops blocking its successors once it
+        has been built, so the returned vertices can be started while other vertices are still running.
+
+        Args:
+            vertex_id (str): The ID of the vertex that finished building.
+
+        Returns:
+            list: A list of IDs of the vertices that are now runnable.
+        """
+        self.remove_from_predecessors(vertex_id)
+        candidates = self.run_map.get(vertex_id, []) + self.find_runnable_predecessors_for_successors(vertex_id)
+        next_runnable_vertices = []
+        for candidate in dict.fromkeys(candidates):  # Keeps the order and avoids duplicates
+            if self.is_vertex_runnable(candidate):
+                self.update_vertex_run_state(candidate, is_runnable=False)
+                next_runnable_vertices.append(candidate)
+        return next_runnable_vertices
+
     def remove_vertex_from_runnables(self, v_id):
         self.update_vertex_run_state(v_id, is_runnable=False)
         self.remove_from_predecessors(v_id)
@@ -18,6 +18,7 @@ class ResultData(BaseModel):
     component_display_name: Optional[str] = None
     component_id: Optional[str] = None
     used_frozen_result: Optional[bool] = False
+    used_memoized_result: Optional[bool] = False
 
     @field_serializer("results")
     def serialize_results(self, value):
@@ -1,5 +1,6 @@
 import ast
 import asyncio
+import copy
 import inspect
 import os
 import traceback
@@ -16,7 +17,14 @@ from langflow.interface.initialize import loading
 from langflow.interface.listing import lazy_load_dict
 from langflow.schema.artifact import ArtifactType
 from langflow.schema.schema import INPUT_FIELD_NAME, OutputLog, build_output_logs
-from langflow.services.deps import get_storage_service
+from langflow.services.cache.result_cache import (
+    MemoizedResult,
+    fingerprint,
+    fingerprint_file,
+    get_vertex_result_cache,
+)
+from langflow.services.cache.utils import CacheMiss
+from langflow.services.deps import get_storage_service, get_variable_service, session_scope
 from langflow.services.monitor.utils import log_transaction
 from langflow.utils.constants import DIRECT_TYPES
 from langflow.utils.schemas import ChatOutputResponse
@@ -71,6 +79,8 @@ class Vertex:
         self.artifacts_type: Dict[str, str] = {}
         self.steps: List[Callable] = [self._build]
         self.steps_ran: List[Callable] = []
+        self.used_memoized_result = False
+        self._result_fingerprint: Optional[str] = None
         self.task_id: Optional[str] = None
         self.is_task = is_task
         self.params = params or {}
@@ -145,11 +155,11 @@ class Vertex:
 
     @property
     def outgoing_edges(self) -> List["ContractEdge"]:
-        return [edge for edge in self.edges if edge.source_id == self.id]
+        return self.graph.get_vertex_edges(self.id, is_target=False)
 
     @property
     def incoming_edges(self) -> List["ContractEdge"]:
-        return [edge for edge in self.edges if edge.target_id == self.id]
+        return self.graph.get_vertex_edges(self.id, is_source=False)
 
     @property
     def edges_source_names(self) -> Set[str | None]:
@@ -180,6 +190,31 @@ class Vertex:
         self._built_object = state.get("_built_object") or UnbuiltObject()
         self._built_result = state.get("_built_result") or UnbuiltResult()
 
+    def get_run_state(self) -> Dict[str, Any]:
+        """Returns the state of the vertex without the graph and the raw data it was created from."""
+        state = self.__getstate__()
+        for key in ("graph", "_data", "data"):
+            state.pop(key, None)
+        return state
+
+    def set_run_state(self, state: Dict[str, Any]):
+        self.__setstate__(state)
+
+    def copy(self, graph: "Graph") -> "Vertex":
+        """Returns a copy of the vertex for `graph`, with its results but not the component that built them."""
+        # Copied attribute by attribute, __setstate__ would reset the results that are falsy
+        vertex = type(self).__new__(type(self))
+        for name, value in vars(self).items():
+            # Containers are copied so building one of the vertices doesn't change the other
+            setattr(vertex, name, copy.copy(value) if isinstance(value, (dict, list, set)) else value)
+        # The steps are methods of this vertex
+        vertex.steps = [getattr(vertex, step.__name__) for step in self.steps]
+        vertex.steps_ran = [getattr(vertex, step.__name__) for step in self.steps_ran]
+        vertex.graph = graph
+        vertex._lock = asyncio.Lock()
+        vertex._custom_component = None
+        return vertex
+
     def set_top_level(self, top_level_vertices: List[str]) -> None:
         self.parent_is_top_level = self.parent_node_id in top_level_vertices
 
@@ -200,6 +235,13 @@ class Vertex:
 
         self.is_input = self.data["node"].get("is_input") or self.is_input
         self.is_output = self.data["node"].get("is_output") or self.is_output
+        # Outputs can override the memoize attribute of their component
+        memoize = self.data["node"].get("memoize", False)
+        self.memoize: bool = (
+            not (self.is_input or self.is_output)
+            and all(memoize if output.get("memoize") is None else output["memoize"] for output in self.outputs)
+            and (memoize or bool(self.outputs))
+        )
         template_dicts = {key: value for key, value in self.data["node"]["template"].items() if isinstance(value, dict)}
 
         self.has_session_id = "session_id" in template_dicts
@@ -461,6 +503,7 @@ class Vertex:
             messages=messages,
             component_display_name=self.display_name,
             component_id=self.id,
+            used_memoized_result=self.used_memoized_result,
         )
         self.set_result(result_dict)
 
@@ -614,6 +657,19 @@ class Vertex:
         """
         if self.base_type is None:
             raise ValueError(f"Base type for vertex {self.display_name} not found")
+        result_cache = get_vertex_result_cache()
+        memoization_key = None
+        if self.memoize and result_cache.enabled:
+            # Reads variables from the database and hashes files, so it runs off the event loop
+            memoization_key = await asyncio.to_thread(self.get_memoization_key, user_id, fallback_to_env_vars)
+        if memoization_key is not None:
+            memoized = await result_cache.get(memoization_key)
+            if not isinstance(memoized, CacheMiss):
+                self.outputs_logs = memoized.outputs_logs
+                self._update_built_object_and_artifacts((None, memoized.built_object, memoized.artifacts))
+                self._result_fingerprint = memoization_key
+                self.used_memoized_result = True
+                return
         try:
             result = await loading.instantiate_class(
                 user_id=user_id,
@@ -626,6 +682,74 @@ class Vertex:
             tb = traceback.format_exc()
             logger.exception(exc)
             raise ComponentBuildException(f"Error building Component {self.display_name}:\n\n{exc}", tb) from exc
+        if memoization_key is not None and isinstance(result, tuple) and len(result) == 3 and self._is_memoizable():
+            await result_cache.set(
+                memoization_key,
+                MemoizedResult(result[1], result[2], self.outputs_logs),
+                persist=not self._has_secret_params(),
+            )
+            self._result_fingerprint = memoization_key
+
+    def get_memoization_key(self, user_id=None, fallback_to_env_vars=False) -> Optional[str]:
+        """
+        Hash of the code, the params and the results of the predecessors of the vertex.
+
+        Fields loaded from the database are hashed with the value of their variable. Returns None
+        when one of them can't be hashed, in which case the result is not memoized.
+        """
+        params: Dict[str, Any] = {}
+        for key, value in self._raw_params.items():
+            if self._is_vertex(value):
+                value = value.get_result_fingerprint()
+            elif isinstance(value, list) and self._is_list_of_vertices(value):
+                value = [vertex.get_result_fingerprint() for vertex in value]
+                if None in value:
+                    return None
+            elif self.data["node"]["template"].get(key, {}).get("type") == "file" and isinstance(value, str):
+                # The same path can point to other content in the next run
+                value = fingerprint_file(value)
+            elif key in self.load_from_db_fields and isinstance(value, str) and value:
+                # The param is the name of the variable, its value can change between runs
+                value = self._get_variable_fingerprint(user_id, key, value, fallback_to_env_vars)
+            if value is None and self._raw_params[key] is not None:
+                return None
+            params[key] = value
+        code = self.data["node"]["template"].get("code", {}).get("value")
+        return fingerprint({"code": code, "params": params, "user_id": str(user_id)})
+
+    @staticmethod
+    def _get_variable_fingerprint(user_id, field: str, name: str, fallback_to_env_vars: bool) -> Optional[str]:
+        """Hash of the value of a variable, or None when the variable can't be read."""
+        value = None
+        if user_id:
+            try:
+                with session_scope() as session:
+                    value = get_variable_service().get_variable(
+                        user_id=user_id, name=name, field=field, session=session
+                    )
+            except Exception as exc:
+                logger.debug(f"Could not read the variable {name} of {field}: {exc}")
+        if value is None and fallback_to_env_vars:
+            value = os.getenv(name)
+        return fingerprint(value) if value is not None else None
+
+    def _has_secret_params(self) -> bool:
+        """Whether the vertex has inputs loaded from variables or password inputs, whose results are not saved to disk."""
+        template = self.data["node"]["template"]
+        return bool(self.load_from_db_fields) or any(
+            isinstance(field, dict) and field.get("password") and field.get("value") for field in template.values()
+        )
+
+    def get_result_fingerprint(self) -> Optional[str]:
+        """Fingerprint of the result of the vertex, used in the memoization keys of its successors."""
+        if self._result_fingerprint is None and self._built:
+            self._result_fingerprint = fingerprint(self.get_built_result())
+        return self._result_fingerprint
+
+    def _is_memoizable(self) -> bool:
+        # Streams can only be consumed once
+        values = self._built_object.values() if isinstance(self._built_object, dict) else [self._built_object]
+        return not any(isinstance(value, (Iterator, AsyncIterator)) for value in values)
 
     def _update_built_object_and_artifacts(self, result):
         """
@@ -664,6 +788,8 @@ class Vertex:
         self._built_result = UnbuiltResult()
         self.artifacts = {}
         self.steps_ran = []
+        self.used_memoized_result = False
+        self._result_fingerprint = None
         self._build_params()
 
     def _is_chat_input(self):
@@ -690,7 +816,7 @@ class Vertex:
                 return
 
             if self.frozen and self._built:
-                return self.get_requester_result(requester)
+                return await self.get_requester_result(requester)
             elif self._built and requester is not None:
                 # This means that the vertex has already been built
                 # and we are just getting the result for the requester
@@ -1,5 +1,6 @@
 import json
-from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Generator, Iterator, List
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Generator, Iterator, List, Optional
 
 import yaml
 from langchain_core.messages import AIMessage, AIMessageChunk
@@ -152,6 +153,7 @@ class ComponentVertex(Vertex):
             messages=messages,
             component_display_name=self.display_name,
             component_id=self.id,
+            used_memoized_result=self.used_memoized_result,
         )
         self.set_result(result_dict)
 
@@ -160,6 +162,8 @@ class InterfaceVertex(ComponentVertex):
     def __init__(self, data: Dict, graph):
         super().__init__(data, graph=graph)
         self.steps = [self._build, self._run]
+        # Token counts and rates of the last stream
+        self.stream_metrics: Optional[Dict[str, Any]] = None
 
     def build_stream_url(self):
         return f"/api/v1/build/{self.graph.flow_id}/{self.id}/stream"
@@ -319,22 +323,41 @@ class InterfaceVertex(ComponentVertex):
 
     async def stream(self):
         iterator = self.params.get(INPUT_FIELD_NAME, None)
+        if isinstance(iterator, Message):
+            # Model components return a Message with the stream as its text
+            iterator = iterator.text
         if not isinstance(iterator, (AsyncIterator, Iterator)):
             raise ValueError("The message must be an iterator or an async iterator.")
         is_async = isinstance(iterator, AsyncIterator)
-        complete_message = ""
+        # Chunks are joined once at the end, concatenating each one is quadratic for long generations
+        chunks: List[str] = []
+        start_time = time.perf_counter()
+        first_chunk_time = None
         if is_async:
             async for message in iterator:
                 message = message.content if hasattr(message, "content") else message
                 message = message.text if hasattr(message, "text") else message
+                if first_chunk_time is None:
+                    first_chunk_time = time.perf_counter()
                 yield message
-                complete_message += message
+                chunks.append(message)
         else:
             for message in iterator:
                 message = message.content if hasattr(message, "content") else message
                 message = message.text if hasattr(message, "text") else message
+                if first_chunk_time is None:
+                    first_chunk_time = time.perf_counter()
                 yield message
-                complete_message += message
+                chunks.append(message)
+        complete_message = "".join(chunks)
+        elapsed_time = time.perf_counter() - start_time
+        self.stream_metrics = {
+            "tokens": len(chunks),
+            "characters": len(complete_message),
+            "seconds": round(elapsed_time, 4),
+            "time_to_first_token": round(first_chunk_time - start_time, 4) if first_chunk_time else None,
+            "tokens_per_second": round(len(chunks) / elapsed_time, 2) if elapsed_time else None,
+        }
         self.artifacts = ChatOutputResponse(
             message=complete_message,
             sender=self.params.get("sender", ""),
@@ -18,6 +18,7 @@ from langflow.base.constants import FIELD_FORMAT_ATTRIBUTES, NODE_FORMAT_ATTRIBU
 from langflow.graph.graph.base import Graph
 from langflow.services.auth.utils import create_super_user
 from langflow.services.database.models.flow.model import Flow, FlowCreate
+from langflow.services.database.models.flow.utils import validate_is_component
 from langflow.services.database.models.folder.model import Folder, FolderCreate
 from langflow.services.database.models.folder.utils import create_default_folder_if_it_doesnt_exist
 from langflow.services.database.models.user.crud import get_user_by_username
@@ -513,6 +514,7 @@ def load_flows_from_directory():
                         if hasattr(existing, key):
                             # flow dict from json and db representation are not 100% the same
                             setattr(existing, key, value)
+                    validate_is_component([existing])
                     existing.updated_at = datetime.utcnow()
                     existing.user_id = user_id
                     session.add(existing)
@@ -521,6 +523,7 @@ def load_flows_from_directory():
                     logger.info(f"Creating new flow: {flow_id} with endpoint name {flow_endpoint_name}")
                     flow["user_id"] = user_id
                     flow = Flow.model_validate(flow, from_attributes=True)
+                    validate_is_component([flow])
                     flow.updated_at = datetime.utcnow()
                     session.add(flow)
                 session.commit()
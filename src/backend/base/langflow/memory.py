@@ -30,33 +30,30 @@ def get_messages(
         List[Data]: A list of Data objects representing the retrieved messages.
     """
     monitor_service = get_monitor_service()
-    messages_df = monitor_service.get_messages(
+    records = monitor_service.get_messages(
         sender=sender,
         sender_name=sender_name,
         session_id=session_id,
         order_by=order_by,
         limit=limit,
         order=order,
+        buffered=True,
     )
 
-    messages: list[Message] = []
-    # messages_df has a timestamp
-    # it gets the last 5 messages, for example
-    # but now they are ordered from most recent to least recent
-    # so we need to reverse the order
-    messages_df = messages_df[::-1] if order == "DESC" else messages_df
-    for row in messages_df.itertuples():
-        msg = Message(
-            text=row.text,
-            sender=row.sender,
-            session_id=row.session_id,
-            sender_name=row.sender_name,
-            timestamp=row.timestamp,
+    # With DESC the query gets the most recent messages first (e.g. the last 5),
+    # they are returned from the oldest to the most recent
+    if order == "DESC":
+        records = records[::-1]
+    return [
+        Message(
+            text=record["text"],
+            sender=record["sender"],
+            session_id=record["session_id"],
+            sender_name=record["sender_name"],
+            timestamp=record["timestamp"],
         )
-
-        messages.append(msg)
-
-    return messages
+        for record in records
+    ]
 
 
 def add_messages(messages: Message | list[Message], flow_id: Optional[str] = None):
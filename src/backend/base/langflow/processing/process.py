@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Union
 
 from langflow.graph.graph.base import Graph
 from langflow.graph.schema import RunOutputs
@@ -18,20 +18,8 @@ class Result(BaseModel):
     session_id: str
 
 
-async def run_graph_internal(
-    graph: "Graph",
-    flow_id: str,
-    stream: bool = False,
-    session_id: Optional[str] = None,
-    inputs: Optional[List["InputValueRequest"]] = None,
-    outputs: Optional[List[str]] = None,
-) -> tuple[List[RunOutputs], str]:
-    """Run the graph and generate the result"""
-    inputs = inputs or []
-    if session_id is None:
-        session_id_str = flow_id
-    else:
-        session_id_str = session_id
+def prepare_run_inputs(inputs: List["InputValueRequest"]) -> tuple[list[dict], list[list[str]], list]:
+    """Splits input value requests into the inputs, components and types `Graph.arun` takes."""
     components = []
     inputs_list = []
     types = []
@@ -42,6 +30,28 @@ async def run_graph_internal(
         components.append(input_value_request.components or [])
         inputs_list.append({INPUT_FIELD_NAME: input_value_request.input_value})
         types.append(input_value_request.type)
+    return inputs_list, components, types
+
+
+async def run_graph_internal(
+    graph: "Graph",
+    flow_id: str,
+    stream: bool = False,
+    session_id: Optional[str] = None,
+    inputs: Optional[List["InputValueRequest"]] = None,
+    outputs: Optional[List[str]] = None,
+    max_concurrency: int = 1,
+) -> tuple[List[RunOutputs], Optional[str]]:
+    """Run the graph and generate the result"""
+    inputs = inputs or []
+    if session_id is not None:
+        session_id_str = session_id
+    elif max_concurrency > 1 and len(inputs) > 1:
+        # Inputs that run at the same time get a session each
+        session_id_str = None
+    else:
+        session_id_str = flow_id
+    inputs_list, components, types = prepare_run_inputs(inputs)
 
     fallback_to_env_vars = get_settings_service().settings.fallback_to_env_var
 
@@ -51,12 +61,35 @@ async def run_graph_internal(
         types=types,
         outputs=outputs or [],
         stream=stream,
-        session_id=session_id_str or "",
+        session_id=session_id_str,
         fallback_to_env_vars=fallback_to_env_vars,
+        max_concurrency=max_concurrency,
     )
     return run_outputs, session_id_str
 
 
+async def stream_graph_runs(
+    graph: "Graph",
+    flow_id: str,
+    session_id: Optional[str] = None,
+    inputs: Optional[List["InputValueRequest"]] = None,
+    outputs: Optional[List[str]] = None,
+    max_concurrency: int = 1,
+) -> AsyncIterator[tuple[int, RunOutputs]]:
+    """Run the graph once per input and yield the index and outputs of each input as its run finishes"""
+    inputs_list, components, types = prepare_run_inputs(inputs or [])
+    async for index, run_outputs in graph.arun_batch(
+        inputs=inputs_list,
+        inputs_components=components,
+        types=types,
+        outputs=outputs or [],
+        session_id=session_id,
+        fallback_to_env_vars=get_settings_service().settings.fallback_to_env_var,
+        max_concurrency=max_concurrency,
+    ):
+        yield index, run_outputs
+
+
 def run_graph(
     graph: "Graph",
     input_value: str,
@@ -1,6 +1,6 @@
 import warnings
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Coroutine, Optional, Union
+from typing import Annotated, Coroutine, Optional
 from uuid import UUID
 
 from cryptography.fernet import Fernet
@@ -11,8 +11,7 @@ from loguru import logger
 from sqlmodel import Session
 from starlette.websockets import WebSocket
 
-from langflow.services.database.models.api_key.crud import check_key
-from langflow.services.database.models.api_key.model import ApiKey
+from langflow.services.database.models.api_key.crud import verify_api_key
 from langflow.services.database.models.user.crud import get_user_by_id, get_user_by_username, update_user_last_login_at
 from langflow.services.database.models.user.model import User
 from langflow.services.deps import get_session, get_settings_service
@@ -32,7 +31,7 @@ async def api_key_security(
     db: Session = Depends(get_session),
 ) -> Optional[User]:
     settings_service = get_settings_service()
-    result: Optional[Union[ApiKey, User]] = None
+    result: Optional[User] = None
     if settings_service.auth_settings.AUTO_LOGIN:
         # Get the first user
         if not settings_service.auth_settings.SUPERUSER:
@@ -50,20 +49,17 @@ async def api_key_security(
         )
 
     elif query_param:
-        result = check_key(db, query_param)
+        result = verify_api_key(db, query_param)
 
     else:
-        result = check_key(db, header_param)
+        result = verify_api_key(db, header_param)
 
     if not result:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid or missing API key",
         )
-    if isinstance(result, ApiKey):
-        return result.user
-    elif isinstance(result, User):
-        return result
+    return result
 
 
 async def get_current_user(
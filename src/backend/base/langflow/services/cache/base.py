@@ -169,3 +169,15 @@ class AsyncBaseCacheService(Service, Generic[AsyncLockType]):
         Returns:
             True if the key is in the cache, False otherwise.
         """
+
+    async def contains(self, key) -> bool:
+        """
+        Check if the key is in the cache, for caches that have to wait for a server to answer.
+
+        Args:
+            key: The key of the item to check.
+
+        Returns:
+            True if the key is in the cache, False otherwise.
+        """
+        return key in self
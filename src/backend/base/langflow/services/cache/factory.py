@@ -24,6 +24,8 @@ class CacheServiceFactory(ServiceFactory):
                 db=settings_service.settings.redis_db,
                 url=settings_service.settings.redis_url,
                 expiration_time=settings_service.settings.redis_cache_expire,
+                max_connections=settings_service.settings.redis_max_connections,
+                compression=settings_service.settings.redis_cache_compression,
             )
             if redis_cache.is_connected():
                 logger.debug("Redis cache is connected")
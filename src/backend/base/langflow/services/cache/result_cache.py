@@ -0,0 +1,155 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+from uuid import UUID
+
+from cachetools import TTLCache
+from loguru import logger
+from pydantic import BaseModel
+
+from langflow.services.cache.serialization import PickleSerializer
+from langflow.services.cache.utils import CacheMiss
+
+# Fields that change on every run without changing what a value means
+VOLATILE_FIELDS = {"timestamp"}
+
+
+def _drop_volatile_fields(values: dict) -> dict:
+    values = {key: value for key, value in values.items() if key not in VOLATILE_FIELDS}
+    # Data and Message keep their fields in `data` too
+    if isinstance(values.get("data"), dict):
+        values["data"] = _drop_volatile_fields(values["data"])
+    return values
+
+
+def _default(value: Any):
+    if isinstance(value, BaseModel):
+        return _drop_volatile_fields(value.model_dump())
+    if hasattr(value, "dict") and hasattr(value, "__fields__"):
+        # langchain objects are still pydantic v1 models
+        return value.dict()
+    if isinstance(value, (UUID, datetime.datetime, datetime.date, Path)):
+        return str(value)
+    if isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    raise TypeError(f"Can't fingerprint a value of type {type(value).__name__}")
+
+
+def fingerprint(value: Any) -> Optional[str]:
+    """Hash of a value, stable across runs and processes. None when the value can't be hashed."""
+    try:
+        data = json.dumps(value, sort_keys=True, default=_default)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def fingerprint_file(file_path: str) -> Optional[str]:
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class MemoizedResult(NamedTuple):
+    built_object: Any
+    artifacts: Any
+    outputs_logs: dict
+
+
+class VertexResultCache:
+    """
+    Results of memoized vertices, keyed by the hash of their code, params and upstream results.
+
+    Results are kept in memory for `ttl` seconds, up to `maxsize` of them. When `cache_dir`
+    is set the results that can be pickled are also written there, so other workers and
+    later processes can read them. The files are not encrypted, so results of vertices with
+    secret inputs are only kept in memory.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: int = 3600, cache_dir: Optional[str] = None):
+        self.ttl = ttl
+        self.enabled = maxsize > 0 and ttl > 0
+        self._results: TTLCache = TTLCache(maxsize=max(maxsize, 1), ttl=max(ttl, 1))
+        self._lock = threading.Lock()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._serializer = PickleSerializer()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"  # type: ignore
+
+    def _read(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return CacheMiss()
+            return self._serializer.loads(path.read_bytes())
+        except FileNotFoundError:
+            return CacheMiss()
+        except Exception as exc:
+            logger.debug(f"Ignoring unreadable vertex result {path}: {exc}")
+            return CacheMiss()
+
+    def _write(self, key: str, result: MemoizedResult) -> None:
+        path = self._path(key)
+        try:
+            data = self._serializer.dumps(result)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("wb", dir=path.parent, delete=False) as file:
+                file.write(data)
+            os.replace(file.name, path)
+        except (TypeError, OSError) as exc:
+            logger.debug(f"Vertex result {key} is only cached in memory: {exc}")
+
+    async def get(self, key: str) -> Any:
+        """Returns the MemoizedResult of `key`, or a CacheMiss."""
+        with self._lock:
+            result = self._results.get(key, CacheMiss())
+        if isinstance(result, CacheMiss) and self.cache_dir is not None:
+            result = await asyncio.to_thread(self._read, key)
+            if not isinstance(result, CacheMiss):
+                with self._lock:
+                    self._results[key] = result
+        return result
+
+    async def set(self, key: str, result: MemoizedResult, persist: bool = True) -> None:
+        """Stores the result of `key`, also on disk unless `persist` is False."""
+        with self._lock:
+            self._results[key] = result
+        if self.cache_dir is not None and persist:
+            await asyncio.to_thread(self._write, key, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+
+_vertex_result_cache: Optional[VertexResultCache] = None
+
+
+def get_vertex_result_cache() -> VertexResultCache:
+    global _vertex_result_cache
+    if _vertex_result_cache is None:
+        from langflow.services.deps import get_settings_service
+
+        settings = get_settings_service().settings
+        _vertex_result_cache = VertexResultCache(
+            maxsize=settings.vertex_result_cache_size,
+            ttl=settings.vertex_result_cache_ttl,
+            cache_dir=settings.vertex_result_cache_dir,
+        )
+    return _vertex_result_cache
@@ -0,0 +1,86 @@
+import pickle
+from typing import Any, Optional, Protocol
+
+COMPRESSIONS = ("zstd", "lz4")
+
+# The first byte of an encoded value says how it was compressed, so values can be read
+# by workers configured with another compression
+_RAW = b"\x00"
+_ZSTD = b"\x01"
+_LZ4 = b"\x02"
+
+
+class Serializer(Protocol):
+    def dumps(self, value: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class PickleSerializer:
+    """Default serializer. Only use it with a cache that is not shared with untrusted clients."""
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (TypeError, AttributeError, pickle.PicklingError) as exc:
+            raise TypeError(f"Value of type {type(value).__name__} can't be pickled: {exc}") from exc
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+def _import_compression(compression: str):
+    try:
+        if compression == "zstd":
+            import zstandard
+
+            return zstandard
+        import lz4.frame
+
+        return lz4.frame
+    except ImportError as exc:
+        package = "zstandard" if compression == "zstd" else "lz4"
+        raise ImportError(f"{compression} compression requires the {package} package: pip install {package}") from exc
+
+
+class ValueCodec:
+    """
+    Serializes cache values and compresses the ones of at least `min_compress_size` bytes.
+
+    Args:
+        serializer: Object with `dumps` and `loads` methods. Defaults to pickle.
+        compression: 'zstd', 'lz4' or None.
+        min_compress_size: Smaller values are stored uncompressed.
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[Serializer] = None,
+        compression: Optional[str] = None,
+        min_compress_size: int = 1024,
+    ):
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Invalid compression: {compression}. Expected one of {COMPRESSIONS}")
+        self.serializer = serializer or PickleSerializer()
+        self.compression = compression
+        self.min_compress_size = min_compress_size
+        if compression is not None:
+            _import_compression(compression)
+
+    def encode(self, value: Any) -> bytes:
+        data = self.serializer.dumps(value)
+        if self.compression is None or len(data) < self.min_compress_size:
+            return _RAW + data
+        if self.compression == "zstd":
+            return _ZSTD + _import_compression("zstd").ZstdCompressor().compress(data)
+        return _LZ4 + _import_compression("lz4").compress(data)
+
+    def decode(self, data: bytes) -> Any:
+        tag, payload = data[:1], data[1:]
+        if tag == _ZSTD:
+            payload = _import_compression("zstd").ZstdDecompressor().decompress(payload)
+        elif tag == _LZ4:
+            payload = _import_compression("lz4").decompress(payload)
+        elif tag != _RAW:
+            raise ValueError(f"Unknown cache value encoding: {tag!r}")
+        return self.serializer.loads(payload)
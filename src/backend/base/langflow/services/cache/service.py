@@ -8,6 +8,7 @@ from typing import Generic, Optional
 from loguru import logger
 
 from langflow.services.cache.base import AsyncBaseCacheService, AsyncLockType, CacheService, LockType
+from langflow.services.cache.serialization import Serializer, ValueCodec
 from langflow.services.cache.utils import CacheMiss
 
 CACHE_MISS = CacheMiss()
@@ -156,6 +157,11 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         with lock or self._lock:
             self._cache.clear()
 
+    def keys(self) -> list:
+        """Return the keys in the cache, from the least to the most recently used."""
+        with self._lock:
+            return list(self._cache)
+
     def __contains__(self, key):
         """Check if the key is in the cache."""
         return key in self._cache
@@ -181,30 +187,51 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         return f"InMemoryCache(max_size={self.max_size}, expiration_time={self.expiration_time})"
 
 
-class RedisCache(CacheService, Generic[LockType]):
+# Every value is a Redis hash so dicts can be merged on the server by `upsert`.
+# A dict has one field per item, other values are stored whole in a single field.
+_VALUE_FIELD = b"\x00"
+_DICT_FIELD = b"\x01"
+_STR_KEY_PREFIX = b"s"
+_OTHER_KEY_PREFIX = b"o"
+
+
+class RedisCache(AsyncBaseCacheService, Generic[AsyncLockType]):
     """
-    A Redis-based cache implementation.
+    A Redis-based cache implementation using the asyncio client.
 
-    This cache supports setting an expiration time for cached items.
+    Connections come from a pool shared by all the calls and multi-command operations are
+    sent in a single pipeline. Dicts are stored as hashes so `upsert` merges them on the
+    server, which lets several workers update the same key without losing each other's items.
 
     Attributes:
         expiration_time (int, optional): Time in seconds after which a cached item expires. Default is 1 hour.
 
     Example:
 
-        cache = RedisCache(expiration_time=5)
+        cache = RedisCache(expiration_time=5, compression="zstd")
 
         # setting cache values
-        cache.set("a", 1)
-        cache.set("b", 2)
-        cache["c"] = 3
+        await cache.set("a", 1)
+        await cache.upsert("b", {"x": 1})
 
         # getting cache values
-        a = cache.get("a")
-        b = cache["b"]
+        a = await cache.get("a")
+        b = await cache["b"]
     """
 
-    def __init__(self, host="localhost", port=6379, db=0, url=None, expiration_time=60 * 60):
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        url=None,
+        expiration_time=60 * 60,
+        max_connections: Optional[int] = None,
+        compression: Optional[str] = None,
+        serializer: Optional[Serializer] = None,
+        client=None,
+        sync_client=None,
+    ):
         """
         Initialize a new RedisCache instance.
 
@@ -212,24 +239,31 @@ class RedisCache(CacheService, Generic[LockType]):
             host (str, optional): Redis host.
             port (int, optional): Redis port.
             db (int, optional): Redis DB.
+            url (str, optional): Redis URL. Takes precedence over host, port and db.
             expiration_time (int, optional): Time in seconds after which a
-            ached item expires. Default is 1 hour.
+            cached item expires. Default is 1 hour.
+            max_connections (int, optional): Maximum number of connections in the pool.
+            compression (str, optional): 'zstd' or 'lz4' to compress large values.
+            serializer (Serializer, optional): Serializer of the values. Defaults to pickle.
+            client (redis.asyncio.Redis, optional): Client to use instead of creating one.
+            sync_client (redis.Redis, optional): Sync client to use instead of creating one.
         """
         try:
             import redis
+            from redis import asyncio as aioredis
         except ImportError as exc:
             raise ImportError(
                 "RedisCache requires the redis-py package."
                 " Please install Langflow with the deploy extra: pip install langflow[deploy]"
             ) from exc
-        logger.warning(
-            "RedisCache is an experimental feature and may not work as expected."
-            " Please report any issues to our GitHub repository."
-        )
         if url:
-            self._client = redis.StrictRedis.from_url(url)
+            self._client = client or aioredis.Redis.from_url(url, max_connections=max_connections)
+            # Used by the sync parts of the interface: `in` and the connection check
+            self._sync_client = sync_client or redis.Redis.from_url(url)
         else:
-            self._client = redis.StrictRedis(host=host, port=port, db=db)
+            self._client = client or aioredis.Redis(host=host, port=port, db=db, max_connections=max_connections)
+            self._sync_client = sync_client or redis.Redis(host=host, port=port, db=db)
+        self.codec = ValueCodec(serializer=serializer, compression=compression)
         self.expiration_time = expiration_time
 
     # check connection
@@ -240,12 +274,34 @@ class RedisCache(CacheService, Generic[LockType]):
         import redis
 
         try:
-            self._client.ping()
+            self._sync_client.ping()
             return True
         except redis.exceptions.ConnectionError as exc:
             logger.error(f"RedisCache could not connect to the Redis server: {exc}")
             return False
 
+    def _encode_field(self, key) -> bytes:
+        if isinstance(key, str):
+            return _STR_KEY_PREFIX + key.encode("utf-8")
+        return _OTHER_KEY_PREFIX + self.codec.serializer.dumps(key)
+
+    def _decode_field(self, field: bytes):
+        if field[:1] == _STR_KEY_PREFIX:
+            return field[1:].decode("utf-8")
+        return self.codec.serializer.loads(field[1:])
+
+    def _encode_dict(self, value: dict) -> dict:
+        fields = {self._encode_field(key): self.codec.encode(item) for key, item in value.items()}
+        fields[_DICT_FIELD] = b""
+        return fields
+
+    def _decode(self, fields: dict):
+        if _VALUE_FIELD in fields:
+            return self.codec.decode(fields[_VALUE_FIELD])
+        return {
+            self._decode_field(field): self.codec.decode(data) for field, data in fields.items() if field != _DICT_FIELD
+        }
+
     async def get(self, key, lock=None):
         """
         Retrieve an item from the cache.
@@ -254,12 +310,12 @@ class RedisCache(CacheService, Generic[LockType]):
             key: The key of the item to retrieve.
 
         Returns:
-            The value associated with the key, or None if the key is not found.
+            The value associated with the key, or CACHE_MISS if the key is not found.
         """
         if key is None:
-            return None
-        value = self._client.get(str(key))
-        return pickle.loads(value) if value else None
+            return CACHE_MISS
+        fields = await self._client.hgetall(str(key))
+        return self._decode(fields) if fields else CACHE_MISS
 
     async def set(self, key, value, lock=None):
         """
@@ -269,13 +325,13 @@ class RedisCache(CacheService, Generic[LockType]):
             key: The key of the item.
             value: The value to cache.
         """
-        try:
-            if pickled := pickle.dumps(value):
-                result = self._client.setex(str(key), self.expiration_time, pickled)
-                if not result:
-                    raise ValueError("RedisCache could not set the value.")
-        except TypeError as exc:
-            raise TypeError("RedisCache only accepts values that can be pickled. ") from exc
+        key = str(key)
+        fields = self._encode_dict(value) if isinstance(value, dict) else {_VALUE_FIELD: self.codec.encode(value)}
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.expiration_time)
+            await pipe.execute()
 
     async def upsert(self, key, value, lock=None):
         """
@@ -288,12 +344,16 @@ class RedisCache(CacheService, Generic[LockType]):
         """
         if key is None:
             return
-        existing_value = await self.get(key)
-        if existing_value is not None and isinstance(existing_value, dict) and isinstance(value, dict):
-            existing_value.update(value)
-            value = existing_value
-
-        await self.set(key, value)
+        if not isinstance(value, dict):
+            await self.set(key, value)
+            return
+        key = str(key)
+        async with self._client.pipeline(transaction=True) as pipe:
+            # A value that isn't a dict is replaced, a dict gets the new items
+            pipe.hdel(key, _VALUE_FIELD)
+            pipe.hset(key, mapping=self._encode_dict(value))
+            pipe.expire(key, self.expiration_time)
+            await pipe.execute()
 
     async def delete(self, key, lock=None):
         """
@@ -302,33 +362,44 @@ class RedisCache(CacheService, Generic[LockType]):
         Args:
             key: The key of the item to remove.
         """
-        self._client.delete(key)
+        await self._client.delete(str(key))
 
     async def clear(self, lock=None):
         """
         Clear all items from the cache.
         """
-        self._client.flushdb()
+        await self._client.flushdb()
+
+    async def contains(self, key) -> bool:
+        """Check if the key is in the cache without blocking the event loop."""
+        return False if key is None else bool(await self._client.exists(str(key)))
 
     def __contains__(self, key):
-        """Check if the key is in the cache."""
-        return False if key is None else self._client.exists(str(key))
+        """Check if the key is in the cache. This blocks until Redis answers, async code should use `contains`."""
+        return False if key is None else bool(self._sync_client.exists(str(key)))
 
     async def __getitem__(self, key):
         """Retrieve an item from the cache using the square bracket notation."""
-        return self.get(key)
+        return await self.get(key)
 
     async def __setitem__(self, key, value):
         """Add an item to the cache using the square bracket notation."""
-        self.set(key, value)
+        await self.set(key, value)
 
     async def __delitem__(self, key):
         """Remove an item from the cache using the square bracket notation."""
-        self.delete(key)
+        await self.delete(key)
+
+    def teardown(self):
+        self._sync_client.close()
+        try:
+            asyncio.get_running_loop().create_task(self._client.aclose())
+        except RuntimeError:
+            pass
 
     def __repr__(self):
         """Return a string representation of the RedisCache instance."""
-        return f"RedisCache(expiration_time={self.expiration_time})"
+        return f"RedisCache(expiration_time={self.expiration_time}, compression={self.codec.compression})"
 
 
 class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
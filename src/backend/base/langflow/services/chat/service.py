@@ -1,10 +1,18 @@
 import asyncio
 from collections import defaultdict
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
 
 from langflow.services.base import Service
+from langflow.services.cache.service import RedisCache
 from langflow.services.deps import get_cache_service
 
+if TYPE_CHECKING:
+    from langflow.graph.graph.base import Graph
+    from langflow.graph.vertex.base import Vertex
+
+# What a frozen vertex takes from the last build of the vertex
+VERTEX_RESULT_ATTRIBUTES = ("_built", "result", "results", "artifacts", "_built_object", "_custom_component")
+
 
 class ChatService(Service):
     name = "chat_service"
@@ -13,6 +21,12 @@ class ChatService(Service):
         self._cache_locks = defaultdict(asyncio.Lock)
         self.cache_service = get_cache_service()
 
+    @property
+    def saves_run_state(self) -> bool:
+        # In-memory caches keep the graph object itself, so it doesn't need to be saved again after
+        # each step. Caches that serialize it get the changes of each step as separate entries instead.
+        return isinstance(self.cache_service, RedisCache)
+
     async def set_cache(self, key: str, data: Any, lock: Optional[asyncio.Lock] = None) -> bool:
         """
         Set the cache for a client.
@@ -24,7 +38,7 @@ class ChatService(Service):
             "type": type(data),
         }
         await self.cache_service.upsert(str(key), result_dict, lock=lock or self._cache_locks[key])
-        return key in self.cache_service
+        return await self.cache_service.contains(key)
 
     async def get_cache(self, key: str, lock: Optional[asyncio.Lock] = None) -> Any:
         """
@@ -37,3 +51,72 @@ class ChatService(Service):
         Clear the cache for a client.
         """
         await self.cache_service.delete(key, lock=lock or self._cache_locks[key])
+        if self.saves_run_state:
+            await self.cache_service.delete(self._run_state_key(key))
+
+    @staticmethod
+    def _run_state_key(key: str) -> str:
+        return f"{key}:run_state"
+
+    async def set_graph(self, key: str, graph: "Graph", lock: Optional[asyncio.Lock] = None):
+        """
+        Cache a graph at the start of a build. The changes made while building it are saved with
+        `set_graph_run_state`.
+        """
+        await self.set_cache(key, graph, lock=lock)
+        if self.saves_run_state:
+            await self.cache_service.delete(self._run_state_key(key))
+
+    async def set_graph_run_state(
+        self, key: str, graph: "Graph", vertex_ids: Iterable[str], lock: Optional[asyncio.Lock] = None
+    ):
+        """
+        Save the state of the given vertices and the run state of a graph cached with `set_graph`.
+        """
+        if not self.saves_run_state or not await self.cache_service.contains(key):
+            await self.set_graph(key, graph, lock=lock)
+            return
+        await self.cache_service.upsert(self._run_state_key(key), graph.dump_run_state(vertex_ids))
+
+    async def get_graph(self, key: str, lock: Optional[asyncio.Lock] = None) -> Optional["Graph"]:
+        """
+        Get a graph cached with `set_graph` with the changes saved by `set_graph_run_state`.
+        """
+        cache = await self.get_cache(key, lock=lock)
+        if not cache:
+            return None
+        graph = cache.get("result")
+        if self.saves_run_state and (run_state := await self.cache_service.get(self._run_state_key(key))):
+            graph.load_run_state(run_state)
+        return graph
+
+    async def set_vertex_result(self, key: str, vertex: "Vertex", lock: Optional[asyncio.Lock] = None):
+        """
+        Cache the result of a vertex, so it can be reused once the vertex is frozen.
+
+        Only the result is cached, not the vertex: the vertex references the graph, so pickling it
+        pickles the whole graph. References to the graph and its vertices are stored by id.
+        """
+        result: Any = {attribute: getattr(vertex, attribute) for attribute in VERTEX_RESULT_ATTRIBUTES}
+        if self.saves_run_state:
+            from langflow.graph.graph.run_state import dump_run_state
+
+            result = dump_run_state(vertex.graph, result)
+        await self.set_cache(key, result, lock=lock)
+
+    async def get_vertex_result(
+        self, key: str, graph: "Graph", lock: Optional[asyncio.Lock] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a result cached with `set_vertex_result`, resolving its references in `graph`.
+        """
+        cache = await self.get_cache(key, lock=lock)
+        if not isinstance(cache, dict):
+            return None
+        result = cache.get("result")
+        if isinstance(result, bytes):
+            from langflow.graph.graph.run_state import load_run_state
+
+            result = load_run_state(graph, result)
+        # Entries cached by older versions hold the whole vertex
+        return result if isinstance(result, dict) else None
@@ -0,0 +1,159 @@
+import atexit
+import datetime
+import hashlib
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from cachetools import TTLCache
+from loguru import logger
+from sqlalchemy import Engine, bindparam, update
+
+from langflow.services.database.models.api_key.model import ApiKey
+
+
+class VerifiedApiKey(NamedTuple):
+    api_key_id: UUID
+    user_id: UUID
+
+
+def hash_api_key(api_key: str) -> str:
+    # Only a digest of the key is kept in memory
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class ApiKeyCache:
+    """
+    Remembers the API keys verified in the last `ttl` seconds. A `ttl` of 0 disables the cache.
+
+    Deleting a key only drops it from the cache of the current process, other workers
+    keep accepting it until it expires from theirs.
+    """
+
+    def __init__(self, ttl: int = 60, maxsize: int = 10_000):
+        self.enabled = ttl > 0
+        self._keys: TTLCache = TTLCache(maxsize=maxsize, ttl=max(ttl, 1))
+        self._lock = threading.Lock()
+
+    def get(self, api_key: str) -> Optional[VerifiedApiKey]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._keys.get(hash_api_key(api_key))
+
+    def set(self, api_key: str, verified: VerifiedApiKey) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._keys[hash_api_key(api_key)] = verified
+
+    def invalidate(self, api_key_id: UUID) -> None:
+        with self._lock:
+            for key_hash, verified in list(self._keys.items()):
+                if verified.api_key_id == api_key_id:
+                    del self._keys[key_hash]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+
+class ApiKeyUsage:
+    """
+    Counts the uses of API keys in memory and writes them every `flush_interval` seconds.
+
+    All the keys used since the last write are updated with a single UPDATE statement,
+    executed from a background thread instead of a new thread per request.
+    """
+
+    def __init__(self, flush_interval: float = 5.0):
+        self.flush_interval = flush_interval
+        self._pending: Dict[UUID, Tuple[int, datetime.datetime]] = {}
+        self._engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="api-key-usage", daemon=True)
+        self._thread.start()
+        # Uses counted by scripts that never tear down the services are written on exit
+        atexit.register(self.stop)
+
+    def record(self, engine: Engine, api_key_id: UUID) -> None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        with self._lock:
+            self._engine = engine
+            uses, _ = self._pending.get(api_key_id, (0, now))
+            self._pending[api_key_id] = (uses + 1, now)
+            if not self.running:
+                self.start()
+
+    def flush(self) -> int:
+        """Writes the pending uses and returns the number of keys updated."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                engine = self._engine
+            if not pending or engine is None:
+                return 0
+            table = ApiKey.__table__  # type: ignore
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("key_id"))
+                .values(total_uses=table.c.total_uses + bindparam("uses"), last_used_at=bindparam("used_at"))
+            )
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        statement,
+                        [
+                            {"key_id": api_key_id, "uses": uses, "used_at": used_at}
+                            for api_key_id, (uses, used_at) in pending.items()
+                        ],
+                    )
+            except Exception as exc:
+                logger.error(f"Error updating API key usage: {exc}")
+                return 0
+            return len(pending)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+_api_key_cache: Optional[ApiKeyCache] = None
+_api_key_usage: Optional[ApiKeyUsage] = None
+
+
+def get_api_key_cache() -> ApiKeyCache:
+    global _api_key_cache
+    if _api_key_cache is None:
+        from langflow.services.deps import get_settings_service
+
+        _api_key_cache = ApiKeyCache(ttl=get_settings_service().settings.api_key_cache_ttl)
+    return _api_key_cache
+
+
+def get_api_key_usage() -> ApiKeyUsage:
+    global _api_key_usage
+    if _api_key_usage is None:
+        from langflow.services.deps import get_settings_service
+
+        _api_key_usage = ApiKeyUsage(flush_interval=get_settings_service().settings.api_key_usage_flush_interval)
+    return _api_key_usage
@@ -1,6 +1,5 @@
 import datetime
 import secrets
-import threading
 from typing import List, Optional
 from uuid import UUID
 
@@ -8,6 +7,8 @@ from sqlmodel import Session, select
 from sqlmodel.sql.expression import SelectOfScalar
 
 from langflow.services.database.models.api_key import ApiKey, ApiKeyCreate, ApiKeyRead, UnmaskedApiKeyRead
+from langflow.services.database.models.api_key.cache import VerifiedApiKey, get_api_key_cache, get_api_key_usage
+from langflow.services.database.models.user.model import User
 
 
 def get_api_keys(session: Session, user_id: UUID) -> List[ApiKeyRead]:
@@ -41,6 +42,7 @@ def delete_api_key(session: Session, api_key_id: UUID) -> None:
         raise ValueError("API Key not found")
     session.delete(api_key)
     session.commit()
+    get_api_key_cache().invalidate(api_key_id)
 
 
 def check_key(session: Session, api_key: str) -> Optional[ApiKey]:
@@ -48,27 +50,24 @@ def check_key(session: Session, api_key: str) -> Optional[ApiKey]:
     query: SelectOfScalar = select(ApiKey).where(ApiKey.api_key == api_key)
     api_key_object: Optional[ApiKey] = session.exec(query).first()
     if api_key_object is not None:
-        threading.Thread(
-            target=update_total_uses,
-            args=(
-                session,
-                api_key_object,
-            ),
-        ).start()
+        get_api_key_usage().record(session.get_bind(), api_key_object.id)
     return api_key_object
 
 
-def update_total_uses(session, api_key: ApiKey):
-    """Update the total uses and last used at."""
-    # This is running in a separate thread to avoid slowing down the request
-    # but session is not thread safe so we need to create a new session
-
-    with Session(session.get_bind()) as new_session:
-        new_api_key = new_session.get(ApiKey, api_key.id)
-        if new_api_key is None:
-            raise ValueError("API Key not found")
-        new_api_key.total_uses += 1
-        new_api_key.last_used_at = datetime.datetime.now(datetime.timezone.utc)
-        new_session.add(new_api_key)
-        new_session.commit()
-    return new_api_key
+def verify_api_key(session: Session, api_key: str) -> Optional[User]:
+    """Return the user of the API key if the key is valid, using the cache of recently verified keys."""
+    cache = get_api_key_cache()
+    verified = cache.get(api_key)
+    if verified is None:
+        api_key_object = check_key(session, api_key)
+        if api_key_object is None:
+            return None
+        cache.set(api_key, VerifiedApiKey(api_key_object.id, api_key_object.user_id))
+        return api_key_object.user
+    user = session.get(User, verified.user_id)
+    if user is None:
+        # The user was deleted along with their keys
+        cache.invalidate(verified.api_key_id)
+        return None
+    get_api_key_usage().record(session.get_bind(), verified.api_key_id)
+    return user
@@ -1,3 +1,3 @@
-from .model import Flow, FlowCreate, FlowRead, FlowUpdate
+from .model import Flow, FlowCreate, FlowHeader, FlowRead, FlowUpdate
 
-__all__ = ["Flow", "FlowCreate", "FlowRead", "FlowUpdate"]
+__all__ = ["Flow", "FlowCreate", "FlowHeader", "FlowRead", "FlowUpdate"]
@@ -171,6 +171,22 @@ class FlowRead(FlowBase):
     folder_id: Optional[UUID] = Field()
 
 
+class FlowHeader(SQLModel):
+    """The fields of a flow without its data, which can be megabytes of JSON."""
+
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    icon: Optional[str] = None
+    icon_bg_color: Optional[str] = None
+    is_component: Optional[bool] = None
+    updated_at: Optional[datetime] = None
+    webhook: Optional[bool] = None
+    endpoint_name: Optional[str] = None
+    user_id: Optional[UUID] = None
+    folder_id: Optional[UUID] = None
+
+
 class FlowUpdate(SQLModel):
     name: Optional[str] = None
     description: Optional[str] = None
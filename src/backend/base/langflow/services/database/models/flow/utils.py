@@ -31,3 +31,25 @@ def get_all_webhook_components_in_flow(flow_data: dict | None):
     if not flow_data:
         return []
     return [node for node in flow_data.get("nodes", []) if "Webhook" in node.get("id")]
+
+
+def validate_is_component(flows: list[Flow]):
+    """Sets the is_component of flows saved without it from their data, so the column can be filtered on."""
+    for flow in flows:
+        if flow.is_component is not None:
+            continue
+        if not flow.data:
+            flow.is_component = False
+            continue
+
+        is_component = get_is_component_from_data(flow.data)
+        if is_component is not None:
+            flow.is_component = is_component
+        else:
+            flow.is_component = len(flow.data.get("nodes", [])) == 1
+    return flows
+
+
+def get_is_component_from_data(data: dict):
+    """Returns True if the data is a component."""
+    return data.get("is_component")
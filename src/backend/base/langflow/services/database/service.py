@@ -8,6 +8,7 @@ from alembic import command, util
 from alembic.config import Config
 from langflow.services.base import Service
 from langflow.services.database import models  # noqa
+from langflow.services.database.models.api_key.cache import get_api_key_cache, get_api_key_usage
 from langflow.services.database.models.user.crud import get_user_by_username
 from langflow.services.database.utils import Result, TableResults
 from langflow.services.deps import get_settings_service
@@ -300,5 +301,9 @@ class DatabaseService(Service):
         except Exception as exc:
             logger.error(f"Error tearing down database: {exc}")
 
+        # Write the API key uses counted since the last flush
+        get_api_key_usage().stop()
+        # The verified keys belong to this database
+        get_api_key_cache().clear()
         self.engine.dispose()
         self.engine.dispose()
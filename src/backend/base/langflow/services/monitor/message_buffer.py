@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+MessageRecord = Dict[str, Any]
+
+
+class SessionMessages:
+    """The last messages of a session, from oldest to newest."""
+
+    def __init__(self, records: List[MessageRecord], size: int, complete: bool):
+        self.records: Deque[MessageRecord] = deque(records, maxlen=size)
+        # Whether `records` holds every message of the session
+        self.complete = complete
+
+
+class SessionMessageBuffer:
+    """
+    Keeps the last `size` messages of the `max_sessions` most recently read sessions in memory.
+
+    A session is loaded from the database the first time its messages are read and is then kept
+    up to date by `append`, so the next reads of an active session don't query the database.
+    Reads the buffer can't answer exactly (e.g. more messages than it holds) return None and
+    must go to the database.
+    """
+
+    def __init__(self, size: int = 100, max_sessions: int = 1000):
+        self.size = max(size, 0)
+        self.max_sessions = max(max_sessions, 0)
+        self.hits = 0
+        self.misses = 0
+        # Held while a session is loaded so that messages added meanwhile are not missed
+        self.lock = threading.RLock()
+        self._sessions: OrderedDict[str, SessionMessages] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and self.max_sessions > 0
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def load(self, session_id: str, records: List[MessageRecord], complete: bool):
+        """Stores the last messages of a session, ordered from oldest to newest."""
+        with self.lock:
+            self._sessions[session_id] = SessionMessages(records[-self.size :], self.size, complete)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def append(self, record: MessageRecord):
+        """Adds a new message to its session if the session is buffered."""
+        with self.lock:
+            session = self._sessions.get(record["session_id"])
+            if session is None:
+                return
+            if session.records and record["timestamp"] < session.records[-1]["timestamp"]:
+                # Out of order messages are rare, the session is loaded again on the next read
+                self.discard(record["session_id"])
+                return
+            if len(session.records) == self.size:
+                session.complete = False
+            session.records.append(record)
+
+    def get(
+        self,
+        session_id: str,
+        filters: Optional[Dict[str, Any]] = None,
+        order: str = "DESC",
+        limit: Optional[int] = None,
+    ) -> Optional[List[MessageRecord]]:
+        """
+        Returns the messages of a session that match `filters`, ordered by timestamp, or None when the
+        session is not buffered or the buffered messages are not enough to answer the query.
+        """
+        with self.lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                self.misses += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            complete = session.complete
+            records = [
+                record
+                for record in session.records
+                if all(record[column] == value for column, value in (filters or {}).items())
+            ]
+        if limit is not None and limit <= len(records):
+            if order == "DESC":
+                records = records[len(records) - limit :]
+            elif complete:
+                records = records[:limit]
+            else:
+                # The oldest messages of the session are not buffered
+                self.misses += 1
+                return None
+        elif not complete:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Copies, so that callers can't change the buffered messages
+        records = [dict(record) for record in records]
+        return records[::-1] if order == "DESC" else records
+
+    def discard(self, session_id: str):
+        with self.lock:
+            self._sessions.pop(session_id, None)
+
+    def clear(self):
+        with self.lock:
+            self._sessions.clear()
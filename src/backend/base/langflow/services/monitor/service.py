@@ -1,10 +1,15 @@
+import json
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Union
 
 import duckdb
 from langflow.services.base import Service
-from langflow.services.monitor.utils import add_row_to_table, drop_and_create_table_if_schema_mismatch
+from langflow.services.monitor.message_buffer import SessionMessageBuffer
+from langflow.services.monitor.utils import drop_and_create_table_if_schema_mismatch, validate_row
+from langflow.services.monitor.writer import MonitorWriter
 from loguru import logger
 from platformdirs import user_cache_dir
 
@@ -12,6 +17,11 @@ if TYPE_CHECKING:
     from langflow.services.settings.service import SettingsService
     from langflow.services.monitor.schema import MessageModel, TransactionModel, VertexBuildModel
 
+MESSAGE_COLUMNS = ("index", "flow_id", "sender_name", "sender", "session_id", "text", "files", "timestamp")
+MESSAGE_ORDERS = ("ASC", "DESC")
+# Attempts to open the database while another process holds its lock
+CONNECT_ATTEMPTS = 8
+
 
 class MonitorService(Service):
     name = "monitor_service"
@@ -27,14 +37,63 @@ class MonitorService(Service):
             "messages": MessageModel,
             "vertex_builds": VertexBuildModel,
         }
+        self.table_indexes: dict[str, list[tuple[str, ...]]] = {
+            "messages": [("flow_id", "session_id", "timestamp")],
+        }
+        settings = settings_service.settings
+        self.writer = MonitorWriter(
+            self.connect,
+            queue_size=settings.monitor_queue_size,
+            batch_size=settings.monitor_batch_size,
+            flush_interval=settings.monitor_flush_interval,
+            queue_full_policy=settings.monitor_queue_full_policy,
+        )
+        self.message_buffer = SessionMessageBuffer(
+            size=settings.message_buffer_size,
+            max_sessions=settings.message_buffer_sessions,
+        )
 
         try:
             self.ensure_tables_exist()
         except Exception as e:
             logger.exception(f"Error initializing monitor service: {e}")
 
+    def connect(self) -> duckdb.DuckDBPyConnection:
+        """
+        Opens a read-write connection to the database, to be closed as soon as it is used.
+
+        DuckDB locks the file for as long as a read-write connection is open, and every worker
+        process writes to it, so connections are not kept open. DuckDB doesn't allow connections
+        with different configurations to the same file in one process, so reads use the same
+        read-write configuration.
+        """
+        attempts = 0
+        while True:
+            try:
+                return duckdb.connect(str(self.db_path), read_only=False)
+            except duckdb.IOException as exc:
+                # Another process is using the database
+                attempts += 1
+                if "lock" not in str(exc).lower() or attempts == CONNECT_ATTEMPTS:
+                    raise
+                time.sleep(0.01 * 2**attempts)
+
+    @contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Yields a connection to the database once the queued rows are written."""
+        self.flush()
+        with self.connect() as conn:
+            yield conn
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every row added so far is written to the database."""
+        return self.writer.flush(timeout)
+
+    def teardown(self):
+        self.writer.stop()
+
     def exec_query(self, query: str, read_only: bool = False):
-        with duckdb.connect(str(self.db_path), read_only=read_only) as conn:
+        with self.connection() as conn:
             return conn.execute(query).df()
 
     def to_df(self, table_name):
@@ -43,6 +102,11 @@ class MonitorService(Service):
     def ensure_tables_exist(self):
         for table_name, model in self.table_map.items():
             drop_and_create_table_if_schema_mismatch(str(self.db_path), table_name, model)
+        with self.connect() as conn:
+            for table_name, indexes in self.table_indexes.items():
+                for columns in indexes:
+                    index_name = f"idx_{table_name}_{'_'.join(columns)}"
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)})")
 
     def add_row(
         self,
@@ -55,12 +119,11 @@ class MonitorService(Service):
         if model is None:
             raise ValueError(f"Unknown table name: {table_name}")
 
-        # Connect to DuckDB and add the row
-        with duckdb.connect(str(self.db_path), read_only=False) as conn:
-            add_row_to_table(conn, table_name, model, data)
+        # The row is written in the background with the next batch
+        self.writer.put(table_name, validate_row(model, data))
 
     def load_table_as_dataframe(self, table_name):
-        with duckdb.connect(str(self.db_path)) as conn:
+        with self.connection() as conn:
             return conn.table(table_name).df()
 
     @staticmethod
@@ -90,7 +153,7 @@ class MonitorService(Service):
         if order_by:
             query += f" ORDER BY {order_by}"
 
-        with duckdb.connect(str(self.db_path), read_only=True) as conn:
+        with self.connection() as conn:
             df = conn.execute(query).df()
 
         return df.to_dict(orient="records")
@@ -100,37 +163,48 @@ class MonitorService(Service):
         if flow_id:
             query += f" WHERE flow_id = '{flow_id}'"
 
-        with duckdb.connect(str(self.db_path), read_only=False) as conn:
+        with self.connection() as conn:
             conn.execute(query)
 
     def delete_messages_session(self, session_id: str):
-        query = f"DELETE FROM messages WHERE session_id = '{session_id}'"
-
-        return self.exec_query(query, read_only=False)
+        with self.message_buffer.lock:
+            self.message_buffer.discard(session_id)
+            with self.connection() as conn:
+                conn.execute("DELETE FROM messages WHERE session_id = ?", [session_id])
 
     def delete_messages(self, message_ids: Union[List[int], str]):
-        if isinstance(message_ids, list):
-            # If message_ids is a list, join the string representations of the integers
-            ids_str = ",".join(map(str, message_ids))
-        elif isinstance(message_ids, str):
-            # If message_ids is already a string, use it directly
-            ids_str = message_ids
-        else:
+        if isinstance(message_ids, str):
+            # A comma separated list of ids
+            message_ids = [int(message_id) for message_id in message_ids.split(",") if message_id.strip()]
+        elif not isinstance(message_ids, list):
             raise ValueError("message_ids must be a list of integers or a string")
-
-        query = f"DELETE FROM messages WHERE index IN ({ids_str})"
-
-        return self.exec_query(query, read_only=False)
-
-    def update_message(self, message_id: str, **kwargs):
-        query = (
-            f"""UPDATE messages SET {', '.join(f"{k} = '{v}'" for k, v in kwargs.items())} WHERE index = {message_id}"""
-        )
-
-        return self.exec_query(query, read_only=False)
+        if not message_ids:
+            return
+
+        placeholders = ", ".join("?" for _ in message_ids)
+        with self.message_buffer.lock:
+            # Buffered messages don't always know their index, so every session is loaded again
+            self.message_buffer.clear()
+            with self.connection() as conn:
+                conn.execute(f"DELETE FROM messages WHERE index IN ({placeholders})", list(message_ids))
+
+    def update_message(self, message_id: Union[int, str], **kwargs):
+        unknown_columns = set(kwargs) - set(MESSAGE_COLUMNS)
+        if unknown_columns:
+            raise ValueError(f"Unknown message columns: {', '.join(sorted(unknown_columns))}")
+        if not kwargs:
+            return
+
+        assignments = ", ".join(f"{column} = ?" for column in kwargs)
+        with self.message_buffer.lock:
+            self.message_buffer.clear()
+            with self.connection() as conn:
+                conn.execute(f"UPDATE messages SET {assignments} WHERE index = ?", [*kwargs.values(), int(message_id)])
 
     def add_message(self, message: "MessageModel"):
-        self.add_row("messages", message)
+        with self.message_buffer.lock:
+            self.add_row("messages", message)
+            self.message_buffer.append(message_record(message))
 
     def get_messages(
         self,
@@ -141,32 +215,67 @@ class MonitorService(Service):
         order_by: Optional[str] = "timestamp",
         order: Optional[str] = "DESC",
         limit: Optional[int] = None,
-    ):
-        query = "SELECT index, flow_id, sender_name, sender, session_id, text, files, timestamp FROM messages"
-        conditions = []
-        if sender:
-            conditions.append(f"sender = '{sender}'")
-        if sender_name:
-            conditions.append(f"sender_name = '{sender_name}'")
-        if session_id:
-            conditions.append(f"session_id = '{session_id}'")
-        if flow_id:
-            conditions.append(f"flow_id = '{flow_id}'")
-
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
-
-        if order_by and order:
-            # Make sure the order is from newest to oldest
-            query += f" ORDER BY {order_by} {order.upper()}"
+        buffered: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the messages that match the filters as dicts with the columns of the messages table.
+
+        With `buffered`, reads of the last messages of a session ordered by timestamp are answered
+        from the in-memory buffer of the session when possible. Buffered messages that were not
+        written yet have no index, and the buffer only knows about the messages added by this
+        process, so it is meant for chat history reads during a run and not for the API.
+        """
+        order = (order or "DESC").upper()
+        if order not in MESSAGE_ORDERS:
+            raise ValueError(f"Invalid order: {order}. Expected one of {MESSAGE_ORDERS}")
+        if order_by and order_by not in MESSAGE_COLUMNS:
+            raise ValueError(f"Invalid order_by: {order_by}. Expected one of {MESSAGE_COLUMNS}")
+        filters = {
+            column: value
+            for column, value in (
+                ("flow_id", flow_id),
+                ("sender", sender),
+                ("sender_name", sender_name),
+                ("session_id", session_id),
+            )
+            if value
+        }
 
+        if buffered and session_id and order_by == "timestamp" and self.message_buffer.enabled:
+            with self.message_buffer.lock:
+                if session_id not in self.message_buffer:
+                    self._load_session_messages(session_id)
+                records = self.message_buffer.get(session_id, filters, order=order, limit=limit)
+            if records is not None:
+                return records
+
+        query = f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages"
+        params: List[Any] = list(filters.values())
+        if filters:
+            query += " WHERE " + " AND ".join(f"{column} = ?" for column in filters)
+        if order_by:
+            # Messages with the same timestamp are ordered by insertion
+            query += f" ORDER BY {order_by} {order}" + (f", index {order}" if order_by != "index" else "")
         if limit is not None:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(limit)
 
-        with duckdb.connect(str(self.db_path), read_only=True) as conn:
-            df = conn.execute(query).df()
+        with self.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [decode_message_row(row) for row in rows]
 
-        return df
+    def _load_session_messages(self, session_id: str):
+        """Loads the last messages of a session in the buffer. Must be called with the buffer lock held."""
+        size = self.message_buffer.size
+        query = (
+            f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages WHERE session_id = ? "
+            "ORDER BY timestamp DESC, index DESC LIMIT ?"
+        )
+        with self.connection() as conn:
+            # One more row than the buffer holds tells whether the session has older messages
+            rows = conn.execute(query, [session_id, size + 1]).fetchall()
+        records = [decode_message_row(row) for row in reversed(rows[:size])]
+        self.message_buffer.load(session_id, records, complete=len(rows) <= size)
 
     def get_transactions(
         self,
@@ -194,7 +303,30 @@ class MonitorService(Service):
 
         if order_by:
             query += f" ORDER BY {order_by} DESC"
-        with duckdb.connect(str(self.db_path), read_only=True) as conn:
+        with self.connection() as conn:
             df = conn.execute(query).df()
 
         return df.to_dict(orient="records")
+
+
+def decode_message_row(row: Sequence[Any]) -> Dict[str, Any]:
+    """Builds a message dict from a row of the messages table selected with MESSAGE_COLUMNS."""
+    record = dict(zip(MESSAGE_COLUMNS, row))
+    if isinstance(record["files"], str):
+        record["files"] = json.loads(record["files"])
+    return record
+
+
+def message_record(message: "MessageModel") -> Dict[str, Any]:
+    """Builds the message dict of a message that was not written to the database yet."""
+    return {
+        "index": None,
+        "flow_id": message.flow_id,
+        "sender_name": message.sender_name,
+        "sender": message.sender,
+        "session_id": message.session_id,
+        "text": message.text,
+        "files": list(message.files),
+        # The table stores naive timestamps with a precision of one second
+        "timestamp": message.timestamp.replace(microsecond=0, tzinfo=None),
+    }
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Any, Dict, Optional, Type, Union
+import contextlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union
 
 import duckdb
 from loguru import logger
@@ -74,44 +75,70 @@ def drop_and_create_table_if_schema_mismatch(db_path: str, table_name: str, mode
             conn.execute(create_table_sql)
 
 
+def validate_row(model: Type, monitor_data: Union[Dict[str, Any], BaseModel]) -> Dict[str, Any]:
+    """Validates the data with the Pydantic model and returns the values of the table columns."""
+    if isinstance(monitor_data, model):
+        validated_data = monitor_data
+    else:
+        validated_data = model(**monitor_data)
+    validated_dict = validated_data.model_dump()
+    validated_dict.pop(INDEX_KEY, None)
+    return validated_dict
+
+
 def add_row_to_table(
     conn: duckdb.DuckDBPyConnection,
     table_name: str,
     model: Type,
     monitor_data: Union[Dict[str, Any], BaseModel],
 ):
-    # Validate the data with the Pydantic model
-    if isinstance(monitor_data, model):
-        validated_data = monitor_data
-    else:
-        validated_data = model(**monitor_data)
+    add_rows_to_table(conn, table_name, [validate_row(model, monitor_data)])
 
-    # Extract data for the insert statement
-    validated_dict = validated_data.model_dump()
-    keys = [key for key in validated_dict.keys() if key != INDEX_KEY]
-    columns = ", ".join(keys)
 
-    values_placeholders = ", ".join(["?" for _ in keys])
-    values = [validated_dict[key] for key in keys]
-
-    # Create the insert statement
-    insert_sql = f"INSERT INTO {table_name} ({columns}) VALUES ({values_placeholders})"
+def add_rows_to_table(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    rows: List[Dict[str, Any]],
+    rows_per_insert: int = 500,
+) -> int:
+    """
+    Inserts validated rows with multi-row INSERT statements in a single transaction.
 
-    # Execute the insert statement
+    Returns the number of rows inserted.
+    """
+    if not rows:
+        return 0
+    keys = list(rows[0].keys())
+    columns = ", ".join(keys)
+    row_placeholders = f"({', '.join(['?' for _ in keys])})"
     try:
-        conn.execute(insert_sql, values)
+        conn.execute("BEGIN TRANSACTION")
+        for start in range(0, len(rows), rows_per_insert):
+            chunk = rows[start : start + rows_per_insert]
+            values_placeholders = ", ".join([row_placeholders] * len(chunk))
+            values = [row[key] for row in chunk for key in keys]
+            conn.execute(f"INSERT INTO {table_name} ({columns}) VALUES {values_placeholders}", values)
+        conn.execute("COMMIT")
+        return len(rows)
     except Exception as e:
-        # Log values types
+        with contextlib.suppress(Exception):
+            conn.execute("ROLLBACK")
+        # Find the row that can't be inserted to log it
         column_error_message = ""
-        for key, value in validated_dict.items():
-            logger.error(f"{key}: {type(value)}")
-            if str(value) in str(e):
-                column_error_message = f"Column: {key} Value: {value} Error: {e}"
+        for row in rows:
+            for key, value in row.items():
+                if str(value) in str(e):
+                    logger.error(f"{key}: {type(value)}")
+                    column_error_message = f"Column: {key} Value: {value} Error: {e}"
+                    break
+            if column_error_message:
+                break
 
         if column_error_message:
-            logger.error(f"Error adding row to {table_name}: {column_error_message}")
+            logger.error(f"Error adding {len(rows)} rows to {table_name}: {column_error_message}")
         else:
-            logger.error(f"Error adding row to {table_name}: {e}")
+            logger.error(f"Error adding {len(rows)} rows to {table_name}: {e}")
+        return 0
 
 
 async def log_message(
@@ -0,0 +1,142 @@
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+import duckdb
+from loguru import logger
+
+from langflow.services.monitor.utils import add_rows_to_table
+
+QUEUE_FULL_POLICIES = ("block", "drop")
+
+_STOP = object()
+
+
+class MonitorWriter:
+    """
+    Writes monitor rows to DuckDB in batches from a background thread.
+
+    Rows are put in a bounded queue and written with one insert per table when
+    `batch_size` rows are waiting or `flush_interval` seconds have passed since
+    the last write. When the queue is full, `queue_full_policy` decides whether
+    the row is dropped ('drop', the default) or the caller waits for the writer
+    ('block'). Rows are added from the event loop, so 'block' can stall it.
+
+    A thread is used instead of an asyncio task because rows are added from
+    sync code, some of which runs outside of the event loop.
+    """
+
+    def __init__(
+        self,
+        get_cursor: Callable[[], duckdb.DuckDBPyConnection],
+        queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        queue_full_policy: str = "drop",
+    ):
+        if queue_full_policy not in QUEUE_FULL_POLICIES:
+            raise ValueError(f"Invalid queue full policy: {queue_full_policy}. Expected one of {QUEUE_FULL_POLICIES}")
+        self.get_cursor = get_cursor
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.queue_full_policy = queue_full_policy
+        self.dropped_rows = 0
+        self.written_rows = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._start_lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="monitor-writer", daemon=True)
+            self._thread.start()
+            # Rows queued by scripts that never tear down the services are written on exit
+            atexit.register(self.stop)
+
+    def put(self, table_name: str, row: Dict[str, Any]):
+        """Queues a row. The row must already be validated and contain only the table columns."""
+        self.start()
+        if self.queue_full_policy == "block":
+            self._queue.put((table_name, row))
+            return
+        try:
+            self._queue.put_nowait((table_name, row))
+        except queue.Full:
+            self.dropped_rows += 1
+            if self.dropped_rows == 1 or self.dropped_rows % 1000 == 0:
+                logger.warning(f"Monitor queue is full, {self.dropped_rows} rows dropped so far")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every row queued before the call is written. Returns False on timeout."""
+        if not self.running:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Writes the pending rows and stops the writer thread."""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+            atexit.unregister(self.stop)
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Monitor writer did not stop in time, some rows may not be written")
+
+    def _run(self):
+        pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        n_pending = 0
+        # Pending rows are written at the latest `flush_interval` seconds after the first of them was queued
+        deadline = 0.0
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if n_pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                table_name, row = item
+                pending[table_name].append(row)
+                n_pending += 1
+                if n_pending == 1:
+                    deadline = time.monotonic() + self.flush_interval
+                if n_pending < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            if n_pending:
+                self._write(pending)
+                pending, n_pending = defaultdict(list), 0
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, pending: Dict[str, List[Dict[str, Any]]]):
+        try:
+            with self.get_cursor() as cursor:
+                for table_name, rows in pending.items():
+                    self.written_rows += add_rows_to_table(cursor, table_name, rows)
+        except Exception as exc:
+            n_rows = sum(len(rows) for rows in pending.values())
+            logger.error(f"Error writing {n_rows} rows to the monitor database: {exc}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued_rows": self._queue.qsize(),
+            "written_rows": self.written_rows,
+            "dropped_rows": self.dropped_rows,
+        }
@@ -5,11 +5,12 @@ from langflow.services.session.service import SessionService
 
 if TYPE_CHECKING:
     from langflow.services.cache.service import CacheService
+    from langflow.services.settings.service import SettingsService
 
 
 class SessionServiceFactory(ServiceFactory):
     def __init__(self):
         super().__init__(SessionService)
 
-    def create(self, cache_service: "CacheService"):
-        return SessionService(cache_service)
+    def create(self, cache_service: "CacheService", settings_service: "SettingsService"):
+        return SessionService(cache_service, settings_service)
@@ -1,19 +1,43 @@
-from typing import Coroutine, Optional
+import copy
+import hashlib
+import pickle
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Coroutine, Dict, Optional, Union
+
+from loguru import logger
 
 from langflow.services.base import Service
+from langflow.services.cache import base as cache_base
 from langflow.services.cache.base import CacheService
+from langflow.services.cache.service import ThreadingInMemoryCache
+from langflow.services.database.models.base import orjson_dumps
 from langflow.services.session.utils import compute_dict_hash, session_id_generator
 
+if TYPE_CHECKING:
+    from langflow.graph.graph.base import Graph
+    from langflow.schema.graph import Tweaks
+    from langflow.services.settings.service import SettingsService
+
 
 class SessionService(Service):
     name = "session_service"
 
-    def __init__(self, cache_service):
+    def __init__(self, cache_service, settings_service: Optional["SettingsService"] = None):
         self.cache_service: "CacheService" = cache_service
+        cache_size = settings_service.settings.compiled_graph_cache_size if settings_service else 0
+        # Compiled graphs are stored pickled so every run gets its own copy
+        self.compiled_graphs: Optional[ThreadingInMemoryCache] = (
+            ThreadingInMemoryCache(max_size=cache_size, expiration_time=None) if cache_size > 0 else None
+        )
 
     async def load_session(self, key, flow_id: str, data_graph: Optional[dict] = None):
         # Check if the data is cached
-        if key in self.cache_service:
+        # The module is imported rather than the class, services are found by the classes of their module
+        if isinstance(self.cache_service, cache_base.AsyncBaseCacheService):
+            cached = await self.cache_service.contains(key)
+        else:
+            cached = key in self.cache_service
+        if cached:
             result = self.cache_service.get(key)
             if isinstance(result, Coroutine):
                 result = await result
@@ -54,3 +78,70 @@ class SessionService(Service):
         # if it is a coroutine, await it
         if isinstance(result, Coroutine):
             await result
+
+    def build_compiled_graph_key(
+        self,
+        flow_id: str,
+        updated_at: Optional[datetime],
+        tweaks: Optional[Union["Tweaks", Dict[str, Any]]],
+        stream: bool = False,
+    ) -> str:
+        if tweaks is not None and not isinstance(tweaks, dict):
+            tweaks = tweaks.model_dump()
+        tweaks_json = orjson_dumps(tweaks or {}, sort_keys=True, indent_2=False)
+        tweaks_hash = hashlib.sha256(tweaks_json.encode("utf-8")).hexdigest()
+        version = updated_at.isoformat() if updated_at else ""
+        return f"{flow_id}:{version}:{tweaks_hash}:{int(stream)}"
+
+    def load_compiled_graph(
+        self,
+        flow_id: str,
+        data_graph: dict,
+        updated_at: Optional[datetime] = None,
+        tweaks: Optional[Union["Tweaks", Dict[str, Any]]] = None,
+        stream: bool = False,
+        user_id: Optional[str] = None,
+    ) -> "Graph":
+        """
+        Returns a Graph for `data_graph` with `tweaks` applied.
+
+        Compiling a flow (deep copying the payload, applying tweaks, instantiating every
+        vertex and edge) only happens once per flow version and tweaks; later calls get a
+        fresh copy of the cached graph so runs never share state.
+        """
+        from langflow.graph.graph.base import Graph
+        from langflow.processing.process import process_tweaks
+
+        key = None
+        if self.compiled_graphs is not None:
+            key = self.build_compiled_graph_key(flow_id, updated_at, tweaks, stream)
+            # The cache unpickles the stored bytes, so this is already a copy
+            graph = self.compiled_graphs.get(key)
+            if graph is not None:
+                graph.user_id = user_id
+                return graph
+
+        # process_tweaks modifies both the payload and the tweaks it is given
+        graph_data = process_tweaks(copy.deepcopy(data_graph), copy.deepcopy(tweaks or {}), stream=stream)
+        graph = Graph.from_payload(graph_data, flow_id=flow_id)
+        if key is not None and self.compiled_graphs is not None:
+            # The execution plan of a full run is cached with the graph, so runs don't sort it again
+            graph.get_execution_plan()
+            try:
+                pickled_graph = pickle.dumps(graph)
+            except Exception as exc:
+                logger.warning(f"Could not cache the compiled graph of flow {flow_id}: {exc}")
+            else:
+                self.compiled_graphs.set(key, pickled_graph)
+        graph.user_id = user_id
+        return graph
+
+    def clear_compiled_graphs(self, flow_id: str):
+        """Drops every compiled graph of `flow_id`, e.g. after the flow was updated or deleted."""
+        if self.compiled_graphs is None:
+            return
+        # The keys start with the flow id, so they are only kept by the cache and evicted with the graphs
+        prefix = f"{flow_id}:"
+        for key in self.compiled_graphs.keys():
+            if key.startswith(prefix):
+                self.compiled_graphs.delete(key)
@@ -79,6 +79,11 @@ class Settings(BaseSettings):
 
     remove_api_keys: bool = False
     components_path: List[str] = []
+    cache_components_manifest: bool = True
+    """Save the templates built from components_path in config_dir and only rebuild the files that changed."""
+    components_build_workers: int = 1
+    """Number of processes that build the changed component files. Each process imports langflow, so this only
+    pays off for large trees of slow components. 0 or 1 builds them in the current process."""
     langchain_cache: str = "InMemoryCache"
     load_flows_path: Optional[str] = None
 
@@ -88,6 +93,10 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_url: Optional[str] = None
     redis_cache_expire: int = 3600
+    redis_max_connections: Optional[int] = None
+    """Maximum number of connections in the Redis connection pool. If not provided, there is no limit."""
+    redis_cache_compression: Optional[str] = None
+    """Compression of large cached values: 'zstd', 'lz4' or None. Needs the zstandard or lz4 package."""
 
     # Sentry
     sentry_dsn: Optional[str] = None
@@ -108,6 +117,12 @@ class Settings(BaseSettings):
     like_webhook_url: Optional[str] = "https://api.langflow.store/flows/trigger/64275852-ec00-45c1-984e-3bff814732da"
 
     storage_type: str = "local"
+    storage_chunk_size: int = 1024 * 1024
+    """Number of bytes read or written at a time when files are streamed to and from the storage."""
+    storage_deduplicate: bool = False
+    """Store files with the same content once, as hard links to a copy named after its SHA-256. Local storage only.
+    The storage service replaces files instead of writing to them, but anything else writing to a stored file in place
+    changes every file with the same content."""
 
     celery_enabled: bool = False
 
@@ -119,12 +134,111 @@ class Settings(BaseSettings):
     """Whether to store environment variables as Global Variables in the database."""
     variables_to_get_from_environment: list[str] = VARIABLES_TO_GET_FROM_ENVIRONMENT
     """List of environment variables to get from the environment and store in the database."""
+    variable_cache_ttl: int = 10
+    """Seconds the decrypted variables of a user are kept in memory after they are loaded. 0 disables the cache.
+    Each worker process has its own cache and only the one that changes a variable drops it, so the other workers
+    can use the old value for up to this many seconds."""
     worker_timeout: int = 300
     """Timeout for the API calls in seconds."""
     frontend_timeout: int = 0
     """Timeout for the frontend API calls in seconds."""
     user_agent: str = "langflow"
     """User agent for the API calls."""
+    graph_scheduler: str = "layered"
+    """How Graph.process schedules vertices. 'layered' waits for every vertex of a layer before starting the next
+    layer, 'streaming' starts each vertex as soon as its predecessors are built."""
+    graph_max_in_flight: int = 0
+    """Maximum number of vertices the 'streaming' scheduler builds at the same time. 0 means no limit."""
+    compiled_graph_cache_size: int = 64
+    """Maximum number of compiled graphs /api/v1/run keeps in memory, keyed by flow, version and tweaks.
+    0 disables the cache."""
+    monitor_queue_size: int = 10_000
+    """Maximum number of monitor rows (messages, transactions and vertex builds) waiting to be written."""
+    monitor_batch_size: int = 500
+    """Number of queued monitor rows that triggers a write."""
+    monitor_flush_interval: float = 1.0
+    """Maximum number of seconds a monitor row waits in the queue before it is written."""
+    monitor_queue_full_policy: str = "drop"
+    """What to do with a new monitor row when the queue is full. 'drop' drops the row and counts it, 'block' waits
+    for the writer, which blocks the event loop when the row is added from it."""
+    message_buffer_size: int = 0
+    """Number of the most recent messages of a session kept in memory to answer chat history reads during runs.
+    Each process has its own buffer, which doesn't see the messages added by other workers, so it should only be
+    enabled with a single worker. 0 disables it."""
+    message_buffer_sessions: int = 1000
+    """Maximum number of sessions whose recent messages are kept in memory."""
+    stream_chunk_interval: float = 0.05
+    """Seconds the tokens of a streamed message are collected before they are sent to the client as one chunk.
+    0 sends every token as it arrives."""
+    stream_chunk_size: int = 2048
+    """Number of characters of collected tokens that are sent to the client without waiting for the interval."""
+    stream_queue_size: int = 1000
+    """Maximum number of tokens waiting to be sent to a slow client before the stream is paused."""
+    component_thread_pool_size: int = 0
+    """Number of threads that run the sync output methods of components. 0, the default, runs them on the event loop.
+    Only enable it when the components in use don't share state that isn't thread safe; outputs can opt out with
+    `run_in_thread=False`."""
+    max_batch_concurrency: int = 8
+    """Maximum number of inputs of a /run/advanced request that run at the same time."""
+    api_key_cache_ttl: int = 60
+    """Seconds a verified API key is accepted without checking the database again. 0 checks it on every request."""
+    api_key_usage_flush_interval: float = 5.0
+    """Seconds between the writes of the use counts of API keys."""
+    vertex_result_cache_size: int = 256
+    """Maximum number of results of memoized components kept in memory. 0 disables memoization."""
+    vertex_result_cache_ttl: int = 3600
+    """Seconds the result of a memoized component is reused for the same code, params and upstream results."""
+    vertex_result_cache_dir: Optional[str] = None
+    """Directory where the results of memoized components are also saved, to share them between workers. Results of
+    components with password inputs or inputs loaded from variables are only kept in memory."""
+    ingestion_cache_size: int = 50_000_000
+    """Maximum number of characters of parsed files the Directory component keeps in memory to skip parsing files
+    that didn't change. 0 disables the cache."""
+    document_process_pool_size: int = 4
+    """Number of processes that parse PDF and DOCX files for the Directory component. 0 parses them in threads."""
+    embedding_cache_size: int = 0
+    """Maximum number of vectors embedding components keep on disk to skip embedding the same text again. Vectors are
+    stored and returned as float32, which is less precise than the float64 some providers return. 0 disables the
+    cache."""
+    embedding_cache_path: Optional[str] = None
+    """SQLite file where the cached vectors are stored. Defaults to embedding_cache.db in the config directory."""
+    faiss_index_cache_size: int = 4
+    """Number of FAISS indexes the FAISS component keeps loaded between runs. 0 loads them from disk on every run."""
+    faiss_mmap_threshold: int = 256 * 1024 * 1024
+    """FAISS index files of at least this many bytes are memory-mapped instead of read into memory."""
+    store_cache_ttl: int = 60
+    """Seconds public store listings and tags are served from memory before they are revalidated with the store.
+    0 disables the cache."""
+    store_cache_size: int = 256
+    """Maximum number of store responses kept in memory."""
+    store_max_connections: int = 20
+    """Maximum number of open connections to the store, shared by every request."""
+    store_http2: bool = True
+    """Use HTTP/2 for the requests to the store when the h2 package is installed."""
+
+    @field_validator("graph_scheduler", mode="after")
+    @classmethod
+    def validate_graph_scheduler(cls, value):
+        # The graph package imports the services, so it can't be imported with this module
+        from langflow.graph.graph.constants import GRAPH_SCHEDULERS
+
+        if value not in GRAPH_SCHEDULERS:
+            raise ValueError(f"Invalid graph scheduler: {value}. Expected one of {GRAPH_SCHEDULERS}")
+        return value
+
+    @field_validator("monitor_queue_full_policy", mode="after")
+    @classmethod
+    def validate_monitor_queue_full_policy(cls, value):
+        if value not in ("block", "drop"):
+            raise ValueError(f"Invalid monitor queue full policy: {value}. Expected 'block' or 'drop'")
+        return value
+
+    @field_validator("redis_cache_compression", mode="after")
+    @classmethod
+    def validate_redis_cache_compression(cls, value):
+        if value not in (None, "zstd", "lz4"):
+            raise ValueError(f"Invalid Redis cache compression: {value}. Expected 'zstd', 'lz4' or None")
+        return value
 
     @field_validator("user_agent", mode="after")
     @classmethod
@@ -1,8 +1,14 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import uuid
 from pathlib import Path
+from typing import AsyncIterator, Optional
 
 from loguru import logger
 
-from .service import StorageService
+from .service import StorageService, StoredFile
 
 
 class LocalStorageService(StorageService):
@@ -12,6 +18,8 @@ class LocalStorageService(StorageService):
         """Initialize the local storage service with session and settings services."""
         super().__init__(session_service, settings_service)
         self.data_dir = Path(settings_service.settings.config_dir)
+        self.blobs_dir = self.data_dir / ".blobs"
+        self.deduplicate = settings_service.settings.storage_deduplicate
         self.set_ready()
 
     def build_full_path(self, flow_id: str, file_name: str) -> str:
@@ -29,17 +37,131 @@ class LocalStorageService(StorageService):
         :raises IsADirectoryError: If the file name is a directory.
         :raises PermissionError: If there is no permission to write the file.
         """
-        folder_path = self.data_dir / flow_id
-        folder_path.mkdir(parents=True, exist_ok=True)
-        file_path = folder_path / file_name
 
+        async def chunks():
+            yield data
+
+        await self.save_file_stream(flow_id, file_name, chunks())
+
+    async def save_file_stream(
+        self, flow_id: str, file_name: Optional[str], chunks: AsyncIterator[bytes]
+    ) -> StoredFile:
+        """
+        Save a file in the local storage while its chunks arrive.
+
+        The chunks are written to a temporary file and hashed from a worker thread, then the
+        file is replaced. When deduplication is enabled, files with the same content are hard
+        links to a single copy in `.blobs`, named after the SHA-256 of the content.
+
+        :param flow_id: The identifier for the flow.
+        :param file_name: The name of the file to be saved. Defaults to the SHA-256 of the content.
+        :param chunks: The byte content of the file.
+        :return: The name, size and SHA-256 of the saved file.
+        """
+        folder_path = self.data_dir / flow_id
+        await asyncio.to_thread(folder_path.mkdir, parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_name = tempfile.mkstemp(dir=folder_path, prefix=".upload-")
+        temp_path = Path(temp_name)
         try:
-            with open(file_path, "wb") as f:
-                f.write(data)
-            logger.info(f"File {file_name} saved successfully in flow {flow_id}.")
-        except Exception as e:
+            with os.fdopen(fd, "wb") as temp_file:
+
+                def write(chunk: bytes):
+                    # hashlib releases the GIL for large chunks, so the loop keeps running
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+                async for chunk in chunks:
+                    size += len(chunk)
+                    await asyncio.to_thread(write, chunk)
+            sha256 = digest.hexdigest()
+            file_name = file_name or sha256
+            await asyncio.to_thread(self._store, temp_path, folder_path / file_name, sha256)
+        except BaseException as e:
+            temp_path.unlink(missing_ok=True)
             logger.error(f"Error saving file {file_name} in flow {flow_id}: {e}")
-            raise e
+            raise
+        logger.info(f"File {file_name} saved successfully in flow {flow_id}.")
+        return StoredFile(name=file_name, size=size, sha256=sha256)
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blobs_dir / sha256[:2] / sha256
+
+    def _inode_path(self, inode: int) -> Path:
+        """A symbolic link to the blob with `inode`, to find the blob of a file without hashing it."""
+        return self.blobs_dir / "inodes" / str(inode)
+
+    def _index_blob(self, blob_path: Path) -> None:
+        inode_path = self._inode_path(blob_path.stat().st_ino)
+        inode_path.parent.mkdir(parents=True, exist_ok=True)
+        # A link left by a deleted blob with the same inode is replaced
+        link_path = inode_path.with_name(f".link-{uuid.uuid4().hex}")
+        os.symlink(blob_path, link_path)
+        os.replace(link_path, inode_path)
+
+    def _store(self, temp_path: Path, file_path: Path, sha256: str) -> None:
+        replaced_inode = self._linked_inode(file_path)
+        if self.deduplicate:
+            blob_path = self._blob_path(sha256)
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            link_path = file_path.with_name(f".link-{uuid.uuid4().hex}")
+            try:
+                # The same content is already stored: the file becomes a link to it
+                os.link(blob_path, link_path)
+                os.replace(link_path, file_path)
+                temp_path.unlink()
+            except FileNotFoundError:
+                try:
+                    # First time this content is stored: the upload becomes the blob
+                    os.link(temp_path, blob_path)
+                except FileExistsError:
+                    # Stored by a concurrent upload since
+                    return self._store(temp_path, file_path, sha256)
+                try:
+                    self._index_blob(blob_path)
+                except OSError as exc:
+                    # A blob that can't be found from its files would never be deleted
+                    logger.debug(f"Not deduplicating {file_path.name}: {exc}")
+                    blob_path.unlink(missing_ok=True)
+                os.replace(temp_path, file_path)
+            except OSError as exc:
+                # The file system doesn't support hard links
+                logger.debug(f"Not deduplicating {file_path.name}: {exc}")
+                os.replace(temp_path, file_path)
+        else:
+            os.replace(temp_path, file_path)
+        if replaced_inode is not None:
+            self._release_blob(replaced_inode)
+
+    @staticmethod
+    def _linked_inode(file_path: Path) -> Optional[int]:
+        """The inode of a file that shares its content with a blob."""
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino if stat.st_nlink > 1 else None
+
+    def _release_blob(self, inode: int) -> None:
+        """Deletes the blob with `inode` if no file links to it anymore."""
+        inode_path = self._inode_path(inode)
+        try:
+            blob_path = Path(os.readlink(inode_path))
+            stat = blob_path.stat()
+        except FileNotFoundError:
+            inode_path.unlink(missing_ok=True)
+            return
+        if stat.st_ino == inode and stat.st_nlink == 1:
+            blob_path.unlink(missing_ok=True)
+            inode_path.unlink(missing_ok=True)
+
+    def _get_file_path(self, flow_id: str, file_name: str) -> Path:
+        file_path = self.data_dir / flow_id / file_name
+        if not file_path.exists():
+            logger.warning(f"File {file_name} not found in flow {flow_id}.")
+            raise FileNotFoundError(f"File {file_name} not found in flow {flow_id}")
+        return file_path
 
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         """
@@ -50,14 +172,45 @@ class LocalStorageService(StorageService):
         :return: The byte content of the file.
         :raises FileNotFoundError: If the file does not exist.
         """
-        file_path = self.data_dir / flow_id / file_name
-        if not file_path.exists():
-            logger.warning(f"File {file_name} not found in flow {flow_id}.")
-            raise FileNotFoundError(f"File {file_name} not found in flow {flow_id}")
+        file_path = self._get_file_path(flow_id, file_name)
+        content = await asyncio.to_thread(file_path.read_bytes)
+        logger.info(f"File {file_name} retrieved successfully from flow {flow_id}.")
+        return content
+
+    async def stream_file(
+        self, flow_id: str, file_name: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Read a file from the local storage in chunks, from a worker thread.
 
+        :param flow_id: The identifier for the flow.
+        :param file_name: The name of the file to be retrieved.
+        :param start: The first byte to read.
+        :param end: The last byte to read, included. Defaults to the end of the file.
+        :raises FileNotFoundError: If the file does not exist.
+        """
+        file_path = self._get_file_path(flow_id, file_name)
+        remaining = None if end is None else end - start + 1
         with open(file_path, "rb") as f:
-            logger.info(f"File {file_name} retrieved successfully from flow {flow_id}.")
-            return f.read()
+            if start:
+                f.seek(start)
+            while remaining is None or remaining > 0:
+                size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await asyncio.to_thread(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    async def get_file_size(self, flow_id: str, file_name: str) -> int:
+        """
+        Get the size of a file in the local storage.
+
+        :raises FileNotFoundError: If the file does not exist.
+        """
+        file_path = self._get_file_path(flow_id, file_name)
+        return (await asyncio.to_thread(file_path.stat)).st_size
 
     async def list_files(self, flow_id: str):
         """
@@ -72,7 +225,8 @@ class LocalStorageService(StorageService):
             logger.warning(f"Flow {flow_id} directory does not exist.")
             raise FileNotFoundError(f"Flow {flow_id} directory does not exist.")
 
-        files = [file.name for file in folder_path.iterdir() if file.is_file()]
+        # Uploads in progress are hidden
+        files = [file.name for file in folder_path.iterdir() if file.is_file() and not file.name.startswith(".")]
         logger.info(f"Listed {len(files)} files in flow {flow_id}.")
         return files
 
@@ -85,7 +239,10 @@ class LocalStorageService(StorageService):
         """
         file_path = self.data_dir / flow_id / file_name
         if file_path.exists():
+            inode = self._linked_inode(file_path)
             file_path.unlink()
+            if inode is not None:
+                await asyncio.to_thread(self._release_blob, inode)
             logger.info(f"File {file_name} deleted successfully from flow {flow_id}.")
         else:
             logger.warning(f"Attempted to delete non-existent file {file_name} in flow {flow_id}.")
@@ -1,89 +1,233 @@
+import asyncio
+import hashlib
+import uuid
+from typing import AsyncIterator, Optional
+
 import boto3  # type: ignore
 from botocore.exceptions import ClientError, NoCredentialsError  # type: ignore
 from loguru import logger
 
-from .service import StorageService
+from .service import StorageService, StoredFile
+
+# S3 rejects multipart uploads with parts smaller than this, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
 
 
 class S3StorageService(StorageService):
     """A service class for handling operations with AWS S3 storage."""
 
-    async def __init__(self, session_service, settings_service):
+    def __init__(self, session_service, settings_service):
         """Initialize the S3 storage service with session and settings services."""
         super().__init__(session_service, settings_service)
         self.bucket = "langflow"
         self.s3_client = boto3.client("s3")
         self.set_ready()
 
-    async def save_file(self, folder: str, file_name: str, data):
+    async def save_file(self, flow_id: str, file_name: str, data):
         """
         Save a file to the S3 bucket.
 
-        :param folder: The folder in the bucket to save the file.
+        :param flow_id: The folder in the bucket to save the file.
         :param file_name: The name of the file to be saved.
         :param data: The byte content of the file.
         :raises Exception: If an error occurs during file saving.
         """
         try:
-            self.s3_client.put_object(Bucket=self.bucket, Key=f"{folder}/{file_name}", Body=data)
-            logger.info(f"File {file_name} saved successfully in folder {folder}.")
+            await asyncio.to_thread(
+                self.s3_client.put_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}", Body=data
+            )
+            logger.info(f"File {file_name} saved successfully in folder {flow_id}.")
         except NoCredentialsError:
             logger.error("Credentials not available for AWS S3.")
             raise
         except ClientError as e:
-            logger.error(f"Error saving file {file_name} in folder {folder}: {e}")
+            logger.error(f"Error saving file {file_name} in folder {flow_id}: {e}")
+            raise
+
+    async def save_file_stream(
+        self, flow_id: str, file_name: Optional[str], chunks: AsyncIterator[bytes]
+    ) -> StoredFile:
+        """
+        Save a file to the S3 bucket while its chunks arrive.
+
+        Files smaller than a part are uploaded with a single request, larger ones with a
+        multipart upload, so only one part is held in memory at a time.
+
+        :param flow_id: The folder in the bucket to save the file.
+        :param file_name: The name of the file to be saved. Defaults to the SHA-256 of the content.
+        :param chunks: The byte content of the file.
+        :return: The name, size and SHA-256 of the saved file.
+        :raises Exception: If an error occurs during file saving.
+        """
+        # Without a name the key is only known once the whole file is hashed
+        key = f"{flow_id}/{file_name}" if file_name else f"{flow_id}/.upload-{uuid.uuid4().hex}"
+        part_size = max(self.chunk_size, MIN_PART_SIZE)
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        upload_id = None
+        parts: list[dict] = []
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(digest.update, chunk)
+                size += len(chunk)
+                buffer += chunk
+                if len(buffer) >= part_size:
+                    if upload_id is None:
+                        upload = await asyncio.to_thread(
+                            self.s3_client.create_multipart_upload, Bucket=self.bucket, Key=key
+                        )
+                        upload_id = upload["UploadId"]
+                    parts.append(await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+                    buffer.clear()
+            if upload_id is None:
+                await asyncio.to_thread(self.s3_client.put_object, Bucket=self.bucket, Key=key, Body=bytes(buffer))
+            else:
+                if buffer:
+                    parts.append(await self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer)))
+                await asyncio.to_thread(
+                    self.s3_client.complete_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            sha256 = digest.hexdigest()
+            if not file_name:
+                file_name = sha256
+                await asyncio.to_thread(
+                    self.s3_client.copy_object,
+                    Bucket=self.bucket,
+                    Key=f"{flow_id}/{file_name}",
+                    CopySource={"Bucket": self.bucket, "Key": key},
+                )
+                await asyncio.to_thread(self.s3_client.delete_object, Bucket=self.bucket, Key=key)
+        except BaseException as e:
+            if upload_id is not None:
+                try:
+                    await asyncio.to_thread(
+                        self.s3_client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id
+                    )
+                except ClientError as abort_error:
+                    logger.error(f"Error aborting the upload of {key}: {abort_error}")
+            if isinstance(e, NoCredentialsError):
+                logger.error("Credentials not available for AWS S3.")
+            elif isinstance(e, ClientError):
+                logger.error(f"Error saving file {file_name} in folder {flow_id}: {e}")
             raise
+        logger.info(f"File {file_name} saved successfully in folder {flow_id}.")
+        return StoredFile(name=file_name, size=size, sha256=sha256)
+
+    async def _upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> dict:
+        response = await asyncio.to_thread(
+            self.s3_client.upload_part,
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
 
-    async def get_file(self, folder: str, file_name: str):
+    async def get_file(self, flow_id: str, file_name: str):
         """
         Retrieve a file from the S3 bucket.
 
-        :param folder: The folder in the bucket where the file is stored.
+        :param flow_id: The folder in the bucket where the file is stored.
         :param file_name: The name of the file to be retrieved.
         :return: The byte content of the file.
         :raises Exception: If an error occurs during file retrieval.
         """
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=f"{folder}/{file_name}")
-            logger.info(f"File {file_name} retrieved successfully from folder {folder}.")
-            return response["Body"].read()
+            response = await asyncio.to_thread(
+                self.s3_client.get_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}"
+            )
+            content = await asyncio.to_thread(response["Body"].read)
+            logger.info(f"File {file_name} retrieved successfully from folder {flow_id}.")
+            return content
+        except ClientError as e:
+            logger.error(f"Error retrieving file {file_name} from folder {flow_id}: {e}")
+            raise
+
+    async def stream_file(
+        self, flow_id: str, file_name: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Read a file from the S3 bucket in chunks. Only the requested range is downloaded.
+
+        :param flow_id: The folder in the bucket where the file is stored.
+        :param file_name: The name of the file to be retrieved.
+        :param start: The first byte to read.
+        :param end: The last byte to read, included. Defaults to the end of the file.
+        :raises Exception: If an error occurs during file retrieval.
+        """
+        if end is not None and end < start:
+            return
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        try:
+            response = await asyncio.to_thread(
+                self.s3_client.get_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}", Range=byte_range
+            )
+        except ClientError as e:
+            logger.error(f"Error retrieving file {file_name} from folder {flow_id}: {e}")
+            raise
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, self.chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def get_file_size(self, flow_id: str, file_name: str) -> int:
+        """
+        Get the size of a file in the S3 bucket.
+
+        :raises FileNotFoundError: If the file does not exist.
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.s3_client.head_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}"
+            )
         except ClientError as e:
-            logger.error(f"Error retrieving file {file_name} from folder {folder}: {e}")
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise FileNotFoundError(f"File {file_name} not found in folder {flow_id}") from e
+            logger.error(f"Error retrieving file {file_name} from folder {flow_id}: {e}")
             raise
+        return response["ContentLength"]
 
-    async def list_files(self, folder: str):
+    async def list_files(self, flow_id: str):
         """
         List all files in a specified folder of the S3 bucket.
 
-        :param folder: The folder in the bucket to list files from.
+        :param flow_id: The folder in the bucket to list files from.
         :return: A list of file names.
         :raises Exception: If an error occurs during file listing.
         """
         try:
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket, Prefix=folder)
-            files = [item["Key"] for item in response.get("Contents", []) if "/" not in item["Key"][len(folder) :]]
-            logger.info(f"{len(files)} files listed in folder {folder}.")
+            response = await asyncio.to_thread(self.s3_client.list_objects_v2, Bucket=self.bucket, Prefix=flow_id)
+            files = [item["Key"] for item in response.get("Contents", []) if "/" not in item["Key"][len(flow_id) :]]
+            logger.info(f"{len(files)} files listed in folder {flow_id}.")
             return files
         except ClientError as e:
-            logger.error(f"Error listing files in folder {folder}: {e}")
+            logger.error(f"Error listing files in folder {flow_id}: {e}")
             raise
 
-    async def delete_file(self, folder: str, file_name: str):
+    async def delete_file(self, flow_id: str, file_name: str):
         """
         Delete a file from the S3 bucket.
 
-        :param folder: The folder in the bucket where the file is stored.
+        :param flow_id: The folder in the bucket where the file is stored.
         :param file_name: The name of the file to be deleted.
         :raises Exception: If an error occurs during file deletion.
         """
         try:
-            self.s3_client.delete_object(Bucket=self.bucket, Key=f"{folder}/{file_name}")
-            logger.info(f"File {file_name} deleted successfully from folder {folder}.")
+            await asyncio.to_thread(self.s3_client.delete_object, Bucket=self.bucket, Key=f"{flow_id}/{file_name}")
+            logger.info(f"File {file_name} deleted successfully from folder {flow_id}.")
         except ClientError as e:
-            logger.error(f"Error deleting file {file_name} from folder {folder}: {e}")
+            logger.error(f"Error deleting file {file_name} from folder {flow_id}: {e}")
             raise
 
-    async def teardown(self):
+    def teardown(self):
         """Perform any cleanup operations when the service is being torn down."""
         # No specific teardown actions required for S3 storage at the moment.
         pass
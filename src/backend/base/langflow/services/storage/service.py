@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AsyncIterator, NamedTuple, Optional
 
 from langflow.services.base import Service
 
@@ -8,12 +8,20 @@ if TYPE_CHECKING:
     from langflow.services.settings.service import SettingsService
 
 
+class StoredFile(NamedTuple):
+    name: str
+    size: int
+    sha256: str
+
+
 class StorageService(Service):
     name = "storage_service"
+    chunk_size: int = 1024 * 1024
 
     def __init__(self, session_service: "SessionService", settings_service: "SettingsService"):
         self.settings_service = settings_service
         self.session_service = session_service
+        self.chunk_size = settings_service.settings.storage_chunk_size
         self.set_ready()
 
     def build_full_path(self, flow_id: str, file_name: str) -> str:
@@ -26,10 +34,29 @@ class StorageService(Service):
     async def save_file(self, flow_id: str, file_name: str, data) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def save_file_stream(
+        self, flow_id: str, file_name: Optional[str], chunks: AsyncIterator[bytes]
+    ) -> StoredFile:
+        """Saves the chunks as they arrive and hashes them on the way. Without a file name
+        the file is named after its SHA-256."""
+        raise NotImplementedError
+
     @abstractmethod
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         raise NotImplementedError
 
+    @abstractmethod
+    def stream_file(
+        self, flow_id: str, file_name: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Yields the bytes from `start` to `end` (inclusive, like HTTP ranges) in chunks of `chunk_size`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_file_size(self, flow_id: str, file_name: str) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     async def list_files(self, flow_id: str) -> list[str]:
         raise NotImplementedError
@@ -1,5 +1,35 @@
+import re
+from typing import Optional, Tuple
+
 from langflow.services.storage.constants import EXTENSION_TO_CONTENT_TYPE
 
 
 def build_content_type_from_extension(extension: str):
     return EXTENSION_TO_CONTENT_TYPE.get(extension.lower(), "application/octet-stream")
+
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range_header(range_header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Returns the first and last byte (inclusive) of a single range `Range` header.
+
+    Returns None when the header is missing or not a single byte range, in which case the
+    whole file is sent. Raises ValueError when the range is outside of the file.
+    """
+    match = RANGE_PATTERN.match(range_header.strip()) if range_header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # The last `last` bytes of the file
+        start, end = max(file_size - int(last), 0), file_size - 1
+    else:
+        start = int(first)
+        end = min(int(last), file_size - 1) if last else file_size - 1
+    if start >= file_size or start > end:
+        raise ValueError(f"Range {range_header} is not satisfiable for a file of {file_size} bytes")
+    return start, end
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from cachetools import LRUCache
+
+RequestKey = Tuple[str, str, str]
+
+
+def request_key(url: str, api_key: Optional[str] = None, params: Optional[Mapping[str, Any]] = None) -> RequestKey:
+    """Identifies a GET request to the store. Only a digest of the API key is kept."""
+    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else ""
+    return url, key_hash, json.dumps(params or {}, sort_keys=True, default=str)
+
+
+class CachedResponse(NamedTuple):
+    data: List[Dict[str, Any]]
+    metadata: Dict[str, Any]
+    etag: Optional[str]
+    fetched_at: float
+
+
+class StoreResponseCache:
+    """
+    Keeps the responses of public store requests (listings, counts and tags) for `ttl` seconds.
+
+    Expired responses that came with an ETag are kept until they are evicted, so that the next
+    request can revalidate them with `If-None-Match` instead of downloading them again.
+    A `ttl` of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: int = 60, maxsize: int = 256):
+        self.ttl = ttl
+        self.enabled = ttl > 0 and maxsize > 0
+        self._responses: LRUCache = LRUCache(maxsize=max(maxsize, 1))
+        self._lock = threading.Lock()
+
+    def get(self, key: RequestKey) -> Optional[CachedResponse]:
+        """Returns the cached response, fresh or not. Use `is_fresh` to know if it can be used as is."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._responses.get(key)
+
+    def is_fresh(self, cached: CachedResponse) -> bool:
+        return time.monotonic() - cached.fetched_at < self.ttl
+
+    def set(
+        self, key: RequestKey, data: List[Dict[str, Any]], metadata: Dict[str, Any], etag: Optional[str] = None
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._responses[key] = CachedResponse(data, metadata, etag, time.monotonic())
+
+    def revalidated(self, key: RequestKey) -> Optional[CachedResponse]:
+        """Marks a response the store reported as not modified as fresh again."""
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None:
+                cached = self._responses[key] = cached._replace(fetched_at=time.monotonic())
+            return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+    def __len__(self) -> int:
+        return len(self._responses)
@@ -1,3 +1,6 @@
+import asyncio
+import copy
+import importlib.util
 import json
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from uuid import UUID
@@ -7,6 +10,7 @@ from httpx import HTTPError, HTTPStatusError
 from loguru import logger
 
 from langflow.services.base import Service
+from langflow.services.store.cache import RequestKey, StoreResponseCache, request_key
 from langflow.services.store.exceptions import APIKeyError, FilterError, ForbiddenError
 from langflow.services.store.schema import (
     CreateComponentResponse,
@@ -97,6 +101,48 @@ class StoreService(Service):
             "last_tested_version",
             "private",
         ]
+        settings = self.settings_service.settings
+        # Public listings and tags are the same for every user, so they are cached per process
+        self.response_cache = StoreResponseCache(ttl=settings.store_cache_ttl, maxsize=settings.store_cache_size)
+        self.http2 = settings.store_http2 and importlib.util.find_spec("h2") is not None
+        if settings.store_http2 and not self.http2:
+            logger.debug("HTTP/2 is disabled for the store because the h2 package is not installed")
+        self.limits = httpx.Limits(
+            max_connections=settings.store_max_connections,
+            max_keepalive_connections=settings.store_max_connections,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Identical GET requests that are running, shared by every caller that makes them meanwhile
+        self._in_flight: Dict[RequestKey, asyncio.Task] = {}
+        self._closing: Optional[asyncio.Task] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Returns the client shared by every request to the store, so connections are reused."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            # The connections of a client can't be used from another event loop. The old client
+            # is left to the garbage collector because its loop may not be running anymore
+            self._client = httpx.AsyncClient(http2=self.http2, limits=self.limits)
+            self._client_loop = loop
+            self._in_flight = {}
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def teardown(self):
+        self.response_cache.clear()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._client is not None and loop is not None and loop is self._client_loop:
+            self._closing = loop.create_task(self.aclose())
+        else:
+            self._client = None
 
     # Create a context manager that will use the api key to
     # get the user data and all requests inside the context manager
@@ -122,19 +168,57 @@ class StoreService(Service):
     async def _get(
         self, url: str, api_key: Optional[str] = None, params: Optional[Dict[str, Any]] = None
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
-        """Utility method to perform GET requests."""
+        """Utility method to perform GET requests.
+
+        Requests without an API key are served from the response cache while they are fresh,
+        and concurrent identical requests share a single call to the store."""
+        key = request_key(url, api_key, params)
+        cacheable = api_key is None and self.response_cache.enabled
+        if cacheable and (cached := self.response_cache.get(key)) and self.response_cache.is_fresh(cached):
+            return copy.deepcopy((cached.data, cached.metadata))
+
+        self._get_client()
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, url, api_key, params, cacheable))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget_request(key, done))
+        # A caller that is cancelled doesn't cancel the request for the others
+        result, metadata = await asyncio.shield(task)
+        return copy.deepcopy((result, metadata))
+
+    def _forget_request(self, key: RequestKey, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Retrieved here so that a failure nobody waited for isn't logged as never retrieved
+            task.exception()
+
+    async def _fetch(
+        self,
+        key: RequestKey,
+        url: str,
+        api_key: Optional[str],
+        params: Optional[Dict[str, Any]],
+        cacheable: bool,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         if api_key:
             headers = {"Authorization": f"Bearer {api_key}"}
         else:
             headers = {}
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
-            except HTTPError as exc:
-                raise exc
-            except Exception as exc:
-                raise ValueError(f"GET failed: {exc}")
+        cached = self.response_cache.get(key) if cacheable else None
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        try:
+            response = await self._get_client().get(url, headers=headers, params=params)
+            if response.status_code == 304 and cached is not None:
+                revalidated = self.response_cache.revalidated(key) or cached
+                return revalidated.data, revalidated.metadata
+            response.raise_for_status()
+        except HTTPError as exc:
+            raise exc
+        except Exception as exc:
+            raise ValueError(f"GET failed: {exc}")
         json_response = response.json()
         result = json_response["data"]
         metadata = {}
@@ -142,7 +226,9 @@ class StoreService(Service):
             metadata = json_response["meta"]
 
         if isinstance(result, dict):
-            return [result], metadata
+            result = [result]
+        if cacheable:
+            self.response_cache.set(key, result, metadata, etag=response.headers.get("ETag"))
         return result, metadata
 
     async def call_webhook(self, api_key: str, webhook_url: str, component_id: UUID) -> None:
@@ -150,9 +236,10 @@ class StoreService(Service):
         # For now we are calling it just for testing
         try:
             headers = {"Authorization": f"Bearer {api_key}"}
-            async with httpx.AsyncClient() as client:
-                response = await client.post(webhook_url, headers=headers, json={"component_id": str(component_id)})
-                response.raise_for_status()
+            response = await self._get_client().post(
+                webhook_url, headers=headers, json={"component_id": str(component_id)}
+            )
+            response.raise_for_status()
             return response.json()
         except HTTPError as exc:
             raise exc
@@ -358,9 +445,10 @@ class StoreService(Service):
         try:
             # response = httpx.post(self.components_url, headers=headers, json=component_dict)
             # response.raise_for_status()
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.components_url, headers=headers, json=component_dict)
-                response.raise_for_status()
+            response = await self._get_client().post(self.components_url, headers=headers, json=component_dict)
+            response.raise_for_status()
+            # The listings now include the new component
+            self.response_cache.clear()
             component = response.json()["data"]
             return CreateComponentResponse(**component)
         except HTTPError as exc:
@@ -392,11 +480,11 @@ class StoreService(Service):
         try:
             # response = httpx.post(self.components_url, headers=headers, json=component_dict)
             # response.raise_for_status()
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    self.components_url + f"/{component_id}", headers=headers, json=component_dict
-                )
-                response.raise_for_status()
+            response = await self._get_client().patch(
+                self.components_url + f"/{component_id}", headers=headers, json=component_dict
+            )
+            response.raise_for_status()
+            self.response_cache.clear()
             component = response.json()["data"]
             return CreateComponentResponse(**component)
         except HTTPError as exc:
@@ -458,13 +546,14 @@ class StoreService(Service):
         # )
 
         # response.raise_for_status()
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.like_webhook_url,
-                json={"component_id": str(component_id)},
-                headers=headers,
-            )
-            response.raise_for_status()
+        response = await self._get_client().post(
+            self.like_webhook_url,
+            json={"component_id": str(component_id)},
+            headers=headers,
+        )
+        response.raise_for_status()
+        # The like counts of the cached listings are out of date
+        self.response_cache.clear()
         if response.status_code == 200:
             result = response.json()
 
@@ -2,7 +2,7 @@ import asyncio
 import os
 import traceback
 from collections import defaultdict
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, Dict, Optional
 from uuid import UUID
@@ -36,6 +36,7 @@ class TracingService(Service):
         self.logs_queue: asyncio.Queue = asyncio.Queue()
         self.running = False
         self.worker_task = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def log_worker(self):
         while self.running or not self.logs_queue.empty():
@@ -48,14 +49,19 @@ class TracingService(Service):
                 self.logs_queue.task_done()
 
     async def start(self):
-        if self.running:
-            return
         try:
-            self.running = True
-            self.worker_task = asyncio.create_task(self.log_worker())
+            self._start_worker(asyncio.get_running_loop())
         except Exception as e:
             logger.error(f"Error starting tracing service: {e}")
 
+    def _start_worker(self, loop: asyncio.AbstractEventLoop):
+        if self.running:
+            return
+        self.running = True
+        # Logs added from other threads are handed to this loop
+        self._loop = loop
+        self.worker_task = loop.create_task(self.log_worker())
+
     async def flush(self):
         try:
             await self.logs_queue.join()
@@ -66,9 +72,11 @@ class TracingService(Service):
         try:
             self.running = False
             await self.flush()
-            self.worker_task.cancel()
             if self.worker_task:
-                await self.worker_task
+                self.worker_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self.worker_task
+                self.worker_task = None
         except Exception as e:
             logger.error(f"Error stopping tracing service: {e}")
 
@@ -138,6 +146,9 @@ class TracingService(Service):
         await self.stop()
 
     async def _add_log(self, trace_name: str, log: Log):
+        self._log(trace_name, log)
+
+    def _log(self, trace_name: str, log: Log):
         for tracer in self._tracers.values():
             if not tracer.ready:
                 continue
@@ -147,9 +158,26 @@ class TracingService(Service):
                 logger.error(f"Error adding log to trace {trace_name}: {e}")
 
     def add_log(self, trace_name: str, log: Log):
-        if not self.running:
-            asyncio.run(self.start())
-        self.logs_queue.put_nowait((self._add_log, (trace_name, log)))
+        item = (self._add_log, (trace_name, log))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            # Logs added from the event loop, e.g. by async output methods
+            self._start_worker(loop)
+            self.logs_queue.put_nowait(item)
+        elif self._loop is not None and self._loop.is_running():
+            # Sync output methods run in worker threads and asyncio.Queue is not thread-safe,
+            # so the log is queued by the loop of the worker
+            self._loop.call_soon_threadsafe(self._enqueue, self._loop, item)
+        else:
+            # No event loop runs the worker
+            self._log(trace_name, log)
+
+    def _enqueue(self, loop: asyncio.AbstractEventLoop, item):
+        self._start_worker(loop)
+        self.logs_queue.put_nowait(item)
 
     @asynccontextmanager
     async def trace_context(
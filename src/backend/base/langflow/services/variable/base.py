@@ -6,6 +6,7 @@ from sqlmodel import Session
 
 from langflow.services.base import Service
 from langflow.services.database.models.variable.model import Variable
+from langflow.services.variable.cache import VariableCache
 
 
 class VariableService(Service):
@@ -15,6 +16,8 @@ class VariableService(Service):
 
     name = "variable_service"
 
+    variable_cache: VariableCache
+
     @abc.abstractmethod
     def initialize_user_variables(self, user_id: Union[UUID, str], session: Session) -> None:
         """
@@ -40,6 +43,26 @@ class VariableService(Service):
             The value of the variable.
         """
 
+    @abc.abstractmethod
+    def prefetch_variables(self, user_id: Union[UUID, str], names: list[str], session: Session) -> None:
+        """
+        Load variables of a user in one round trip, so that `get_variable` serves them from the cache.
+
+        Args:
+            user_id: The user ID.
+            names: The names of the variables.
+            session: The database session.
+        """
+
+    def invalidate_variables(self, user_id: Union[UUID, str]) -> None:
+        """
+        Drop the cached variables of a user. Must be called whenever one of them changes.
+
+        Args:
+            user_id: The user ID.
+        """
+        self.variable_cache.invalidate(user_id)
+
     @abc.abstractmethod
     def list_variables(self, user_id: Union[UUID, str], session: Session) -> list[Optional[str]]:
         """
@@ -0,0 +1,52 @@
+import threading
+from typing import Dict, NamedTuple, Optional, Union
+from uuid import UUID
+
+from cachetools import TTLCache
+
+
+class ResolvedVariable(NamedTuple):
+    type: Optional[str]
+    value: str
+
+
+class VariableCache:
+    """
+    Keeps the decrypted variables of recently active users for `ttl` seconds.
+
+    Variables are cached per user so changing any variable of a user drops all of them.
+    The cache belongs to the process, so changes made by other workers are only seen
+    once the variables expire. A `ttl` of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: int = 10, maxsize: int = 1024):
+        self.enabled = ttl > 0
+        self._users: TTLCache = TTLCache(maxsize=maxsize, ttl=max(ttl, 1))
+        # Components may resolve variables from worker threads
+        self._lock = threading.Lock()
+
+    def get(self, user_id: Union[UUID, str], name: str) -> Optional[ResolvedVariable]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            variables = self._users.get(str(user_id))
+            return variables.get(name) if variables is not None else None
+
+    def update(self, user_id: Union[UUID, str], variables: Dict[str, ResolvedVariable]) -> None:
+        if not self.enabled or not variables:
+            return
+        with self._lock:
+            cached = self._users.get(str(user_id))
+            if cached is None:
+                self._users[str(user_id)] = dict(variables)
+            else:
+                # Adding variables doesn't extend the life of the ones already cached
+                cached.update(variables)
+
+    def invalidate(self, user_id: Union[UUID, str]) -> None:
+        with self._lock:
+            self._users.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
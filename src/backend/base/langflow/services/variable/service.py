@@ -11,6 +11,7 @@ from langflow.services.base import Service
 from langflow.services.database.models.variable.model import Variable, VariableCreate
 from langflow.services.deps import get_session
 from langflow.services.variable.base import VariableService
+from langflow.services.variable.cache import ResolvedVariable, VariableCache
 from langflow.services.variable.kubernetes_secrets import KubernetesSecretManager, encode_user_id
 
 if TYPE_CHECKING:
@@ -20,9 +21,19 @@ CREDENTIAL_TYPE = "Credential"
 GENERIC_TYPE = "Generic"
 
 
+def check_variable_field(name: str, variable: ResolvedVariable, field: str) -> str:
+    if variable.type == CREDENTIAL_TYPE and field == "session_id":
+        raise TypeError(
+            f"variable {name} of type 'Credential' cannot be used in a Session ID field "
+            "because its purpose is to prevent the exposure of values."
+        )
+    return variable.value
+
+
 class DatabaseVariableService(VariableService, Service):
     def __init__(self, settings_service: "SettingsService"):
         self.settings_service = settings_service
+        self.variable_cache = VariableCache(ttl=settings_service.settings.variable_cache_ttl)
 
     def initialize_user_variables(self, user_id: Union[UUID, str], session: Session = Depends(get_session)):
         # Check for environment variables that should be stored in the database
@@ -60,21 +71,36 @@ class DatabaseVariableService(VariableService, Service):
         field: str,
         session: Session = Depends(get_session),
     ) -> str:
-        # we get the credential from the database
-        # credential = session.query(Variable).filter(Variable.user_id == user_id, Variable.name == name).first()
-        variable = session.exec(select(Variable).where(Variable.user_id == user_id, Variable.name == name)).first()
+        variable = self.variable_cache.get(user_id, name)
+        if variable is None:
+            # we get the credential from the database
+            db_variable = session.exec(
+                select(Variable).where(Variable.user_id == user_id, Variable.name == name)
+            ).first()
+            if not db_variable or not db_variable.value:
+                raise ValueError(f"{name} variable not found.")
+            variable = self._decrypt(db_variable)
+            self.variable_cache.update(user_id, {name: variable})
+        return check_variable_field(name, variable, field)
 
-        if variable.type == CREDENTIAL_TYPE and field == "session_id":  # type: ignore
-            raise TypeError(
-                f"variable {name} of type 'Credential' cannot be used in a Session ID field "
-                "because its purpose is to prevent the exposure of values."
-            )
+    def prefetch_variables(
+        self, user_id: Union[UUID, str], names: list[str], session: Session = Depends(get_session)
+    ) -> None:
+        names = [name for name in set(names) if self.variable_cache.get(user_id, name) is None]
+        if not names:
+            return
+        db_variables = session.exec(
+            select(Variable).where(Variable.user_id == user_id, Variable.name.in_(names))  # type: ignore
+        ).all()
+        self.variable_cache.update(
+            user_id, {variable.name: self._decrypt(variable) for variable in db_variables if variable.value}
+        )
 
+    def _decrypt(self, variable: Variable) -> ResolvedVariable:
         # we decrypt the value
-        if not variable or not variable.value:
-            raise ValueError(f"{name} variable not found.")
-        decrypted = auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
-        return decrypted
+        return ResolvedVariable(
+            variable.type, auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+        )
 
     def list_variables(self, user_id: Union[UUID, str], session: Session = Depends(get_session)) -> list[Optional[str]]:
         variables = session.exec(select(Variable).where(Variable.user_id == user_id)).all()
@@ -95,6 +121,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         session.commit()
         session.refresh(variable)
+        self.invalidate_variables(user_id)
         return variable
 
     def delete_variable(
@@ -108,6 +135,7 @@ class DatabaseVariableService(VariableService, Service):
             raise ValueError(f"{name} variable not found.")
         session.delete(variable)
         session.commit()
+        self.invalidate_variables(user_id)
         return variable
 
     def create_variable(
@@ -129,6 +157,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         session.commit()
         session.refresh(variable)
+        self.invalidate_variables(user_id)
         return variable
 
 
@@ -137,6 +166,7 @@ class KubernetesSecretService(VariableService, Service):
         self.settings_service = settings_service
         # TODO: settings_service to set kubernetes namespace
         self.kubernetes_secrets = KubernetesSecretManager()
+        self.variable_cache = VariableCache(ttl=settings_service.settings.variable_cache_ttl)
 
     def initialize_user_variables(self, user_id: Union[UUID, str], session: Session):
         # Check for environment variables that should be stored in the database
@@ -192,14 +222,31 @@ class KubernetesSecretService(VariableService, Service):
         field: str,
         _session: Session,
     ) -> str:
-        secret_name = encode_user_id(user_id)
-        key, value = self.resolve_variable(secret_name, user_id, name)
-        if key.startswith(CREDENTIAL_TYPE + "_") and field == "session_id":  # type: ignore
-            raise TypeError(
-                f"variable {name} of type 'Credential' cannot be used in a Session ID field "
-                "because its purpose is to prevent the exposure of values."
+        variable = self.variable_cache.get(user_id, name)
+        if variable is None:
+            secret_name = encode_user_id(user_id)
+            key, value = self.resolve_variable(secret_name, user_id, name)
+            variable = ResolvedVariable(
+                CREDENTIAL_TYPE if key.startswith(CREDENTIAL_TYPE + "_") else GENERIC_TYPE, value
             )
-        return value
+            self.variable_cache.update(user_id, {name: variable})
+        return check_variable_field(name, variable, field)
+
+    def prefetch_variables(self, user_id: Union[UUID, str], names: list[str], _session: Session) -> None:
+        if all(self.variable_cache.get(user_id, name) is not None for name in names):
+            return
+        # All the variables of a user live in the same secret, so they are cached together
+        variables = self.kubernetes_secrets.get_secret(name=encode_user_id(user_id))
+        if not variables:
+            return
+        resolved = {}
+        for key, value in variables.items():
+            # Like in resolve_variable, a key without the credential prefix takes precedence
+            if key.startswith(CREDENTIAL_TYPE + "_"):
+                resolved.setdefault(key[len(CREDENTIAL_TYPE) + 1 :], ResolvedVariable(CREDENTIAL_TYPE, value))
+            else:
+                resolved[key] = ResolvedVariable(GENERIC_TYPE, value)
+        self.variable_cache.update(user_id, resolved)
 
     def list_variables(
         self,
@@ -227,7 +274,9 @@ class KubernetesSecretService(VariableService, Service):
     ):
         secret_name = encode_user_id(user_id)
         secret_key, _ = self.resolve_variable(secret_name, user_id, name)
-        return self.kubernetes_secrets.update_secret(name=secret_name, data={secret_key: value})
+        secret = self.kubernetes_secrets.update_secret(name=secret_name, data={secret_key: value})
+        self.invalidate_variables(user_id)
+        return secret
 
     def delete_variable(
         self,
@@ -238,6 +287,7 @@ class KubernetesSecretService(VariableService, Service):
         secret_name = encode_user_id(user_id)
         secret_key, _ = self.resolve_variable(secret_name, user_id, name)
         self.kubernetes_secrets.delete_secret_key(name=secret_name, key=secret_key)
+        self.invalidate_variables(user_id)
         return
 
     def create_variable(
@@ -257,6 +307,7 @@ class KubernetesSecretService(VariableService, Service):
             _type = GENERIC_TYPE
 
         self.kubernetes_secrets.upsert_secret(secret_name=secret_name, data={secret_key: value})
+        self.invalidate_variables(user_id)
 
         variable_base = VariableCreate(
             name=name,
@@ -163,6 +163,12 @@ class Output(BaseModel):
 
     cache: bool = Field(default=True)
 
+    memoize: Optional[bool] = Field(default=None)
+    """Whether the result of the output is reused for the same inputs. Defaults to the `memoize` of the component."""
+
+    run_in_thread: Optional[bool] = Field(default=None)
+    """Set to False to keep a sync method on the event loop when the component thread pool is enabled."""
+
     def to_dict(self):
         return self.model_dump(by_alias=True, exclude_none=True)
 
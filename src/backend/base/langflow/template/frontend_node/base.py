@@ -43,6 +43,8 @@ class FrontendNode(BaseModel):
     """List of conditional paths for the frontend node."""
     frozen: bool = False
     """Whether the frontend node is frozen."""
+    memoize: bool = False
+    """Whether the results of the frontend node are reused for the same inputs."""
     outputs: List[Output] = []
     """List of output fields for the frontend node."""
 
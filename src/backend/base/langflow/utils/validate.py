@@ -278,6 +278,12 @@ def get_default_imports(code_string):
     necessary_imports = find_names_in_code(code_string, langflow_imports)
     langflow_module = importlib.import_module("langflow.field_typing")
     default_imports.update({name: getattr(langflow_module, name) for name in necessary_imports})
+    # Building the bundled components used to leave these in the globals of this module, so code that
+    # doesn't import them worked once the components were loaded
+    custom_imports = find_names_in_code(code_string, ["Component", "CustomComponent"])
+    if custom_imports:
+        custom_module = importlib.import_module("langflow.custom")
+        default_imports.update({name: getattr(custom_module, name) for name in custom_imports})
 
     return default_imports
 
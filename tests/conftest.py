@@ -102,6 +102,19 @@ class Config:
     result_backend = "redis://localhost:6379/0"
 
 
+@pytest.fixture
+def component_thread_pool(monkeypatch):
+    """Runs sync output methods in a thread pool of their own, which is disabled by default."""
+    from langflow.custom import executor
+    from langflow.services.deps import get_settings_service
+
+    monkeypatch.setattr(get_settings_service().settings, "component_thread_pool_size", 8)
+    monkeypatch.setattr(executor, "_executor", None)
+    yield
+    if executor._executor is not None:
+        executor._executor.shutdown(wait=False)
+
+
 @pytest.fixture(name="load_flows_dir")
 def load_flows_dir():
     tempdir = tempfile.TemporaryDirectory()
@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from langflow.custom import Component
+from langflow.custom.utils import build_custom_component_template
+
+
+def synthetic_node(vertex_id: str, value: str = "") -> dict:
+    """Builds a minimal Component node with a single Text input and a single Text output."""
+    return {
+        "id": vertex_id,
+        "data": {
+            "id": vertex_id,
+            "type": "Synthetic",
+            "node": {
+                "display_name": vertex_id,
+                "base_classes": ["Text"],
+                "outputs": [{"name": "text_output", "types": ["Text"], "selected": "Text", "method": "build_text"}],
+                "template": {
+                    "_type": "Component",
+                    "input_value": {
+                        "type": "str",
+                        "show": True,
+                        "list": True,
+                        "required": False,
+                        "input_types": ["Text"],
+                        "value": value,
+                    },
+                },
+            },
+        },
+    }
+
+
+def synthetic_edge(source_id: str, target_id: str) -> dict:
+    return {
+        "source": source_id,
+        "target": target_id,
+        "data": {
+            "sourceHandle": {"dataType": "Synthetic", "id": source_id, "name": "text_output", "output_types": ["Text"]},
+            "targetHandle": {"fieldName": "input_value", "id": target_id, "inputTypes": ["Text"], "type": "str"},
+        },
+    }
+
+
+def synthetic_flow(
+    vertex_ids: Iterable[str], connections: Iterable[Tuple[str, str]], values: Optional[Dict[str, str]] = None
+) -> dict:
+    """Builds the payload of a flow from a list of vertex ids and (source, target) pairs."""
+    values = values or {}
+    return {
+        "nodes": [synthetic_node(vertex_id, values.get(vertex_id, "")) for vertex_id in vertex_ids],
+        "edges": [synthetic_edge(source_id, target_id) for source_id, target_id in connections],
+    }
+
+
+def component_node(vertex_id: str, code: str, frozen: bool = False) -> dict:
+    """Builds the node of the component defined by `code`. The type is the part of the id before the dash."""
+    template, _ = build_custom_component_template(Component(code=code))
+    template["frozen"] = frozen
+    return {"id": vertex_id, "data": {"id": vertex_id, "type": vertex_id.split("-")[0], "node": template}}
+
+
+def component_edge(source_id: str, output: str, target_id: str, field: str) -> dict:
+    """Connects the `output` of a component to its `field` of another one, both carrying Messages."""
+    return {
+        "source": source_id,
+        "target": target_id,
+        "data": {
+            "sourceHandle": {
+                "dataType": source_id.split("-")[0],
+                "id": source_id,
+                "name": output,
+                "output_types": ["Message"],
+            },
+            "targetHandle": {"fieldName": field, "id": target_id, "inputTypes": ["Message"], "type": "str"},
+        },
+    }
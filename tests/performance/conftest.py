@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import pytest
+
+from flow_payloads import synthetic_flow
+
+
+def chains_flow(n_chains: int, depth: int) -> dict:
+    """`n_chains` independent chains of `depth` vertices each. Vertex ids are `Synthetic-<chain>x<position>`."""
+    vertex_ids: List[str] = []
+    connections: List[Tuple[str, str]] = []
+    for chain in range(n_chains):
+        for position in range(depth):
+            vertex_ids.append(f"Synthetic-{chain}x{position}")
+            if position:
+                connections.append((f"Synthetic-{chain}x{position - 1}", f"Synthetic-{chain}x{position}"))
+    return synthetic_flow(vertex_ids, connections)
+
+
+def layered_flow(n_layers: int, width: int) -> dict:
+    """`n_layers` layers of `width` vertices where every vertex is connected to every vertex of the next layer."""
+    vertex_ids = [f"Synthetic-{layer}x{index}" for layer in range(n_layers) for index in range(width)]
+    connections = [
+        (f"Synthetic-{layer}x{source}", f"Synthetic-{layer + 1}x{target}")
+        for layer in range(n_layers - 1)
+        for source in range(width)
+        for target in range(width)
+    ]
+    return synthetic_flow(vertex_ids, connections)
+
+
+def diamonds_flow(n_diamonds: int, width: int = 2) -> dict:
+    """A chain of `n_diamonds` diamonds: each fans out to `width` vertices that fan back in to a single vertex."""
+    vertex_ids = ["Synthetic-0"]
+    connections: List[Tuple[str, str]] = []
+    for diamond in range(n_diamonds):
+        source_id, sink_id = f"Synthetic-{diamond}", f"Synthetic-{diamond + 1}"
+        for index in range(width):
+            branch_id = f"Synthetic-{diamond}b{index}"
+            vertex_ids.append(branch_id)
+            connections += [(source_id, branch_id), (branch_id, sink_id)]
+        vertex_ids.append(sink_id)
+    return synthetic_flow(vertex_ids, connections)
+
+
+@pytest.fixture
+def synthetic_flows():
+    """Builders of synthetic flow payloads, to be loaded with `Graph.from_payload`."""
+    return SimpleNamespace(custom=synthetic_flow, chains=chains_flow, layered=layered_flow, diamonds=diamonds_flow)
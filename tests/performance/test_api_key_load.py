@@ -0,0 +1,90 @@
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from langflow.services.database.models.api_key import ApiKey, ApiKeyCreate
+from langflow.services.database.models.api_key import cache as api_key_cache
+from langflow.services.database.models.api_key.crud import create_api_key, verify_api_key
+from langflow.services.database.models.user.model import User
+
+pytestmark = pytest.mark.noclient
+
+N_REQUESTS = 400
+N_WORKERS = 16
+
+usage_threads: list[threading.Thread] = []
+
+
+def update_total_uses(session: Session, api_key: ApiKey):
+    """How each use was counted before, in a session of its own because it runs in another thread."""
+    with Session(session.get_bind()) as new_session:
+        new_api_key = new_session.get(ApiKey, api_key.id)
+        if new_api_key is None:
+            raise ValueError("API Key not found")
+        new_api_key.total_uses += 1
+        new_api_key.last_used_at = datetime.datetime.now(datetime.timezone.utc)
+        new_session.add(new_api_key)
+        new_session.commit()
+
+
+def check_key_with_a_thread_per_use(session: Session, api_key: str):
+    """How keys were checked before: a SELECT on the key, then a thread per request updating its use count."""
+    api_key_object = session.exec(select(ApiKey).where(ApiKey.api_key == api_key)).first()
+    if api_key_object is not None:
+        thread = threading.Thread(target=update_total_uses, args=(session, api_key_object))
+        thread.start()
+        usage_threads.append(thread)
+        return api_key_object.user
+    return None
+
+
+def run_load(engine, verify, api_key: str) -> tuple[float, int]:
+    """Verifies the key N_REQUESTS times from N_WORKERS request threads, like concurrent /run requests."""
+    started_threads = threading.active_count()
+    peak_threads = 0
+
+    def request(_):
+        nonlocal peak_threads
+        with Session(engine) as session:
+            assert verify(session, api_key) is not None
+        peak_threads = max(peak_threads, threading.active_count() - started_threads)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(N_WORKERS) as executor:
+        list(executor.map(request, range(N_REQUESTS)))
+    elapsed = time.perf_counter() - start
+    # Let the usage writes of the old implementation finish
+    for thread in usage_threads:
+        thread.join()
+    return elapsed, peak_threads
+
+
+def test_api_key_verification_under_load(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'load.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(username="load", password="password")
+        session.add(user)
+        session.commit()
+        api_key = create_api_key(session, ApiKeyCreate(name="load"), user_id=user.id).api_key
+    usage = api_key_cache.ApiKeyUsage(flush_interval=0.2)
+    monkeypatch.setattr(api_key_cache, "_api_key_cache", api_key_cache.ApiKeyCache(ttl=60))
+    monkeypatch.setattr(api_key_cache, "_api_key_usage", usage)
+
+    before, before_threads = run_load(engine, check_key_with_a_thread_per_use, api_key)
+    after, after_threads = run_load(engine, verify_api_key, api_key)
+    usage.stop()
+
+    print(
+        f"\n{N_REQUESTS} requests: {before * 1000 / N_REQUESTS:.2f} ms per request and up to {before_threads} "
+        f"extra threads before, {after * 1000 / N_REQUESTS:.2f} ms and {after_threads} after"
+    )
+    assert after < before
+    with Session(engine) as session:
+        stored = session.exec(select(ApiKey)).one()
+        # Concurrent updates of the old implementation lose some of the uses
+        assert stored.total_uses >= N_REQUESTS
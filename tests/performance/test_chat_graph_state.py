@@ -0,0 +1,112 @@
+import pytest
+
+from langflow.graph import Graph
+from langflow.graph.schema import ResultData
+from langflow.services.cache.service import RedisCache
+from langflow.services.chat.service import ChatService
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.noclient
+
+FLOW_ID = "flow"
+
+
+def counting_chat_service(server) -> tuple[ChatService, list]:
+    """A ChatService on a fake Redis server that records the size of every value it writes."""
+    cache = RedisCache(client=fakeredis.FakeAsyncRedis(server=server), sync_client=fakeredis.FakeRedis(server=server))
+    written: list = []
+    encode = cache.codec.encode
+
+    def counting_encode(value):
+        data = encode(value)
+        written.append(len(data))
+        return data
+
+    cache.codec.encode = counting_encode  # type: ignore
+    chat_service = ChatService()
+    chat_service.cache_service = cache
+    return chat_service, written
+
+
+def fake_build(graph: Graph, vertex_id: str):
+    """Sets what building a vertex sets, without running a component."""
+    vertex = graph.get_vertex(vertex_id)
+    text = f"{vertex_id} " * 100
+    vertex._built = True
+    vertex._built_object = text
+    vertex._built_result = text
+    vertex.results = {"text_output": text}
+    vertex.artifacts = {"text_output": {"repr": text, "raw": text, "type": "text"}}
+    graph.run_manager.remove_from_predecessors(vertex_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n_vertices", [50, 200])
+async def test_graph_run_state_bytes_per_build(synthetic_flows, n_vertices):
+    server = fakeredis.FakeServer()
+    payload = synthetic_flows.chains(n_chains=5, depth=n_vertices // 5)
+
+    # Before: the whole graph was saved after each vertex
+    graph = Graph.from_payload(payload, flow_id=FLOW_ID)
+    graph.sort_vertices()
+    chat_service, full_graph_bytes = counting_chat_service(server)
+    for vertex in graph.vertices:
+        fake_build(graph, vertex.id)
+        await chat_service.set_cache(FLOW_ID, graph)
+
+    # Now: the graph is saved once and each vertex only saves its own changes
+    graph = Graph.from_payload(payload, flow_id=FLOW_ID)
+    graph.sort_vertices()
+    chat_service, run_state_bytes = counting_chat_service(server)
+    await chat_service.set_graph(FLOW_ID, graph)
+    for vertex in graph.vertices:
+        fake_build(graph, vertex.id)
+        await chat_service.set_graph_run_state(FLOW_ID, graph, [vertex.id])
+
+    full, deltas = sum(full_graph_bytes), sum(run_state_bytes)
+    print(f"\n{n_vertices} vertices: {full:,} bytes per build with full graphs, {deltas:,} with run state")
+    assert deltas * 5 < full
+
+    # Another worker gets the graph with the state of every vertex
+    other_worker, _ = counting_chat_service(server)
+    cached_graph = await other_worker.get_graph(FLOW_ID)
+    assert cached_graph is not None and cached_graph is not graph
+    for vertex in graph.vertices:
+        cached_vertex = cached_graph.get_vertex(vertex.id)
+        assert cached_vertex._built
+        assert cached_vertex.results == vertex.results
+        assert cached_vertex.graph is cached_graph
+    assert dict(cached_graph.run_manager.run_predecessors) == dict(graph.run_manager.run_predecessors)
+    assert cached_graph._run_id == graph._run_id
+
+
+@pytest.mark.asyncio
+async def test_build_vertex_caches_results_without_the_graph(synthetic_flows, monkeypatch):
+    sizes = {}
+    for n_vertices in (50, 200):
+        graph = Graph.from_payload(synthetic_flows.chains(n_chains=5, depth=n_vertices // 5), flow_id=FLOW_ID)
+        graph.sort_vertices()
+        chat_service, written = counting_chat_service(fakeredis.FakeServer())
+        for vertex in graph.vertices:
+
+            async def build(vertex=vertex, **kwargs):
+                fake_build(graph, vertex.id)
+                vertex.result = ResultData(results=vertex.results)
+
+            monkeypatch.setattr(vertex, "build", build)
+            await graph.build_vertex(chat_service, vertex.id)
+        sizes[n_vertices] = max(written)
+
+        # A frozen vertex reuses the cached result
+        vertex = graph.vertices[-1]
+        vertex.frozen = True
+        vertex._built_object = None
+        monkeypatch.setattr(vertex, "build", None)
+        await graph.build_vertex(chat_service, vertex.id)
+        assert vertex._built_object == f"{vertex.id} " * 100
+        assert vertex.result.used_frozen_result
+
+    print(f"\nLargest vertex result written: {sizes[50]:,} bytes with 50 vertices, {sizes[200]:,} with 200")
+    # The size of each write doesn't grow with the graph
+    assert sizes[200] < sizes[50] * 1.5
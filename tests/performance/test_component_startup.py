@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from langflow.custom.directory_reader import utils
+from langflow.services.deps import get_settings_service
+
+pytestmark = pytest.mark.noclient
+
+N_FILES = 120
+
+COMPONENT = """from langflow.custom import Component
+from langflow.io import Output, TextInput
+from langflow.schema.message import Message
+
+
+class Generated{index}Component(Component):
+    display_name = "Generated {index}"
+    description = "Generated component {index}."
+    inputs = [TextInput(name="input_value", display_name="Input")]
+    outputs = [Output(display_name="Message", name="message", method="build_message")]
+
+    def build_message(self) -> Message:
+        return Message(text=self.input_value)
+"""
+
+
+def timed_build(path: str) -> tuple[float, dict]:
+    start = time.perf_counter()
+    components = utils.build_custom_component_list_from_path(path)
+    return time.perf_counter() - start, components
+
+
+def test_component_startup_with_manifest(tmp_path, monkeypatch):
+    for index in range(N_FILES):
+        menu = tmp_path / "components" / f"menu{index % 4}"
+        menu.mkdir(parents=True, exist_ok=True)
+        (menu / f"generated_{index}.py").write_text(COMPONENT.format(index=index))
+    path = str(tmp_path / "components")
+    settings = get_settings_service().settings
+    monkeypatch.setattr(settings, "config_dir", str(tmp_path / "config"))
+
+    # How components were built before: every file, one after the other
+    monkeypatch.setattr(settings, "cache_components_manifest", False)
+    monkeypatch.setattr(settings, "components_build_workers", 1)
+    serial, expected = timed_build(path)
+
+    monkeypatch.setattr(settings, "cache_components_manifest", True)
+    cold, components = timed_build(path)
+    assert components == expected
+    warm, components = timed_build(path)
+    assert components == expected
+
+    (tmp_path / "components" / "menu0" / "generated_0.py").write_text(COMPONENT.format(index="Changed"))
+    one_changed, components = timed_build(path)
+    assert components["menu0"]["Generated 0"]["display_name"] == "Generated Changed"
+
+    print(
+        f"\n{N_FILES} component files: {serial:.2f}s built serially, {cold:.2f}s on a cold manifest, "
+        f"{warm:.3f}s warm, {one_changed:.3f}s with one file changed"
+    )
+    assert warm < serial / 5
+    assert one_changed < serial / 5
@@ -0,0 +1,73 @@
+import time
+
+import chardet
+import pytest
+
+from langflow.base.data.manifest import IngestionManifest
+from langflow.base.data.utils import parallel_load_data, read_text_file, retrieve_file_paths
+
+pytestmark = pytest.mark.noclient
+
+
+def read_text_file_with_full_detection(file_path: str) -> str:
+    """How read_text_file detected the encoding before: chardet over the whole file."""
+    with open(file_path, "rb") as f:
+        encoding = chardet.detect(f.read())["encoding"]
+        if encoding in ["Windows-1252", "Windows-1254", "MacRoman"]:
+            encoding = "utf-8"
+    with open(file_path, "r", encoding=encoding) as f:
+        return f.read()
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for index in range(300):
+        (tmp_path / f"notes-{index}.md").write_text(f"# Note {index}\n\n" + "Some markdown text. " * 1000)
+        (tmp_path / f"data-{index}.json").write_text(
+            '{"values": [' + ",".join(str(index + i) for i in range(2000)) + "]}"
+        )
+    return tmp_path
+
+
+def test_repeated_runs_use_the_manifest(directory):
+    file_paths = retrieve_file_paths(str(directory), load_hidden=False, recursive=False, depth=0)
+    manifest = IngestionManifest()
+
+    start = time.perf_counter()
+    first = parallel_load_data(file_paths, False, 4, manifest=manifest)
+    first_run = time.perf_counter() - start
+
+    start = time.perf_counter()
+    second = parallel_load_data(file_paths, False, 4, manifest=manifest)
+    second_run = time.perf_counter() - start
+
+    # One file changed since the last run
+    (directory / "notes-0.md").write_text("changed")
+    third = parallel_load_data(file_paths, False, 4, manifest=manifest)
+
+    print(
+        f"\n{len(file_paths)} files: first run {first_run * 1000:.0f} ms, "
+        f"unchanged {second_run * 1000:.0f} ms ({manifest.hits} cache hits)"
+    )
+    assert [data.text for data in first] == [data.text for data in second]
+    assert manifest.hits == len(file_paths) + len(file_paths) - 1
+    assert "changed" in [data.text for data in third]
+
+
+def test_encoding_detection_on_a_sample(tmp_path):
+    file_path = tmp_path / "large.txt"
+    file_path.write_bytes(("Texte accentué écrit en français. " * 15_000).encode("latin-1"))
+
+    start = time.perf_counter()
+    sampled = read_text_file(str(file_path))
+    sample_detection = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full = read_text_file_with_full_detection(str(file_path))
+    full_detection = time.perf_counter() - start
+
+    print(
+        f"\n{file_path.stat().st_size / 1e6:.1f} MB latin-1 file: detection on the whole file "
+        f"{full_detection * 1000:.0f} ms, on a sample {sample_detection * 1000:.0f} ms"
+    )
+    assert sampled == full
@@ -0,0 +1,79 @@
+import pickle
+import time
+
+import pytest
+
+from langflow.graph import Graph
+
+pytestmark = pytest.mark.noclient
+
+
+def sort_without_plans(graph: Graph):
+    """What sort_vertices did on every call before plans were cached."""
+    graph._execution_plans.clear()
+    return graph.sort_vertices()
+
+
+def test_sorting_does_not_change_the_graph_maps(synthetic_flows):
+    graph = Graph.from_payload(synthetic_flows.diamonds(n_diamonds=5, width=3))
+    in_degree_map = dict(graph.in_degree_map)
+
+    first_layer = graph.sort_vertices()
+    layers = [list(layer) for layer in graph.sorted_vertices_layers]
+
+    assert dict(graph.in_degree_map) == in_degree_map
+    # A second sort uses the same plan and gives the same order
+    plan = graph.get_execution_plan()
+    assert graph.sort_vertices() == first_layer
+    assert graph.sorted_vertices_layers == layers
+    assert graph.get_execution_plan() is plan
+    # Runs change their run state, not the plan
+    graph.run_manager.remove_from_predecessors("Synthetic-0")
+    graph.vertices_layers.clear()
+    assert plan.run_predecessors["Synthetic-0b0"] == ("Synthetic-0",)
+    assert graph.sort_vertices() == first_layer
+    assert graph.vertices_layers == layers[1:]
+
+
+def test_plans_are_keyed_by_structure_start_and_stop(synthetic_flows):
+    graph = Graph.from_payload(synthetic_flows.chains(n_chains=2, depth=4))
+
+    full = graph.get_execution_plan()
+    up_to = graph.get_execution_plan(stop_component_id="Synthetic-0x1")
+    from_start = graph.get_execution_plan(start_component_id="Synthetic-0x2")
+    assert len({full.key, up_to.key, from_start.key}) == 3
+    assert up_to.vertices_to_run == {"Synthetic-0x0", "Synthetic-0x1"}
+    assert from_start.vertices_to_run == {"Synthetic-0x0", "Synthetic-0x1", "Synthetic-0x2", "Synthetic-0x3"}
+
+    # Compiled graphs are pickled with their plans
+    copied_graph = pickle.loads(pickle.dumps(graph))
+    assert copied_graph.get_execution_plan() == full
+
+    # A new connection changes the structure, so the plan is computed again
+    updated = synthetic_flows.chains(n_chains=2, depth=4)
+    updated["edges"].append(synthetic_flows.custom([], [("Synthetic-0x3", "Synthetic-1x0")])["edges"][0])
+    graph.update(Graph.from_payload(updated))
+    plan = graph.get_execution_plan()
+    assert plan.key[0] != full.key[0]
+    assert list(graph._execution_plans) == [plan.key]
+    assert graph.sort_vertices() == ["Synthetic-0x0"]
+
+
+@pytest.mark.parametrize("n_layers,width", [(20, 10), (50, 10)])
+def test_cached_plans_are_faster_than_sorting(synthetic_flows, n_layers, width):
+    graph = Graph.from_payload(synthetic_flows.layered(n_layers=n_layers, width=width))
+    expected = graph.sort_vertices()
+
+    start = time.perf_counter()
+    for _ in range(20):
+        assert sort_without_plans(graph) == expected
+    sorting = (time.perf_counter() - start) / 20
+
+    graph.sort_vertices()
+    start = time.perf_counter()
+    for _ in range(20):
+        assert graph.sort_vertices() == expected
+    cached = (time.perf_counter() - start) / 20
+
+    print(f"\n{n_layers * width} vertices: sorting {sorting * 1000:.2f} ms, cached plan {cached * 1000:.2f} ms")
+    assert cached < sorting
@@ -0,0 +1,90 @@
+import shutil
+import time
+
+import numpy as np
+import pytest
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from langflow.base.vectorstores.faiss_registry import FaissIndexRegistry
+
+faiss = pytest.importorskip("faiss")
+pytestmark = pytest.mark.noclient
+
+DIMENSIONS = 128
+VECTORS = 200_000
+
+
+class RandomEmbeddings(Embeddings):
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return np.random.default_rng(len(text)).random(DIMENSIONS, dtype="float32").tolist()
+
+
+@pytest.fixture(scope="module")
+def index_folder(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("faiss")
+    index = faiss.IndexFlatL2(DIMENSIONS)
+    index.add(np.random.default_rng(0).random((VECTORS, DIMENSIONS), dtype="float32"))
+    ids = [str(position) for position in range(VECTORS)]
+    docstore = InMemoryDocstore({id_: Document(page_content=f"document {id_}") for id_ in ids})
+    FAISS(RandomEmbeddings(), index, docstore, dict(enumerate(ids))).save_local(str(folder), "index")
+    return folder
+
+
+def test_searches_reuse_the_loaded_index(index_folder):
+    embeddings = RandomEmbeddings()
+    searches = 5
+
+    start = time.perf_counter()
+    for _ in range(searches):
+        vector_store = FAISS.load_local(str(index_folder), embeddings, "index", allow_dangerous_deserialization=True)
+        reloaded = vector_store.similarity_search("query", k=4)
+    reload_time = (time.perf_counter() - start) / searches
+
+    registry = FaissIndexRegistry()
+    start = time.perf_counter()
+    for _ in range(searches):
+        vector_store = registry.get(str(index_folder), "index", embeddings, allow_dangerous_deserialization=True)
+        cached = vector_store.similarity_search("query", k=4)
+    cached_time = (time.perf_counter() - start) / searches
+
+    print(
+        f"\n{VECTORS} vectors: load and search {reload_time * 1000:.0f} ms, "
+        f"search with the registry {cached_time * 1000:.0f} ms"
+    )
+    assert reloaded == cached
+    assert registry.loads == 1
+
+
+def test_adding_documents_writes_a_delta(index_folder, tmp_path):
+    for file_name in ("index.faiss", "index.pkl"):
+        shutil.copy(index_folder / file_name, tmp_path / file_name)
+    embeddings = RandomEmbeddings()
+    registry = FaissIndexRegistry()
+    loaded = registry.get(str(tmp_path), "index", embeddings, allow_dangerous_deserialization=True)
+    documents = [loaded.docstore.search(id_) for id_ in loaded.index_to_docstore_id.values()]
+    # The first update identifies the documents of the index by their content
+    start = time.perf_counter()
+    registry.update(str(tmp_path), "index", embeddings, [*documents, Document(page_content="first document")])
+    first_time = time.perf_counter() - start
+    documents.extend([Document(page_content="first document"), Document(page_content="new document")])
+
+    start = time.perf_counter()
+    vector_store = registry.update(str(tmp_path), "index", embeddings, documents)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector_store.save_local(str(tmp_path), "rewritten")
+    rewrite_time = time.perf_counter() - start
+
+    print(
+        f"\nAdding a document to {VECTORS} vectors: {first_time * 1000:.0f} ms the first time, "
+        f"{add_time * 1000:.0f} ms afterwards, rewriting {rewrite_time * 1000:.0f} ms"
+    )
+    assert vector_store.index.ntotal == VECTORS + 2
+    assert (tmp_path / "index.delta-000002.faiss").exists()
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from langflow.graph import Graph
+
+pytestmark = pytest.mark.noclient
+
+
+def query_edges(graph: Graph):
+    """Runs the edge lookups that building and sorting a graph do for every vertex."""
+    for vertex in graph.vertices:
+        assert graph._validate_vertex(vertex)
+        vertex.outgoing_edges
+        vertex.incoming_edges
+        vertex.edges_source_names
+        graph.get_vertices_with_target(vertex.id)
+        for successor_id in graph.successor_map.get(vertex.id, []):
+            assert graph.get_edge(vertex.id, successor_id) is not None
+    graph.topological_sort()
+
+
+def scan_edges(graph: Graph):
+    """The same lookups done by scanning every edge of the graph."""
+    for vertex in graph.vertices:
+        [edge for edge in graph.edges if vertex.id in (edge.source_id, edge.target_id)]
+        [edge for edge in graph.edges if edge.source_id == vertex.id]
+        [edge for edge in graph.edges if edge.target_id == vertex.id]
+        for successor_id in graph.successor_map.get(vertex.id, []):
+            next(edge for edge in graph.edges if edge.source_id == vertex.id and edge.target_id == successor_id)
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("n_vertices", [500, 1000, 2000])
+def test_edge_lookups_scale_linearly(synthetic_flows, n_vertices):
+    graph = Graph.from_payload(synthetic_flows.chains(n_chains=n_vertices // 10, depth=10))
+
+    indexed = timed(query_edges, graph)
+    scanned = timed(scan_edges, graph)
+
+    print(f"\n{n_vertices} vertices: indexed {indexed:.3f}s, scanned {scanned:.3f}s")
+    assert indexed < scanned / 5
+
+
+def test_edge_indexes_follow_graph_changes(synthetic_flows):
+    graph = Graph.from_payload(synthetic_flows.layered(n_layers=3, width=3))
+    vertex = graph.get_vertex("Synthetic-1x0")
+
+    graph.remove_vertex(vertex.id)
+    assert graph.get_edge("Synthetic-0x0", vertex.id) is None
+    assert all(edge.target_id != vertex.id for edge in graph.get_vertex("Synthetic-0x0").outgoing_edges)
+    assert len(graph.get_vertex("Synthetic-2x0").incoming_edges) == 2
+
+    # The edges of a vertex come from its graph
+    graph.add_vertex(Graph.from_payload(synthetic_flows.layered(n_layers=3, width=3)).get_vertex(vertex.id))
+    assert graph.get_edge("Synthetic-0x0", vertex.id) is not None
+    assert len(graph.get_vertex("Synthetic-2x0").incoming_edges) == 3
+    assert len(graph.get_vertex_edges(vertex.id)) == 6
+
+    other = Graph.from_payload(synthetic_flows.layered(n_layers=2, width=3))
+    graph.update(other)
+    assert graph.get_vertex_edges("Synthetic-1x0") == other.get_vertex_edges("Synthetic-1x0")
+    assert sorted(edge.source_id for edge in graph.edges) == sorted(edge.source_id for edge in other.edges)
+
+    unpickled = Graph.__new__(Graph)
+    unpickled.__setstate__(graph.__getstate__())
+    assert len(unpickled.get_vertex_edges("Synthetic-1x0")) == 3
+    assert unpickled.get_edge("Synthetic-0x1", "Synthetic-1x2") is not None
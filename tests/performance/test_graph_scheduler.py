@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from langflow.graph import Graph
+
+pytestmark = pytest.mark.noclient
+
+SLOW = 0.05
+FAST = 0.005
+
+
+def fake_build(graph: Graph, durations: dict[str, float], built: list[str], concurrency: dict[str, int]):
+    """Replaces Graph.build_vertex with a coroutine that sleeps and checks that the predecessors are built."""
+
+    async def build_vertex(chat_service, vertex_id, **kwargs):
+        vertex = graph.get_vertex(vertex_id)
+        for predecessor_id in graph.predecessor_map.get(vertex_id, []):
+            assert predecessor_id in built, f"{vertex_id} started before {predecessor_id} was built"
+        concurrency["current"] += 1
+        concurrency["max"] = max(concurrency["max"], concurrency["current"])
+        await asyncio.sleep(durations[vertex_id])
+        concurrency["current"] -= 1
+        built.append(vertex_id)
+        return None, "", True, {}, vertex
+
+    graph.build_vertex = build_vertex  # type: ignore
+
+
+async def run_scheduler(payload: dict, durations: dict[str, float], scheduler: str, max_in_flight: int = 0):
+    graph = Graph.from_payload(payload)
+    built: list[str] = []
+    concurrency = {"current": 0, "max": 0}
+    fake_build(graph, durations, built, concurrency)
+    start = time.perf_counter()
+    await graph.process(fallback_to_env_vars=False, scheduler=scheduler, max_in_flight=max_in_flight)
+    elapsed = time.perf_counter() - start
+    assert sorted(built) == sorted(durations)
+    return elapsed, concurrency["max"]
+
+
+def skewed_durations(n_chains: int, depth: int) -> dict[str, float]:
+    # Every layer has one slow vertex, but each chain only has depth / n_chains of them
+    return {
+        f"Synthetic-{chain}x{position}": SLOW if (chain + position) % n_chains == 0 else FAST
+        for chain in range(n_chains)
+        for position in range(depth)
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n_chains, depth", [(8, 4), (4, 20)], ids=["wide", "deep"])
+async def test_streaming_scheduler_does_not_wait_for_layers(synthetic_flows, n_chains, depth):
+    payload = synthetic_flows.chains(n_chains, depth)
+    durations = skewed_durations(n_chains, depth)
+
+    layered, _ = await run_scheduler(payload, durations, "layered")
+    streaming, _ = await run_scheduler(payload, durations, "streaming")
+
+    print(f"\n{n_chains} chains x {depth}: layered {layered:.3f}s, streaming {streaming:.3f}s")
+    assert layered >= depth * SLOW
+    assert streaming < layered * 0.75
+
+
+@pytest.mark.asyncio
+async def test_streaming_scheduler_respects_dependencies(synthetic_flows):
+    payload = synthetic_flows.layered(n_layers=4, width=3)
+    durations = {node["id"]: FAST for node in payload["nodes"]}
+
+    await run_scheduler(payload, durations, "streaming")
+
+
+@pytest.mark.asyncio
+async def test_streaming_scheduler_max_in_flight(synthetic_flows):
+    payload = synthetic_flows.chains(n_chains=10, depth=2)
+    durations = {node["id"]: FAST for node in payload["nodes"]}
+
+    _, unlimited = await run_scheduler(payload, durations, "streaming")
+    _, limited = await run_scheduler(payload, durations, "streaming", max_in_flight=3)
+
+    assert unlimited == 10
+    assert limited == 3
@@ -0,0 +1,107 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from langflow.schema.message import Message
+from langflow.services.monitor import service as monitor_service_module
+from langflow.services.monitor.service import MonitorService
+from langflow.services.monitor.utils import add_rows_to_table
+
+pytestmark = pytest.mark.noclient
+
+N_MESSAGES = 10_000
+N_SESSIONS = 5
+N_READS = 50
+LIMIT = 100
+
+
+def get_messages_with_dataframe(service: MonitorService, session_id: str, limit: int) -> list[Message]:
+    """How the chat history was read before: concatenated SQL, a pandas DataFrame and a Message per row."""
+    query = (
+        "SELECT index, flow_id, sender_name, sender, session_id, text, files, timestamp FROM messages"
+        f" WHERE session_id = '{session_id}' ORDER BY timestamp DESC LIMIT {limit}"
+    )
+    with service.connection() as conn:
+        df = conn.execute(query).df()
+    return [
+        Message(
+            text=row.text,
+            sender=row.sender,
+            session_id=row.session_id,
+            sender_name=row.sender_name,
+            timestamp=row.timestamp,
+        )
+        for row in df[::-1].itertuples()
+    ]
+
+
+def get_messages(service: MonitorService, session_id: str, limit: int) -> list[Message]:
+    """What langflow.memory.get_messages does with the monitor service."""
+    records = service.get_messages(session_id=session_id, limit=limit, buffered=True)[::-1]
+    return [
+        Message(
+            text=record["text"],
+            sender=record["sender"],
+            session_id=record["session_id"],
+            sender_name=record["sender_name"],
+            timestamp=record["timestamp"],
+        )
+        for record in records
+    ]
+
+
+def time_reads(read, service: MonitorService, session_id: str) -> float:
+    start = time.perf_counter()
+    for _ in range(N_READS):
+        messages = read(service, session_id, LIMIT)
+    elapsed = (time.perf_counter() - start) / N_READS
+    assert len(messages) == LIMIT
+    assert messages[-1].text == f"{session_id} message {N_MESSAGES - 1}"
+    return elapsed
+
+
+def test_chat_history_reads_of_long_sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor_service_module, "user_cache_dir", lambda *args: str(tmp_path))
+    settings = SimpleNamespace(
+        monitor_queue_size=10_000,
+        monitor_batch_size=500,
+        monitor_flush_interval=1.0,
+        monitor_queue_full_policy="block",
+        message_buffer_size=LIMIT,
+        message_buffer_sessions=1000,
+    )
+    service = MonitorService(SimpleNamespace(settings=settings))
+    start_time = datetime(2024, 1, 1)
+    rows = [
+        {
+            "flow_id": "flow",
+            "timestamp": (start_time + timedelta(seconds=index)).strftime("%Y-%m-%d %H:%M:%S"),
+            "sender": "User",
+            "sender_name": "User",
+            "session_id": f"session-{session}",
+            "text": f"session-{session} message {index}",
+            "files": "[]",
+        }
+        for session in range(N_SESSIONS)
+        for index in range(N_MESSAGES)
+    ]
+    with service.connection() as conn:
+        assert add_rows_to_table(conn, "messages", rows) == len(rows)
+
+    try:
+        dataframe = time_reads(get_messages_with_dataframe, service, "session-0")
+        # A buffer of size 0 is disabled
+        service.message_buffer.size = 0
+        without_buffer = time_reads(get_messages, service, "session-1")
+        service.message_buffer.size = LIMIT
+        with_buffer = time_reads(get_messages, service, "session-2")
+    finally:
+        service.teardown()
+
+    print(
+        f"\nLast {LIMIT} of {N_MESSAGES} messages: DataFrame {dataframe * 1000:.2f} ms, "
+        f"parameterized {without_buffer * 1000:.2f} ms, session buffer {with_buffer * 1000:.2f} ms"
+    )
+    assert with_buffer < dataframe
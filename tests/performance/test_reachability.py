@@ -0,0 +1,106 @@
+import time
+from collections import deque
+
+import pytest
+
+from langflow.graph import Graph
+from langflow.graph.graph.reachability import ReachabilityIndex
+
+pytestmark = pytest.mark.noclient
+
+
+def recursive_successors(vertex) -> list:
+    """How get_all_successors and sort_up_to_vertex expanded successors before: once per path."""
+    successors_result = []
+    for successor in vertex.successors:
+        successors_result.extend(recursive_successors(successor))
+        successors_result.append(successor)
+    return successors_result
+
+
+def walk(successor_map: dict, vertex_id: str) -> set:
+    seen: set = set()
+    queue = deque(successor_map.get(vertex_id, []))
+    while queue:
+        current = queue.popleft()
+        if current not in seen:
+            seen.add(current)
+            queue.extend(successor_map.get(current, []))
+    return seen
+
+
+def test_reachability_index_matches_a_graph_walk():
+    successor_map = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": ["e"], "e": ["c", "f"], "g": ["g"], "h": []}
+    vertex_ids = list("abcdefgh")
+    predecessor_map: dict = {}
+    for source, targets in successor_map.items():
+        for target in targets:
+            predecessor_map.setdefault(target, []).append(source)
+
+    index = ReachabilityIndex(vertex_ids, successor_map)
+
+    for vertex_id in vertex_ids:
+        assert set(index.descendants(vertex_id)) == walk(successor_map, vertex_id)
+        assert set(index.ancestors(vertex_id)) == walk(predecessor_map, vertex_id)
+    # c, d and e are a cycle, g has a self loop
+    assert index.reaches("c", "c") and index.reaches("g", "g")
+    assert not index.reaches("b", "a") and not index.reaches("h", "h")
+    assert set(index.descendants("b", "g")) == {"c", "d", "e", "f", "g"}
+
+
+def test_graph_queries_use_the_index(synthetic_flows):
+    graph = Graph.from_payload(synthetic_flows.diamonds(n_diamonds=6, width=3))
+    first = graph.get_vertex("Synthetic-0")
+
+    successors = graph.get_all_successors(first)
+    assert sorted(vertex.id for vertex in successors) == sorted({vertex.id for vertex in recursive_successors(first)})
+    assert len(successors) == len({vertex.id for vertex in successors})
+
+    # Everything downstream of the stopped vertex is excluded
+    kept = {vertex.id for vertex in graph.sort_up_to_vertex("Synthetic-3")}
+    assert kept == {vertex.id for vertex in graph.vertices if not graph.reachability.reaches("Synthetic-3", vertex.id)}
+
+    graph.mark_branch("Synthetic-4", "INACTIVE")
+    inactive = {vertex.id for vertex in graph.vertices if vertex.state.name == "INACTIVE"}
+    assert inactive == {"Synthetic-4", *graph.reachability.descendants("Synthetic-4")}
+
+    # The index follows changes of the graph
+    updated = synthetic_flows.diamonds(n_diamonds=6, width=3)
+    updated["edges"] = [edge for edge in updated["edges"] if edge["target"] != "Synthetic-5"]
+    graph.update(Graph.from_payload(updated))
+    assert not graph.reachability.reaches("Synthetic-0", "Synthetic-5")
+
+
+@pytest.mark.parametrize("n_diamonds,width", [(12, 2), (8, 4)])
+def test_successors_of_layered_diamonds(synthetic_flows, n_diamonds, width):
+    graph = Graph.from_payload(synthetic_flows.diamonds(n_diamonds=n_diamonds, width=width))
+    first = graph.get_vertex("Synthetic-0")
+
+    start = time.perf_counter()
+    expanded = recursive_successors(first)
+    recursive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph._reachability = None
+    successors = graph.get_all_successors(first)
+    indexed = time.perf_counter() - start
+
+    print(
+        f"\n{n_diamonds} diamonds of width {width}: recursive {recursive:.3f}s ({len(expanded)} visits), "
+        f"index {indexed * 1000:.2f} ms ({len(successors)} successors)"
+    )
+    assert {vertex.id for vertex in successors} == {vertex.id for vertex in expanded}
+    assert indexed < recursive
+
+
+def test_deep_diamonds_stay_fast(synthetic_flows):
+    graph = Graph.from_payload(synthetic_flows.diamonds(n_diamonds=500, width=4))
+
+    start = time.perf_counter()
+    successors = graph.get_all_successors(graph.get_vertex("Synthetic-0"))
+    graph.sort_vertices(stop_component_id="Synthetic-250")
+    graph.mark_branch("Synthetic-250", "INACTIVE")
+    elapsed = time.perf_counter() - start
+
+    print(f"\n500 diamonds of width 4: successors, sort up to a vertex and mark_branch in {elapsed:.3f}s")
+    assert len(successors) == len(graph.vertices) - 1
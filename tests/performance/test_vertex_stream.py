@@ -0,0 +1,105 @@
+import inspect
+import json
+import sys
+import time
+import uuid
+
+import pytest
+
+from langflow.api.v1.chat import build_vertex_stream
+from langflow.components.outputs.ChatOutput import ChatOutput
+from langflow.graph import Graph
+from langflow.services.deps import get_settings_service
+
+from flow_payloads import component_edge, component_node
+
+pytestmark = pytest.mark.noclient
+
+N_TOKENS = 50_000
+
+FAKE_LLM_CODE = f"""
+import asyncio
+
+from langflow.custom import Component
+from langflow.schema.message import Message
+from langflow.template.field.base import Output
+
+
+class FakeLLM(Component):
+    display_name = "Fake LLM"
+    outputs = [Output(display_name="Text", name="text_output", method="stream_text")]
+
+    def stream_text(self) -> Message:
+        async def tokens():
+            for index in range({N_TOKENS}):
+                # A token every few microseconds, like a fast model on a local network
+                if index % 50 == 0:
+                    await asyncio.sleep(0)
+                yield f"t{{index}} "
+
+        return Message(text=tokens())
+"""
+
+
+class GraphCache:
+    """The part of ChatService the stream endpoint uses."""
+
+    def __init__(self, graph: Graph):
+        self.graph = graph
+
+    async def get_graph(self, key):
+        return self.graph
+
+    async def set_graph_run_state(self, key, graph, vertex_ids):
+        pass
+
+
+async def build_streaming_graph(flow_id: str) -> Graph:
+    payload = {
+        "nodes": [
+            component_node("FakeLLM-1", FAKE_LLM_CODE),
+            component_node("ChatOutput-1", inspect.getsource(sys.modules[ChatOutput.__module__])),
+        ],
+        "edges": [component_edge("FakeLLM-1", "text_output", "ChatOutput-1", "input_value")],
+    }
+    graph = Graph.from_payload(payload, flow_id=flow_id)
+    for vertex_id in ("FakeLLM-1", "ChatOutput-1"):
+        await graph.get_vertex(vertex_id).build(fallback_to_env_vars=False)
+    return graph
+
+
+async def replay_stream(monkeypatch, interval: float) -> tuple[float, int, str, dict]:
+    """Streams the fake LLM through the endpoint and returns the time, SSE frames, message and close event."""
+    monkeypatch.setattr(get_settings_service().settings, "stream_chunk_interval", interval)
+    flow_id = uuid.uuid4()
+    graph = await build_streaming_graph(str(flow_id))
+
+    start = time.perf_counter()
+    response = await build_vertex_stream(
+        flow_id=flow_id, vertex_id="ChatOutput-1", chat_service=GraphCache(graph), session_service=None
+    )
+    frames = [frame async for frame in response.body_iterator]
+    elapsed = time.perf_counter() - start
+
+    events = [frame.split("\n")[1].removeprefix("data: ") for frame in frames]
+    chunks = [json.loads(event).get("chunk", "") for event in events[1:-1]]
+    return elapsed, len(frames), "".join(chunks), json.loads(events[-1])
+
+
+@pytest.mark.asyncio
+async def test_stream_50k_tokens_through_the_endpoint(monkeypatch):
+    expected = "".join(f"t{index} " for index in range(N_TOKENS))
+
+    per_token, per_token_frames, per_token_message, _ = await replay_stream(monkeypatch, interval=0)
+    coalesced, coalesced_frames, coalesced_message, close = await replay_stream(monkeypatch, interval=0.05)
+
+    print(
+        f"\n{N_TOKENS} tokens: one frame per token {per_token:.2f} s ({per_token_frames} frames), "
+        f"coalesced {coalesced:.2f} s ({coalesced_frames} frames, "
+        f"{close['metrics']['tokens_per_second']:.0f} tokens/s)"
+    )
+    assert per_token_message == coalesced_message == expected
+    assert per_token_frames == N_TOKENS + 2
+    assert coalesced_frames < N_TOKENS // 10
+    assert close["metrics"]["tokens"] == N_TOKENS
+    assert close["metrics"]["characters"] == len(expected)
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from langflow.services.database.models.api_key import ApiKey, ApiKeyCreate
+from langflow.services.database.models.api_key import cache as api_key_cache
+from langflow.services.database.models.api_key.crud import create_api_key, delete_api_key, verify_api_key
+from langflow.services.database.models.user.model import User
+
+pytestmark = pytest.mark.noclient
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def usage(monkeypatch):
+    usage = api_key_cache.ApiKeyUsage(flush_interval=3600)
+    monkeypatch.setattr(api_key_cache, "_api_key_cache", api_key_cache.ApiKeyCache(ttl=60))
+    monkeypatch.setattr(api_key_cache, "_api_key_usage", usage)
+    yield usage
+    usage.stop()
+
+
+def test_verified_api_keys_are_cached(session, usage):
+    user = User(username="api-key-user", password="password")
+    session.add(user)
+    session.commit()
+    api_key = create_api_key(session, ApiKeyCreate(name="key"), user_id=user.id)
+    queries: list[str] = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    for _ in range(5):
+        assert verify_api_key(session, api_key.api_key).id == user.id
+    assert verify_api_key(session, "sk-invalid") is None
+    # Only the first request looked the key up
+    assert sum("FROM apikey" in query for query in queries) == 2
+    assert not any(query.startswith("UPDATE") for query in queries)
+
+    assert usage.flush() == 1
+    stored = session.get(ApiKey, api_key.id)
+    session.refresh(stored)
+    assert stored.total_uses == 5
+    assert stored.last_used_at is not None
+
+    delete_api_key(session, api_key.id)
+    assert verify_api_key(session, api_key.api_key) is None
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from langflow.graph import Graph
+
+from flow_payloads import component_node
+
+pytestmark = [pytest.mark.noclient, pytest.mark.usefixtures("component_thread_pool")]
+
+CODE = """
+import time
+
+from langflow.custom import Component, cache_per_build
+from langflow.template.field.base import Output
+
+
+class ConcurrentProbe(Component):
+    display_name = "Concurrent Probe"
+    concurrent_outputs = {concurrent}
+    outputs = [
+        Output(display_name="Slow", name="slow_output", method="slow"),
+        Output(display_name="Fast", name="fast_output", method="fast"),
+    ]
+
+    @cache_per_build
+    def setup(self) -> str:
+        self.setup_calls = getattr(self, "setup_calls", 0) + 1
+        time.sleep(0.1)
+        return "index"
+
+    def slow(self) -> str:
+        index = self.setup()
+        time.sleep(0.2)
+        self.status = "slow status"
+        self.log("slow log")
+        return f"slow {{index}}"
+
+    def fast(self) -> str:
+        index = self.setup()
+        time.sleep(0.15)
+        self.status = "fast status"
+        self.log("fast log")
+        return f"fast {{index}}"
+"""
+
+
+def build_graph(concurrent: bool) -> Graph:
+    payload = {"nodes": [component_node("ConcurrentProbe-1", CODE.format(concurrent=concurrent))], "edges": []}
+    return Graph.from_payload(payload)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrent", [True, False])
+async def test_concurrent_outputs_are_deterministic(concurrent):
+    graph = build_graph(concurrent)
+    vertex = graph.get_vertex("ConcurrentProbe-1")
+
+    start = time.perf_counter()
+    await vertex.build(fallback_to_env_vars=False)
+    elapsed = time.perf_counter() - start
+
+    component = vertex._custom_component
+    assert component.setup_calls == 1
+    assert list(vertex.results) == ["slow_output", "fast_output"]
+    assert vertex.results == {"slow_output": "slow index", "fast_output": "fast index"}
+    # Each artifact gets the status set by its own output and the logs keep the output order
+    assert [artifact["raw"] for artifact in vertex.artifacts.values()] == ["slow status", "fast status"]
+    assert [log["message"] for log in component._logs] == ["slow log", "fast log"]
+    assert component.status == "fast status"
+    if concurrent:
+        # The setup is shared and the outputs overlap instead of taking 0.1 + 0.2 + 0.15 seconds
+        assert elapsed < 0.4
@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from langflow.custom.executor import run_in_component_executor
+from langflow.services.deps import get_settings_service
+from langflow.template.field.base import Output
+
+pytestmark = [pytest.mark.noclient, pytest.mark.usefixtures("component_thread_pool")]
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+
+class SlowComponent:
+    pass
+
+
+class OtherComponent:
+    pass
+
+
+def blocking_call(concurrency: dict, duration: float = 0.05) -> str:
+    with concurrency["lock"]:
+        concurrency["current"] += 1
+        concurrency["max"] = max(concurrency["max"], concurrency["current"])
+    time.sleep(duration)
+    with concurrency["lock"]:
+        concurrency["current"] -= 1
+    return threading.current_thread().name
+
+
+def new_concurrency() -> dict:
+    return {"lock": threading.Lock(), "current": 0, "max": 0}
+
+
+@pytest.mark.asyncio
+async def test_sync_methods_do_not_block_the_event_loop():
+    concurrency = new_concurrency()
+    released = threading.Event()
+
+    def wait_for_the_event_loop() -> str:
+        with concurrency["lock"]:
+            concurrency["current"] += 1
+            concurrency["max"] = max(concurrency["max"], concurrency["current"])
+        # Only the event loop releases the calls, so they return only if it keeps running
+        assert released.wait(timeout=10)
+        return threading.current_thread().name
+
+    async def release_when_all_are_running():
+        while concurrency["current"] < 4:
+            await asyncio.sleep(0.001)
+        released.set()
+
+    thread_names, _ = await asyncio.wait_for(
+        asyncio.gather(
+            asyncio.gather(*[run_in_component_executor(wait_for_the_event_loop) for _ in range(4)]),
+            release_when_all_are_running(),
+        ),
+        timeout=10,
+    )
+
+    assert all(name.startswith("langflow-component") for name in thread_names)
+    assert concurrency["max"] == 4
+
+
+@pytest.mark.asyncio
+async def test_sync_methods_run_on_the_event_loop_by_default(monkeypatch):
+    monkeypatch.setattr(get_settings_service().settings, "component_thread_pool_size", 0)
+
+    assert await run_in_component_executor(lambda: threading.current_thread().name) == threading.current_thread().name
+
+
+def test_outputs_serialize_run_in_thread_only_when_set():
+    assert "run_in_thread" not in Output(name="output", method="build").to_dict()
+    assert Output(name="output", method="build", run_in_thread=False).to_dict()["run_in_thread"] is False
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_per_component_class():
+    slow, other = new_concurrency(), new_concurrency()
+
+    await asyncio.gather(
+        *[run_in_component_executor(blocking_call, slow, component_class=SlowComponent, limit=2) for _ in range(6)],
+        *[run_in_component_executor(blocking_call, other, component_class=OtherComponent, limit=4) for _ in range(6)],
+    )
+
+    assert slow["max"] == 2
+    assert other["max"] == 4
+
+
+@pytest.mark.asyncio
+async def test_context_is_propagated_to_the_thread():
+    request_id.set("request-1")
+
+    assert await run_in_component_executor(request_id.get) == "request-1"
+
+
+class RecordingTracer:
+    ready = True
+
+    def __init__(self):
+        self.logs = []
+
+    def add_log(self, trace_name, log):
+        self.logs.append((trace_name, log["message"], threading.current_thread().name))
+
+
+@pytest.mark.asyncio
+async def test_logs_of_sync_methods_are_handed_to_the_event_loop():
+    from langflow.services.tracing.service import TracingService
+
+    tracing_service = TracingService(None, None)  # type: ignore
+    tracer = tracing_service._tracers["recording"] = RecordingTracer()  # type: ignore
+    await tracing_service.start()
+
+    await asyncio.gather(
+        *[run_in_component_executor(tracing_service.add_log, "trace", {"message": f"log {i}"}) for i in range(4)]
+    )
+    await asyncio.wait_for(tracing_service.flush(), timeout=5)
+    assert sorted(message for _, message, _ in tracer.logs) == ["log 0", "log 1", "log 2", "log 3"]
+    # The logs were processed by the worker of the tracing service
+    assert {thread_name for _, _, thread_name in tracer.logs} == {threading.current_thread().name}
+    await tracing_service.stop()
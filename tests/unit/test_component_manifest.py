@@ -0,0 +1,108 @@
+import pytest
+
+from langflow.custom.directory_reader import utils
+from langflow.custom.directory_reader.manifest import ComponentManifest, get_sources_signature
+from langflow.services.deps import get_settings_service
+
+pytestmark = pytest.mark.noclient
+
+COMPONENT = """from langflow.custom import Component
+from langflow.io import Output, TextInput
+from langflow.schema.message import Message
+
+
+class {name}Component(Component):
+    display_name = "{name}"
+    inputs = [TextInput(name="input_value", display_name="Input")]
+    outputs = [Output(display_name="Message", name="message", method="build_message")]
+
+    def build_message(self) -> Message:
+        return Message(text=self.input_value)
+"""
+
+
+@pytest.fixture
+def components_path(tmp_path, monkeypatch):
+    settings = get_settings_service().settings
+    monkeypatch.setattr(settings, "config_dir", str(tmp_path / "config"))
+    monkeypatch.setattr(settings, "cache_components_manifest", True)
+    monkeypatch.setattr(settings, "components_build_workers", 1)
+    menu = tmp_path / "components" / "generated"
+    menu.mkdir(parents=True)
+    for name in ("First", "Second", "Third"):
+        (menu / f"{name.lower()}.py").write_text(COMPONENT.format(name=name))
+    (menu / "broken.py").write_text("def build(:\n")
+    return tmp_path / "components"
+
+
+@pytest.fixture
+def built_files(monkeypatch):
+    built: list[str] = []
+    build_component_entry = utils.build_component_entry
+
+    def record(file_path):
+        built.append(file_path.rsplit("/", 1)[-1])
+        return build_component_entry(file_path)
+
+    monkeypatch.setattr(utils, "build_component_entry", record)
+    return built
+
+
+def test_manifest_only_rebuilds_changed_files(components_path, built_files, monkeypatch):
+    path = str(components_path)
+    monkeypatch.setattr(get_settings_service().settings, "cache_components_manifest", False)
+    expected = utils.build_custom_component_list_from_path(path)
+    monkeypatch.setattr(get_settings_service().settings, "cache_components_manifest", True)
+    # Files with errors are left out
+    assert sorted(expected["generated"]) == ["first", "second", "third"]
+
+    built_files.clear()
+    assert utils.build_custom_component_list_from_path(path) == expected
+    assert sorted(built_files) == ["broken.py", "first.py", "second.py", "third.py"]
+
+    # Files with errors are not saved in the manifest, they are built again
+    built_files.clear()
+    assert utils.build_custom_component_list_from_path(path) == expected
+    assert built_files == ["broken.py"]
+
+    built_files.clear()
+    (components_path / "generated" / "second.py").write_text(COMPONENT.format(name="Changed"))
+    (components_path / "generated" / "third.py").unlink()
+    menu = utils.build_custom_component_list_from_path(path)["generated"]
+    assert sorted(built_files) == ["broken.py", "second.py"]
+    assert menu["second"]["display_name"] == "Changed"
+    assert "third" not in menu
+
+
+def test_manifest_is_dropped_on_version_change(components_path, built_files):
+    path = str(components_path)
+    utils.build_custom_component_list_from_path(path)
+    manifest = utils.get_components_manifest(path)
+    assert len(manifest.entries) == 3
+    assert ComponentManifest(manifest.manifest_path, version="0.0.0", sources=manifest.sources).load().entries == {}
+    assert ComponentManifest(manifest.manifest_path, sources="other sources").load().entries == {}
+
+    manifest.manifest_path.write_text("not json")
+    built_files.clear()
+    assert sorted(utils.build_custom_component_list_from_path(path)["generated"]) == ["first", "second", "third"]
+    assert len(built_files) == 4
+
+
+def test_sources_signature_changes_with_the_langflow_files(tmp_path, monkeypatch):
+    import langflow
+
+    (tmp_path / "base").mkdir()
+    (tmp_path / "components").mkdir()
+    (tmp_path / "base" / "model.py").write_text("class Model: ...\n")
+    (tmp_path / "components" / "component.py").write_text("class Component: ...\n")
+    monkeypatch.setattr(langflow, "__path__", [str(tmp_path)])
+    components = str(tmp_path / "components")
+    signature = get_sources_signature(exclude=components)
+
+    # The component files are compared one by one, changing them keeps the other entries
+    (tmp_path / "components" / "component.py").write_text("class ChangedComponent: ...\n")
+    assert get_sources_signature(exclude=components) == signature
+
+    # Components built on a base class that changed are built again
+    (tmp_path / "base" / "model.py").write_text("class ChangedModel: ...\n")
+    assert get_sources_signature(exclude=components) != signature
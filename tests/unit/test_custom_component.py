@@ -8,6 +8,7 @@ from langchain_core.documents import Document
 from langflow.custom import Component, CustomComponent
 from langflow.custom.code_parser.code_parser import CodeParser, CodeSyntaxError
 from langflow.custom.custom_component.base_component import BaseComponent, ComponentCodeNullError
+from langflow.custom.eval import eval_custom_component_code
 from langflow.custom.utils import build_custom_component_template
 from langflow.services.database.models.flow import Flow, FlowCreate
 
@@ -526,3 +527,23 @@ def test_build_config_field_value_keys(component):
 def test_custom_component_multiple_outputs(code_component_with_multiple_outputs, active_user):
     frontnd_node_dict, _ = build_custom_component_template(code_component_with_multiple_outputs, active_user.id)
     assert frontnd_node_dict["outputs"][0]["types"] == ["Text"]
+
+
+@pytest.mark.noclient
+def test_eval_custom_component_code_is_cached(code_component_with_multiple_outputs):
+    code = code_component_with_multiple_outputs.code
+    eval_custom_component_code.cache_clear()
+
+    first_class = eval_custom_component_code(code)
+    second_class = eval_custom_component_code(code)
+
+    assert first_class is second_class
+    cache_info = eval_custom_component_code.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+
+    # Instances of the shared class don't share their input values
+    first, second = first_class(), second_class()
+    first.set_attributes({"input": "first", "number": 1})
+    second.set_attributes({"input": "second", "number": 2})
+    assert first._inputs["input"].value == "first"
+    assert second._inputs["input"].value == "second"
@@ -9,6 +9,7 @@ import respx
 from dictdiffer import diff
 from httpx import Response
 
+from langflow.base.data.manifest import get_ingestion_manifest
 from langflow.components import data
 
 
@@ -156,7 +157,7 @@ def test_directory_component_build_with_multithreading(
     mock_resolve_path.assert_called_once_with(path)
     mock_retrieve_file_paths.assert_called_once_with(path, load_hidden, recursive, depth)
     mock_parallel_load_data.assert_called_once_with(
-        mock_retrieve_file_paths.return_value, silent_errors, max_concurrency
+        mock_retrieve_file_paths.return_value, silent_errors, max_concurrency, manifest=get_ingestion_manifest()
     )
 
 
@@ -63,6 +63,62 @@ def test_read_flows(client: TestClient, json_flow: str, active_user, logged_in_h
     assert len(response.json()) > 0
 
 
+def test_read_flows_pages_filters_and_etag(client: TestClient, json_flow: str, active_user, logged_in_headers):
+    data = orjson.loads(json_flow)["data"]
+    names = [f"Paged {i}" for i in range(5)]
+    for name in names:
+        flow = FlowCreate(name=name, description="description", data=data)
+        response = client.post("api/v1/flows/", json=flow.model_dump(), headers=logged_in_headers)
+        assert response.status_code == 201
+
+    params = {"name": "Paged", "header_flows": True, "remove_example_flows": True, "page": 1, "size": 2}
+    response = client.get("api/v1/flows/", params=params, headers=logged_in_headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert (page["total"], page["pages"], len(page["items"])) == (5, 3, 2)
+    assert all("data" not in item for item in page["items"])
+    # The last updated flows come first
+    assert [item["name"] for item in page["items"]] == ["Paged 4", "Paged 3"]
+
+    response = client.get("api/v1/flows/", params={**params, "page": 3}, headers=logged_in_headers)
+    assert [item["name"] for item in response.json()["items"]] == ["Paged 0"]
+
+    response = client.get("api/v1/flows/", params={"name": "Paged 1"}, headers=logged_in_headers)
+    flows = response.json()
+    assert [flow["name"] for flow in flows] == ["Paged 1"]
+    assert flows[0]["data"] == data
+
+    etag = response.headers["etag"]
+    headers = {**logged_in_headers, "If-None-Match": etag}
+    response = client.get("api/v1/flows/", params={"name": "Paged 1"}, headers=headers)
+    assert response.status_code == 304
+    client.patch(f"api/v1/flows/{flows[0]['id']}", json={"description": "changed"}, headers=logged_in_headers)
+    response = client.get("api/v1/flows/", params={"name": "Paged 1"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_flows_without_is_component_are_filtered_by_their_data(
+    client: TestClient, json_flow: str, active_user, logged_in_headers
+):
+    data = orjson.loads(json_flow)["data"]
+    flows = {
+        "Inferred flow": data,
+        "Inferred component": {**data, "nodes": data["nodes"][:1], "edges": []},
+    }
+    for name, flow_data in flows.items():
+        flow = FlowCreate(name=name, description="description", data=flow_data, is_component=None)
+        response = client.post("api/v1/flows/", json=flow.model_dump(), headers=logged_in_headers)
+        assert response.status_code == 201
+
+    params = {"name": "Inferred", "header_flows": True, "remove_example_flows": True}
+    for is_component, name in [(True, "Inferred component"), (False, "Inferred flow")]:
+        response = client.get(
+            "api/v1/flows/", params={**params, "is_component": is_component}, headers=logged_in_headers
+        )
+        assert [(flow["name"], flow["is_component"]) for flow in response.json()] == [(name, is_component)]
+
+
 def test_read_flow(client: TestClient, json_flow: str, active_user, logged_in_headers):
     flow = orjson.loads(json_flow)
     data = flow["data"]
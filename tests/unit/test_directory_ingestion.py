@@ -0,0 +1,107 @@
+import os
+from concurrent import futures
+
+import pytest
+
+from langflow.base.data import utils
+from langflow.base.data.manifest import IngestionManifest
+from langflow.base.data.utils import load_file_to_data, parallel_load_data, read_text_file
+
+pytestmark = pytest.mark.noclient
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    parse_file_text = utils.parse_file_text
+
+    def counting_parse(file_path, process_pool=None):
+        calls.append(os.path.basename(file_path))
+        return parse_file_text(file_path, process_pool)
+
+    monkeypatch.setattr(utils, "parse_file_text", counting_parse)
+    return calls
+
+
+def test_unchanged_files_are_not_parsed_again(tmp_path, parse_calls):
+    manifest = IngestionManifest()
+    (tmp_path / "a.txt").write_text("first")
+    (tmp_path / "b.json").write_text('{"key": "value"}')
+    paths = [str(tmp_path / "a.txt"), str(tmp_path / "b.json")]
+
+    first = [load_file_to_data(path, False, manifest) for path in paths]
+    second = [load_file_to_data(path, False, manifest) for path in paths]
+    assert [data.text for data in first] == [data.text for data in second] == ["first", '{"key":"value"}']
+    assert parse_calls == ["a.txt", "b.json"]
+
+    # A changed file is parsed again
+    (tmp_path / "a.txt").write_text("second version")
+    assert load_file_to_data(paths[0], False, manifest).text == "second version"
+    assert parse_calls[-1] == "a.txt"
+
+    # A copy of a parsed file is hashed but not parsed
+    (tmp_path / "c.txt").write_text("second version")
+    copy = load_file_to_data(str(tmp_path / "c.txt"), False, manifest)
+    assert copy.text == "second version"
+    assert copy.file_path == str(tmp_path / "c.txt")
+    assert parse_calls == ["a.txt", "b.json", "a.txt"]
+    # Unless its type is parsed differently
+    (tmp_path / "d.json").write_text('{"key": "value"}')
+    (tmp_path / "d.txt").write_text('{"key": "value"}')
+    assert load_file_to_data(str(tmp_path / "d.txt"), False, manifest).text == '{"key": "value"}'
+
+
+def test_parsed_yaml_is_copied(tmp_path):
+    manifest = IngestionManifest()
+    (tmp_path / "config.yaml").write_text("items:\n  - one\n")
+
+    load_file_to_data(str(tmp_path / "config.yaml"), False, manifest).text["items"].append("two")
+    assert load_file_to_data(str(tmp_path / "config.yaml"), False, manifest).text == {"items": ["one"]}
+
+
+def test_failures_are_not_cached(tmp_path):
+    manifest = IngestionManifest()
+    (tmp_path / "broken.json").write_text("{not json")
+
+    assert load_file_to_data(str(tmp_path / "broken.json"), True, manifest) is None
+    with pytest.raises(ValueError, match="Error loading file"):
+        load_file_to_data(str(tmp_path / "broken.json"), False, manifest)
+    assert load_file_to_data(str(tmp_path / "missing.txt"), True, manifest) is None
+
+
+def test_read_text_file_encodings(tmp_path):
+    (tmp_path / "bom.txt").write_bytes("﻿café\r\nline".encode("utf-8"))
+    assert read_text_file(str(tmp_path / "bom.txt")) == "café\nline"
+
+    # The encoding is detected from the start of the file only
+    latin = ("Ceci est un texte en français, écrit très simplement. " * 3000).encode("latin-1")
+    (tmp_path / "latin.txt").write_bytes(latin)
+    assert read_text_file(str(tmp_path / "latin.txt")) == latin.decode("latin-1")
+
+
+def test_documents_are_parsed_in_the_process_pool(tmp_path, monkeypatch):
+    from docx import Document  # type: ignore
+
+    paths = []
+    for index in range(3):
+        document = Document()
+        document.add_paragraph(f"Document {index}")
+        document.save(tmp_path / f"document-{index}.docx")
+        paths.append(str(tmp_path / f"document-{index}.docx"))
+    (tmp_path / "notes.txt").write_text("notes")
+    paths.append(str(tmp_path / "notes.txt"))
+
+    submitted = []
+    with futures.ProcessPoolExecutor(max_workers=1) as process_pool:
+        submit = process_pool.submit
+
+        def recording_submit(function, *args):
+            submitted.extend(args)
+            return submit(function, *args)
+
+        monkeypatch.setattr(process_pool, "submit", recording_submit)
+        monkeypatch.setattr(utils, "get_document_executor", lambda: process_pool)
+        results = parallel_load_data(paths, False, 2, manifest=IngestionManifest())
+
+    assert [data.text for data in results] == ["Document 0", "Document 1", "Document 2", "notes"]
+    assert submitted == paths[:3]
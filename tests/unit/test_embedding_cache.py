@@ -0,0 +1,168 @@
+import hashlib
+import pickle
+from array import array
+from typing import Any, Dict, List, Optional
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_core.pydantic_v1 import BaseModel, SecretStr
+
+from langflow.base.embeddings import cache
+from langflow.base.embeddings.cache import CachedEmbeddings, EmbeddingStore, embedding_namespace
+from langflow.base.embeddings.model import LCEmbeddingsModel
+from langflow.base.models.model import LCModelComponent
+
+pytestmark = pytest.mark.noclient
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic vectors derived from the hash of the text. Counts the texts it embeds."""
+
+    def __init__(self, model: str = "fake-model", dimensions: int = 8):
+        self.model = model
+        self.dimensions = dimensions
+        self.embedded: List[str] = []
+
+    def _vector(self, text: str) -> List[float]:
+        digest = hashlib.sha256(f"{self.model}:{text}".encode()).digest()
+        return [byte / 255 for byte in digest[: self.dimensions]]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.embedded.append(text)
+        return [-value for value in self._vector(text)]
+
+
+def float32(vector: List[float]) -> List[float]:
+    return array("f", vector).tolist()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = EmbeddingStore(str(tmp_path / "embeddings.db"), max_vectors=100)
+    monkeypatch.setattr(cache, "_embedding_store", store)
+    yield store
+    store.close()
+
+
+def test_only_new_texts_are_embedded(store):
+    fake = FakeEmbeddings()
+    embeddings = CachedEmbeddings(fake, store)
+
+    first = embeddings.embed_documents(["a", "b", "a", "c"])
+    assert fake.embedded == ["a", "b", "c"]
+    assert first == [float32(fake._vector(text)) for text in ["a", "b", "a", "c"]]
+
+    second = embeddings.embed_documents(["c", "d", "a"])
+    assert fake.embedded == ["a", "b", "c", "d"]
+    assert second == [first[3], float32(fake._vector("d")), first[0]]
+    # Each position is its own list
+    second[0].append(1.0)
+    assert len(embeddings.embed_documents(["c"])[0]) == 8
+
+    # Queries are cached apart from documents
+    assert embeddings.embed_query("a") == float32([-value for value in fake._vector("a")])
+    assert embeddings.embed_query("a") == float32([-value for value in fake._vector("a")])
+    assert fake.embedded == ["a", "b", "c", "d", "a"]
+
+
+@pytest.mark.asyncio
+async def test_async_embeddings_use_the_same_store(store):
+    fake = FakeEmbeddings()
+    embeddings = CachedEmbeddings(fake, store)
+
+    embeddings.embed_documents(["a"])
+    assert await embeddings.aembed_documents(["a", "b", "b"]) == embeddings.embed_documents(["a", "b", "b"])
+    assert await embeddings.aembed_query("q") == embeddings.embed_query("q")
+    assert fake.embedded == ["a", "b", "q"]
+
+
+def test_vectors_are_shared_per_model(store):
+    small = FakeEmbeddings(model="small")
+    large = FakeEmbeddings(model="large")
+    assert embedding_namespace(small) != embedding_namespace(large)
+    assert embedding_namespace(FakeEmbeddings(dimensions=4)) != embedding_namespace(FakeEmbeddings(dimensions=8))
+
+    CachedEmbeddings(small, store).embed_documents(["text"])
+    CachedEmbeddings(large, store).embed_documents(["text"])
+    assert small.embedded == large.embedded == ["text"]
+
+    # Another process (or a new run) reads the same file
+    other_store = EmbeddingStore(store.path, max_vectors=100)
+    again = FakeEmbeddings(model="small")
+    CachedEmbeddings(again, other_store).embed_documents(["text"])
+    assert again.embedded == []
+    other_store.close()
+
+
+class SettingsEmbeddings(BaseModel, Embeddings):
+    client: Any = None
+    model_name: str = "model"
+    encode_kwargs: Dict[str, Any] = {}
+    api_key: Optional[SecretStr] = None
+    huggingfacehub_api_token: Optional[str] = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[0.0] for _ in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [0.0]
+
+
+def test_namespace_includes_every_setting_but_credentials():
+    namespace = embedding_namespace(SettingsEmbeddings(client=object()))
+    assert namespace == embedding_namespace(SettingsEmbeddings(client=object()))
+    assert namespace != embedding_namespace(SettingsEmbeddings(encode_kwargs={"normalize_embeddings": True}))
+    assert namespace != embedding_namespace(SettingsEmbeddings(model_name="other"))
+
+    with_credentials = SettingsEmbeddings(api_key="secret", huggingfacehub_api_token="token")
+    assert embedding_namespace(with_credentials) == namespace
+    assert "secret" not in namespace
+
+
+def test_least_recently_used_vectors_are_evicted(tmp_path):
+    store = EmbeddingStore(str(tmp_path / "embeddings.db"), max_vectors=3)
+    fake = FakeEmbeddings()
+    embeddings = CachedEmbeddings(fake, store)
+
+    for text in ["a", "b", "c", "a", "d"]:
+        embeddings.embed_documents([text])
+    assert len(store) == 3
+
+    fake.embedded.clear()
+    embeddings.embed_documents(["a", "c", "d"])
+    assert fake.embedded == []
+    embeddings.embed_documents(["b"])
+    assert fake.embedded == ["b"]
+    store.close()
+
+
+def test_embedding_components_return_cached_embeddings(store):
+    class FakeEmbeddingsComponent(LCEmbeddingsModel):
+        def build_embeddings(self) -> Embeddings:
+            return FakeEmbeddings()
+
+    embeddings = FakeEmbeddingsComponent().build_embeddings()
+    assert isinstance(embeddings, CachedEmbeddings)
+    assert embeddings.model == "fake-model"
+
+    copied = pickle.loads(pickle.dumps(embeddings))
+    assert copied.store is store
+    assert copied.embed_documents(["x"]) == embeddings.embed_documents(["x"])
+
+    # Most embeddings components are built on LCModelComponent
+    class FakeModelEmbeddingsComponent(LCModelComponent):
+        def build_embeddings(self) -> Embeddings:
+            return FakeEmbeddings()
+
+    assert isinstance(FakeModelEmbeddingsComponent().build_embeddings(), CachedEmbeddings)
+
+
+def test_disabled_cache_returns_the_embeddings(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_embedding_store", EmbeddingStore(str(tmp_path / "embeddings.db"), max_vectors=0))
+    fake = FakeEmbeddings()
+    assert cache.cache_embeddings(fake) is fake
+    assert not (tmp_path / "embeddings.db").exists()
@@ -0,0 +1,200 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from langflow.base.vectorstores import faiss_registry
+from langflow.base.vectorstores.faiss_registry import MAX_DELTAS, FaissIndexRegistry
+from langflow.schema import Data
+
+pytest.importorskip("faiss")
+pytestmark = pytest.mark.noclient
+
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [byte / 255 for byte in hashlib.sha256(text.encode()).digest()[:8]]
+
+
+def contents(vector_store) -> List[str]:
+    return sorted(vector_store.docstore.search(id_).page_content for id_ in vector_store.index_to_docstore_id.values())
+
+
+def documents(*texts: str) -> List[Document]:
+    return [Document(page_content=text) for text in texts]
+
+
+def test_indexes_are_loaded_once(tmp_path):
+    registry = FaissIndexRegistry()
+    registry.update(str(tmp_path), "index", FakeEmbeddings(), documents("a", "b"))
+
+    other_process = FaissIndexRegistry()
+    first = other_process.get(str(tmp_path), "index", FakeEmbeddings(), allow_dangerous_deserialization=True)
+    second = other_process.get(
+        str(tmp_path / "." / ""), "index", FakeEmbeddings(), allow_dangerous_deserialization=True
+    )
+    assert first.index is second.index
+    assert contents(second) == ["a", "b"]
+    assert other_process.loads == 1
+
+    # Changed on disk, so it is read again
+    registry.update(str(tmp_path), "index", FakeEmbeddings(), documents("a", "b", "c"))
+    third = other_process.get(str(tmp_path), "index", FakeEmbeddings(), allow_dangerous_deserialization=True)
+    assert contents(third) == ["a", "b", "c"]
+    assert other_process.loads == 2
+
+
+def test_deserialization_has_to_be_allowed(tmp_path):
+    FaissIndexRegistry().update(str(tmp_path), "index", FakeEmbeddings(), documents("a"))
+
+    registry = FaissIndexRegistry()
+    with pytest.raises(ValueError, match="has to be allowed"):
+        registry.get(str(tmp_path), "index", FakeEmbeddings())
+    # Without deserialization the index is replaced, as it was before indexes were added to
+    assert contents(registry.update(str(tmp_path), "index", FakeEmbeddings(), documents("b"))) == ["b"]
+
+
+def test_only_new_documents_are_added(tmp_path):
+    registry = FaissIndexRegistry()
+    embeddings = FakeEmbeddings()
+    first = registry.update(str(tmp_path), "index", embeddings, documents("a", "b", "a"))
+    vector_store = registry.update(str(tmp_path), "index", embeddings, documents("a", "b", "c"))
+
+    assert embeddings.embedded == ["a", "b", "c"]
+    assert contents(vector_store) == ["a", "b", "c"]
+    assert vector_store.similarity_search("c", k=1)[0].page_content == "c"
+    # The index that was returned before may still be searched, it is not modified
+    assert contents(first) == ["a", "b"]
+    assert first.index.ntotal == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "index.delta-000001.faiss",
+        "index.delta-000001.pkl",
+        "index.faiss",
+        "index.pkl",
+    ]
+
+    # The deltas are merged into the index once there are enough of them
+    texts = ["a", "b", "c"]
+    for number in range(MAX_DELTAS):
+        texts.append(f"text {number}")
+        registry.update(str(tmp_path), "index", embeddings, documents(*texts))
+    assert sorted(path.name for path in tmp_path.iterdir() if "delta" in path.name) == [
+        "index.delta-000001.faiss",
+        "index.delta-000001.pkl",
+    ]
+    reloaded = FaissIndexRegistry().get(str(tmp_path), "index", embeddings, allow_dangerous_deserialization=True)
+    assert contents(reloaded) == contents(registry.get(str(tmp_path), "index", embeddings))
+    assert len(contents(reloaded)) == 3 + MAX_DELTAS
+
+
+def test_removed_documents_are_removed_from_the_index(tmp_path):
+    registry = FaissIndexRegistry()
+    embeddings = FakeEmbeddings()
+    registry.update(str(tmp_path), "index", embeddings, documents("a", "b"))
+    registry.update(str(tmp_path), "index", embeddings, documents("a", "b", "c"))
+    vector_store = registry.update(str(tmp_path), "index", embeddings, documents("a", "c"))
+
+    assert embeddings.embedded == ["a", "b", "c"]
+    assert contents(vector_store) == ["a", "c"]
+    assert vector_store.similarity_search("b", k=2)[0].page_content != "b"
+    # Deltas can't remove documents, the index is rewritten
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["index.faiss", "index.pkl"]
+    reloaded = FaissIndexRegistry().get(str(tmp_path), "index", embeddings, allow_dangerous_deserialization=True)
+    assert contents(reloaded) == ["a", "c"]
+
+
+def test_indexes_with_random_ids_are_not_duplicated(tmp_path):
+    # Indexes saved before documents were identified by their content have random ids
+    FAISS.from_documents(documents("a", "b", "a"), FakeEmbeddings()).save_local(str(tmp_path), "index")
+
+    embeddings = FakeEmbeddings()
+    vector_store = FaissIndexRegistry().update(
+        str(tmp_path), "index", embeddings, documents("a", "b", "c"), allow_dangerous_deserialization=True
+    )
+    assert embeddings.embedded == ["c"]
+    assert contents(vector_store) == ["a", "b", "c"]
+
+
+def test_memory_mapped_indexes_are_not_modified(tmp_path):
+    FaissIndexRegistry().update(str(tmp_path), "index", FakeEmbeddings(), documents("a", "b"))
+
+    registry = FaissIndexRegistry(mmap_threshold=0)
+    mapped = registry.get(str(tmp_path), "index", FakeEmbeddings(), allow_dangerous_deserialization=True)
+    assert registry._indexes[registry._key(str(tmp_path), "index")].mmapped
+
+    vector_store = registry.update(str(tmp_path), "index", FakeEmbeddings(), documents("a", "b", "c"))
+    assert vector_store.index is not mapped.index
+    assert contents(vector_store) == ["a", "b", "c"]
+    assert contents(mapped) == ["a", "b"]
+
+
+def test_faiss_component_loads_the_index_once_per_build(tmp_path, monkeypatch):
+    from langflow.components.vectorstores.FAISS import FaissVectorStoreComponent
+
+    registry = FaissIndexRegistry()
+    monkeypatch.setattr(faiss_registry, "_faiss_index_registry", registry)
+    monkeypatch.setattr(FaissVectorStoreComponent, "resolve_path", lambda self, path: path)
+    FaissIndexRegistry().update(str(tmp_path), "index", FakeEmbeddings(), documents("a", "b"))
+
+    component = FaissVectorStoreComponent()
+    component._attributes.update(
+        folder_path=str(tmp_path),
+        index_name="index",
+        embedding=FakeEmbeddings(),
+        vector_store_inputs=[Data(text="c")],
+        add_to_vector_store=False,
+        allow_dangerous_deserialization=True,
+        search_input="a",
+        number_of_results=1,
+    )
+    retriever = component.build_base_retriever()
+    assert [data.text for data in component.search_documents()] == ["a"]
+    assert retriever.vectorstore.index is component.build_vector_store().index
+    assert registry.loads == 1
+
+
+def test_faiss_component_outputs_can_run_concurrently(tmp_path, monkeypatch):
+    from langflow.components.vectorstores.FAISS import FaissVectorStoreComponent
+
+    registry = FaissIndexRegistry()
+    monkeypatch.setattr(faiss_registry, "_faiss_index_registry", registry)
+    monkeypatch.setattr(FaissVectorStoreComponent, "resolve_path", lambda self, path: path)
+    embeddings = FakeEmbeddings()
+
+    component = FaissVectorStoreComponent()
+    component._attributes.update(
+        folder_path=str(tmp_path),
+        index_name="index",
+        embedding=embeddings,
+        vector_store_inputs=[Data(text="a"), Data(text="b")],
+        add_to_vector_store=True,
+        allow_dangerous_deserialization=True,
+        search_input="a",
+        number_of_results=1,
+    )
+    assert FaissVectorStoreComponent.concurrent_outputs
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        vector_store, retriever, results = [
+            future.result()
+            for future in [
+                executor.submit(component.build_vector_store),
+                executor.submit(component.build_base_retriever),
+                executor.submit(component.search_documents),
+            ]
+        ]
+
+    # The outputs share one update of the index
+    assert retriever.vectorstore is vector_store
+    assert [data.text for data in results] == ["a"]
+    assert sorted(embeddings.embedded) == ["a", "b"]
@@ -3,7 +3,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from langflow.services.deps import get_storage_service
-from langflow.services.storage.service import StorageService
+from langflow.services.storage.service import StorageService, StoredFile
 
 
 @pytest.fixture
@@ -11,8 +11,16 @@ def mock_storage_service():
     # Create a mock instance of StorageService
     service = MagicMock(spec=StorageService)
     # Setup mock behaviors for the service methods as needed
+    service.chunk_size = 1024
     service.save_file.return_value = None
+    service.save_file_stream.return_value = StoredFile(name="test.txt", size=12, sha256="hash")
     service.get_file.return_value = b"file content"  # Binary content for files
+    service.get_file_size.return_value = len(b"file content")
+
+    async def stream_file(*args, **kwargs):
+        yield b"file content"
+
+    service.stream_file.side_effect = stream_file
     service.list_files.return_value = ["file1.txt", "file2.jpg"]
     service.delete_file.return_value = None
     return service
@@ -102,3 +110,27 @@ def test_file_operations(client, created_api_key, flow):
     # Verify that the file is indeed deleted
     response = client.get(f"api/v1/files/list/{flow_id}", headers=headers)
     assert file_name not in response.json()["files"]
+
+
+def test_download_file_range(client, created_api_key, flow):
+    headers = {"x-api-key": created_api_key.api_key}
+    file_content = b"Hello, world!"
+    response = client.post(
+        f"api/v1/files/upload/{flow.id}",
+        files={"file": ("range.txt", file_content)},
+        headers=headers,
+    )
+    assert response.status_code == 201
+
+    response = client.get(f"api/v1/files/download/{flow.id}/range.txt", headers={**headers, "Range": "bytes=7-11"})
+    assert response.status_code == 206
+    assert response.content == b"world"
+    assert response.headers["content-range"] == f"bytes 7-11/{len(file_content)}"
+
+    response = client.get(f"api/v1/files/download/{flow.id}/range.txt", headers={**headers, "Range": "bytes=-6"})
+    assert response.status_code == 206
+    assert response.content == b"world!"
+
+    response = client.get(f"api/v1/files/download/{flow.id}/range.txt", headers={**headers, "Range": "bytes=50-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(file_content)}"
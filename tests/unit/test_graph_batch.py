@@ -0,0 +1,129 @@
+import inspect
+import sys
+
+import pytest
+
+from langflow.components.inputs.TextInput import TextInputComponent
+from langflow.graph import Graph
+
+from flow_payloads import component_edge, component_node
+
+pytestmark = pytest.mark.noclient
+
+SETUP_CODE = """
+import asyncio
+import uuid
+
+from langflow.custom import Component
+from langflow.schema.message import Message
+from langflow.template.field.base import Output
+
+
+class BatchSetup(Component):
+    display_name = "Batch Setup"
+    outputs = [Output(display_name="Index", name="index", method="build_index")]
+
+    async def build_index(self) -> Message:
+        await asyncio.sleep(0.05)
+        return Message(text=uuid.uuid4().hex)
+"""
+
+COMBINE_CODE = """
+import asyncio
+
+from langflow.custom import Component
+from langflow.inputs.inputs import TextInput
+from langflow.template.field.base import Output
+
+
+class BatchCombine(Component):
+    display_name = "Batch Combine"
+    inputs = [
+        TextInput(name="text_value", display_name="Text"),
+        TextInput(name="index_value", display_name="Index"),
+    ]
+    outputs = [Output(display_name="Combined", name="combined", method="combine")]
+
+    async def combine(self) -> str:
+        await asyncio.sleep(0.1)
+        return f"{self.text_value}|{self.index_value}"
+"""
+
+
+def build_graph() -> Graph:
+    payload = {
+        "nodes": [
+            component_node("TextInput-1", inspect.getsource(sys.modules[TextInputComponent.__module__])),
+            component_node("BatchSetup-1", SETUP_CODE, frozen=True),
+            component_node("BatchCombine-1", COMBINE_CODE),
+        ],
+        "edges": [
+            component_edge("TextInput-1", "text", "BatchCombine-1", "text_value"),
+            component_edge("BatchSetup-1", "index", "BatchCombine-1", "index_value"),
+        ],
+    }
+    return Graph.from_payload(payload)
+
+
+def combined(run_outputs) -> str:
+    return run_outputs.outputs[0].outputs["combined"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_arun_runs_inputs_concurrently_on_isolated_copies():
+    graph = build_graph()
+    assert graph.get_shared_vertex_ids() == ["BatchSetup-1"]
+    inputs = [{"input_value": f"input {i}"} for i in range(6)]
+
+    results = await graph.arun(inputs, types=["text"] * 6, outputs=["BatchCombine-1"], max_concurrency=3)
+
+    values = [combined(run_outputs) for run_outputs in results]
+    assert [value.split("|")[0] for value in values] == [f"input {i}" for i in range(6)]
+    # The frozen setup is built once and shared by every run
+    assert len({value.split("|")[1] for value in values}) == 1
+    # The graph itself is left untouched by the runs
+    assert not graph.get_vertex("BatchCombine-1")._built
+
+
+@pytest.mark.asyncio
+async def test_arun_batch_yields_runs_as_they_finish():
+    graph = build_graph()
+    inputs = [{"input_value": f"input {i}"} for i in range(5)]
+
+    results = {}
+    async for index, run_outputs in graph.arun_batch(
+        inputs, types=["text"] * 5, outputs=["BatchCombine-1"], max_concurrency=2
+    ):
+        results[index] = combined(run_outputs)
+
+    assert sorted(results) == list(range(5))
+    assert all(value.startswith(f"input {index}|") for index, value in results.items())
+
+
+@pytest.mark.asyncio
+async def test_arun_batch_runs_each_input_in_its_own_session(monkeypatch):
+    graph = build_graph()
+    sessions = {}
+    run = Graph._run
+
+    async def record_session(self, **kwargs):
+        sessions[self._run_id] = kwargs["session_id"]
+        assert self is not graph
+        return await run(self, **kwargs)
+
+    monkeypatch.setattr(Graph, "_run", record_session)
+    inputs = [{"input_value": f"input {i}"} for i in range(3)]
+
+    async for _ in graph.arun_batch(inputs, types=["text"] * 3, outputs=["BatchCombine-1"], max_concurrency=3):
+        pass
+    # Each copy is a graph of its own, with its own run and session
+    assert len(sessions) == 3
+    assert len(set(sessions.values())) == 3
+
+    # The shared vertex is built now, so the graph can't be pickled and is copied from its data
+    sessions.clear()
+    async for _ in graph.arun_batch(
+        inputs, types=["text"] * 3, outputs=["BatchCombine-1"], session_id="session", max_concurrency=3
+    ):
+        pass
+    assert list(sessions.values()) == ["session"] * 3
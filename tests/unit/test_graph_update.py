@@ -0,0 +1,114 @@
+import copy
+
+import pytest
+
+from langflow.graph import Graph
+
+from flow_payloads import synthetic_flow
+
+pytestmark = pytest.mark.noclient
+
+
+def maps(graph: Graph) -> dict:
+    return {
+        name: {key: sorted(value) for key, value in getattr(graph, name).items() if value}
+        for name in ("predecessor_map", "successor_map", "parent_child_map")
+    } | {"in_degree_map": {key: value for key, value in graph.in_degree_map.items() if value}}
+
+
+def mark_built(graph: Graph) -> None:
+    for vertex in graph.vertices:
+        vertex._built = True
+
+
+def built_ids(graph: Graph) -> set:
+    return {vertex.id for vertex in graph.vertices if vertex._built}
+
+
+VERTICES = ["Synthetic-a", "Synthetic-b", "Synthetic-c", "Synthetic-d", "Synthetic-e"]
+CONNECTIONS = [("Synthetic-a", "Synthetic-b"), ("Synthetic-b", "Synthetic-c"), ("Synthetic-d", "Synthetic-e")]
+
+
+def test_update_only_invalidates_changed_vertices_and_successors():
+    graph = Graph.from_payload(synthetic_flow(VERTICES, CONNECTIONS))
+    mark_built(graph)
+    unchanged_vertex = graph.get_vertex("Synthetic-a")
+
+    new_payload = synthetic_flow(
+        VERTICES + ["Synthetic-f"],
+        CONNECTIONS + [("Synthetic-e", "Synthetic-f")],
+        values={"Synthetic-b": "changed"},
+    )
+    diff = graph.diff(Graph.from_payload(copy.deepcopy(new_payload)))
+    assert diff.changed_vertices == {"Synthetic-b"}
+    assert diff.added_vertices == {"Synthetic-f"}
+    assert [(edge["source"], edge["target"]) for edge in diff.added_edges] == [("Synthetic-e", "Synthetic-f")]
+
+    graph.update(Graph.from_payload(new_payload))
+
+    assert built_ids(graph) == {"Synthetic-a", "Synthetic-d", "Synthetic-e"}
+    assert graph.get_vertex("Synthetic-a") is unchanged_vertex
+    assert graph.get_vertex("Synthetic-b").data["node"]["template"]["input_value"]["value"] == "changed"
+    assert graph.get_vertex("Synthetic-f").graph is graph
+    assert maps(graph) == maps(Graph.from_payload(new_payload))
+
+
+def test_update_removes_vertices_and_edges():
+    graph = Graph.from_payload(synthetic_flow(VERTICES, CONNECTIONS))
+    mark_built(graph)
+    new_payload = synthetic_flow(
+        ["Synthetic-a", "Synthetic-b", "Synthetic-c", "Synthetic-e"],
+        [("Synthetic-a", "Synthetic-b"), ("Synthetic-a", "Synthetic-c")],
+    )
+
+    graph.update(Graph.from_payload(new_payload))
+
+    # c lost its edge from b and gained one from a, e lost its only predecessor
+    assert built_ids(graph) == {"Synthetic-a", "Synthetic-b"}
+    assert "Synthetic-d" not in graph.vertex_map
+    assert sorted((edge.source_id, edge.target_id) for edge in graph.edges) == [
+        ("Synthetic-a", "Synthetic-b"),
+        ("Synthetic-a", "Synthetic-c"),
+    ]
+    assert graph.get_vertex_edges("Synthetic-e") == []
+    assert maps(graph) == maps(Graph.from_payload(new_payload))
+    assert graph.sort_vertices() == Graph.from_payload(new_payload).sort_vertices()
+
+
+def test_update_without_changes_keeps_results():
+    graph = Graph.from_payload(synthetic_flow(VERTICES, CONNECTIONS))
+    mark_built(graph)
+    graph.update(Graph.from_payload(synthetic_flow(VERTICES, CONNECTIONS)))
+    assert built_ids(graph) == set(VERTICES)
+
+
+def test_update_of_a_copy_leaves_the_graph_as_is():
+    graph = Graph.from_payload(synthetic_flow(VERTICES, CONNECTIONS))
+    mark_built(graph)
+    graph_maps = maps(graph)
+    new_payload = synthetic_flow(
+        VERTICES + ["Synthetic-f"], CONNECTIONS + [("Synthetic-e", "Synthetic-f")], {"Synthetic-b": "changed"}
+    )
+
+    updated = graph.copy().update_from_payload(new_payload)
+
+    assert built_ids(updated) == {"Synthetic-a", "Synthetic-d", "Synthetic-e"}
+    assert all(vertex.graph is updated for vertex in updated.vertices)
+    assert maps(updated) == maps(Graph.from_payload(new_payload))
+    assert built_ids(graph) == set(VERTICES)
+    assert graph.get_vertex("Synthetic-b").data["node"]["template"]["input_value"]["value"] == ""
+    assert maps(graph) == graph_maps
+    assert len(graph.edges) == len(CONNECTIONS)
+
+
+def test_copies_refer_to_their_own_vertices():
+    graph = Graph.from_payload(synthetic_flow(VERTICES, CONNECTIONS))
+    graph_copy = graph.copy()
+
+    for vertex in graph_copy.vertices:
+        assert vertex.graph is graph_copy
+        assert vertex is not graph.get_vertex(vertex.id)
+        assert all(step.__self__ is vertex for step in vertex.steps)
+    (source,) = graph_copy.get_vertex("Synthetic-b")._raw_params["input_value"]
+    assert source is graph_copy.get_vertex("Synthetic-a")
+    assert graph.get_vertex("Synthetic-b")._raw_params["input_value"] == [graph.get_vertex("Synthetic-a")]
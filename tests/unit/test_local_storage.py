@@ -0,0 +1,102 @@
+import hashlib
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from langflow.services.storage.local import LocalStorageService
+from langflow.services.storage.utils import parse_range_header
+
+pytestmark = pytest.mark.noclient
+
+
+@pytest.fixture
+def storage(tmp_path):
+    settings = SimpleNamespace(config_dir=str(tmp_path), storage_chunk_size=4, storage_deduplicate=True)
+    return LocalStorageService(None, SimpleNamespace(settings=settings))
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def read(storage, flow_id, file_name, start=0, end=None) -> list[bytes]:
+    return [chunk async for chunk in storage.stream_file(flow_id, file_name, start=start, end=end)]
+
+
+@pytest.mark.asyncio
+async def test_files_are_written_and_read_in_chunks(storage):
+    stored = await storage.save_file_stream("flow", "file.txt", chunks(b"Hello", b", ", b"world!"))
+
+    assert stored.name == "file.txt"
+    assert stored.size == 13
+    assert stored.sha256 == hashlib.sha256(b"Hello, world!").hexdigest()
+    assert await storage.get_file("flow", "file.txt") == b"Hello, world!"
+    assert await storage.get_file_size("flow", "file.txt") == 13
+    assert await read(storage, "flow", "file.txt") == [b"Hell", b"o, w", b"orld", b"!"]
+    assert await read(storage, "flow", "file.txt", start=7, end=11) == [b"worl", b"d"]
+    # Files without a name are named after their content and temporary files are not listed
+    unnamed = await storage.save_file_stream("flow", None, chunks(b"data"))
+    assert unnamed.name == hashlib.sha256(b"data").hexdigest()
+    assert sorted(await storage.list_files("flow")) == sorted(["file.txt", unnamed.name])
+    with pytest.raises(FileNotFoundError):
+        await storage.get_file_size("flow", "missing.txt")
+
+
+@pytest.mark.asyncio
+async def test_files_with_the_same_content_are_stored_once(storage, tmp_path, monkeypatch):
+    first = await storage.save_file_stream("flow-1", "a.txt", chunks(b"same content"))
+    await storage.save_file_stream("flow-2", "b.txt", chunks(b"same ", b"content"))
+    blob_path = storage._blob_path(first.sha256)
+
+    assert os.stat(tmp_path / "flow-1" / "a.txt").st_ino == os.stat(tmp_path / "flow-2" / "b.txt").st_ino
+    assert blob_path.stat().st_nlink == 3
+    inode_path = storage._inode_path(blob_path.stat().st_ino)
+    assert inode_path.resolve() == blob_path.resolve()
+
+    # The blob of a file is found without listing the blobs
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "scandir", None)
+        await storage.delete_file("flow-1", "a.txt")
+    assert blob_path.exists()
+    # Replacing the last copy of the content releases its blob
+    await storage.save_file_stream("flow-2", "b.txt", chunks(b"other content"))
+    assert not blob_path.exists()
+    assert not inode_path.is_symlink()
+    assert await storage.get_file("flow-2", "b.txt") == b"other content"
+    await storage.delete_file("flow-2", "b.txt")
+    assert not any(path.is_file() for path in storage.blobs_dir.rglob("*"))
+
+
+@pytest.mark.asyncio
+async def test_failed_uploads_leave_no_files(storage, tmp_path):
+    async def failing():
+        yield b"partial"
+        raise ConnectionError("client went away")
+
+    with pytest.raises(ConnectionError):
+        await storage.save_file_stream("flow", "file.txt", failing())
+    assert list((tmp_path / "flow").iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        (None, None),
+        ("bytes=0-4", (0, 4)),
+        ("bytes=5-", (5, 9)),
+        ("bytes=-3", (7, 9)),
+        ("bytes=8-100", (8, 9)),
+        ("bytes=0-1,4-5", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 10) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=10-", "bytes=5-2"])
+def test_unsatisfiable_ranges(header):
+    with pytest.raises(ValueError):
+        parse_range_header(header, 10)
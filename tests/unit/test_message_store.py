@@ -0,0 +1,145 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from langflow.services.monitor import service as monitor_service_module
+from langflow.services.monitor.schema import MessageModel
+from langflow.services.monitor.service import MonitorService
+
+pytestmark = pytest.mark.noclient
+
+
+@pytest.fixture
+def monitor_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor_service_module, "user_cache_dir", lambda *args: str(tmp_path))
+    settings = SimpleNamespace(
+        monitor_queue_size=1000,
+        monitor_batch_size=100,
+        monitor_flush_interval=0.05,
+        monitor_queue_full_policy="block",
+        message_buffer_size=5,
+        message_buffer_sessions=2,
+    )
+    service = MonitorService(SimpleNamespace(settings=settings))
+    yield service
+    service.teardown()
+
+
+def add_message(service: MonitorService, index: int, session_id: str = "session", sender: str = "User"):
+    service.add_message(
+        MessageModel(
+            sender=sender,
+            sender_name=sender,
+            session_id=session_id,
+            text=f"message {index}",
+            timestamp=f"2024-01-01 00:00:{index:02d}",
+            flow_id="flow",
+        )
+    )
+
+
+def texts(records):
+    return [record["text"] for record in records]
+
+
+def test_messages_table_is_indexed(monitor_service):
+    with monitor_service.connection() as conn:
+        indexes = conn.execute("SELECT index_name FROM duckdb_indexes() WHERE table_name = 'messages'").fetchall()
+    assert indexes == [("idx_messages_flow_id_session_id_timestamp",)]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"order": "DESC", "limit": 3},
+        {"order": "DESC", "limit": 5, "sender": "Machine"},
+        {"order": "ASC", "limit": 3},
+        {"order": "ASC"},
+        {"order": "DESC", "flow_id": "flow"},
+        {"order": "DESC", "limit": 100},
+    ],
+)
+def test_buffered_reads_match_the_database(monitor_service, query):
+    for index in range(8):
+        add_message(monitor_service, index, sender="User" if index % 2 else "Machine")
+
+    # The first read loads the session, the second one is answered from the buffer when possible
+    first = monitor_service.get_messages(session_id="session", buffered=True, **query)
+    second = monitor_service.get_messages(session_id="session", buffered=True, **query)
+    expected = monitor_service.get_messages(session_id="session", **query)
+    assert texts(first) == texts(second) == texts(expected)
+
+
+def test_buffer_is_kept_up_to_date(monitor_service):
+    for index in range(3):
+        add_message(monitor_service, index)
+    assert texts(monitor_service.get_messages(buffered=True, session_id="session", limit=2)) == [
+        "message 2",
+        "message 1",
+    ]
+
+    for index in range(3, 10):
+        add_message(monitor_service, index)
+    hits = monitor_service.message_buffer.hits
+    assert texts(monitor_service.get_messages(buffered=True, session_id="session", limit=2)) == [
+        "message 9",
+        "message 8",
+    ]
+    assert monitor_service.message_buffer.hits == hits + 1
+    # The buffer only holds the last 5 messages, older ones are read from the database
+    assert len(monitor_service.get_messages(buffered=True, session_id="session")) == 10
+
+    monitor_service.delete_messages_session("session")
+    assert monitor_service.get_messages(buffered=True, session_id="session") == []
+    add_message(monitor_service, 10)
+    assert texts(monitor_service.get_messages(buffered=True, session_id="session")) == ["message 10"]
+
+
+def test_buffer_keeps_the_most_recent_sessions(monitor_service):
+    for session_id in ("a", "b", "c"):
+        add_message(monitor_service, 0, session_id=session_id)
+        monitor_service.get_messages(buffered=True, session_id=session_id)
+    assert "a" not in monitor_service.message_buffer
+    assert len(monitor_service.message_buffer) == 2
+
+
+def test_unbuffered_reads_have_the_index_of_every_message(monitor_service):
+    add_message(monitor_service, 0)
+    monitor_service.get_messages(session_id="session", buffered=True)
+    add_message(monitor_service, 1)
+
+    records = monitor_service.get_messages(session_id="session")
+    assert texts(records) == ["message 1", "message 0"]
+    assert all(isinstance(record["index"], int) for record in records)
+
+
+def test_update_and_delete_messages_are_parameterized(monitor_service):
+    add_message(monitor_service, 0, session_id="it's")
+    add_message(monitor_service, 1, session_id="it's")
+    records = monitor_service.get_messages(session_id="it's", order="ASC")
+    assert texts(records) == ["message 0", "message 1"]
+
+    monitor_service.update_message(records[0]["index"], text="it's updated")
+    monitor_service.delete_messages([records[1]["index"]])
+    assert texts(monitor_service.get_messages(session_id="it's")) == ["it's updated"]
+
+    with pytest.raises(ValueError):
+        monitor_service.update_message(records[0]["index"], **{"text = 'x' --": "y"})
+    with pytest.raises(ValueError):
+        monitor_service.get_messages(order_by="timestamp; DROP TABLE messages")
+
+
+def test_other_processes_can_write_to_the_database(monitor_service):
+    add_message(monitor_service, 1)
+    assert monitor_service.flush(timeout=5)
+
+    # Another worker process writes a message while this one is running
+    script = (
+        "import duckdb, sys; conn = duckdb.connect(sys.argv[1]); "
+        'conn.execute("INSERT INTO messages (sender, sender_name, session_id, text, timestamp, flow_id) '
+        "VALUES ('User', 'User', 'session', 'message 2', '2024-01-01 00:00:02', 'flow')\"); conn.close()"
+    )
+    subprocess.run([sys.executable, "-c", script, str(monitor_service.db_path)], check=True, timeout=60)
+    assert texts(monitor_service.get_messages(session_id="session", order="ASC")) == ["message 1", "message 2"]
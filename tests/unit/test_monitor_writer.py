@@ -0,0 +1,88 @@
+import time
+
+import duckdb
+import pytest
+
+from langflow.services.monitor.schema import MessageModel
+from langflow.services.monitor.utils import drop_and_create_table_if_schema_mismatch, validate_row
+from langflow.services.monitor.writer import MonitorWriter
+
+pytestmark = pytest.mark.noclient
+
+
+@pytest.fixture
+def connection(tmp_path):
+    db_path = str(tmp_path / "monitor.duckdb")
+    drop_and_create_table_if_schema_mismatch(db_path, "messages", MessageModel)
+    conn = duckdb.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def message_row(index: int) -> dict:
+    return validate_row(
+        MessageModel, {"sender": "User", "sender_name": "User", "session_id": "session", "text": f"message {index}"}
+    )
+
+
+def count_messages(connection) -> int:
+    with connection.cursor() as cursor:
+        return cursor.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+def test_monitor_writer_writes_in_batches(connection):
+    writer = MonitorWriter(connection.cursor, batch_size=10, flush_interval=60)
+    for index in range(25):
+        writer.put("messages", message_row(index))
+
+    # Two full batches are written without waiting for the flush interval
+    deadline = time.monotonic() + 5
+    while count_messages(connection) < 20 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert count_messages(connection) == 20
+
+    assert writer.flush(timeout=5)
+    assert count_messages(connection) == 25
+    assert writer.stats() == {"queued_rows": 0, "written_rows": 25, "dropped_rows": 0}
+    writer.stop()
+
+
+def test_monitor_writer_flushes_after_interval(connection):
+    writer = MonitorWriter(connection.cursor, batch_size=100, flush_interval=0.05)
+    writer.put("messages", message_row(0))
+
+    deadline = time.monotonic() + 5
+    while count_messages(connection) < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert count_messages(connection) == 1
+    writer.stop()
+
+
+def test_monitor_writer_drops_rows_when_full_by_default(connection):
+    # Rows are dropped by default instead of blocking the caller
+    writer = MonitorWriter(connection.cursor, queue_size=5, batch_size=100, flush_interval=60)
+    # Without the writer thread nothing is taken from the queue
+    writer.start = lambda: None  # type: ignore
+    for index in range(8):
+        writer.put("messages", message_row(index))
+    assert writer.dropped_rows == 3
+
+    del writer.start
+    writer.start()
+    writer.stop()
+    assert count_messages(connection) == 5
+
+
+def test_monitor_writer_stop_writes_pending_rows(connection):
+    writer = MonitorWriter(connection.cursor, batch_size=100, flush_interval=60)
+    for index in range(3):
+        writer.put("messages", message_row(index))
+    writer.stop()
+
+    assert not writer.running
+    assert count_messages(connection) == 3
+
+
+def test_monitor_writer_rejects_unknown_policy(connection):
+    with pytest.raises(ValueError):
+        MonitorWriter(connection.cursor, queue_full_policy="unknown")
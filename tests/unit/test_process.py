@@ -1,6 +1,12 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
 import pytest
 from langflow.processing.process import process_tweaks
+from langflow.services.cache.service import ThreadingInMemoryCache
 from langflow.services.deps import get_session_service
+from langflow.services.session.service import SessionService
 
 
 def test_no_tweaks():
@@ -301,3 +307,35 @@ async def test_load_langchain_object_without_session_id(client, basic_graph_data
     graph2, artifacts2 = await session_service.load_session(session_id1, data_graph=basic_graph_data, flow_id="flow_id")
 
     assert graph1 == graph2
+
+
+@pytest.mark.noclient
+def test_load_compiled_graph_is_cached_per_flow_version_and_tweaks(basic_graph_data):
+    settings_service = SimpleNamespace(settings=SimpleNamespace(compiled_graph_cache_size=4))
+    session_service = SessionService(ThreadingInMemoryCache(), settings_service)
+    updated_at = datetime.now(timezone.utc)
+    tweaks = {"dndnode_82": {"temperature": 0.5}}
+
+    graph1 = session_service.load_compiled_graph("flow_id", basic_graph_data, updated_at, tweaks, user_id="user1")
+    graph2 = session_service.load_compiled_graph("flow_id", basic_graph_data, updated_at, tweaks, user_id="user2")
+
+    assert len(session_service.compiled_graphs) == 1
+    # Every run gets its own copy of the graph
+    assert graph1 is not graph2
+    assert graph1.get_vertex("dndnode_82") is not graph2.get_vertex("dndnode_82")
+    assert graph1.user_id == "user1"
+    assert graph2.user_id == "user2"
+    assert graph2.get_vertex("dndnode_82").params["temperature"] == 0.5
+    assert [edge.matched_type for edge in graph1.edges] == [edge.matched_type for edge in graph2.edges]
+    # The payload of the flow is not modified by the tweaks
+    assert basic_graph_data == json.loads(pytest.BASIC_EXAMPLE_PATH.read_text())
+
+    session_service.load_compiled_graph("flow_id", basic_graph_data, updated_at, {})
+    session_service.load_compiled_graph("flow_id", basic_graph_data, updated_at + timedelta(seconds=1), tweaks)
+    assert len(session_service.compiled_graphs) == 3
+
+    session_service.load_compiled_graph("other_flow_id", basic_graph_data, updated_at, tweaks)
+    session_service.clear_compiled_graphs("flow_id")
+    assert session_service.compiled_graphs.keys() == [
+        session_service.build_compiled_graph_key("other_flow_id", updated_at, tweaks)
+    ]
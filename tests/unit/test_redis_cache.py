@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from langflow.services.cache.serialization import ValueCodec
+from langflow.services.cache.service import CACHE_MISS, RedisCache
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.noclient
+
+
+class JSONSerializer:
+    def dumps(self, value):
+        return json.dumps(value).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def redis_cache(server, **kwargs) -> RedisCache:
+    return RedisCache(
+        client=fakeredis.FakeAsyncRedis(server=server),
+        sync_client=fakeredis.FakeRedis(server=server),
+        expiration_time=60,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_set_get_delete(server):
+    cache = redis_cache(server)
+    assert cache.is_connected()
+
+    await cache.set("value", ("graph", {"artifact": 1}))
+    await cache.set("empty", {})
+    assert await cache.get("value") == ("graph", {"artifact": 1})
+    assert await cache.get("empty") == {}
+    assert await cache.get("missing") is CACHE_MISS
+    assert "value" in cache
+    assert await cache.contains("value")
+    assert fakeredis.FakeRedis(server=server).ttl("value") == 60
+
+    await cache.delete("value")
+    assert await cache.get("value") is CACHE_MISS
+
+
+@pytest.mark.asyncio
+async def test_sessions_check_the_cache_without_blocking(server):
+    from langflow.services.session.service import SessionService
+
+    cache = redis_cache(server)
+    # The sync client blocks the event loop while it waits for Redis
+    cache._sync_client = None
+    await cache.set("session", ("graph", {"artifact": 1}))
+
+    assert await SessionService(cache).load_session("session", flow_id="flow") == ("graph", {"artifact": 1})
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_upsert_merges_dicts_on_the_server(server):
+    # Two workers share the same Redis server
+    first, second = redis_cache(server), redis_cache(server)
+
+    await first.upsert("vertex", {"result": 1, 2: "two"})
+    await second.upsert("vertex", {"type": "int"})
+    assert await first.get("vertex") == {"result": 1, 2: "two", "type": "int"}
+
+    await second.upsert("vertex", {"result": 3})
+    assert await first.get("vertex") == {"result": 3, 2: "two", "type": "int"}
+
+    # Values that aren't dicts are replaced
+    await first.upsert("vertex", "done")
+    assert await second.get("vertex") == "done"
+    await first.upsert("vertex", {"result": 4})
+    assert await second.get("vertex") == {"result": 4}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compression", ["zstd", "lz4"])
+async def test_redis_cache_compression(server, compression):
+    pytest.importorskip("zstandard" if compression == "zstd" else "lz4")
+    cache = redis_cache(server, compression=compression)
+    value = {"text": "langflow " * 1000}
+
+    await cache.set("large", value)
+
+    stored = fakeredis.FakeRedis(server=server).hgetall("large")
+    assert sum(len(data) for data in stored.values()) < 1000
+    assert await cache.get("large") == value
+    # Workers without compression can still read the value
+    assert await redis_cache(server).get("large") == value
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_custom_serializer(server):
+    cache = redis_cache(server, serializer=JSONSerializer())
+
+    await cache.set("json", [1, "two"])
+
+    stored = fakeredis.FakeRedis(server=server).hgetall("json")
+    assert b'[1, "two"]' in b"".join(stored.values())
+    assert await cache.get("json") == [1, "two"]
+
+
+def test_value_codec_rejects_unknown_compression():
+    with pytest.raises(ValueError):
+        ValueCodec(compression="gzip")
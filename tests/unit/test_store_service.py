@@ -0,0 +1,184 @@
+import asyncio
+import socket
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from langflow.services.store.service import StoreService, user_data_var
+
+pytestmark = pytest.mark.noclient
+
+
+class MockStore:
+    """A Directus-like store that counts requests and answers conditional requests with 304."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.version = 1
+        self.requests: Counter = Counter()
+        self.not_modified = 0
+        self.client_ports: set = set()
+        self.components = [
+            {"id": f"{index:08d}-0000-0000-0000-000000000000", "name": f"C{index}"} for index in range(3)
+        ]
+
+    async def respond(self, request: Request, path: str, data) -> Response:
+        self.requests[path] += 1
+        self.client_ports.add(request.scope["client"][1])
+        await asyncio.sleep(self.delay)
+        etag = f'"{path}-{self.version}"'
+        if request.headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return Response(status_code=304, headers={"ETag": etag})
+        return JSONResponse(data, headers={"ETag": etag})
+
+    async def components_route(self, request: Request):
+        if "aggregate" in request.query_params:
+            return await self.respond(request, "count", {"data": [{"count": len(self.components)}]})
+        if "liked_by" in request.query_params.get("filter", ""):
+            if request.headers.get("authorization") != "Bearer key":
+                return JSONResponse({"errors": [{"message": "Invalid token"}]}, status_code=401)
+            return await self.respond(request, "liked", {"data": [{"id": self.components[0]["id"]}]})
+        return await self.respond(
+            request, "components", {"data": self.components, "meta": {"filter_count": len(self.components)}}
+        )
+
+    async def tags_route(self, request: Request):
+        return await self.respond(request, "tags", {"data": [{"id": "1", "name": "agents"}]})
+
+    async def like_route(self, request: Request):
+        self.requests["like"] += 1
+        self.version += 1
+        return JSONResponse([1])
+
+    def app(self) -> Starlette:
+        return Starlette(
+            routes=[
+                Route("/items/components", self.components_route),
+                Route("/items/tags", self.tags_route),
+                Route("/like", self.like_route, methods=["POST"]),
+            ]
+        )
+
+
+@pytest.fixture
+def mock_store():
+    store = MockStore()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(store.app(), log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    store.url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    yield store
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def store_service(store: MockStore, **settings) -> StoreService:
+    defaults = dict(
+        store_url=store.url,
+        download_webhook_url=None,
+        like_webhook_url=f"{store.url}/like",
+        store_cache_ttl=60,
+        store_cache_size=256,
+        store_max_connections=20,
+        store_http2=True,
+    )
+    return StoreService(SimpleNamespace(settings=SimpleNamespace(**{**defaults, **settings})))
+
+
+@pytest.mark.asyncio
+async def test_public_listings_and_tags_are_cached(mock_store):
+    service = store_service(mock_store)
+    filters = service.build_filter_conditions(search="agent")
+
+    for _ in range(5):
+        components, metadata = await service.query_components(filter_conditions=filters)
+        assert [component.name for component in components] == ["C0", "C1", "C2"]
+        assert metadata == {"filter_count": 3}
+        assert await service.get_tags() == [{"id": "1", "name": "agents"}]
+        assert await service.count_components(filters) == 3
+
+    assert mock_store.requests == {"components": 1, "tags": 1, "count": 1}
+    # Changing what is returned doesn't change what is cached
+    (await service.get_tags())[0]["name"] = "changed"
+    assert (await service.get_tags())[0]["name"] == "agents"
+    # Every request went through the same pooled connection
+    assert len(mock_store.client_ports) == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced(mock_store):
+    service = store_service(mock_store, store_cache_ttl=0)
+
+    results = await asyncio.gather(*(service.get_tags() for _ in range(20)))
+    assert all(tags == [{"id": "1", "name": "agents"}] for tags in results)
+    assert mock_store.requests["tags"] == 1
+
+    # Once the request is done, the next one goes to the store again since the cache is disabled
+    await service.get_tags()
+    assert mock_store.requests["tags"] == 2
+
+    # A cancelled caller doesn't cancel the request of the others
+    first = asyncio.create_task(service.get_tags())
+    second = asyncio.create_task(service.get_tags())
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == [{"id": "1", "name": "agents"}]
+    assert mock_store.requests["tags"] == 3
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_responses_are_revalidated(mock_store, monkeypatch):
+    service = store_service(mock_store)
+    await service.get_tags()
+
+    # Expire the cached response
+    monkeypatch.setattr(service.response_cache, "ttl", 0)
+    assert await service.get_tags() == [{"id": "1", "name": "agents"}]
+    assert mock_store.requests["tags"] == 2
+    assert mock_store.not_modified == 1
+
+    # Liking a component drops the cached listings
+    monkeypatch.setattr(service.response_cache, "ttl", 60)
+    await service.query_components()
+    assert await service.like_component("key", mock_store.components[0]["id"]) is True
+    await service.query_components()
+    assert mock_store.requests["components"] == 2
+    assert mock_store.not_modified == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_are_not_cached(mock_store):
+    service = store_service(mock_store)
+    user_data_var.set({"id": "user"})
+    component_ids = [component["id"] for component in mock_store.components]
+
+    for _ in range(3):
+        assert await service.get_liked_by_user_components(component_ids, "key") == [component_ids[0]]
+    assert mock_store.requests["liked"] == 3
+
+    # Requests with different keys are never shared
+    results = await asyncio.gather(
+        service.get_liked_by_user_components(component_ids, "key"),
+        service.get_liked_by_user_components(component_ids, "other"),
+        return_exceptions=True,
+    )
+    assert results[0] == [component_ids[0]]
+    assert results[1].response.status_code == 401
+    user_data_var.set(None)
+    await service.aclose()
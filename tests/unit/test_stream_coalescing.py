@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from langflow.api.utils import coalesce_chunks
+
+pytestmark = pytest.mark.noclient
+
+
+async def tokens(n_tokens: int, delay: float = 0, produced: list | None = None):
+    for index in range(n_tokens):
+        if delay:
+            await asyncio.sleep(delay)
+        if produced is not None:
+            produced.append(index)
+        yield f"{index},"
+
+
+def expected_text(n_tokens: int) -> str:
+    return "".join(f"{index}," for index in range(n_tokens))
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_without_interval_passes_tokens_through():
+    chunks = [chunk async for chunk in coalesce_chunks(tokens(20), max_interval=0)]
+    assert chunks == [f"{index}," for index in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_joins_tokens_up_to_the_size():
+    chunks = [chunk async for chunk in coalesce_chunks(tokens(1000), max_interval=60, max_size=100)]
+    assert "".join(chunks) == expected_text(1000)
+    # Every chunk but the last one is sent because it reached the size
+    assert all(len(chunk) >= 100 for chunk in chunks[:-1])
+    assert all(len(chunk) < 100 + len("999,") for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_sends_slow_tokens_after_the_interval():
+    chunks = [chunk async for chunk in coalesce_chunks(tokens(5, delay=0.05), max_interval=0.01, max_size=1000)]
+    assert chunks == [f"{index}," for index in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_pauses_the_stream_for_slow_consumers():
+    produced: list[int] = []
+    chunks = coalesce_chunks(tokens(1000, produced=produced), max_interval=0.01, max_size=10_000, queue_size=10)
+    received = [await chunks.__anext__()]
+    await asyncio.sleep(0.05)
+    # The stream is read only up to the size of the queue while the consumer is busy
+    assert len(produced) <= len(received[0].split(",")) + 11
+    received += [chunk async for chunk in chunks]
+    assert "".join(received) == expected_text(1000)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_raises_stream_errors():
+    async def failing_tokens():
+        yield "a"
+        raise ValueError("stream failed")
+
+    with pytest.raises(ValueError, match="stream failed"):
+        async for _ in coalesce_chunks(failing_tokens(), max_interval=0.01):
+            pass
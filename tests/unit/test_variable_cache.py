@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from langflow.services.deps import get_settings_service
+from langflow.services.variable.service import (
+    CREDENTIAL_TYPE,
+    GENERIC_TYPE,
+    DatabaseVariableService,
+    KubernetesSecretService,
+)
+
+pytestmark = pytest.mark.noclient
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def queries(session):
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_database_variables_are_prefetched_in_one_query(session, queries):
+    service = DatabaseVariableService(get_settings_service())
+    user_id = uuid4()
+    for name in ["OPENAI_API_KEY", "ANTHROPIC_API_KEY", "SESSION"]:
+        _type = GENERIC_TYPE if name == "SESSION" else CREDENTIAL_TYPE
+        service.create_variable(user_id, name, f"{name} value", _type=_type, session=session)
+    service.variable_cache.clear()
+
+    queries.clear()
+    service.prefetch_variables(user_id, ["OPENAI_API_KEY", "ANTHROPIC_API_KEY", "SESSION", "MISSING"], session)
+    assert len(queries) == 1
+    assert service.get_variable(user_id, "OPENAI_API_KEY", "api_key", session) == "OPENAI_API_KEY value"
+    assert service.get_variable(user_id, "SESSION", "session_id", session) == "SESSION value"
+    with pytest.raises(TypeError):
+        service.get_variable(user_id, "ANTHROPIC_API_KEY", "session_id", session)
+    assert len(queries) == 1
+    with pytest.raises(ValueError):
+        service.get_variable(user_id, "MISSING", "api_key", session)
+
+    # Changing a variable drops the cached values of the user
+    service.update_variable(user_id, "OPENAI_API_KEY", "new value", session=session)
+    assert service.get_variable(user_id, "OPENAI_API_KEY", "api_key", session) == "new value"
+    service.delete_variable(user_id, "SESSION", session=session)
+    with pytest.raises(ValueError):
+        service.get_variable(user_id, "SESSION", "session_id", session)
+
+
+def test_kubernetes_variables_are_prefetched_from_one_secret(mocker):
+    mocker.patch("kubernetes.config.load_kube_config")
+    mocker.patch("kubernetes.config.load_incluster_config")
+    service = KubernetesSecretService(get_settings_service())
+    service.kubernetes_secrets = MagicMock()
+    service.kubernetes_secrets.get_secret.return_value = {
+        f"{CREDENTIAL_TYPE}_OPENAI_API_KEY": "secret",
+        "SESSION": "generic",
+    }
+    user_id = uuid4()
+
+    service.prefetch_variables(user_id, ["OPENAI_API_KEY", "SESSION"], None)
+    assert service.get_variable(user_id, "OPENAI_API_KEY", "api_key", None) == "secret"
+    assert service.get_variable(user_id, "SESSION", "session_id", None) == "generic"
+    with pytest.raises(TypeError):
+        service.get_variable(user_id, "OPENAI_API_KEY", "session_id", None)
+    service.prefetch_variables(user_id, ["OPENAI_API_KEY"], None)
+    assert service.kubernetes_secrets.get_secret.call_count == 1
+
+    service.update_variable(user_id, "SESSION", "changed", None)
+    service.kubernetes_secrets.get_secret.return_value = {"SESSION": "changed"}
+    assert service.get_variable(user_id, "SESSION", "session_id", None) == "changed"
@@ -0,0 +1,112 @@
+import inspect
+import sys
+
+import pytest
+
+from langflow.components.inputs.TextInput import TextInputComponent
+from langflow.graph import Graph
+from langflow.services.cache import result_cache
+
+from flow_payloads import component_edge, component_node
+
+pytestmark = pytest.mark.noclient
+
+SPLIT_CODE = """
+import uuid
+
+from langflow.custom import Component
+from langflow.inputs.inputs import TextInput
+from langflow.schema.message import Message
+from langflow.template.field.base import Output
+
+
+class Split(Component):
+    display_name = "Split"
+    memoize = True
+    inputs = [TextInput(name="text_value", display_name="Text")]
+    outputs = [Output(display_name="Chunks", name="chunks", method="split")]
+
+    def split(self) -> Message:
+        return Message(text=f"{self.text_value}|{uuid.uuid4().hex}")
+"""
+
+
+def build_graph(code: str = SPLIT_CODE) -> Graph:
+    payload = {
+        "nodes": [
+            component_node("TextInput-1", inspect.getsource(sys.modules[TextInputComponent.__module__])),
+            component_node("Split-1", code),
+        ],
+        "edges": [component_edge("TextInput-1", "text", "Split-1", "text_value")],
+    }
+    return Graph.from_payload(payload)
+
+
+async def run_split(input_value: str, code: str = SPLIT_CODE, **kwargs) -> tuple[str, dict]:
+    graph = build_graph(code)
+    results = await graph.arun([{"input_value": input_value}], types=["text"], outputs=["Split-1"], **kwargs)
+    return results[0].outputs[0].outputs["chunks"]["message"]["text"], graph.get_result_cache_counts()
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = result_cache.VertexResultCache(maxsize=16, ttl=60, cache_dir=str(tmp_path / "results"))
+    monkeypatch.setattr(result_cache, "_vertex_result_cache", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_memoized_vertex_reuses_results_for_the_same_inputs(cache, monkeypatch):
+    first, counts = await run_split("a")
+    assert counts == {"hits": 0, "misses": 1}
+    again, counts = await run_split("a")
+    assert again == first
+    assert counts == {"hits": 1, "misses": 0}
+
+    other, counts = await run_split("b")
+    assert other.split("|")[0] == "b"
+    assert counts == {"hits": 0, "misses": 1}
+    # Changing the code of the component changes the key
+    changed, _ = await run_split("a", SPLIT_CODE.replace('display_name = "Split"', 'display_name = "Splitter"'))
+    assert changed != first
+
+    # Another process reads the result from the disk
+    monkeypatch.setattr(
+        result_cache, "_vertex_result_cache", result_cache.VertexResultCache(cache_dir=str(cache.cache_dir))
+    )
+    from_disk, counts = await run_split("a")
+    assert from_disk == first
+    assert counts == {"hits": 1, "misses": 0}
+
+
+@pytest.mark.asyncio
+async def test_vertices_are_not_memoized_by_default(cache):
+    code = SPLIT_CODE.replace("    memoize = True\n", "")
+    first, counts = await run_split("a", code)
+    again, _ = await run_split("a", code)
+    assert first != again
+    assert counts == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.asyncio
+async def test_variables_are_hashed_by_value_and_not_saved_to_disk(cache, monkeypatch):
+    code = SPLIT_CODE.replace(
+        "from langflow.inputs.inputs import TextInput", "from langflow.inputs.inputs import SecretStrInput, TextInput"
+    ).replace(
+        '    inputs = [TextInput(name="text_value", display_name="Text")]',
+        '    inputs = [\n        TextInput(name="text_value", display_name="Text"),\n'
+        '        SecretStrInput(name="api_key", display_name="API Key", value="SPLIT_API_KEY", load_from_db=True),\n'
+        "    ]",
+    )
+    monkeypatch.setenv("SPLIT_API_KEY", "first key")
+    first, counts = await run_split("a", code, fallback_to_env_vars=True)
+    again, counts = await run_split("a", code, fallback_to_env_vars=True)
+    assert again == first
+    assert counts == {"hits": 1, "misses": 0}
+
+    # The name of the variable is the same, its value changed
+    monkeypatch.setenv("SPLIT_API_KEY", "second key")
+    changed, counts = await run_split("a", code, fallback_to_env_vars=True)
+    assert changed != first
+    assert counts == {"hits": 0, "misses": 1}
+    assert not cache.cache_dir.exists() or not any(cache.cache_dir.rglob("*.pkl"))